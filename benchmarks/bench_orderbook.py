@@ -0,0 +1,103 @@
+"""
+Order Book Benchmark
+
+Measures depth updates per second on a single core with a synthetic feed,
+for the array-backed OrderBook and for a dict/list rebuild baseline.
+
+Usage:
+    python benchmarks/bench_orderbook.py --symbols 1000 --updates 500000 --levels 5
+"""
+
+import argparse
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from kgi_trading_app.orderbook import OrderBook
+
+
+def make_feed(symbols: int, updates: int, levels: int, seed: int = 1) -> list:
+    """Build (symbol, bid_prices, bid_sizes, ask_prices, ask_sizes) updates."""
+    rng = np.random.default_rng(seed)
+    names = [f"{1000 + i}" for i in range(symbols)]
+    mids = rng.uniform(10, 1000, symbols)
+    ticks = np.arange(1, levels + 1) * 0.05
+    feed = []
+    for index in rng.integers(0, symbols, updates):
+        mid = mids[index] + rng.normal(0, 0.1)
+        sizes = rng.integers(1, 500, 2 * levels).tolist()
+        feed.append((names[index], (mid - ticks).tolist(), sizes[:levels],
+                     (mid + ticks).tolist(), sizes[levels:]))
+    return feed
+
+
+def bench_array_book(feed: list, symbols: int, levels: int) -> float:
+    book = OrderBook(levels=levels, capacity=symbols)
+    update = book.update
+    start = time.perf_counter()
+    for symbol, bid_prices, bid_sizes, ask_prices, ask_sizes in feed:
+        update(symbol, bid_prices, bid_sizes, ask_prices, ask_sizes, 0)
+    return len(feed) / (time.perf_counter() - start)
+
+
+def bench_dict_rebuild(feed: list) -> float:
+    books = {}
+    start = time.perf_counter()
+    for symbol, bid_prices, bid_sizes, ask_prices, ask_sizes in feed:
+        books[symbol] = {
+            "bids": [{"price": p, "size": s} for p, s in zip(bid_prices, bid_sizes)],
+            "asks": [{"price": p, "size": s} for p, s in zip(ask_prices, ask_sizes)],
+            "timestamp_ns": 0
+        }
+    return len(feed) / (time.perf_counter() - start)
+
+
+def bench_snapshots(book_symbols: list, book: OrderBook, count: int) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        book.snapshot(book_symbols[i % len(book_symbols)])
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Order book update benchmark")
+    parser.add_argument("--symbols", type=int, default=1000, help="Number of symbols")
+    parser.add_argument("--updates", type=int, default=500000, help="Number of depth updates")
+    parser.add_argument("--levels", type=int, default=5, help="Depth levels per side (5 or 10)")
+    parser.add_argument("--core", type=int, default=0, help="CPU core to pin to (Linux only)")
+    args = parser.parse_args()
+
+    if hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, {args.core})
+        except OSError:
+            pass
+
+    print(f"Building synthetic feed: {args.updates:,} updates, {args.symbols:,} symbols, "
+          f"{args.levels} levels...")
+    feed = make_feed(args.symbols, args.updates, args.levels)
+
+    array_rate = bench_array_book(feed, args.symbols, args.levels)
+    dict_rate = bench_dict_rebuild(feed)
+
+    book = OrderBook(levels=args.levels, capacity=args.symbols)
+    for symbol, bid_prices, bid_sizes, ask_prices, ask_sizes in feed[:args.symbols * 4]:
+        book.update(symbol, bid_prices, bid_sizes, ask_prices, ask_sizes, 0)
+    snapshot_rate = bench_snapshots(book.symbols(), book, min(args.updates, 200000))
+
+    start = time.perf_counter()
+    for _ in range(100):
+        book.top_of_book()
+    top_ms = (time.perf_counter() - start) * 10
+
+    print(f"OrderBook.update     : {array_rate:>12,.0f} updates/s per core")
+    print(f"dict/list rebuild    : {dict_rate:>12,.0f} updates/s per core")
+    print(f"OrderBook.snapshot   : {snapshot_rate:>12,.0f} snapshots/s")
+    print(f"OrderBook.top_of_book: {top_ms:>12.3f} ms for {len(book.symbols()):,} symbols")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 import threading
 import queue
+import argparse
 import sys
 import os
 from datetime import datetime
@@ -17,6 +18,10 @@ from datetime import datetime
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from kgi_trading_app.client import KGITradingClient
+from kgi_trading_app.events import ClientEvent
+from kgi_trading_app.profiling import SessionProfiler
+from kgi_trading_app.tracing import configure_tracing, get_tracer
+from kgi_trading_app.shutdown import get_shutdown_manager, PRIORITY_FLUSH
 
 
 class KGITradingGUI:
@@ -33,6 +38,7 @@ class KGITradingGUI:
         
         # Initialize client
         self.client = None
+        self._unsubscribe_client = None
         self.simulation_mode = True
         
         # Thread-safe queue for updating GUI from worker threads
@@ -250,12 +256,40 @@ class KGITradingGUI:
     def initialize_client(self):
         """Initialize the trading client."""
         try:
-            self.client = KGITradingClient(simulation=self.simulation_mode)
+            self.attach_client(KGITradingClient(simulation=self.simulation_mode))
             mode_text = "模擬模式" if self.simulation_mode else "正式模式"
             self.add_log(f"交易客戶端已初始化 ({mode_text})")
         except Exception as e:
             self.add_log(f"客戶端初始化錯誤: {str(e)}", "ERROR")
     
+    def attach_client(self, client):
+        """
+        Make a client current and follow its state through events.
+        
+        Args:
+            client (KGITradingClient): Newly created client
+        """
+        if self._unsubscribe_client:
+            self._unsubscribe_client()
+        self.client = client
+        self.client.register_shutdown()
+        # Events arrive on SDK and worker threads; hand them to the Tk thread
+        # through the same queue as log and status updates
+        self._unsubscribe_client = client.subscribe(
+            lambda event: self.message_queue.put(('event', event)))
+    
+    def on_client_event(self, event):
+        """Handle a client event on the Tk thread."""
+        if event.type == ClientEvent.LOGGED_IN:
+            self.update_button_states(True)
+        elif event.type == ClientEvent.LOGGED_OUT:
+            self.update_button_states(False)
+        elif event.type == ClientEvent.CONTRACTS_READY:
+            self.add_log("合約資料已載入", "SUCCESS")
+        elif event.type == ClientEvent.CONNECTION_LOST:
+            self.add_log(f"連線中斷: {event.data.get('reason', '')}", "ERROR")
+            self.update_status("連線中斷", "ERROR")
+    
     def on_mode_change(self):
         """Handle mode change."""
         self.simulation_mode = (self.mode_var.get() == "simulation")
@@ -316,9 +350,8 @@ class KGITradingGUI:
                         self.status_label.configure(text=status, style='Success.TLabel')
                     else:
                         self.status_label.configure(text=status, style='Status.TLabel')
-                elif item[0] == 'buttons':
-                    logged_in = item[1]
-                    self.update_button_states(logged_in)
+                elif item[0] == 'event':
+                    self.on_client_event(item[1])
                     
         except queue.Empty:
             pass
@@ -369,33 +402,32 @@ class KGITradingGUI:
                 self.update_status("登入中...", "INFO")
                 
                 # Reinitialize client with current mode
-                self.client = KGITradingClient(simulation=self.simulation_mode)
+                self.attach_client(KGITradingClient(simulation=self.simulation_mode))
                 
                 success = self.client.login(user_id, password, account_type=account_type)
                 
                 if success:
                     self.add_log("登入成功！", "SUCCESS")
                     self.update_status("已連線", "SUCCESS")
-                    self.message_queue.put(('buttons', True))
                     
                     # Show account information
-                    accounts = self.client.get_account_list()
+                    records = self.client.get_account_records()
                     account_types = self.client.get_available_account_types()
                     
-                    self.add_log(f"找到 {len(accounts)} 個帳戶 (證券: {account_types['stock']}, 期貨: {account_types['futures']})")
+                    self.add_log(f"找到 {len(records)} 個帳戶 (證券: {account_types['stock']}, 期貨: {account_types['futures']})")
                     
-                    for i, account in enumerate(accounts):
-                        account_type_name = "證券" if "Stock" in str(type(account)) else "期貨"
-                        signed_status = "已簽署" if hasattr(account, 'signed') and account.signed else "未簽署"
+                    for i, record in enumerate(records):
+                        account_type_name = "證券" if record.type == "Stock" else "期貨"
+                        signed_status = "已簽署" if record.signed else "未簽署"
                         
                         self.add_log(f"帳戶 {i+1}: {account_type_name}")
-                        self.add_log(f"  身份證字號: {account.person_id}")
-                        self.add_log(f"  券商代碼: {account.broker_id}")
-                        self.add_log(f"  帳戶代碼: {account.account_id}")
+                        self.add_log(f"  身份證字號: {record.person_id}")
+                        self.add_log(f"  券商代碼: {record.broker_id}")
+                        self.add_log(f"  帳戶代碼: {record.account_id}")
                         self.add_log(f"  狀態: {signed_status}")
                         
-                        if hasattr(account, 'trader') and account.trader:
-                            self.add_log(f"  交易員: {account.trader}")
+                        if record.trader:
+                            self.add_log(f"  交易員: {record.trader}")
                 else:
                     self.add_log("登入失敗！請檢查您的憑證", "ERROR")
                     self.update_status("登入失敗", "ERROR")
@@ -404,9 +436,10 @@ class KGITradingGUI:
                 self.add_log(f"登入錯誤: {str(e)}", "ERROR")
                 self.update_status("連線錯誤", "ERROR")
         
-        # Start login in background thread
-        thread = threading.Thread(target=login_worker, daemon=True)
-        thread.start()
+        # Start login in background thread, carrying the trace context
+        with get_tracer().span("gui.login"):
+            thread = threading.Thread(target=get_tracer().wrap(login_worker), daemon=True)
+            thread.start()
     
     def logout_async(self):
         """Perform logout in a separate thread."""
@@ -421,7 +454,6 @@ class KGITradingGUI:
                     if success:
                         self.add_log("登出成功", "SUCCESS")
                         self.update_status("未連線", "INFO")
-                        self.message_queue.put(('buttons', False))
                         self.password_var.set("")  # Clear password
                     else:
                         self.add_log("登出失敗", "ERROR")
@@ -431,8 +463,9 @@ class KGITradingGUI:
             except Exception as e:
                 self.add_log(f"登出錯誤: {str(e)}", "ERROR")
         
-        thread = threading.Thread(target=logout_worker, daemon=True)
-        thread.start()
+        with get_tracer().span("gui.logout"):
+            thread = threading.Thread(target=get_tracer().wrap(logout_worker), daemon=True)
+            thread.start()
     
     def show_accounts(self):
         """Show account information."""
@@ -440,24 +473,24 @@ class KGITradingGUI:
             self.add_log("尚未登入", "WARNING")
             return
         
-        accounts = self.client.get_account_list()
+        records = self.client.get_account_records()
         
-        if accounts:
+        if records:
             self.add_log("-" * 40)
             self.add_log("帳戶資訊:")
             
-            for i, account in enumerate(accounts):
-                account_type = "證券" if "Stock" in str(type(account)) else "期貨"
-                signed_status = "✅ 已簽署" if hasattr(account, 'signed') and account.signed else "❌ 未簽署"
+            for i, record in enumerate(records):
+                account_type = "證券" if record.type == "Stock" else "期貨"
+                signed_status = "✅ 已簽署" if record.signed else "❌ 未簽署"
                 
                 self.add_log(f"\n帳戶 {i+1}: {account_type}")
-                self.add_log(f"  身份證字號: {account.person_id}")
-                self.add_log(f"  券商代碼: {account.broker_id}")
-                self.add_log(f"  帳戶代碼: {account.account_id}")
+                self.add_log(f"  身份證字號: {record.person_id}")
+                self.add_log(f"  券商代碼: {record.broker_id}")
+                self.add_log(f"  帳戶代碼: {record.account_id}")
                 self.add_log(f"  狀態: {signed_status}")
                 
-                if hasattr(account, 'trader') and account.trader:
-                    self.add_log(f"  交易員: {account.trader}")
+                if record.trader:
+                    self.add_log(f"  交易員: {record.trader}")
             
             self.add_log("-" * 40)
         else:
@@ -604,27 +637,49 @@ class KGITradingGUI:
                     "您仍處於登入狀態。確定要退出應用程式嗎？",
                     icon='question'
                 )
-                if result == 'yes':
-                    self.client.logout()
-                    self.client.cleanup()
-                else:
+                if result != 'yes':
                     return
             
+            # Logout at shutdown still emits events; stop taking them first
+            if self._unsubscribe_client:
+                self._unsubscribe_client()
+                self._unsubscribe_client = None
+            
+            # Leaving mainloop hands over to the shutdown manager, which
+            # logs out under a deadline and flushes before exiting
             self.root.quit()
             self.root.destroy()
             
-            # Force exit to handle any hanging threads
-            import os
-            os._exit(0)
-            
         except Exception as e:
             print(f"關閉錯誤: {e}")
-            import os
-            os._exit(0)
+            self.root.quit()
 
 
 def main():
     """Main entry point for the GUI application."""
+    parser = argparse.ArgumentParser(description='KGI Securities Trading Application GUI')
+    parser.add_argument('--profile', type=str, metavar='PREFIX',
+                       help='Profile the whole session and write PREFIX.collapsed / .threads.json on exit')
+    parser.add_argument('--profile-mode', choices=['sample', 'cprofile'], default='sample',
+                       help='Profiler type (default: sample); cprofile also writes PREFIX.prof')
+    parser.add_argument('--trace', type=str, metavar='FILE',
+                       help='Write tracing spans to a rotating JSON lines file')
+    parser.add_argument('--shutdown-timeout', type=float, default=10.0,
+                       help='Seconds allowed for logout and flushing on exit (default: 10)')
+    args = parser.parse_args()
+    
+    shutdown = get_shutdown_manager()
+    shutdown.deadline = args.shutdown_timeout
+    
+    if args.trace:
+        tracer = configure_tracing(args.trace)
+        shutdown.register("tracing", tracer.shutdown, priority=PRIORITY_FLUSH)
+    
+    if args.profile:
+        profiler = SessionProfiler(args.profile, mode=args.profile_mode)
+        profiler.start()
+        shutdown.register("profiler", profiler.stop, priority=PRIORITY_FLUSH)
+    
     try:
         root = tk.Tk()
         app = KGITradingGUI(root)
@@ -634,8 +689,7 @@ def main():
     except Exception as e:
         print(f"應用程式錯誤: {e}")
     finally:
-        import os
-        os._exit(0)
+        shutdown.exit(0)
 
 
 if __name__ == "__main__":
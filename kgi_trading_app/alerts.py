@@ -0,0 +1,288 @@
+"""
+Price Alerts
+
+This module provides ``AlertEngine``, which checks thousands of price
+alerts per tick without scanning them all.
+
+Each symbol keeps three threshold lists sorted ascending, with alert ids in
+parallel lists:
+
+- ``above``: fires when the price is at or above the threshold
+- ``below``: fires when the price is at or below the threshold
+- ``cross``: fires when the price moves through the threshold between two
+  ticks, in either direction
+
+A tick finds the triggered span with one ``bisect`` per list, so the cost
+is O(log n + k) for n alerts on the symbol and k triggered. Above and below
+alerts are one-shot and removed when they fire; cross alerts can repeat.
+
+Triggered alerts are delivered to consumers as dicts::
+
+    {"alert_id", "symbol", "kind", "threshold", "price", "previous",
+     "message", "timestamp_ns"}
+
+Consumers run on the quote thread; wrap GUI callbacks with
+``events.tk_bridge`` and use ``log_consumer()`` for logging.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+KINDS = ("above", "below", "cross")
+
+logger = logging.getLogger(__name__)
+
+
+class Alert:
+    """A registered price alert."""
+
+    __slots__ = ("alert_id", "symbol", "kind", "threshold", "repeat", "message")
+
+    def __init__(self, alert_id: int, symbol: str, kind: str, threshold: float,
+                 repeat: bool = False, message: str = ""):
+        """
+        Initialize the alert.
+
+        Args:
+            alert_id (int): Engine-assigned id
+            symbol (str): Symbol code
+            kind (str): "above", "below" or "cross"
+            threshold (float): Price threshold
+            repeat (bool): Cross alerts stay armed after firing (default: False)
+            message (str): Text passed to consumers (default: "")
+        """
+        self.alert_id = alert_id
+        self.symbol = symbol
+        self.kind = kind
+        self.threshold = threshold
+        self.repeat = repeat
+        self.message = message
+
+    def __repr__(self):
+        return f"Alert({self.alert_id}, {self.symbol} {self.kind} {self.threshold})"
+
+
+class _SymbolIndex:
+    """Sorted thresholds and parallel alert ids for one symbol."""
+
+    __slots__ = ("thresholds", "ids", "last")
+
+    def __init__(self):
+        self.thresholds = {kind: [] for kind in KINDS}
+        self.ids = {kind: [] for kind in KINDS}
+        self.last = None
+
+
+class AlertEngine:
+    """
+    Per-symbol sorted threshold index for price alerts.
+    """
+
+    def __init__(self):
+        """Initialize an empty engine."""
+        self._symbols: Dict[str, _SymbolIndex] = {}
+        self._alerts: Dict[int, Alert] = {}
+        self._ids = itertools.count(1)
+        self._consumers: Tuple[Callable, ...] = ()
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def add_alert(self, symbol: str, kind: str, threshold: float, repeat: bool = False,
+                  message: str = "") -> int:
+        """
+        Register an alert.
+
+        Args:
+            symbol (str): Symbol code
+            kind (str): "above", "below" or "cross"
+            threshold (float): Price threshold
+            repeat (bool): Keep a cross alert armed after it fires (default: False)
+            message (str): Text passed to consumers (default: "")
+
+        Returns:
+            int: Alert id
+        """
+        if kind not in KINDS:
+            raise ValueError(f"kind must be one of {KINDS}, got {kind}")
+        if repeat and kind != "cross":
+            raise ValueError("only cross alerts can repeat")
+        threshold = float(threshold)
+
+        with self._lock:
+            alert_id = next(self._ids)
+            self._alerts[alert_id] = Alert(alert_id, symbol, kind, threshold, repeat, message)
+            index = self._symbols.get(symbol)
+            if index is None:
+                index = self._symbols[symbol] = _SymbolIndex()
+            thresholds, ids = index.thresholds[kind], index.ids[kind]
+            position = bisect_right(thresholds, threshold)
+            thresholds.insert(position, threshold)
+            ids.insert(position, alert_id)
+        return alert_id
+
+    def remove_alert(self, alert_id: int) -> bool:
+        """
+        Remove an alert.
+
+        Args:
+            alert_id (int): Id returned by add_alert
+
+        Returns:
+            bool: True if the alert was registered
+        """
+        with self._lock:
+            alert = self._alerts.pop(alert_id, None)
+            if alert is None:
+                return False
+            index = self._symbols[alert.symbol]
+            thresholds, ids = index.thresholds[alert.kind], index.ids[alert.kind]
+            position = bisect_left(thresholds, alert.threshold)
+            while ids[position] != alert_id:
+                position += 1
+            del thresholds[position]
+            del ids[position]
+        return True
+
+    def alerts(self, symbol: Optional[str] = None) -> List[Alert]:
+        """Get registered alerts, optionally for one symbol."""
+        with self._lock:
+            return [alert for alert in self._alerts.values()
+                    if symbol is None or alert.symbol == symbol]
+
+    def __len__(self) -> int:
+        return len(self._alerts)
+
+    def subscribe(self, consumer: Callable[[dict], None]) -> Callable[[], None]:
+        """
+        Register a consumer for triggered alerts.
+
+        Args:
+            consumer (Callable): Called with each triggered alert dict
+
+        Returns:
+            Callable: Call it to unsubscribe
+        """
+        with self._lock:
+            self._consumers = self._consumers + (consumer,)
+
+        def unsubscribe():
+            with self._lock:
+                self._consumers = tuple(c for c in self._consumers if c is not consumer)
+        return unsubscribe
+
+    def check(self, symbol: str, price: float, timestamp_ns: Optional[int] = None) -> List[dict]:
+        """
+        Trigger the alerts crossed by a new price and deliver them.
+
+        Args:
+            symbol (str): Symbol code
+            price (float): New price
+            timestamp_ns (int): Tick time in ns (default: time.time_ns())
+
+        Returns:
+            List[dict]: Triggered alerts
+        """
+        index = self._symbols.get(symbol)
+        if index is None:
+            return []
+
+        fired = []
+        with self._lock:
+            previous, index.last = index.last, price
+
+            thresholds, ids = index.thresholds["above"], index.ids["above"]
+            if thresholds and thresholds[0] <= price:
+                end = bisect_right(thresholds, price)
+                fired.extend(ids[:end])
+                del thresholds[:end]
+                del ids[:end]
+
+            thresholds, ids = index.thresholds["below"], index.ids["below"]
+            if thresholds and thresholds[-1] >= price:
+                start = bisect_left(thresholds, price)
+                fired.extend(ids[start:])
+                del thresholds[start:]
+                del ids[start:]
+
+            thresholds, ids = index.thresholds["cross"], index.ids["cross"]
+            if thresholds and previous is not None and previous != price:
+                if price > previous:
+                    start, end = bisect_right(thresholds, previous), bisect_right(thresholds, price)
+                else:
+                    start, end = bisect_left(thresholds, price), bisect_left(thresholds, previous)
+                if start < end:
+                    crossed = ids[start:end]
+                    fired.extend(crossed)
+                    kept = [alert_id for alert_id in crossed if self._alerts[alert_id].repeat]
+                    if len(kept) < len(crossed):
+                        kept_thresholds = [self._alerts[alert_id].threshold for alert_id in kept]
+                        thresholds[start:end] = kept_thresholds
+                        ids[start:end] = kept
+
+            if not fired:
+                return []
+            alerts = self._alerts
+            triggered = [alerts[alert_id] if alerts[alert_id].repeat else alerts.pop(alert_id)
+                         for alert_id in fired]
+            consumers = self._consumers
+
+        if timestamp_ns is None:
+            timestamp_ns = time.time_ns()
+        hits = [{"alert_id": alert.alert_id, "symbol": symbol, "kind": alert.kind,
+                 "threshold": alert.threshold, "price": price, "previous": previous,
+                 "message": alert.message, "timestamp_ns": timestamp_ns}
+                for alert in triggered]
+        for hit in hits:
+            for consumer in consumers:
+                try:
+                    consumer(hit)
+                except Exception as e:
+                    self.logger.error(f"Alert consumer error: {str(e)}")
+        return hits
+
+    def on_quote(self, symbol: str, quote: dict):
+        """
+        Quote listener compatible with ``KGITradingClient.add_quote_listener``.
+
+        Args:
+            symbol (str): Symbol code
+            quote (dict): Quote fields; ``last`` (or ``close``) is the price
+        """
+        price = quote.get("last")
+        if price is None:
+            price = quote.get("close")
+        if price is not None:
+            self.check(symbol, float(price), quote.get("timestamp_ns"))
+
+    def attach(self, client):
+        """Check alerts on every quote the client dispatches."""
+        client.add_quote_listener(self.on_quote)
+
+    def detach(self, client):
+        """Stop following a client's quotes."""
+        client.remove_quote_listener(self.on_quote)
+
+
+def log_consumer(log: Optional[logging.Logger] = None, level: int = logging.INFO) -> Callable[[dict], None]:
+    """
+    Create a consumer that logs triggered alerts.
+
+    Args:
+        log (logging.Logger): Logger to use (default: this module's logger)
+        level (int): Log level (default: logging.INFO)
+
+    Returns:
+        Callable: Consumer suitable for AlertEngine.subscribe
+    """
+    log = log or logger
+
+    def consume(hit):
+        message = f" - {hit['message']}" if hit["message"] else ""
+        log.log(level, f"Alert {hit['alert_id']}: {hit['symbol']} {hit['kind']} "
+                       f"{hit['threshold']} at {hit['price']}{message}")
+    return consume
@@ -0,0 +1,340 @@
+"""
+Multi-Account Order Allocation
+
+This module splits one block ("parent") order into child orders across the
+accounts in ``client.all_accounts`` and submits the children concurrently.
+
+Quantities are allocated by ratio (largest-remainder rounding in whole
+lots, so the children always add up to the parent quantity) or by a fixed
+size per account. Children are sent from a thread pool through
+``client.place_order``, which applies the session's order rate limit, so
+the last account is not left waiting behind every earlier one.
+
+``ParentOrder`` follows the children's trade reports and aggregates fill
+progress::
+
+    parent = submit_parent_order(client, contract, make_order,
+                                 allocate_quantities(10_000, ["S1", "S2"], {"S1": 3, "S2": 1}))
+    parent.wait(timeout=60)
+    parent.progress()   # quantity, filled_quantity, avg_fill_price, children, ...
+
+``make_order(account, quantity)`` builds the SDK order object for one child.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Union
+
+from .reports import account_id_of, order_id_of, symbol_of
+
+
+logger = logging.getLogger(__name__)
+
+
+def allocate_quantities(total: float, accounts: List[str],
+                        ratios: Optional[Dict[str, float]] = None,
+                        lot_size: int = 1) -> Dict[str, float]:
+    """
+    Split a quantity across accounts by ratio.
+
+    Whole lots are assigned by the largest-remainder method, so the result
+    sums to ``total``; accounts that round to zero are left out.
+
+    Args:
+        total (float): Parent quantity, a multiple of lot_size
+        accounts (List[str]): Account ids
+        ratios (Dict[str, float]): account id -> weight (default: equal weights)
+        lot_size (int): Child quantities are multiples of this (default: 1)
+
+    Returns:
+        Dict[str, float]: account id -> child quantity
+    """
+    lots, remainder = divmod(total, lot_size)
+    if remainder:
+        raise ValueError(f"quantity {total} is not a multiple of lot size {lot_size}")
+    weights = [float(ratios.get(account, 0.0)) if ratios else 1.0 for account in accounts]
+    if any(weight < 0 for weight in weights) or sum(weights) <= 0:
+        raise ValueError("ratios must be non-negative with a positive sum")
+
+    total_weight = sum(weights)
+    exact = [lots * weight / total_weight for weight in weights]
+    shares = [int(value) for value in exact]
+    leftover = int(lots) - sum(shares)
+    by_remainder = sorted(range(len(accounts)), key=lambda i: exact[i] - shares[i], reverse=True)
+    for i in by_remainder[:leftover]:
+        shares[i] += 1
+    return {account: share * lot_size for account, share in zip(accounts, shares) if share}
+
+
+def fixed_quantities(accounts: List[str], size: Union[float, Dict[str, float]]) -> Dict[str, float]:
+    """
+    Give each account a fixed child quantity.
+
+    Args:
+        accounts (List[str]): Account ids
+        size (float or Dict[str, float]): Quantity for every account, or per account id
+
+    Returns:
+        Dict[str, float]: account id -> child quantity
+    """
+    if isinstance(size, dict):
+        return {account: size[account] for account in accounts if size.get(account)}
+    if size <= 0:
+        raise ValueError(f"size must be positive, got {size}")
+    return {account: size for account in accounts}
+
+
+class ParentOrder:
+    """
+    A block order split into per-account children, with aggregate fill progress.
+
+    Attach the parent to the client before the children are sent
+    (submit_parent_order does this); reports that arrive before a child's
+    order id is known are held and applied once it is. Once every child has
+    been sent, reports for unknown order ids are ignored. The listener is
+    removed when every child is done or when close() is called.
+    """
+
+    def __init__(self, symbol: Optional[str], allocations: Dict[str, float]):
+        """
+        Initialize the parent order.
+
+        Args:
+            symbol (str): Symbol code
+            allocations (Dict[str, float]): account id -> child quantity
+        """
+        self.symbol = symbol
+        self.children = {
+            account: {"account": account, "quantity": quantity, "order_id": None,
+                      "status": "pending", "filled_quantity": 0.0, "notional": 0.0,
+                      "done": False, "error": None}
+            for account, quantity in allocations.items()
+        }
+        self._by_order_id: Dict[str, dict] = {}
+        self._early_reports: Dict[str, List[dict]] = {}
+        self._unsent = len(self.children)
+        self._client = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._on_done: List[Callable[[], None]] = []
+        if not self.children:
+            self._done.set()
+
+    @property
+    def quantity(self) -> float:
+        """Total child quantity."""
+        return sum(child["quantity"] for child in self.children.values())
+
+    def attach(self, client):
+        """
+        Follow the client's trade reports until every child is done or close() is called.
+
+        Args:
+            client (KGITradingClient): Client sending the children
+        """
+        with self._lock:
+            if self._closed or self._done.is_set():
+                return
+            self._client = client
+        client.add_trade_listener(self.on_report)
+
+    def close(self):
+        """
+        Stop following trade reports.
+
+        The trade listener is removed and held reports are dropped; progress()
+        keeps the state reached so far. Safe to call more than once.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._early_reports.clear()
+            client, self._client = self._client, None
+        if client is not None:
+            client.remove_trade_listener(self.on_report)
+
+    def child_sent(self, account: str, order_id: Optional[str], error: Optional[str] = None):
+        """
+        Record the outcome of sending one child.
+
+        Args:
+            account (str): Account id
+            order_id (str): Broker order id, or None if the order was not sent
+            error (str): Failure reason (default: None)
+        """
+        with self._lock:
+            child = self.children[account]
+            if order_id is None:
+                child.update(status="failed", done=True, error=error or "order not sent")
+                early = []
+            else:
+                child["order_id"] = order_id
+                if child["status"] == "pending":
+                    child["status"] = "sent"
+                self._by_order_id[order_id] = child
+                early = self._early_reports.pop(order_id, [])
+            for report in early:
+                self._apply(child, report)
+            self._unsent -= 1
+            if self._unsent <= 0:
+                # Anything still held belongs to some other order
+                self._early_reports.clear()
+        self._check_done()
+
+    def on_report(self, report: dict):
+        """
+        Trade listener compatible with ``KGITradingClient.add_trade_listener``.
+
+        Args:
+            report (dict): Normalized trade report
+        """
+        order_id = report.get("order_id")
+        if order_id is None:
+            return
+        with self._lock:
+            if self._closed:
+                return
+            child = self._by_order_id.get(order_id)
+            if child is None:
+                if report.get("symbol") in (None, self.symbol) and self._unsent > 0:
+                    self._early_reports.setdefault(order_id, []).append(report)
+                return
+            self._apply(child, report)
+        self._check_done()
+
+    @staticmethod
+    def _apply(child: dict, report: dict):
+        if report.get("status"):
+            child["status"] = report["status"]
+        filled = report.get("filled_quantity") or 0.0
+        delta = filled - child["filled_quantity"]
+        if delta > 0:
+            child["filled_quantity"] = filled
+            price = report.get("fill_price")
+            if isinstance(price, (int, float)):
+                child["notional"] += delta * price
+        if report.get("done"):
+            child["done"] = True
+
+    def _check_done(self):
+        with self._lock:
+            if self._done.is_set() or not all(child["done"] for child in self.children.values()):
+                return
+            self._done.set()
+            callbacks, self._on_done = self._on_done, []
+        self.close()
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Parent order completion callback error: {str(e)}")
+
+    def on_done(self, callback: Callable[[], None]):
+        """Run a callback once every child is done (immediately if already done)."""
+        with self._lock:
+            if not self._done.is_set():
+                self._on_done.append(callback)
+                return
+        callback()
+
+    @property
+    def done(self) -> bool:
+        """Whether every child is filled, cancelled, rejected or failed."""
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every child is done.
+
+        Args:
+            timeout (float): Maximum seconds to wait (default: wait forever)
+
+        Returns:
+            bool: True if every child is done
+        """
+        return self._done.wait(timeout)
+
+    def progress(self) -> dict:
+        """
+        Get aggregate fill progress.
+
+        Returns:
+            dict: symbol, quantity, filled_quantity, fill_ratio,
+                avg_fill_price, sent, failed, done and children
+        """
+        with self._lock:
+            children = {account: dict(child) for account, child in self.children.items()}
+        quantity = sum(child["quantity"] for child in children.values())
+        filled = sum(child["filled_quantity"] for child in children.values())
+        notional = sum(child["notional"] for child in children.values())
+        priced = sum(child["filled_quantity"] for child in children.values() if child["notional"])
+        return {
+            "symbol": self.symbol,
+            "quantity": quantity,
+            "filled_quantity": filled,
+            "fill_ratio": filled / quantity if quantity else 0.0,
+            "avg_fill_price": notional / priced if priced else None,
+            "sent": sum(1 for child in children.values() if child["order_id"] is not None),
+            "failed": sum(1 for child in children.values() if child["status"] == "failed"),
+            "done": self.done,
+            "children": children
+        }
+
+
+def submit_parent_order(client, contract, order_factory: Callable, allocations: Dict[str, float],
+                        max_workers: int = 8, timeout: Optional[float] = None,
+                        track_timeout: Optional[float] = None) -> ParentOrder:
+    """
+    Send a parent order's children concurrently.
+
+    Children go through ``client.place_order``, so the session order rate
+    limit (and any order listeners, e.g. the journal) still apply. Returns
+    once every child has been sent or has failed; fills are tracked
+    afterwards through the client's trade reports.
+
+    Args:
+        client (KGITradingClient): Logged-in client
+        contract: SDK contract object
+        order_factory (Callable): order_factory(account, quantity) -> SDK order object
+        allocations (Dict[str, float]): account id -> child quantity
+            (see allocate_quantities and fixed_quantities)
+        max_workers (int): Maximum children in flight at once (default: 8)
+        timeout (float): Maximum seconds each child waits for the rate limiter (default: wait forever)
+        track_timeout (float): Seconds after which the parent is closed even if
+            children are still working (default: follow reports until done)
+
+    Returns:
+        ParentOrder: Parent tracking the children
+    """
+    accounts = {account_id_of(account): account for account in client.all_accounts}
+    unknown = [account for account in allocations if account not in accounts]
+    if unknown:
+        raise ValueError(f"Unknown accounts: {', '.join(map(str, unknown))}")
+
+    parent = ParentOrder(symbol_of(contract), allocations)
+    parent.attach(client)
+    if track_timeout is not None:
+        timer = threading.Timer(track_timeout, parent.close)
+        timer.daemon = True
+        timer.start()
+        parent.on_done(timer.cancel)
+
+    def send(account_id, quantity):
+        try:
+            trade = client.place_order(contract, order_factory(accounts[account_id], quantity),
+                                       timeout=timeout)
+        except Exception as e:
+            parent.child_sent(account_id, None, str(e))
+            return
+        order_id = order_id_of(trade) if trade is not None else None
+        parent.child_sent(account_id, order_id, None if trade is not None else "order not sent")
+
+    if allocations:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(allocations)),
+                                thread_name_prefix="allocation") as pool:
+            for account_id, quantity in allocations.items():
+                pool.submit(send, account_id, quantity)
+    return parent
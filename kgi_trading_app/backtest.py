@@ -0,0 +1,413 @@
+"""
+Backtesting Engine
+
+This module runs strategies over cached historical bars (see kbars.py) with
+a ``SimulatedBroker`` that exposes the same order interface as a live
+``KGITradingClient`` session: ``place_order(contract, order)`` returns a
+trade and ``cancel_order(trade)`` returns a bool. Order code can therefore be
+pointed at either a live client or the simulator.
+
+Balances differ: the live ``get_account_balance()`` returns the SDK's own
+balance fields, while the simulator returns ``{"balance": {"cash",
+"equity", "initial_cash"}}``. Strategies that read balance fields need an
+adapter for each.
+
+Two execution paths are provided:
+
+* Vectorized: a strategy with ``target_positions(bars)`` returns the
+  desired position after each bar. Position changes are executed at the next
+  bar's open in one pass of array operations.
+* Event-driven: a strategy with ``on_bar(symbol, bar, client)`` places and
+  cancels orders bar by bar. Market orders fill at the next bar's open and
+  limit orders fill when the next bars trade through the limit price.
+
+``run_backtests`` spreads symbols across a process pool.
+
+Orders may be dicts or objects with ``action`` ("Buy"/"Sell"), ``quantity``
+and optional ``price`` (None or 0 for market). Contracts may be symbol
+strings or objects with a ``code`` attribute.
+"""
+
+import itertools
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .kbars import KBarCache, to_day, NS_PER_DAY
+
+
+logger = logging.getLogger(__name__)
+
+
+def _field(obj, name, default=None):
+    if isinstance(obj, dict):
+        return obj.get(name, default)
+    return getattr(obj, name, default)
+
+
+def _symbol_of(contract) -> str:
+    if isinstance(contract, str):
+        return contract
+    return str(_field(contract, "code", contract))
+
+
+def _side_of(order) -> int:
+    action = str(_field(order, "action", "")).rsplit(".", 1)[-1].lower()
+    if action == "buy":
+        return 1
+    if action == "sell":
+        return -1
+    raise ValueError(f"Unknown order action: {_field(order, 'action')}")
+
+
+class SimulatedBroker:
+    """
+    Order, fill and position simulator with a KGITradingClient-style interface.
+    """
+
+    def __init__(self, initial_cash: float = 1_000_000.0, fee_rate: float = 0.0,
+                 slippage: float = 0.0):
+        """
+        Initialize the broker.
+
+        Args:
+            initial_cash (float): Starting cash (default: 1,000,000)
+            fee_rate (float): Fee as a fraction of traded notional (default: 0)
+            slippage (float): Price units added to buys / taken from sells (default: 0)
+        """
+        self.initial_cash = initial_cash
+        self.cash = initial_cash
+        self.fee_rate = fee_rate
+        self.slippage = slippage
+        self.positions: Dict[str, float] = {}
+        self.last_prices: Dict[str, float] = {}
+        self.trades: List[dict] = []
+        self.is_logged_in = True
+        self._open_orders: Dict[str, List[dict]] = {}
+        self._ids = itertools.count(1)
+        self._now = 0
+        self.logger = logging.getLogger(__name__)
+
+    def is_connected(self) -> bool:
+        """The simulator is always connected."""
+        return True
+
+    def place_order(self, contract, order, timeout: Optional[float] = None):
+        """
+        Queue an order for the next bar of its symbol.
+
+        Args:
+            contract: Symbol string or contract object
+            order: Order dict or object
+            timeout (float): Ignored; kept for interface compatibility
+
+        Returns:
+            dict: Trade record, or None if the order is invalid
+        """
+        try:
+            symbol = _symbol_of(contract)
+            side = _side_of(order)
+            quantity = float(_field(order, "quantity", 0))
+            if quantity <= 0:
+                raise ValueError(f"Invalid quantity: {quantity}")
+        except Exception as e:
+            self.logger.error(f"Order error: {str(e)}")
+            return None
+
+        price = _field(order, "price")
+        trade = {
+            "id": next(self._ids),
+            "symbol": symbol,
+            "action": "Buy" if side > 0 else "Sell",
+            "quantity": quantity,
+            "price": float(price) if price else None,
+            "status": "Submitted",
+            "submitted_ts": self._now,
+            "fill_price": None,
+            "fill_ts": None
+        }
+        self._open_orders.setdefault(symbol, []).append(trade)
+        self.trades.append(trade)
+        return trade
+
+    def cancel_order(self, trade, timeout: Optional[float] = None) -> bool:
+        """
+        Cancel an unfilled order.
+
+        Args:
+            trade (dict): Trade returned by place_order
+            timeout (float): Ignored; kept for interface compatibility
+
+        Returns:
+            bool: True if the order was still open
+        """
+        orders = self._open_orders.get(trade["symbol"], [])
+        if trade in orders:
+            orders.remove(trade)
+            trade["status"] = "Cancelled"
+            return True
+        return False
+
+    def get_positions(self) -> Dict[str, float]:
+        """Get the non-zero positions by symbol."""
+        return {symbol: qty for symbol, qty in self.positions.items() if qty}
+
+    def get_account_balance(self, account=None) -> dict:
+        """
+        Get simulated cash and equity.
+
+        Only the call signature matches ``KGITradingClient.get_account_balance``;
+        the live client returns the SDK's balance fields instead.
+
+        Args:
+            account: Ignored; kept for interface compatibility
+
+        Returns:
+            dict: {"balance": {"cash", "equity", "initial_cash"}}
+        """
+        return {"balance": {
+            "cash": self.cash,
+            "equity": self.equity(),
+            "initial_cash": self.initial_cash
+        }}
+
+    def equity(self) -> float:
+        """Get cash plus positions marked at the last seen prices."""
+        return self.cash + sum(qty * self.last_prices.get(symbol, 0.0)
+                               for symbol, qty in self.positions.items())
+
+    def process_bar(self, symbol: str, ts: int, open_: float, high: float,
+                    low: float, close: float):
+        """
+        Fill this symbol's open orders against a new bar and mark to close.
+
+        Args:
+            symbol (str): Symbol code
+            ts (int): Bar timestamp
+            open_ (float): Open price
+            high (float): High price
+            low (float): Low price
+            close (float): Close price
+        """
+        self._now = ts
+        orders = self._open_orders.get(symbol)
+        if orders:
+            remaining = []
+            for trade in orders:
+                side = 1 if trade["action"] == "Buy" else -1
+                limit = trade["price"]
+                if limit is None:
+                    fill = open_ + side * self.slippage
+                elif side > 0 and low <= limit:
+                    fill = min(open_, limit)
+                elif side < 0 and high >= limit:
+                    fill = max(open_, limit)
+                else:
+                    remaining.append(trade)
+                    continue
+                self._fill(trade, side, fill, ts)
+            self._open_orders[symbol] = remaining
+        self.last_prices[symbol] = close
+
+    def _fill(self, trade: dict, side: int, price: float, ts: int):
+        notional = trade["quantity"] * price
+        self.cash -= side * notional + abs(notional) * self.fee_rate
+        symbol = trade["symbol"]
+        self.positions[symbol] = self.positions.get(symbol, 0.0) + side * trade["quantity"]
+        trade["status"] = "Filled"
+        trade["fill_price"] = price
+        trade["fill_ts"] = ts
+
+
+def _drawdown(equity: np.ndarray) -> float:
+    if not len(equity):
+        return 0.0
+    peak = np.maximum.accumulate(equity)
+    return float(np.max((peak - equity) / np.where(peak > 0, peak, 1.0)))
+
+
+def _summary(symbol: str, mode: str, equity: np.ndarray, initial_cash: float,
+             trade_count: int) -> dict:
+    final = float(equity[-1]) if len(equity) else initial_cash
+    return {
+        "symbol": symbol,
+        "mode": mode,
+        "bars": len(equity),
+        "trades": trade_count,
+        "final_equity": final,
+        "return": final / initial_cash - 1.0,
+        "max_drawdown": _drawdown(equity),
+        "equity": equity
+    }
+
+
+def run_vectorized(strategy, symbol: str, bars: Dict[str, np.ndarray],
+                   initial_cash: float = 1_000_000.0, fee_rate: float = 0.0,
+                   slippage: float = 0.0) -> dict:
+    """
+    Backtest a target-position strategy with array operations.
+
+    The position wanted after bar t is traded at the open of bar t + 1,
+    matching market orders in the event-driven path.
+
+    Args:
+        strategy: Object with target_positions(bars) -> array of positions
+        symbol (str): Symbol code
+        bars (Dict[str, np.ndarray]): Bars (see kbars.py)
+        initial_cash (float): Starting cash (default: 1,000,000)
+        fee_rate (float): Fee as a fraction of traded notional (default: 0)
+        slippage (float): Price units added to buys / taken from sells (default: 0)
+
+    Returns:
+        dict: Summary with an equity curve
+    """
+    target = np.asarray(strategy.target_positions(bars), dtype=np.float64)
+    if target.shape != bars["close"].shape:
+        raise ValueError("target_positions must return one position per bar")
+    if not len(target):
+        return _summary(symbol, "vectorized", np.empty(0), initial_cash, 0)
+
+    held = np.concatenate([[0.0], target[:-1]])
+    traded = np.diff(held, prepend=0.0)
+    price = bars["open"] + np.sign(traded) * slippage
+    notional = traded * price
+    cash = initial_cash - np.cumsum(notional + np.abs(notional) * fee_rate)
+    equity = cash + held * bars["close"]
+    return _summary(symbol, "vectorized", equity, initial_cash, int(np.count_nonzero(traded)))
+
+
+def run_event_driven(strategy, bars_by_symbol: Dict[str, Dict[str, np.ndarray]],
+                     broker: Optional[SimulatedBroker] = None) -> dict:
+    """
+    Backtest an on_bar strategy over one or more symbols on a merged timeline.
+
+    Args:
+        strategy: Object with on_bar(symbol, bar, client); optional on_start(client)
+        bars_by_symbol (Dict[str, Dict[str, np.ndarray]]): Bars per symbol
+        broker (SimulatedBroker): Broker to use (default: a new one)
+
+    Returns:
+        dict: Summary with an equity curve (one point per bar event)
+    """
+    broker = broker or SimulatedBroker()
+    symbols = list(bars_by_symbol)
+    if hasattr(strategy, "on_start"):
+        strategy.on_start(broker)
+
+    # Merge all symbols into one time-ordered event sequence
+    ts = np.concatenate([bars_by_symbol[s]["ts"] for s in symbols]) if symbols else np.empty(0, np.int64)
+    owner = np.concatenate([np.full(len(bars_by_symbol[s]["ts"]), i) for i, s in enumerate(symbols)]) \
+        if symbols else np.empty(0, np.int64)
+    row = np.concatenate([np.arange(len(bars_by_symbol[s]["ts"])) for s in symbols]) \
+        if symbols else np.empty(0, np.int64)
+    order = np.argsort(ts, kind="stable")
+
+    columns = {s: {k: bars_by_symbol[s][k].tolist() for k in ("ts", "open", "high", "low", "close", "volume")}
+               for s in symbols}
+    equity = np.empty(len(order))
+    for n, index in enumerate(order):
+        symbol = symbols[owner[index]]
+        i = row[index]
+        data = columns[symbol]
+        bar = {key: data[key][i] for key in data}
+        broker.process_bar(symbol, bar["ts"], bar["open"], bar["high"], bar["low"], bar["close"])
+        strategy.on_bar(symbol, bar, broker)
+        equity[n] = broker.equity()
+
+    filled = sum(1 for trade in broker.trades if trade["status"] == "Filled")
+    label = symbols[0] if len(symbols) == 1 else ",".join(symbols)
+    return _summary(label, "event", equity, broker.initial_cash, filled)
+
+
+class CachedBarLoader:
+    """
+    Picklable loader that reads bars for a date range from a KBarCache.
+
+    Use it to hand bars to worker processes without re-fetching.
+    """
+
+    def __init__(self, cache_dir: str, start, end, interval: str = "1min"):
+        """
+        Initialize the loader.
+
+        Args:
+            cache_dir (str): KBarService cache directory
+            start: First day (inclusive)
+            end: Last day (inclusive)
+            interval (str): Bar interval (default: "1min")
+        """
+        self.cache_dir = cache_dir
+        self.start_ns = to_day(start) * NS_PER_DAY
+        self.end_ns = (to_day(end) + 1) * NS_PER_DAY
+        self.interval = interval
+
+    def __call__(self, symbol: str) -> Dict[str, np.ndarray]:
+        bars, _ = KBarCache(self.cache_dir).load(symbol, self.interval)
+        first, last = np.searchsorted(bars["ts"], [self.start_ns, self.end_ns])
+        return {field: array[first:last] for field, array in bars.items()}
+
+
+def run_backtest(strategy, symbol: str, bars: Dict[str, np.ndarray],
+                 initial_cash: float = 1_000_000.0, fee_rate: float = 0.0,
+                 slippage: float = 0.0) -> dict:
+    """
+    Backtest one symbol, using the vectorized path when the strategy supports it.
+
+    Args:
+        strategy: Strategy with target_positions(bars) or on_bar(symbol, bar, client)
+        symbol (str): Symbol code
+        bars (Dict[str, np.ndarray]): Bars (see kbars.py)
+        initial_cash (float): Starting cash (default: 1,000,000)
+        fee_rate (float): Fee as a fraction of traded notional (default: 0)
+        slippage (float): Price units added to buys / taken from sells (default: 0)
+
+    Returns:
+        dict: Summary with an equity curve
+    """
+    if hasattr(strategy, "target_positions"):
+        return run_vectorized(strategy, symbol, bars, initial_cash, fee_rate, slippage)
+    broker = SimulatedBroker(initial_cash, fee_rate, slippage)
+    return run_event_driven(strategy, {symbol: bars}, broker)
+
+
+def _run_one(strategy_factory: Callable, loader: Callable, symbol: str, options: dict) -> dict:
+    try:
+        return run_backtest(strategy_factory(symbol), symbol, loader(symbol), **options)
+    except Exception as e:
+        return {"symbol": symbol, "error": str(e)}
+
+
+def run_backtests(strategy_factory: Callable, symbols: Iterable[str], loader: Callable,
+                  max_workers: Optional[int] = None, keep_equity: bool = False,
+                  **options) -> List[dict]:
+    """
+    Backtest many symbols in parallel worker processes.
+
+    ``strategy_factory`` and ``loader`` must be picklable (module-level
+    functions or classes such as CachedBarLoader).
+
+    Args:
+        strategy_factory (Callable): strategy_factory(symbol) -> strategy
+        symbols (Iterable[str]): Symbols to test
+        loader (Callable): loader(symbol) -> bars
+        max_workers (int): Worker processes (default: CPU count)
+        keep_equity (bool): Return equity curves (default: False, to keep results small)
+        **options: initial_cash, fee_rate, slippage
+
+    Returns:
+        List[dict]: One summary per symbol, or {"symbol", "error"} on failure
+    """
+    symbols = list(symbols)
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+        futures = [pool.submit(_run_one, strategy_factory, loader, symbol, options)
+                   for symbol in symbols]
+        results = [future.result() for future in futures]
+
+    if not keep_equity:
+        for result in results:
+            result.pop("equity", None)
+    return results
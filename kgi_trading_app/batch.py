@@ -0,0 +1,250 @@
+"""
+Batch Job Runner
+
+This module runs non-interactive jobs (login checks, account dumps, balance
+queries and exports) for many users concurrently. Each job uses its own
+client session; results are streamed as JSON lines as soon as each job
+finishes.
+
+Job file format (JSON lines, ``#`` comments allowed)::
+
+    {"user_id": "A123456789", "operations": ["login_check", "balance"]}
+    {"user_id": "B987654321", "password_env": "KGI_PASSWORD_B",
+     "account_type": "stock", "operations": ["account_dump", "export"],
+     "timeout": 20}
+
+Passwords are never read from the job file. Each job names the environment
+variable holding its password (default: ``KGI_PASSWORD``).
+"""
+
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from typing import Callable, List, Optional, TextIO
+
+
+OPERATIONS = ("login_check", "account_dump", "balance", "export")
+DEFAULT_OPERATIONS = ["login_check"]
+
+logger = logging.getLogger(__name__)
+
+
+def export_filename(user_id: str) -> str:
+    """
+    Build a safe export file name from a user id.
+
+    Anything other than letters, digits, ``_``, ``-`` and ``.`` is replaced,
+    so ids such as ``../x`` cannot leave the export directory.
+
+    Args:
+        user_id (str): User id from the job file
+
+    Returns:
+        str: File name ending in ".json"
+    """
+    name = re.sub(r"[^A-Za-z0-9_.-]", "_", str(user_id)).lstrip(".")
+    return f"{name or 'user'}.json"
+
+
+def load_jobs(path: str) -> List[dict]:
+    """
+    Load jobs from a JSON lines file.
+
+    Args:
+        path (str): Path to the job file
+
+    Returns:
+        List[dict]: Parsed jobs
+
+    Raises:
+        ValueError: If a line is not valid JSON, names an unknown operation
+            or has a timeout that is not a positive number
+    """
+    jobs = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                job = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_no}: invalid JSON ({e.msg})")
+            if "user_id" not in job:
+                raise ValueError(f"{path}:{line_no}: missing user_id")
+            for operation in job.get("operations", DEFAULT_OPERATIONS):
+                if operation not in OPERATIONS:
+                    raise ValueError(f"{path}:{line_no}: unknown operation {operation}")
+            job_timeout = job.get("timeout")
+            if job_timeout is not None and (isinstance(job_timeout, bool) or
+                                            not isinstance(job_timeout, (int, float)) or
+                                            not job_timeout > 0):
+                raise ValueError(f"{path}:{line_no}: timeout must be a positive number")
+            jobs.append(job)
+    return jobs
+
+
+def run_job(job: dict, client_factory: Callable, export_dir: str = ".") -> dict:
+    """
+    Run a single job with its own client session.
+
+    Args:
+        job (dict): Job definition
+        client_factory (Callable): Returns a new, logged-out client
+        export_dir (str): Directory for "export" output files (default: ".")
+
+    Returns:
+        dict: Result keyed by operation name
+    """
+    user_id = job["user_id"]
+    password = os.environ.get(job.get("password_env", "KGI_PASSWORD"), "")
+    if not password:
+        raise ValueError(f"Password environment variable {job.get('password_env', 'KGI_PASSWORD')} is not set")
+
+    client = client_factory()
+    results = {}
+    try:
+        start = time.monotonic()
+        success = client.login(user_id, password,
+                               fetch_contract=job.get("fetch_contract", False),
+                               account_type=job.get("account_type", "all"))
+        results["login_check"] = {
+            "success": success,
+            "elapsed_ms": round((time.monotonic() - start) * 1000, 1)
+        }
+        if not success:
+            return results
+
+        for operation in job.get("operations", DEFAULT_OPERATIONS):
+            if operation == "account_dump":
+                results["account_dump"] = client.get_all_account_details()
+            elif operation == "balance":
+                results["balance"] = client.get_account_balance()
+            elif operation == "export":
+                os.makedirs(export_dir, exist_ok=True)
+                export_path = os.path.join(export_dir, export_filename(user_id))
+                with open(export_path, "w", encoding="utf-8") as f:
+                    json.dump({
+                        "client_info": client.get_client_info(),
+                        "account_details": client.get_all_account_details()
+                    }, f, indent=2, ensure_ascii=False, default=str)
+                results["export"] = {"path": export_path}
+        return results
+    finally:
+        if client.is_connected():
+            client.logout()
+        client.cleanup()
+
+
+def run_batch(jobs: List[dict], client_factory: Callable, output: TextIO,
+              max_workers: int = 4, timeout: float = 60.0,
+              export_dir: str = ".", abandon_after: float = 30.0,
+              max_abandoned: Optional[int] = None) -> dict:
+    """
+    Run jobs concurrently and stream one JSON result line per job.
+
+    At most ``max_workers`` jobs run at once. A job that exceeds its timeout
+    is reported as ``"timeout"`` straight away, but keeps its slot while its
+    SDK call is still running. Only after a further ``abandon_after`` seconds
+    is the thread abandoned (it is a daemon thread) and the slot released. At
+    most ``max_abandoned`` threads may be abandoned at a time. While that
+    many are still stuck, the remaining jobs are reported as errors instead
+    of being started.
+
+    Args:
+        jobs (List[dict]): Jobs from load_jobs
+        client_factory (Callable): Returns a new, logged-out client
+        output (TextIO): Stream receiving JSON lines
+        max_workers (int): Maximum concurrent jobs (default: 4)
+        timeout (float): Default per-job timeout in seconds (default: 60)
+        export_dir (str): Directory for "export" output files (default: ".")
+        abandon_after (float): Seconds a timed-out job keeps its slot (default: 30)
+        max_abandoned (int): Maximum abandoned threads still running (default: max_workers)
+
+    Returns:
+        dict: Counts of ok / error / timeout jobs
+    """
+    finished = queue.Queue()
+    slots = threading.Semaphore(max_workers)
+    summary = {"ok": 0, "error": 0, "timeout": 0}
+    if max_abandoned is None:
+        max_abandoned = max_workers
+    abandoned = set()
+    exited = set()
+    abandoned_lock = threading.Lock()
+
+    def execute(index, job, claim):
+        started = time.monotonic()
+        try:
+            results = run_job(job, client_factory, export_dir)
+            status = "ok" if results.get("login_check", {}).get("success") else "error"
+            error = None if status == "ok" else "login failed"
+        except Exception as e:
+            results, status, error = {}, "error", str(e)
+        # Whoever takes the claim first (job or timeout) reports the result.
+        if claim.acquire(blocking=False):
+            finished.put((index, job, status, error, results, time.monotonic() - started))
+        with abandoned_lock:
+            exited.add(index)
+            abandoned.discard(index)
+
+    def supervise(index, job):
+        claim = threading.Lock()
+        job_timeout = job.get("timeout", timeout)
+        try:
+            worker = threading.Thread(target=execute, args=(index, job, claim),
+                                      name=f"batch-job-{index}", daemon=True)
+            worker.start()
+            worker.join(job_timeout)
+            if claim.acquire(blocking=False):
+                finished.put((index, job, "timeout", f"exceeded {job_timeout}s", {}, job_timeout))
+            # The stuck call still uses the session; keep its slot for a while
+            worker.join(abandon_after)
+            with abandoned_lock:
+                stuck = index not in exited
+                if stuck:
+                    abandoned.add(index)
+            if stuck:
+                logger.warning(f"Batch job {index} ({job['user_id']}) still running; abandoning its thread")
+        except Exception as e:
+            # Every job must report exactly once or run_batch waits forever
+            if claim.acquire(blocking=False):
+                finished.put((index, job, "error", f"supervisor error: {str(e)}", {}, 0.0))
+        finally:
+            slots.release()
+
+    def dispatch():
+        for index, job in enumerate(jobs):
+            slots.acquire()
+            with abandoned_lock:
+                stuck = len(abandoned)
+            if stuck >= max_abandoned:
+                slots.release()
+                finished.put((index, job, "error", f"not started: {stuck} abandoned jobs still running",
+                              {}, 0.0))
+                continue
+            threading.Thread(target=supervise, args=(index, job), daemon=True).start()
+
+    threading.Thread(target=dispatch, name="batch-dispatch", daemon=True).start()
+
+    for _ in range(len(jobs)):
+        index, job, status, error, results, elapsed = finished.get()
+        summary[status] += 1
+        record = {
+            "job": index,
+            "user_id": job["user_id"],
+            "status": status,
+            "elapsed_ms": round(elapsed * 1000, 1),
+            "results": results
+        }
+        if error:
+            record["error"] = error
+        output.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        output.flush()
+        logger.info(f"Batch job {index} ({job['user_id']}) finished: {status}")
+
+    return summary
@@ -0,0 +1,133 @@
+"""
+Capability Introspection
+
+This module discovers the public methods and attributes of SDK classes once
+per concrete type and caches the result. Discovery inspects the class with
+``inspect.getattr_static`` so properties and ``__getattr__`` hooks on live SDK
+objects are never triggered.
+"""
+
+import inspect
+import threading
+from typing import Dict, FrozenSet, Tuple
+
+
+class CapabilityMap:
+    """
+    Immutable capability map for one SDK class.
+
+    ``supports(name)`` is a frozenset lookup, so routing code can check
+    capabilities in O(1) on every call.
+    """
+
+    __slots__ = ("type_name", "methods", "attributes", "_sorted_methods")
+
+    def __init__(self, type_name: str, methods: FrozenSet[str], attributes: FrozenSet[str]):
+        """
+        Initialize the capability map.
+
+        Args:
+            type_name (str): Qualified class name
+            methods (FrozenSet[str]): Public callable names
+            attributes (FrozenSet[str]): Public non-callable names (including properties)
+        """
+        object.__setattr__(self, "type_name", type_name)
+        object.__setattr__(self, "methods", methods)
+        object.__setattr__(self, "attributes", attributes)
+        object.__setattr__(self, "_sorted_methods", tuple(sorted(methods)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CapabilityMap is immutable")
+
+    def __repr__(self):
+        return f"CapabilityMap({self.type_name}, {len(self.methods)} methods)"
+
+    def supports(self, name: str) -> bool:
+        """
+        Check whether the class has a public method.
+
+        Args:
+            name (str): Method name
+
+        Returns:
+            bool: True if the method exists
+        """
+        return name in self.methods
+
+    def has_attribute(self, name: str) -> bool:
+        """
+        Check whether the class has a public attribute or property.
+
+        Args:
+            name (str): Attribute name
+
+        Returns:
+            bool: True if the attribute exists
+        """
+        return name in self.attributes
+
+    @property
+    def method_names(self) -> Tuple[str, ...]:
+        """Get the public method names in sorted order."""
+        return self._sorted_methods
+
+    def to_dict(self) -> dict:
+        """
+        Get the map as a dict.
+
+        Returns:
+            dict: type, methods and attributes
+        """
+        return {
+            "type": self.type_name,
+            "methods": list(self._sorted_methods),
+            "attributes": sorted(self.attributes)
+        }
+
+
+_cache: Dict[type, CapabilityMap] = {}
+_cache_lock = threading.Lock()
+
+
+def _discover(cls: type) -> CapabilityMap:
+    methods = set()
+    attributes = set()
+    for name in dir(cls):
+        if name.startswith('_'):
+            continue
+        try:
+            attr = inspect.getattr_static(cls, name)
+        except AttributeError:
+            continue
+        if isinstance(attr, (staticmethod, classmethod)) or (
+                callable(attr) and not isinstance(attr, property)):
+            methods.add(name)
+        else:
+            attributes.add(name)
+    return CapabilityMap(f"{cls.__module__}.{cls.__qualname__}",
+                         frozenset(methods), frozenset(attributes))
+
+
+def get_capabilities(obj) -> CapabilityMap:
+    """
+    Get the cached capability map for an object's concrete class.
+
+    Args:
+        obj: SDK object or class
+
+    Returns:
+        CapabilityMap: Capabilities of the class
+    """
+    cls = obj if isinstance(obj, type) else type(obj)
+    capabilities = _cache.get(cls)
+    if capabilities is None:
+        capabilities = _discover(cls)
+        with _cache_lock:
+            capabilities = _cache.setdefault(cls, capabilities)
+    return capabilities
+
+
+def clear_capability_cache():
+    """Forget all cached capability maps (e.g. after an SDK upgrade in-process)."""
+    with _cache_lock:
+        _cache.clear()
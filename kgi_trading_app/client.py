@@ -6,10 +6,26 @@ using the kgisuperpy API.
 """
 
 import superpy as sp
-from typing import Optional, List
+from typing import Optional, List, Callable
+import itertools
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from .rate_limit import RateLimiter
+from .records import AccountRecord
+from .state import ClientState
+from .capabilities import CapabilityMap, get_capabilities
+from .shutdown import get_shutdown_manager, PRIORITY_SESSION, PRIORITY_FLUSH
+from .tracing import traced, get_tracer
+from .events import ClientEvent, EventDispatcher
+from .latency import OrderLatencyTracker
+from .snapshots import chunked, empty_columns, fill_rows, is_symbol_error
+from .reports import (ACK_STATUSES, FILL_STATUSES, normalize_trade_report,
+                      order_id_of, symbol_of, account_id_of, get_field, status_name)
+
 
 class KGITradingClient:
     """
@@ -17,20 +33,34 @@ class KGITradingClient:
     Provides basic login/logout functionality.
     """
     
-    def __init__(self, simulation: bool = True):
+    def __init__(self, simulation: bool = True, order_rate: float = 10.0,
+                 order_burst: int = 10, query_rate: float = 5.0, query_burst: int = 5):
         """
         Initialize the KGI Trading Client.
         
         Args:
             simulation (bool): Whether to use simulation mode (default: True)
+            order_rate (float): Maximum orders per second for this session (default: 10)
+            order_burst (int): Maximum orders sent at once (default: 10)
+            query_rate (float): Maximum market data queries per second (default: 5)
+            query_burst (int): Maximum market data queries sent at once (default: 5)
         """
         self.simulation = simulation
         self.api = sp.SuperPy(simulation=simulation)
-        self.is_logged_in = False
-        self.accounts = []
-        self.all_accounts = []  # Store all accounts from original login
-        self.stock_account = None
-        self.futopt_account = None
+        # Session state is an immutable snapshot: writers publish a new one
+        # under the lock, readers take self._state without locking.
+        self._state_lock = threading.Lock()
+        self._state = ClientState()
+        self._quote_listeners = []
+        self._trade_listeners = []
+        self._order_listeners = []
+        # Local order ids are unique across sessions: start time prefix + counter
+        self._local_prefix = f"{time.time_ns():x}"
+        self._local_ids = itertools.count(1)
+        self.latency = OrderLatencyTracker()
+        self.events = EventDispatcher()
+        self.order_limiter = RateLimiter(rate=order_rate, burst=order_burst)
+        self.query_limiter = RateLimiter(rate=query_rate, burst=query_burst)
         
         # Setup logging
         logging.basicConfig(
@@ -38,7 +68,69 @@ class KGITradingClient:
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
         self.logger = logging.getLogger(__name__)
+    
+    @property
+    def state(self) -> ClientState:
+        """Current immutable session snapshot (lock-free read)."""
+        return self._state
+    
+    @property
+    def is_logged_in(self) -> bool:
+        """Whether the session is logged in."""
+        return self._state.logged_in
+    
+    @property
+    def accounts(self) -> List:
+        """Accounts visible in the current type filter."""
+        return list(self._state.accounts)
+    
+    @property
+    def all_accounts(self) -> List:
+        """All accounts from the original login."""
+        return list(self._state.all_accounts)
+    
+    @property
+    def stock_account(self):
+        """Default stock account."""
+        return self._state.stock_account
+    
+    @property
+    def futopt_account(self):
+        """Default futures/options account."""
+        return self._state.futopt_account
+    
+    @property
+    def account_records(self) -> tuple:
+        """Immutable snapshots of all_accounts, built at login."""
+        return self._state.account_records
+    
+    def _publish(self, **changes) -> ClientState:
+        """Publish a new state snapshot. Callers must hold _state_lock."""
+        self._state = self._state.replace(**changes)
+        return self._state
+    
+    def _notify_state_change(self, old: ClientState, new: ClientState):
+        """
+        Emit events for the differences between two snapshots.
+        
+        Called after releasing _state_lock so subscribers never run under it.
+        
+        Args:
+            old (ClientState): Snapshot before the change
+            new (ClientState): Snapshot after the change
+        """
+        events = self.events
+        if old.logged_in != new.logged_in:
+            events.emit(ClientEvent.LOGGED_IN if new.logged_in else ClientEvent.LOGGED_OUT, new)
+        if old.accounts != new.accounts:
+            events.emit(ClientEvent.ACCOUNTS_CHANGED, new, count=len(new.accounts))
+        if (old.stock_account is not new.stock_account or
+                old.futopt_account is not new.futopt_account):
+            events.emit(ClientEvent.DEFAULTS_CHANGED, new)
+        if new.contracts_ready and not old.contracts_ready:
+            events.emit(ClientEvent.CONTRACTS_READY, new)
         
+    @traced("client.login")
     def login(self, user_id: str, password: str, fetch_contract: bool = True, 
               account_type: str = "all") -> bool:
         """
@@ -57,25 +149,43 @@ class KGITradingClient:
             self.logger.info(f"Attempting to login with user ID: {user_id}")
             
             # Perform login
-            self.accounts = self.api.login(
-                userID=user_id,
-                password=password,
-                fetch_contract=fetch_contract,
-                contracts_timeout=10000,
-                subscribe_trade=True,
-                receive_window=30000
-            )
+            with get_tracer().span("sdk.login", fetch_contract=fetch_contract):
+                accounts = self.api.login(
+                    userID=user_id,
+                    password=password,
+                    fetch_contract=fetch_contract,
+                    contracts_timeout=10000,
+                    subscribe_trade=True,
+                    receive_window=30000
+                )
             
-            if self.accounts:
-                self.is_logged_in = True
-                self.all_accounts = self.accounts.copy()  # Save all accounts
-                self.logger.info(f"Login successful. Found {len(self.accounts)} accounts.")
+            if accounts:
+                # Save all accounts and snapshot them once (the only
+                # per-login SDK attribute reads)
+                all_accounts = tuple(accounts)
+                records = tuple(AccountRecord.from_account(i + 1, account)
+                                for i, account in enumerate(all_accounts))
+                records_by_id = {id(account): record
+                                 for account, record in zip(all_accounts, records)}
+                self.logger.info(f"Login successful. Found {len(all_accounts)} accounts.")
                 
                 # Filter accounts based on type preference
-                self._filter_accounts_by_type(account_type)
+                visible = self._filter_accounts_by_type(all_accounts, account_type, records_by_id)
+                if account_type.lower() in ("stock", "futures"):
+                    self.logger.info(f"Filtered to {account_type.lower()} accounts only: {len(visible)} accounts")
                 
-                # Set default accounts
-                self._set_default_accounts()
+                # Set default accounts and publish the new session state
+                stock_account, futopt_account = self._default_accounts(visible, records_by_id)
+                with self._state_lock:
+                    old = self._state
+                    new = self._publish(logged_in=True, accounts=visible, all_accounts=all_accounts,
+                                        stock_account=stock_account, futopt_account=futopt_account,
+                                        account_records=records, records_by_id=records_by_id,
+                                        contracts_ready=False)
+                self._notify_state_change(old, new)
+                
+                if fetch_contract:
+                    self._watch_contracts()
                 
                 # Display account information
                 self._display_account_info()
@@ -89,28 +199,49 @@ class KGITradingClient:
             self.logger.error(f"Login error: {str(e)}")
             return False
     
-    def logout(self) -> bool:
+    @traced("client.logout")
+    def logout(self, timeout: Optional[float] = 10.0) -> bool:
         """
         Logout from KGI Securities system.
         
+        The SDK logout runs under a deadline so a hanging SDK call cannot
+        block the caller; local session state is released either way.
+        
+        Args:
+            timeout (float): Maximum seconds to wait for the SDK logout (default: 10)
+        
         Returns:
             bool: True if logout successful, False otherwise
         """
         try:
             if self.is_logged_in:
-                self.api.logout()
-                self.is_logged_in = False
-                self.accounts = []
-                self.all_accounts = []
-                self.stock_account = None
-                self.futopt_account = None
+                errors = []
+                
+                def sdk_logout():
+                    try:
+                        self.api.logout()
+                    except Exception as e:
+                        errors.append(e)
+                
+                worker = threading.Thread(target=sdk_logout, name="sdk-logout", daemon=True)
+                worker.start()
+                worker.join(timeout)
+                if errors:
+                    raise errors[0]
+                if worker.is_alive():
+                    self.logger.warning(f"SDK logout did not finish within {timeout}s; releasing session")
+                
+                with self._state_lock:
+                    old = self._state
+                    new = self._publish(logged_in=False, accounts=(), all_accounts=(),
+                                        stock_account=None, futopt_account=None,
+                                        account_records=(), records_by_id={},
+                                        contracts_ready=False)
+                self._notify_state_change(old, new)
                 self.logger.info("Logout successful")
                 
                 # Clean up API object to prevent hanging
-                try:
-                    del self.api
-                except:
-                    pass
+                self._release_api()
                     
                 return True
             else:
@@ -121,25 +252,282 @@ class KGITradingClient:
             self.logger.error(f"Logout error: {str(e)}")
             return False
     
-    def cleanup(self):
-        """Force cleanup of resources to prevent hanging."""
+    def _release_api(self):
+        """Drop the SDK session object so its threads can wind down."""
+        try:
+            del self.api
+        except AttributeError:
+            pass
+    
+    def cleanup(self, timeout: Optional[float] = 10.0):
+        """
+        Force cleanup of resources to prevent hanging.
+        
+        Args:
+            timeout (float): Maximum seconds to wait for the SDK logout (default: 10)
+        """
         try:
             if hasattr(self, 'api'):
                 if self.is_logged_in:
-                    self.logout()
-                del self.api
-        except:
-            pass
+                    self.logout(timeout)
+                self._release_api()
+        except Exception as e:
+            self.logger.error(f"Cleanup error: {str(e)}")
     
-    def _filter_accounts_by_type(self, account_type: str):
+    def register_shutdown(self, manager=None, name: str = "kgi-client", timeout: float = 4.0):
+        """
+        Register this client's logout and SDK teardown with a shutdown manager.
+        
+        Also stops any periodic latency export after writing a final snapshot.
+        Registering again under the same name replaces the previous client.
+        The session hook has its own timeout, shorter than the manager's
+        deadline, so a hanging SDK logout still leaves time for the flush
+        hooks (journal, latency export, profiler, traces).
+        
+        Args:
+            manager (ShutdownManager): Manager to use (default: the process-wide manager)
+            name (str): Hook name (default: "kgi-client")
+            timeout (float): Maximum seconds for logout and SDK teardown (default: 4)
+        """
+        manager = manager or get_shutdown_manager()
+        # Most of the budget goes to the SDK logout; the rest releases the API
+        logout_timeout = timeout * 0.75
+        manager.register(name, lambda: self.cleanup(logout_timeout), priority=PRIORITY_SESSION,
+                         timeout=timeout)
+        manager.register(f"{name}-latency", self.latency.stop_export, priority=PRIORITY_FLUSH)
+    
+    def subscribe(self, callback: Callable, event_type: Optional[ClientEvent] = None) -> Callable[[], None]:
+        """
+        Subscribe to client events instead of polling state.
+        
+        Callbacks run on the thread that changed the state; wrap them with
+        events.tk_bridge or events.asyncio_bridge to run elsewhere.
+        
+        Args:
+            callback (Callable): Called with each Event
+            event_type (ClientEvent): Only receive this type (default: all events)
+            
+        Returns:
+            Callable: Call it to unsubscribe
+        """
+        return self.events.subscribe(callback, event_type)
+    
+    def handle_contracts_ready(self):
+        """Mark contract data as loaded and emit contracts_ready once per session."""
+        with self._state_lock:
+            old = self._state
+            if not old.logged_in or old.contracts_ready:
+                return
+            new = self._publish(contracts_ready=True)
+        self._notify_state_change(old, new)
+        self.logger.info("Contracts ready")
+    
+    def handle_connection_lost(self, reason: str = ""):
+        """
+        Report a dropped SDK connection to subscribers.
+        
+        Intended as the SDK's session-down callback; local state is kept so
+        the application can decide whether to log in again.
+        
+        Args:
+            reason (str): Description of the failure (default: "")
+        """
+        state = self._state
+        if not state.logged_in:
+            return
+        self.logger.warning(f"Connection lost: {reason}")
+        self.events.emit(ClientEvent.CONNECTION_LOST, state, reason=reason)
+    
+    @staticmethod
+    def _contracts_loaded(status) -> bool:
+        """Check whether an SDK contracts status means fully loaded."""
+        text = str(status).rsplit('.', 1)[-1].lower()
+        return text in ("fetched", "ready", "done", "complete", "completed", "loaded")
+    
+    def _watch_contracts(self, timeout: float = 10.0, interval: float = 0.2):
+        """
+        Emit contracts_ready once the SDK finishes loading contracts.
+        
+        A single background watcher per login replaces status polling by
+        every consumer; it gives up after the login contracts timeout.
+        
+        Args:
+            timeout (float): Maximum seconds to wait (default: 10)
+            interval (float): Seconds between status checks (default: 0.2)
+        """
+        session = self._state
+        if self._contracts_loaded(self.get_contracts_status()):
+            self.handle_contracts_ready()
+            return
+        
+        def watch():
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                time.sleep(interval)
+                if self._state.all_accounts is not session.all_accounts:
+                    return
+                if self._contracts_loaded(self.get_contracts_status()):
+                    self.handle_contracts_ready()
+                    return
+            self.logger.warning(f"Contracts not ready after {timeout}s")
+        
+        threading.Thread(target=watch, name="contracts-watch", daemon=True).start()
+    
+    def add_quote_listener(self, listener: Callable[[str, dict], None]):
+        """
+        Register a callback for quote updates.
+        
+        Args:
+            listener (Callable): Called as listener(symbol, quote) where quote
+                is a dict with last/bid/ask/volume/timestamp_ns keys
+        """
+        if listener not in self._quote_listeners:
+            self._quote_listeners.append(listener)
+    
+    def remove_quote_listener(self, listener: Callable[[str, dict], None]):
+        """
+        Unregister a quote callback.
+        
+        Args:
+            listener (Callable): Callback previously passed to add_quote_listener
+        """
+        if listener in self._quote_listeners:
+            self._quote_listeners.remove(listener)
+    
+    def handle_quote(self, symbol: str, quote: dict):
+        """
+        Dispatch a quote update to all registered listeners.
+        
+        This is the single entry point for market data; call it from the
+        SDK quote callback with the normalized quote fields.
+        
+        Args:
+            symbol (str): Symbol code
+            quote (dict): Quote fields (last, bid, ask, volume, timestamp_ns)
+        """
+        for listener in tuple(self._quote_listeners):
+            try:
+                listener(symbol, quote)
+            except Exception as e:
+                self.logger.error(f"Quote listener error: {str(e)}")
+    
+    def add_trade_listener(self, listener: Callable[[dict], None]):
+        """
+        Register a callback for order and deal reports.
+        
+        Args:
+            listener (Callable): Called as listener(report) with a normalized
+                report dict (see reports.py) plus a received_ns timestamp
+        """
+        if listener not in self._trade_listeners:
+            self._trade_listeners.append(listener)
+    
+    def remove_trade_listener(self, listener: Callable[[dict], None]):
+        """
+        Unregister a trade report callback.
+        
+        Args:
+            listener (Callable): Callback previously passed to add_trade_listener
+        """
+        if listener in self._trade_listeners:
+            self._trade_listeners.remove(listener)
+    
+    def add_order_listener(self, listener: Callable[[str, dict], None]):
+        """
+        Register a callback for orders sent through place_order.
+        
+        Listeners run in the calling thread. An exception raised for the
+        "submit" stage stops the order from being sent, so write-ahead
+        consumers (see journal.py) can refuse orders they could not record.
+        
+        Args:
+            listener (Callable): Called as listener(stage, info) with stage
+                "submit" (before the SDK call; info has local_id, account,
+                symbol, action, quantity and price), "sent" (local_id,
+                order_id) or "failed" (local_id, error)
+        """
+        if listener not in self._order_listeners:
+            self._order_listeners.append(listener)
+    
+    def remove_order_listener(self, listener: Callable[[str, dict], None]):
+        """
+        Unregister an order callback.
+        
+        Args:
+            listener (Callable): Callback previously passed to add_order_listener
+        """
+        if listener in self._order_listeners:
+            self._order_listeners.remove(listener)
+    
+    def _notify_order(self, stage: str, info: dict):
+        for listener in tuple(self._order_listeners):
+            try:
+                listener(stage, info)
+            except Exception as e:
+                self.logger.error(f"Order listener error: {str(e)}")
+    
+    def handle_trade_report(self, report) -> dict:
+        """
+        Record order latency stages and dispatch a trade report to listeners.
+        
+        This is the single entry point for order/deal updates; call it from
+        the SDK order callback.
+        
+        Args:
+            report: SDK order/deal report (object or dict)
+            
+        Returns:
+            dict: Normalized report
+        """
+        received_ns = time.monotonic_ns()
+        normalized = normalize_trade_report(report)
+        normalized["received_ns"] = received_ns
+        
+        order_id = normalized["order_id"]
+        account, symbol = normalized["account"], normalized["symbol"]
+        status = normalized["status"]
+        if status in ACK_STATUSES:
+            self.latency.mark(order_id, "ack", received_ns, account, symbol, done=normalized["done"])
+        elif status in FILL_STATUSES or normalized["filled_quantity"] > 0:
+            self.latency.mark(order_id, "first_fill", received_ns, account, symbol)
+            if normalized["complete"]:
+                self.latency.mark(order_id, "complete", received_ns, account, symbol)
+        elif normalized["done"]:
+            self.latency.discard(order_id)
+        
+        for listener in tuple(self._trade_listeners):
+            try:
+                listener(normalized)
+            except Exception as e:
+                self.logger.error(f"Trade listener error: {str(e)}")
+        return normalized
+    
+    def get_account_records(self, visible_only: bool = True) -> List[AccountRecord]:
+        """
+        Get immutable account snapshots.
+        
+        Args:
+            visible_only (bool): Only accounts in the current type filter (default: True)
+            
+        Returns:
+            List[AccountRecord]: Account records
+        """
+        state = self._state
+        if not state.logged_in:
+            return []
+        if not visible_only:
+            return list(state.account_records)
+        return [state.record_for(account) for account in state.accounts]
+    
+    @staticmethod
+    def _filter_accounts_by_type(accounts, account_type: str, records_by_id: dict) -> tuple:
         """Filter accounts based on requested type."""
-        if account_type.lower() == "stock":
-            self.accounts = [acc for acc in self.accounts if "Stock" in str(type(acc))]
-            self.logger.info(f"Filtered to stock accounts only: {len(self.accounts)} accounts")
-        elif account_type.lower() == "futures":
-            self.accounts = [acc for acc in self.accounts if "Future" in str(type(acc))]
-            self.logger.info(f"Filtered to futures accounts only: {len(self.accounts)} accounts")
-        # "all" - keep all accounts
+        wanted = {"stock": "Stock", "futures": "Future"}.get(account_type.lower())
+        if wanted is None:
+            # "all" - keep all accounts
+            return tuple(accounts)
+        return tuple(account for account in accounts
+                     if records_by_id[id(account)].type == wanted)
     
     def get_available_account_types(self) -> dict:
         """
@@ -148,18 +536,24 @@ class KGITradingClient:
         Returns:
             dict: Available account types with counts
         """
-        if not self.is_logged_in:
+        return self._account_type_counts(self._state)
+    
+    @staticmethod
+    def _account_type_counts(state: ClientState) -> dict:
+        """Count visible accounts by type in one snapshot."""
+        if not state.logged_in:
             return {"stock": 0, "futures": 0}
-            
-        stock_count = len([acc for acc in self.accounts if "Stock" in str(type(acc))])
-        futures_count = len([acc for acc in self.accounts if "Future" in str(type(acc))])
+        
+        stock_count = sum(1 for account in state.accounts
+                          if state.record_for(account).type == "Stock")
         
         return {
             "stock": stock_count,
-            "futures": futures_count,
-            "total": len(self.accounts)
+            "futures": len(state.accounts) - stock_count,
+            "total": len(state.accounts)
         }
     
+    @traced("client.switch_account_type")
     def switch_account_type(self, account_type: str) -> bool:
         """
         Switch to specific account type without re-login.
@@ -170,56 +564,60 @@ class KGITradingClient:
         Returns:
             bool: True if switch successful
         """
-        if not self.is_logged_in:
-            self.logger.warning("Not logged in")
-            return False
+        with self._state_lock:
+            state = self._state
+            new = state
+            if not state.logged_in:
+                self.logger.warning("Not logged in")
+                return False
             
-        # Use stored all_accounts instead of calling API again
-        if account_type.lower() == "stock":
-            filtered_accounts = [acc for acc in self.all_accounts if "Stock" in str(type(acc))]
-        elif account_type.lower() == "futures":
-            filtered_accounts = [acc for acc in self.all_accounts if "Future" in str(type(acc))]
-        else:  # "all"
-            filtered_accounts = self.all_accounts.copy()
+            # Use stored all_accounts instead of calling API again
+            filtered_accounts = self._filter_accounts_by_type(
+                state.all_accounts, account_type, state.records_by_id)
             
+            if filtered_accounts:
+                stock_account, futopt_account = self._default_accounts(
+                    filtered_accounts, state.records_by_id)
+                new = self._publish(accounts=filtered_accounts, stock_account=stock_account,
+                                    futopt_account=futopt_account)
+        self._notify_state_change(state, new)
+        
         if filtered_accounts:
-            self.accounts = filtered_accounts
-            self._set_default_accounts()
-            self.logger.info(f"Switched to {account_type} accounts: {len(self.accounts)} accounts")
+            self.logger.info(f"Switched to {account_type} accounts: {len(filtered_accounts)} accounts")
             return True
         else:
             self.logger.warning(f"No {account_type} accounts found")
             return False
     
-    def _set_default_accounts(self):
-        """Set default stock and futures/options accounts."""
-        self.stock_account = None
-        self.futopt_account = None
+    @staticmethod
+    def _default_accounts(accounts, records_by_id: dict) -> tuple:
+        """Pick the first signed stock and futures/options accounts."""
+        stock_account = None
+        futopt_account = None
         
-        for account in self.accounts:
-            if hasattr(account, 'signed') and account.signed:
-                if 'Stock' in str(type(account)):
-                    if not self.stock_account:
-                        self.stock_account = account
-                elif 'Future' in str(type(account)):
-                    if not self.futopt_account:
-                        self.futopt_account = account
+        for account in accounts:
+            record = records_by_id[id(account)]
+            if record.signed:
+                if record.type == "Stock":
+                    if not stock_account:
+                        stock_account = account
+                elif not futopt_account:
+                    futopt_account = account
+        
+        return stock_account, futopt_account
     
     def _display_account_info(self):
         """Display account information."""
         self.logger.info("=== Account Information ===")
-        for i, account in enumerate(self.accounts):
-            account_type = "Stock" if "Stock" in str(type(account)) else "Future"
-            signed_status = "Signed" if hasattr(account, 'signed') and account.signed else "Not Signed"
-            
-            self.logger.info(f"Account {i+1}: {account_type}")
-            self.logger.info(f"  Person ID: {account.person_id}")
-            self.logger.info(f"  Broker ID: {account.broker_id}")
-            self.logger.info(f"  Account ID: {account.account_id}")
-            self.logger.info(f"  Status: {signed_status}")
+        for i, record in enumerate(self.get_account_records()):
+            self.logger.info(f"Account {i+1}: {record.type}")
+            self.logger.info(f"  Person ID: {record.person_id}")
+            self.logger.info(f"  Broker ID: {record.broker_id}")
+            self.logger.info(f"  Account ID: {record.account_id}")
+            self.logger.info(f"  Status: {record.signed_status}")
             
-            if hasattr(account, 'trader') and account.trader:
-                self.logger.info(f"  Trader: {account.trader}")
+            if record.trader:
+                self.logger.info(f"  Trader: {record.trader}")
             
             self.logger.info("")
     
@@ -230,8 +628,9 @@ class KGITradingClient:
         Returns:
             List: List of account objects
         """
-        if self.is_logged_in:
-            return self.accounts
+        state = self._state
+        if state.logged_in:
+            return list(state.accounts)
         else:
             self.logger.warning("Not logged in")
             return []
@@ -246,16 +645,257 @@ class KGITradingClient:
         try:
             self.api.set_default_account(account)
             
-            if 'Stock' in str(type(account)):
-                self.stock_account = account
-                self.logger.info(f"Set default stock account: {account.account_id}")
-            elif 'Future' in str(type(account)):
-                self.futopt_account = account
-                self.logger.info(f"Set default futures account: {account.account_id}")
+            record = self._state.record_for(account)
+            with self._state_lock:
+                old = self._state
+                if record.type == "Stock":
+                    new = self._publish(stock_account=account)
+                else:
+                    new = self._publish(futopt_account=account)
+            self._notify_state_change(old, new)
+            
+            if record.type == "Stock":
+                self.logger.info(f"Set default stock account: {record.account_id}")
+            else:
+                self.logger.info(f"Set default futures account: {record.account_id}")
                 
         except Exception as e:
             self.logger.error(f"Error setting default account: {str(e)}")
     
+    @traced("client.place_order")
+    def place_order(self, contract, order, timeout: Optional[float] = None):
+        """
+        Place an order through the session's rate limiter.
+        
+        Args:
+            contract: SDK contract object
+            order: SDK order object
+            timeout (float): Maximum seconds to wait for the rate limiter (default: wait forever)
+            
+        Returns:
+            Trade object returned by the SDK, or None if the order was not sent
+        """
+        if not self.is_logged_in:
+            self.logger.warning("Not logged in")
+            return None
+        
+        if not self.order_limiter.acquire(timeout=timeout):
+            self.logger.error("Order rejected locally: rate limit wait timed out")
+            return None
+        
+        account = account_id_of(get_field(order, "account"))
+        if account is None:
+            default = self.stock_account or self.futopt_account
+            account = self._state.record_for(default).account_id if default is not None else None
+        symbol = symbol_of(contract)
+        
+        local_id = None
+        if self._order_listeners:
+            local_id = f"{self._local_prefix}-{next(self._local_ids)}"
+            quantity, price = get_field(order, "quantity"), get_field(order, "price")
+            info = {"local_id": local_id, "account": account, "symbol": symbol,
+                    "action": status_name(get_field(order, "action")),
+                    "quantity": float(quantity) if isinstance(quantity, (int, float)) else None,
+                    "price": float(price) if isinstance(price, (int, float)) else None}
+            for listener in tuple(self._order_listeners):
+                try:
+                    listener("submit", info)
+                except Exception as e:
+                    self.logger.error(f"Order not sent: listener refused submit: {str(e)}")
+                    self._notify_order("failed", {"local_id": local_id, "error": str(e)})
+                    return None
+        
+        try:
+            with get_tracer().span("sdk.place_order"):
+                sent_ns = time.monotonic_ns()
+                trade = self.api.place_order(contract, order)
+        except Exception as e:
+            self.logger.error(f"Error placing order: {str(e)}")
+            if local_id is not None:
+                self._notify_order("failed", {"local_id": local_id, "error": str(e)})
+            return None
+        
+        order_id = order_id_of(trade)
+        self.latency.mark(order_id, "send", sent_ns, account=account, symbol=symbol)
+        if local_id is not None:
+            self._notify_order("sent", {"local_id": local_id, "order_id": order_id})
+        return trade
+    
+    @traced("client.cancel_order")
+    def cancel_order(self, trade, timeout: Optional[float] = None) -> bool:
+        """
+        Cancel an order through the session's rate limiter.
+        
+        Args:
+            trade: Trade object returned by place_order
+            timeout (float): Maximum seconds to wait for the rate limiter (default: wait forever)
+            
+        Returns:
+            bool: True if the cancel request was sent
+        """
+        if not self.is_logged_in:
+            self.logger.warning("Not logged in")
+            return False
+        
+        if not self.order_limiter.acquire(timeout=timeout):
+            self.logger.error("Cancel rejected locally: rate limit wait timed out")
+            return False
+        
+        try:
+            self.api.cancel_order(trade)
+            return True
+        except Exception as e:
+            self.logger.error(f"Error cancelling order: {str(e)}")
+            return False
+    
+    @traced("client.get_account_balance")
+    def get_account_balance(self, account=None) -> dict:
+        """
+        Query the account balance.
+        
+        Args:
+            account: Account to query (default: the default stock account)
+            
+        Returns:
+            dict: Balance fields, or {"error": ...} on failure
+        """
+        state = self._state
+        if not state.logged_in:
+            return {"error": "Not logged in"}
+        
+        account = account or state.stock_account
+        try:
+            if account is not None:
+                balance = self.api.account_balance(account)
+            else:
+                balance = self.api.account_balance()
+        except Exception as e:
+            self.logger.error(f"Error querying account balance: {str(e)}")
+            return {"error": str(e)}
+        
+        if isinstance(balance, dict):
+            return balance
+        if hasattr(balance, '__dict__'):
+            return {key: value for key, value in vars(balance).items()
+                    if not key.startswith('_')}
+        return {"balance": balance}
+    
+    def _contracts_for(self, symbols: List[str]) -> list:
+        """Resolve symbol codes to SDK contracts (codes are passed through if unknown)."""
+        try:
+            stocks = self.api.Contracts.Stocks
+        except Exception:
+            return list(symbols)
+        
+        contracts = []
+        for symbol in symbols:
+            try:
+                contracts.append(stocks[symbol])
+            except Exception:
+                contracts.append(symbol)
+        return contracts
+    
+    @traced("client.get_snapshots")
+    def get_snapshots(self, symbols: List[str], chunk_size: int = 200, max_workers: int = 4,
+                      retries: int = 2, timeout: Optional[float] = None,
+                      max_split_calls: int = 32) -> dict:
+        """
+        Fetch current snapshots for many symbols as NumPy columns.
+        
+        Symbols are split into chunks of ``chunk_size``, fetched by up to
+        ``max_workers`` threads under the query rate limiter, and failed
+        chunks are retried with exponential backoff. A chunk that still fails
+        is bisected (one attempt per part, without backoff) to isolate a bad
+        symbol, but only when its error names a symbol or another chunk
+        succeeded; when every chunk fails the session itself is failing and
+        no extra calls are made. Bisection is capped at ``max_split_calls``
+        SDK calls per request.
+        
+        Args:
+            symbols (List[str]): Symbol codes (duplicates are dropped)
+            chunk_size (int): Symbols per SDK call (default: 200)
+            max_workers (int): Concurrent SDK calls (default: 4)
+            retries (int): Extra attempts per failed chunk (default: 2)
+            timeout (float): Maximum seconds to wait for the rate limiter per attempt (default: wait forever)
+            max_split_calls (int): Maximum SDK calls spent bisecting failed chunks (default: 32)
+            
+        Returns:
+            dict: Columnar result (see snapshots.py), or {"error": ...} if not logged in;
+                every symbol without a snapshot has an entry in "errors"
+        """
+        if not self.is_logged_in:
+            return {"error": "Not logged in"}
+        
+        symbols = list(dict.fromkeys(symbols))
+        columns = empty_columns(symbols)
+        rows = {symbol: row for row, symbol in enumerate(symbols)}
+        split_budget = [max_split_calls]
+        budget_lock = threading.Lock()
+        
+        def attempt_fetch(chunk, attempts):
+            error = None
+            for attempt in range(attempts):
+                if attempt:
+                    time.sleep(min(0.5 * 2 ** (attempt - 1), 5.0))
+                if not self.query_limiter.acquire(timeout=timeout):
+                    error = "rate limit wait timed out"
+                    continue
+                try:
+                    with get_tracer().span("sdk.snapshots", size=len(chunk), attempt=attempt):
+                        return self.api.snapshots(self._contracts_for(chunk)), None
+                except Exception as e:
+                    error = str(e)
+            return None, error
+        
+        def fetch(chunk):
+            snapshots, error = attempt_fetch(chunk, retries + 1)
+            return chunk, snapshots, error
+        
+        def bisect(chunk, error):
+            if len(chunk) == 1:
+                return [(chunk, None, error)]
+            results = []
+            middle = len(chunk) // 2
+            for part in (chunk[:middle], chunk[middle:]):
+                with budget_lock:
+                    allowed = split_budget[0] > 0
+                    split_budget[0] -= allowed
+                if not allowed:
+                    results.append((part, None, error))
+                    continue
+                snapshots, part_error = attempt_fetch(part, 1)
+                if part_error is None:
+                    results.append((part, snapshots, None))
+                else:
+                    results.extend(bisect(part, part_error))
+            return results
+        
+        def record(chunk, snapshots, error):
+            if error is None:
+                fill_rows(columns, rows, chunk, snapshots)
+                missing = [symbol for symbol in chunk if not columns["ok"][rows[symbol]]]
+                for symbol in missing:
+                    columns["errors"][symbol] = "no snapshot returned"
+            else:
+                self.logger.error(f"Snapshot query failed for {chunk[0]}: {error}")
+                for symbol in chunk:
+                    columns["errors"][symbol] = error
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="snapshots") as pool:
+            results = list(pool.map(get_tracer().wrap(fetch), chunked(symbols, chunk_size)))
+            healthy = any(error is None for _, _, error in results)
+            failed = []
+            for chunk, snapshots, error in results:
+                if error is not None and len(chunk) > 1 and (healthy or is_symbol_error(error, chunk)):
+                    failed.append((chunk, error))
+                else:
+                    record(chunk, snapshots, error)
+            for parts in pool.map(get_tracer().wrap(lambda item: bisect(*item)), failed):
+                for chunk, snapshots, error in parts:
+                    record(chunk, snapshots, error)
+        
+        return columns
+    
     def get_contracts_status(self) -> str:
         """
         Get contracts download status.
@@ -285,50 +925,67 @@ class KGITradingClient:
         """
         Get detailed information about all available accounts.
         
+        Built from the login snapshots and cached until the visible or
+        default accounts change; treat the result as read-only.
+        
         Returns:
             dict: Detailed account information
         """
-        if not self.is_logged_in:
+        state = self._state
+        if not state.logged_in:
             return {"error": "Not logged in", "accounts": []}
         
+        cached = state.cached_details()
+        if cached is not None:
+            return cached
+        
+        visible_ids = {id(account) for account in state.accounts}
+        stock_id = id(state.stock_account) if state.stock_account is not None else None
+        futures_id = id(state.futopt_account) if state.futopt_account is not None else None
+        
         account_details = {
-            "total_accounts": len(self.all_accounts),
-            "current_visible_accounts": len(self.accounts),
+            "total_accounts": len(state.all_accounts),
+            "current_visible_accounts": len(state.accounts),
             "accounts": []
         }
         
-        for i, account in enumerate(self.all_accounts):
-            account_type = "Stock" if "Stock" in str(type(account)) else "Future"
-            signed_status = "Signed" if hasattr(account, 'signed') and account.signed else "Not Signed"
-            is_visible = account in self.accounts
-            
-            account_info = {
-                "index": i + 1,
-                "type": account_type,
-                "person_id": getattr(account, 'person_id', 'N/A'),
-                "broker_id": getattr(account, 'broker_id', 'N/A'),
-                "account_id": getattr(account, 'account_id', 'N/A'),
-                "signed": signed_status,
-                "is_visible_in_current_filter": is_visible,
-                "is_default_stock": account == self.stock_account,
-                "is_default_futures": account == self.futopt_account
-            }
-            
-            if hasattr(account, 'trader') and account.trader:
-                account_info['trader'] = account.trader
-                
+        for account, record in zip(state.all_accounts, state.account_records):
+            account_info = dict(record.to_dict())
+            account_info["is_visible_in_current_filter"] = id(account) in visible_ids
+            account_info["is_default_stock"] = id(account) == stock_id
+            account_info["is_default_futures"] = id(account) == futures_id
             account_details["accounts"].append(account_info)
         
-        return account_details
+        return state.cache_details(account_details)
+    
+    def get_account_capabilities(self, account=None) -> Optional[CapabilityMap]:
+        """
+        Get the cached capability map for an account's class.
+        
+        Args:
+            account: SDK account (default: default stock account, then futures account)
+            
+        Returns:
+            CapabilityMap: Capabilities, or None if there is no account
+        """
+        state = self._state
+        account = account or state.stock_account or state.futopt_account
+        if account is None:
+            return None
+        return get_capabilities(account)
     
     def test_account_capabilities(self) -> dict:
         """
         Test what capabilities each account type has.
         
+        Method discovery is cached per account class, so repeated calls do
+        not re-inspect the SDK objects.
+        
         Returns:
             dict: Test results for different account types
         """
-        if not self.is_logged_in:
+        state = self._state
+        if not state.logged_in:
             return {"error": "Not logged in"}
         
         results = {
@@ -337,40 +994,33 @@ class KGITradingClient:
             "contracts_info": None
         }
         
-        # Test stock account capabilities
-        if self.stock_account:
-            try:
-                # Try to access stock-related methods
-                results["stock_account_test"] = {
-                    "account_id": self.stock_account.account_id,
-                    "type": str(type(self.stock_account)),
-                    "signed": getattr(self.stock_account, 'signed', False),
-                    "available_methods": [method for method in dir(self.stock_account) 
-                                        if not method.startswith('_') and callable(getattr(self.stock_account, method))]
-                }
-            except Exception as e:
-                results["stock_account_test"] = {"error": str(e)}
-        
-        # Test futures account capabilities  
-        if self.futopt_account:
+        for key, account in (("stock_account_test", state.stock_account),
+                             ("futures_account_test", state.futopt_account)):
+            if not account:
+                continue
             try:
-                results["futures_account_test"] = {
-                    "account_id": self.futopt_account.account_id,
-                    "type": str(type(self.futopt_account)),
-                    "signed": getattr(self.futopt_account, 'signed', False),
-                    "available_methods": [method for method in dir(self.futopt_account) 
-                                        if not method.startswith('_') and callable(getattr(self.futopt_account, method))]
+                record = state.record_for(account)
+                capabilities = get_capabilities(account)
+                results[key] = {
+                    "account_id": record.account_id,
+                    "type": str(type(account)),
+                    "signed": record.signed,
+                    "available_methods": list(capabilities.method_names)
                 }
             except Exception as e:
-                results["futures_account_test"] = {"error": str(e)}
+                results[key] = {"error": str(e)}
         
         # Test contracts information
         try:
             if hasattr(self.api, 'Contracts'):
+                contracts = self.api.Contracts
+                capabilities = get_capabilities(contracts)
+                names = capabilities.methods | capabilities.attributes
+                if hasattr(contracts, '__dict__'):
+                    names = names | {name for name in vars(contracts) if not name.startswith('_')}
                 results["contracts_info"] = {
-                    "status": getattr(self.api.Contracts, 'status', 'Unknown'),
-                    "available_methods": [method for method in dir(self.api.Contracts) 
-                                        if not method.startswith('_')]
+                    "status": getattr(contracts, 'status', 'Unknown'),
+                    "available_methods": sorted(names)
                 }
         except Exception as e:
             results["contracts_info"] = {"error": str(e)}
@@ -393,16 +1043,19 @@ class KGITradingClient:
         Returns:
             dict: Client information
         """
-        account_types = self.get_available_account_types()
+        state = self._state
+        account_types = self._account_type_counts(state)
         
         return {
             "simulation_mode": self.simulation,
-            "logged_in": self.is_logged_in,
-            "account_count": len(self.accounts),
+            "logged_in": state.logged_in,
+            "account_count": len(state.accounts),
             "total_accounts": account_types.get("total", 0),
             "stock_accounts": account_types.get("stock", 0),
             "futures_accounts": account_types.get("futures", 0),
-            "has_stock_account": self.stock_account is not None,
-            "has_futures_account": self.futopt_account is not None,
-            "contracts_status": self.get_contracts_status()
+            "has_stock_account": state.stock_account is not None,
+            "has_futures_account": state.futopt_account is not None,
+            "contracts_status": self.get_contracts_status(),
+            "contracts_ready": state.contracts_ready,
+            "order_latency_ns": self.latency.snapshot()
         }
@@ -0,0 +1,178 @@
+"""
+Client Events
+
+This module provides typed client events and a low-overhead dispatcher, so
+GUIs and scripts can react to state changes instead of polling
+``is_connected()``, ``get_client_info()`` or ``get_contracts_status()``.
+
+Callbacks run on the thread that emitted the event (usually a worker or SDK
+thread). Use ``tk_bridge`` or ``asyncio_bridge`` to hop onto a Tk mainloop or
+an asyncio event loop.
+"""
+
+import logging
+import queue
+import threading
+import time
+from enum import Enum
+from typing import Callable, Dict, Optional, Tuple
+
+
+class ClientEvent(Enum):
+    """Types of events emitted by KGITradingClient."""
+
+    LOGGED_IN = "logged_in"
+    LOGGED_OUT = "logged_out"
+    ACCOUNTS_CHANGED = "accounts_changed"
+    DEFAULTS_CHANGED = "defaults_changed"
+    CONTRACTS_READY = "contracts_ready"
+    CONNECTION_LOST = "connection_lost"
+
+
+class Event:
+    """A single emitted event."""
+
+    __slots__ = ("type", "state", "data", "timestamp_ns")
+
+    def __init__(self, type: ClientEvent, state=None, data: Optional[dict] = None):
+        """
+        Initialize the event.
+
+        Args:
+            type (ClientEvent): Event type
+            state (ClientState): Client state snapshot after the change (default: None)
+            data (dict): Extra event details (default: empty)
+        """
+        self.type = type
+        self.state = state
+        self.data = data or {}
+        self.timestamp_ns = time.time_ns()
+
+    def __repr__(self):
+        return f"Event({self.type.value}, {self.data})"
+
+
+class EventDispatcher:
+    """
+    Copy-on-write publish/subscribe dispatcher.
+
+    Subscribing swaps in a new tuple of callbacks under a lock; emitting
+    reads the current tuple without locking and allocates nothing when
+    there are no subscribers.
+    """
+
+    def __init__(self):
+        """Initialize the dispatcher."""
+        self._subscribers: Dict[Optional[ClientEvent], Tuple[Callable, ...]] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def subscribe(self, callback: Callable[[Event], None],
+                  event_type: Optional[ClientEvent] = None) -> Callable[[], None]:
+        """
+        Register a callback.
+
+        Args:
+            callback (Callable): Called with each Event
+            event_type (ClientEvent): Only receive this type (default: all events)
+
+        Returns:
+            Callable: Call it to unsubscribe
+        """
+        with self._lock:
+            self._subscribers[event_type] = self._subscribers.get(event_type, ()) + (callback,)
+
+        def unsubscribe():
+            with self._lock:
+                callbacks = list(self._subscribers.get(event_type, ()))
+                if callback in callbacks:
+                    callbacks.remove(callback)
+                    self._subscribers[event_type] = tuple(callbacks)
+        return unsubscribe
+
+    def has_subscribers(self, event_type: ClientEvent) -> bool:
+        """
+        Check whether anyone listens for an event type.
+
+        Args:
+            event_type (ClientEvent): Event type
+
+        Returns:
+            bool: True if at least one callback would run
+        """
+        return bool(self._subscribers.get(event_type) or self._subscribers.get(None))
+
+    def emit(self, event_type: ClientEvent, state=None, **data):
+        """
+        Deliver an event to its subscribers.
+
+        Args:
+            event_type (ClientEvent): Event type
+            state (ClientState): Client state snapshot after the change (default: None)
+            **data: Extra event details
+        """
+        callbacks = self._subscribers.get(event_type, ()) + self._subscribers.get(None, ())
+        if not callbacks:
+            return
+
+        event = Event(event_type, state, data)
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                self.logger.error(f"Event callback error ({event_type.value}): {str(e)}")
+
+
+def tk_bridge(root, callback: Callable[[Event], None], interval_ms: int = 50) -> Callable[[Event], None]:
+    """
+    Wrap a callback so it runs on the Tk mainloop thread.
+
+    Tk must not be called from other threads, so events are queued and
+    drained by a ``root.after`` poll on the Tk thread; create the bridge on
+    that thread. Polling stops once the root is destroyed.
+
+    Args:
+        root: Tk root widget
+        callback (Callable): Function to run on the Tk thread
+        interval_ms (int): Poll interval in milliseconds (default: 50)
+
+    Returns:
+        Callable: Callback suitable for EventDispatcher.subscribe
+    """
+    pending = queue.SimpleQueue()
+    logger = logging.getLogger(__name__)
+
+    def pump():
+        while True:
+            try:
+                event = pending.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Tk event callback error ({event.type.value}): {str(e)}")
+        try:
+            root.after(interval_ms, pump)
+        except Exception:
+            # Root destroyed: stop polling
+            pass
+
+    root.after(interval_ms, pump)
+    return pending.put
+
+
+def asyncio_bridge(loop, callback: Callable[[Event], None]) -> Callable[[Event], None]:
+    """
+    Wrap a callback so it runs on an asyncio event loop.
+
+    Args:
+        loop: asyncio event loop
+        callback (Callable): Function to run on the loop (may schedule coroutines)
+
+    Returns:
+        Callable: Callback suitable for EventDispatcher.subscribe
+    """
+    def bridged(event):
+        loop.call_soon_threadsafe(callback, event)
+    return bridged
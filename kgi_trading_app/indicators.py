@@ -0,0 +1,520 @@
+"""
+Technical Indicators
+
+This module provides NumPy-vectorized indicators for whole bar histories and
+matching streaming classes that update in O(1) per new bar. Batch and
+streaming versions use the same definitions, so a strategy can warm up on
+history and then continue bar by bar with identical values.
+
+Batch functions work along the last axis, so a 2-D array of shape
+``(symbols, bars)`` computes a whole universe in one call. Rolling-window
+outputs are NaN until ``period`` values have been seen; EMA, RSI and ATR are
+seeded with their first input (Wilder smoothing uses ``alpha = 1 / period``).
+
+Example::
+
+    bars = KBarService(client).get_bars("2330", "2024-01-01", "2024-06-30")
+    upper, middle, lower = bollinger(bars["close"], 20)
+
+    rsi14 = RSI(14)
+    for close in live_closes:
+        value = rsi14.update(close)
+"""
+
+import math
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+def _as_float(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def _check_period(period: int):
+    if period < 1:
+        raise ValueError(f"period must be >= 1, got {period}")
+
+
+def _rolling_sum(values: np.ndarray, period: int) -> np.ndarray:
+    """Rolling sum along the last axis (NaN during warm-up)."""
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] < period:
+        return out
+    total = np.cumsum(values, axis=-1)
+    out[..., period - 1] = total[..., period - 1]
+    out[..., period:] = total[..., period:] - total[..., :-period]
+    return out
+
+
+def _ema_filter(values: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Exponential smoothing ``y[t] = alpha * x[t] + (1 - alpha) * y[t-1]``
+    seeded with ``y[0] = x[0]``.
+
+    The recursion is solved in closed form over blocks short enough that the
+    decay factors stay within 1e12, so each block is a single cumsum.
+    """
+    out = np.empty(values.shape)
+    length = values.shape[-1]
+    if length == 0:
+        return out
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        out[...] = values
+        return out
+
+    block = max(1, int(12 * math.log(10) / -math.log(decay)))
+    powers = decay ** np.arange(block + 1)
+    inverse = 1.0 / powers[:block]
+
+    previous = values[..., 0]
+    for start in range(0, length, block):
+        chunk = values[..., start:start + block]
+        size = chunk.shape[-1]
+        weighted = np.cumsum(chunk * inverse[:size], axis=-1)
+        smoothed = (powers[1:size + 1] * previous[..., None] +
+                    alpha * powers[:size] * weighted)
+        out[..., start:start + size] = smoothed
+        previous = smoothed[..., -1]
+    return out
+
+
+def sma(values, period: int) -> np.ndarray:
+    """
+    Simple moving average.
+
+    Args:
+        values: Input series (time on the last axis)
+        period (int): Window length
+
+    Returns:
+        np.ndarray: Moving average
+    """
+    _check_period(period)
+    values = _as_float(values)
+    return _rolling_sum(values, period) / period
+
+
+def ema(values, period: int) -> np.ndarray:
+    """
+    Exponential moving average with ``alpha = 2 / (period + 1)``.
+
+    Args:
+        values: Input series (time on the last axis)
+        period (int): Span
+
+    Returns:
+        np.ndarray: Moving average
+    """
+    _check_period(period)
+    return _ema_filter(_as_float(values), 2.0 / (period + 1))
+
+
+def rolling_std(values, period: int) -> np.ndarray:
+    """
+    Rolling population standard deviation.
+
+    Args:
+        values: Input series (time on the last axis)
+        period (int): Window length
+
+    Returns:
+        np.ndarray: Standard deviation
+    """
+    _check_period(period)
+    values = _as_float(values)
+    if values.shape[-1] == 0:
+        return np.empty(values.shape)
+    # Shift by the first value so the sums stay small and precise
+    shifted = values - values[..., :1]
+    mean = _rolling_sum(shifted, period) / period
+    variance = _rolling_sum(shifted * shifted, period) / period - mean * mean
+    return np.sqrt(np.maximum(variance, 0.0))
+
+
+def bollinger(values, period: int = 20, width: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bollinger bands.
+
+    Args:
+        values: Input series (time on the last axis)
+        period (int): Window length (default: 20)
+        width (float): Band width in standard deviations (default: 2)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: (upper, middle, lower)
+    """
+    middle = sma(values, period)
+    offset = width * rolling_std(values, period)
+    return middle + offset, middle, middle - offset
+
+
+def zscore(values, period: int) -> np.ndarray:
+    """
+    Rolling z-score of each value against its trailing window.
+
+    Args:
+        values: Input series (time on the last axis)
+        period (int): Window length
+
+    Returns:
+        np.ndarray: Z-scores (0 where the window is flat)
+    """
+    values = _as_float(values)
+    mean = sma(values, period)
+    std = rolling_std(values, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(std > 0, (values - mean) / std, np.where(np.isnan(std), np.nan, 0.0))
+
+
+def vwap(high, low, close, volume, period: Optional[int] = None) -> np.ndarray:
+    """
+    Volume-weighted average of the typical price (high + low + close) / 3.
+
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+        volume: Volumes
+        period (int): Rolling window; cumulative when None (default: None)
+
+    Returns:
+        np.ndarray: VWAP (NaN while no volume has traded)
+    """
+    volume = _as_float(volume)
+    typical = (_as_float(high) + _as_float(low) + _as_float(close)) / 3.0
+    if period is None:
+        notional = np.cumsum(typical * volume, axis=-1)
+        traded = np.cumsum(volume, axis=-1)
+    else:
+        _check_period(period)
+        notional = _rolling_sum(typical * volume, period)
+        traded = _rolling_sum(volume, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(traded > 0, notional / traded, np.nan)
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """
+    True range; the first bar uses high - low.
+
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+
+    Returns:
+        np.ndarray: True range
+    """
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    ranges = high - low
+    if ranges.shape[-1] > 1:
+        previous = close[..., :-1]
+        ranges[..., 1:] = np.maximum(ranges[..., 1:],
+                                     np.maximum(np.abs(high[..., 1:] - previous),
+                                                np.abs(low[..., 1:] - previous)))
+    return ranges
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """
+    Average true range with Wilder smoothing.
+
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+        period (int): Smoothing period (default: 14)
+
+    Returns:
+        np.ndarray: ATR
+    """
+    _check_period(period)
+    return _ema_filter(true_range(high, low, close), 1.0 / period)
+
+
+def rsi(values, period: int = 14) -> np.ndarray:
+    """
+    Relative strength index with Wilder smoothing.
+
+    Args:
+        values: Close prices (time on the last axis)
+        period (int): Smoothing period (default: 14)
+
+    Returns:
+        np.ndarray: RSI in [0, 100]; NaN for the first bar
+    """
+    _check_period(period)
+    values = _as_float(values)
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] < 2:
+        return out
+    change = np.diff(values, axis=-1)
+    gain = _ema_filter(np.maximum(change, 0.0), 1.0 / period)
+    loss = _ema_filter(np.maximum(-change, 0.0), 1.0 / period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[..., 1:] = np.where(loss > 0, 100.0 - 100.0 / (1.0 + gain / loss),
+                                np.where(gain > 0, 100.0, 50.0))
+    return out
+
+
+def bar_indicators(bars: Dict[str, np.ndarray], period: int = 20) -> Dict[str, np.ndarray]:
+    """
+    Compute the standard indicator set for a bar dict (see kbars.py).
+
+    Args:
+        bars (Dict[str, np.ndarray]): Bars with high/low/close/volume arrays
+        period (int): Window for SMA/EMA/Bollinger/z-score (default: 20)
+
+    Returns:
+        Dict[str, np.ndarray]: Indicator arrays aligned with the bars
+    """
+    close = bars["close"]
+    upper, middle, lower = bollinger(close, period)
+    return {
+        "sma": middle,
+        "ema": ema(close, period),
+        "vwap": vwap(bars["high"], bars["low"], close, bars["volume"]),
+        "atr": atr(bars["high"], bars["low"], close),
+        "bollinger_upper": upper,
+        "bollinger_lower": lower,
+        "rsi": rsi(close),
+        "zscore": zscore(close, period)
+    }
+
+
+class SMA:
+    """Streaming simple moving average."""
+
+    __slots__ = ("period", "_window", "_index", "_count", "_sum", "value")
+
+    def __init__(self, period: int):
+        """
+        Initialize the indicator.
+
+        Args:
+            period (int): Window length
+        """
+        _check_period(period)
+        self.period = period
+        self._window = [0.0] * period
+        self._index = 0
+        self._count = 0
+        self._sum = 0.0
+        self.value = math.nan
+
+    def update(self, value: float) -> float:
+        """Add a value and get the current average (NaN during warm-up)."""
+        value = float(value)
+        self._sum += value - self._window[self._index]
+        self._window[self._index] = value
+        self._index = (self._index + 1) % self.period
+        if self._count < self.period:
+            self._count += 1
+        if self._count == self.period:
+            self.value = self._sum / self.period
+        return self.value
+
+
+class EMA:
+    """Streaming exponential moving average."""
+
+    __slots__ = ("alpha", "value")
+
+    def __init__(self, period: int, alpha: Optional[float] = None):
+        """
+        Initialize the indicator.
+
+        Args:
+            period (int): Span (alpha = 2 / (period + 1))
+            alpha (float): Explicit smoothing factor (default: None)
+        """
+        _check_period(period)
+        self.alpha = alpha if alpha is not None else 2.0 / (period + 1)
+        self.value = math.nan
+
+    def update(self, value: float) -> float:
+        """Add a value and get the current average."""
+        value = float(value)
+        if self.value != self.value:
+            self.value = value
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+
+class RollingStats:
+    """Streaming rolling mean and population standard deviation."""
+
+    __slots__ = ("period", "_window", "_index", "_count", "_shift", "_sum", "_sum_sq",
+                 "mean", "std")
+
+    def __init__(self, period: int):
+        """
+        Initialize the statistics.
+
+        Args:
+            period (int): Window length
+        """
+        _check_period(period)
+        self.period = period
+        self._window = [0.0] * period
+        self._index = 0
+        self._count = 0
+        self._shift = None
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self.mean = math.nan
+        self.std = math.nan
+
+    def update(self, value: float):
+        """Add a value and refresh mean and std (NaN during warm-up)."""
+        if self._shift is None:
+            self._shift = float(value)
+        shifted = float(value) - self._shift
+        old = self._window[self._index]
+        self._sum += shifted - old
+        self._sum_sq += shifted * shifted - old * old
+        self._window[self._index] = shifted
+        self._index = (self._index + 1) % self.period
+        if self._count < self.period:
+            self._count += 1
+        if self._count == self.period:
+            mean = self._sum / self.period
+            self.mean = mean + self._shift
+            self.std = math.sqrt(max(self._sum_sq / self.period - mean * mean, 0.0))
+
+
+class Bollinger:
+    """Streaming Bollinger bands."""
+
+    __slots__ = ("width", "_stats")
+
+    def __init__(self, period: int = 20, width: float = 2.0):
+        """
+        Initialize the indicator.
+
+        Args:
+            period (int): Window length (default: 20)
+            width (float): Band width in standard deviations (default: 2)
+        """
+        self.width = width
+        self._stats = RollingStats(period)
+
+    def update(self, value: float) -> Tuple[float, float, float]:
+        """Add a value and get (upper, middle, lower)."""
+        self._stats.update(value)
+        middle = self._stats.mean
+        offset = self.width * self._stats.std
+        return middle + offset, middle, middle - offset
+
+
+class ZScore:
+    """Streaming rolling z-score."""
+
+    __slots__ = ("_stats",)
+
+    def __init__(self, period: int):
+        """
+        Initialize the indicator.
+
+        Args:
+            period (int): Window length
+        """
+        self._stats = RollingStats(period)
+
+    def update(self, value: float) -> float:
+        """Add a value and get its z-score against the window."""
+        stats = self._stats
+        stats.update(value)
+        if stats.std != stats.std:
+            return math.nan
+        return (float(value) - stats.mean) / stats.std if stats.std > 0 else 0.0
+
+
+class VWAP:
+    """Streaming cumulative VWAP; call reset() at each session start."""
+
+    __slots__ = ("_notional", "_volume", "value")
+
+    def __init__(self):
+        """Initialize the indicator."""
+        self.reset()
+
+    def reset(self):
+        """Start a new session."""
+        self._notional = 0.0
+        self._volume = 0.0
+        self.value = math.nan
+
+    def update(self, high: float, low: float, close: float, volume: float) -> float:
+        """Add a bar and get the current VWAP."""
+        volume = float(volume)
+        self._notional += (float(high) + float(low) + float(close)) / 3.0 * volume
+        self._volume += volume
+        if self._volume > 0:
+            self.value = self._notional / self._volume
+        return self.value
+
+
+class ATR:
+    """Streaming average true range (Wilder smoothing)."""
+
+    __slots__ = ("_previous_close", "_average")
+
+    def __init__(self, period: int = 14):
+        """
+        Initialize the indicator.
+
+        Args:
+            period (int): Smoothing period (default: 14)
+        """
+        self._previous_close = None
+        self._average = EMA(period, alpha=1.0 / period)
+
+    @property
+    def value(self) -> float:
+        """Current ATR."""
+        return self._average.value
+
+    def update(self, high: float, low: float, close: float) -> float:
+        """Add a bar and get the current ATR."""
+        high, low = float(high), float(low)
+        span = high - low
+        if self._previous_close is not None:
+            span = max(span, abs(high - self._previous_close), abs(low - self._previous_close))
+        self._previous_close = float(close)
+        return self._average.update(span)
+
+
+class RSI:
+    """Streaming relative strength index (Wilder smoothing)."""
+
+    __slots__ = ("_previous", "_gain", "_loss", "value")
+
+    def __init__(self, period: int = 14):
+        """
+        Initialize the indicator.
+
+        Args:
+            period (int): Smoothing period (default: 14)
+        """
+        self._previous = None
+        self._gain = EMA(period, alpha=1.0 / period)
+        self._loss = EMA(period, alpha=1.0 / period)
+        self.value = math.nan
+
+    def update(self, value: float) -> float:
+        """Add a close and get the current RSI (NaN for the first bar)."""
+        value = float(value)
+        if self._previous is not None:
+            change = value - self._previous
+            gain = self._gain.update(max(change, 0.0))
+            loss = self._loss.update(max(-change, 0.0))
+            if loss > 0:
+                self.value = 100.0 - 100.0 / (1.0 + gain / loss)
+            else:
+                self.value = 100.0 if gain > 0 else 50.0
+        self._previous = value
+        return self.value
@@ -0,0 +1,537 @@
+"""
+Order and Fill Journal
+
+This module provides ``Journal``, an append-only write-ahead log of order
+requests and trade reports, and ``OrderState``, the in-memory order and
+position state rebuilt from it.
+
+Record layout (little endian)::
+
+    length(I) crc32(I) seq(Q) ts_ns(Q) type(B) payload(length bytes)
+
+The CRC covers everything after itself. Payloads are ``marshal``-encoded
+dicts of plain values, which decode several times faster than JSON.
+
+Writers append to an in-memory batch; a flusher thread writes and fsyncs
+whatever has accumulated (group commit), so appends that arrive while an
+fsync is in progress share the next one. ``commit_interval`` optionally
+waits longer to gather bigger batches. Order submissions wait until they
+are durable before the order is sent; trade reports do not wait.
+
+Segments (``segment-<first seq>.wal``) rotate at ``segment_bytes``.
+``checkpoint()`` writes the current state (``checkpoint-<seq>.ckpt``: a CRC
+plus the marshalled state) and deletes segments it fully covers; the
+flusher checkpoints every ``checkpoint_records`` records so recovery only
+replays a bounded tail. On open, the latest checkpoint is loaded and the
+tail after it is replayed; a torn or corrupt record at the end of the last
+segment is truncated.
+
+Usage::
+
+    journal = Journal("journal")
+    journal.attach(client)           # logs orders and reports, closes at shutdown
+    journal.state.positions          # {"account:symbol": quantity}
+"""
+
+import logging
+import marshal
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from typing import List, Optional, Tuple
+
+
+SUBMIT, SENT, FAILED, REPORT = 1, 2, 3, 4
+RECORD_TYPES = {"submit": SUBMIT, "sent": SENT, "failed": FAILED}
+
+_HEADER = struct.Struct("<IIQQB")
+_CRC_OFFSET = 8  # CRC covers seq, ts_ns, type and payload
+_SEGMENT_PREFIX = "segment-"
+_CHECKPOINT_PREFIX = "checkpoint-"
+
+logger = logging.getLogger(__name__)
+
+
+def _side(action) -> int:
+    return -1 if str(action or "").lower() == "sell" else 1
+
+
+class OrderState:
+    """
+    Orders and positions rebuilt from journal records.
+
+    Orders are keyed by the client's local id; broker order ids map to them
+    once known. Reports for orders submitted elsewhere are keyed by their
+    broker order id. Positions are net filled quantities per
+    ``"account:symbol"``, derived from cumulative filled quantities.
+    """
+
+    def __init__(self, seq: int = 0, orders: Optional[dict] = None,
+                 order_ids: Optional[dict] = None, positions: Optional[dict] = None):
+        """
+        Initialize the state.
+
+        Args:
+            seq (int): Last applied record sequence number
+            orders (dict): key -> order dict
+            order_ids (dict): broker order id -> key
+            positions (dict): "account:symbol" -> net quantity
+        """
+        self.seq = seq
+        self.orders = orders or {}
+        self.order_ids = order_ids or {}
+        self.positions = positions or {}
+
+    def apply(self, seq: int, record_type: int, payload: dict):
+        """Apply one journal record."""
+        self.seq = seq
+        if record_type == SUBMIT:
+            order = dict(payload)
+            order.update(status="submitted", filled_quantity=0.0, order_id=None)
+            self.orders[payload["local_id"]] = order
+        elif record_type == SENT:
+            order = self.orders.get(payload["local_id"])
+            if order is not None:
+                order["order_id"] = payload["order_id"]
+                if order["status"] == "submitted":
+                    order["status"] = "sent"
+                if payload["order_id"] is not None:
+                    self._adopt(order, payload["order_id"])
+                    self.order_ids[payload["order_id"]] = payload["local_id"]
+        elif record_type == FAILED:
+            order = self.orders.get(payload["local_id"])
+            if order is not None:
+                order["status"] = "failed"
+                order["error"] = payload.get("error")
+        elif record_type == REPORT:
+            self._apply_report(payload)
+
+    def _adopt(self, order: dict, order_id: str):
+        """Merge an order keyed by broker id (reports that beat SENT) into its local order."""
+        orphan = self.orders.get(order_id)
+        if orphan is None or orphan is order or orphan.get("local_id") is not None:
+            return
+        del self.orders[order_id]
+        order["status"] = orphan["status"]
+        if orphan.get("fill_price") is not None:
+            order["fill_price"] = orphan["fill_price"]
+        # Re-book the orphan's fills under the local order's account, symbol and side
+        filled = max(order["filled_quantity"], orphan["filled_quantity"])
+        orphan_position = self._add_position(orphan, -orphan["filled_quantity"])
+        position = self._add_position(order, filled - order["filled_quantity"])
+        order["filled_quantity"] = filled
+        if orphan_position != position and self.positions.get(orphan_position) == 0:
+            del self.positions[orphan_position]
+
+    def _add_position(self, order: dict, quantity: float) -> str:
+        position = f"{order.get('account') or '-'}:{order.get('symbol')}"
+        if quantity:
+            self.positions[position] = self.positions.get(position, 0.0) + _side(order.get("action")) * quantity
+        return position
+
+    def _apply_report(self, report: dict):
+        order_id = report.get("order_id")
+        key = self.order_ids.get(order_id, order_id)
+        order = self.orders.get(key)
+        if order is None:
+            if order_id is None:
+                return
+            order = self.orders[order_id] = {
+                "local_id": None, "order_id": order_id, "account": report.get("account"),
+                "symbol": report.get("symbol"), "action": report.get("action"),
+                "quantity": report.get("quantity"), "price": report.get("price"),
+                "status": "sent", "filled_quantity": 0.0
+            }
+            self.order_ids[order_id] = order_id
+
+        if report.get("status"):
+            order["status"] = report["status"]
+        filled = report.get("filled_quantity") or 0.0
+        delta = filled - order["filled_quantity"]
+        if delta > 0:
+            order["filled_quantity"] = filled
+            self._add_position(order, delta)
+        if report.get("fill_price") is not None:
+            order["fill_price"] = report["fill_price"]
+
+    def open_orders(self) -> List[dict]:
+        """Get orders that have not reached a final status."""
+        final = ("filled", "cancelled", "canceled", "failed", "rejected")
+        return [order for order in self.orders.values() if order["status"] not in final]
+
+    def to_dict(self) -> dict:
+        """Get the state as a dict of plain values."""
+        return {"seq": self.seq, "orders": self.orders, "order_ids": self.order_ids,
+                "positions": self.positions}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "OrderState":
+        """Rebuild state from to_dict() output."""
+        return cls(data["seq"], data["orders"], data["order_ids"], data["positions"])
+
+
+def _segment_files(directory: str) -> List[Tuple[int, str]]:
+    files = []
+    for name in os.listdir(directory):
+        if name.startswith(_SEGMENT_PREFIX) and name.endswith(".wal"):
+            files.append((int(name[len(_SEGMENT_PREFIX):-4]), os.path.join(directory, name)))
+    return sorted(files)
+
+
+def _checkpoint_files(directory: str) -> List[Tuple[int, str]]:
+    files = []
+    for name in os.listdir(directory):
+        if name.startswith(_CHECKPOINT_PREFIX) and name.endswith(".ckpt"):
+            files.append((int(name[len(_CHECKPOINT_PREFIX):-5]), os.path.join(directory, name)))
+    return sorted(files)
+
+
+def read_segment(path: str, after_seq: int = 0):
+    """
+    Read valid records from a segment file.
+
+    Args:
+        path (str): Segment file
+        after_seq (int): Skip records with seq <= after_seq (default: 0)
+
+    Returns:
+        Tuple[list, int]: ([(seq, ts_ns, type, payload)], bytes of valid data)
+    """
+    with open(path, "rb") as f:
+        data = memoryview(f.read())
+
+    records = []
+    append = records.append
+    unpack_from, crc32, loads = _HEADER.unpack_from, zlib.crc32, marshal.loads
+    offset = 0
+    size = len(data)
+    header_size = _HEADER.size
+    while offset + header_size <= size:
+        length, crc, seq, ts_ns, record_type = unpack_from(data, offset)
+        start = offset + header_size
+        end = start + length
+        if end > size or crc32(data[offset + _CRC_OFFSET:end]) != crc:
+            break
+        if seq > after_seq:
+            try:
+                payload = loads(data[start:end])
+            except (EOFError, ValueError, TypeError):
+                break
+            append((seq, ts_ns, record_type, payload))
+        offset = end
+    return records, offset
+
+
+class Journal:
+    """
+    Group-committed, checksummed write-ahead journal.
+    """
+
+    def __init__(self, directory: str, segment_bytes: int = 64 * 1024 * 1024,
+                 commit_interval: float = 0.0, checkpoint_records: Optional[int] = 50_000,
+                 fsync: bool = True):
+        """
+        Open (and recover) a journal directory.
+
+        Args:
+            directory (str): Journal directory (created if missing)
+            segment_bytes (int): Rotate segments at this size (default: 64 MB)
+            commit_interval (float): Extra seconds to gather records per fsync (default: 0)
+            checkpoint_records (int): Checkpoint automatically after this many
+                records, bounding recovery time; None disables (default: 50,000)
+            fsync (bool): fsync each commit (default: True; disable only for tests)
+        """
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.commit_interval = commit_interval
+        self.checkpoint_records = checkpoint_records
+        self.fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+
+        self.recovery_stats = {}
+        self.state = self._recover()
+        self._seq = self.state.seq
+        self._durable_seq = self._seq
+        # Highest seq whose commit has been attempted, and (first, last, error)
+        # of recent batches that failed to write
+        self._processed_seq = self._seq
+        self._failures = deque(maxlen=64)
+        self._checkpoint_seq = self._seq - self.recovery_stats["records"]
+        self._batch: List[bytes] = []
+        self._batch_last_seq = self._seq
+        self._lock = threading.Lock()
+        self._committed = threading.Condition(self._lock)
+        self._pending = threading.Condition(self._lock)
+        self._closed = False
+        self._io_lock = threading.Lock()
+        self._file = None
+        self._file_size = 0
+        self._open_segment(self._seq + 1)
+
+        self.logger = logging.getLogger(__name__)
+        self._flusher = threading.Thread(target=self._flush_loop, name="journal-flush", daemon=True)
+        self._flusher.start()
+
+    def _recover(self) -> OrderState:
+        """Load the latest checkpoint and replay the journal tail."""
+        start = time.perf_counter()
+        state = OrderState()
+        for seq, path in reversed(_checkpoint_files(self.directory)):
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+                if len(data) < 4 or zlib.crc32(data[4:]) != struct.unpack_from("<I", data)[0]:
+                    raise ValueError("checksum mismatch")
+                state = OrderState.from_dict(marshal.loads(data[4:]))
+                break
+            except (OSError, ValueError, EOFError, TypeError, KeyError) as e:
+                logger.warning(f"Skipping unreadable checkpoint {path}: {str(e)}")
+
+        replayed = 0
+        segments = _segment_files(self.directory)
+        for index, (first_seq, path) in enumerate(segments):
+            records, valid_bytes = read_segment(path, after_seq=state.seq)
+            for seq, _, record_type, payload in records:
+                state.apply(seq, record_type, payload)
+            replayed += len(records)
+            if valid_bytes < os.path.getsize(path):
+                if index == len(segments) - 1:
+                    logger.warning(f"Truncating torn journal tail in {path} at byte {valid_bytes}")
+                    with open(path, "r+b") as f:
+                        f.truncate(valid_bytes)
+                else:
+                    logger.error(f"Corrupt record in {path} at byte {valid_bytes}; later records in it were skipped")
+
+        self.recovery_stats = {"records": replayed, "seq": state.seq,
+                               "seconds": time.perf_counter() - start}
+        return state
+
+    def _open_segment(self, first_seq: int):
+        if self._file is not None:
+            self._file.close()
+        path = os.path.join(self.directory, f"{_SEGMENT_PREFIX}{first_seq:020d}.wal")
+        # Unbuffered, so a failed write leaves nothing behind to flush later
+        self._file = open(path, "ab", buffering=0)
+        self._file_size = self._file.tell()
+
+    def append(self, record_type: int, payload: dict, durable: bool = False,
+               timeout: Optional[float] = 5.0) -> int:
+        """
+        Append a record and apply it to the in-memory state.
+
+        Args:
+            record_type (int): SUBMIT, SENT, FAILED or REPORT
+            payload (dict): Plain-value dict
+            durable (bool): Wait until the record is fsynced (default: False)
+            timeout (float): Maximum seconds to wait when durable (default: 5)
+
+        Returns:
+            int: Record sequence number
+
+        Raises:
+            OSError: A durable record could not be written
+        """
+        body = marshal.dumps(payload)
+        ts_ns = time.time_ns()
+        with self._lock:
+            if self._closed:
+                raise ValueError("Journal is closed")
+            self._seq += 1
+            seq = self._seq
+            tail = _HEADER.pack(len(body), 0, seq, ts_ns, record_type)[_CRC_OFFSET:] + body
+            self._batch.append(struct.pack("<II", len(body), zlib.crc32(tail)) + tail)
+            self._batch_last_seq = seq
+            self.state.apply(seq, record_type, payload)
+            self._pending.notify()
+            if durable:
+                self._wait_processed(seq, timeout)
+                self._raise_failure(seq - 1, seq)
+        return seq
+
+    def _wait_processed(self, seq: int, timeout: Optional[float]):
+        """Wait until the commit of seq has been attempted. Caller holds the lock."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._processed_seq < seq and not self._closed:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise TimeoutError(f"Journal record {seq} not durable after {timeout}s")
+            self._committed.wait(remaining)
+
+    def _raise_failure(self, after_seq: int, through_seq: int):
+        """Raise if a record in (after_seq, through_seq] failed to write. Caller holds the lock."""
+        for first, last, error in self._failures:
+            if first <= through_seq and last > after_seq:
+                raise OSError(f"Journal records {first}-{last} were not written: {error}")
+
+    def _flush_loop(self):
+        while True:
+            with self._lock:
+                while not self._batch and not self._closed:
+                    self._pending.wait()
+                if not self._batch and self._closed:
+                    return
+            if self.commit_interval > 0:
+                # Let more concurrent writers join this commit
+                time.sleep(self.commit_interval)
+            self._commit()
+            if (self.checkpoint_records and
+                    self._durable_seq - self._checkpoint_seq >= self.checkpoint_records):
+                try:
+                    self._write_checkpoint()
+                except OSError as e:
+                    self.logger.error(f"Journal checkpoint error: {str(e)}")
+
+    def _commit(self):
+        with self._lock:
+            batch, self._batch = self._batch, []
+            last_seq = self._batch_last_seq
+        if not batch:
+            return
+        data = memoryview(b"".join(batch))
+        error = None
+        with self._io_lock:
+            try:
+                written = 0
+                while written < len(data):
+                    written += self._file.write(data[written:])
+                if self.fsync:
+                    os.fsync(self._file.fileno())
+                self._file_size += len(data)
+                if self._file_size >= self.segment_bytes:
+                    self._open_segment(last_seq + 1)
+            except (OSError, ValueError) as e:
+                error = str(e)
+                self.logger.error(f"Journal write error: {error}")
+                self._discard_partial(last_seq)
+        with self._lock:
+            if error is None:
+                self._durable_seq = last_seq
+            else:
+                self._failures.append((last_seq - len(batch) + 1, last_seq, error))
+            self._processed_seq = last_seq
+            self._committed.notify_all()
+
+    def _discard_partial(self, last_seq: int):
+        """
+        Cut a failed batch's bytes off the segment so later records stay
+        readable; if that fails, continue in a new segment. Caller holds _io_lock.
+        """
+        try:
+            os.ftruncate(self._file.fileno(), self._file_size)
+            return
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Journal truncate error: {str(e)}")
+        try:
+            self._open_segment(last_seq + 1)
+        except OSError as e:
+            self.logger.error(f"Journal segment error: {str(e)}")
+
+    def record_order(self, stage: str, info: dict):
+        """
+        Order listener compatible with ``KGITradingClient.add_order_listener``.
+
+        Submissions are made durable before the client sends the order.
+
+        Args:
+            stage (str): "submit", "sent" or "failed"
+            info (dict): Order details
+        """
+        record_type = RECORD_TYPES.get(stage)
+        if record_type is not None:
+            self.append(record_type, info, durable=(record_type == SUBMIT))
+
+    def record_report(self, report: dict):
+        """
+        Trade listener compatible with ``KGITradingClient.add_trade_listener``.
+
+        Args:
+            report (dict): Normalized trade report
+        """
+        self.append(REPORT, {key: value for key, value in report.items()
+                             if isinstance(value, (str, int, float, bool, type(None)))})
+
+    def attach(self, client, manager=None):
+        """
+        Journal a client's orders and trade reports and close at shutdown.
+
+        Args:
+            client (KGITradingClient): Client to follow
+            manager (ShutdownManager): Manager to use (default: the process-wide manager)
+        """
+        from .shutdown import get_shutdown_manager, PRIORITY_FLUSH
+
+        client.add_order_listener(self.record_order)
+        client.add_trade_listener(self.record_report)
+        (manager or get_shutdown_manager()).register("order-journal", self.close, priority=PRIORITY_FLUSH)
+
+    def checkpoint(self) -> str:
+        """
+        Write the current state and delete segments it fully covers.
+
+        Returns:
+            str: Checkpoint file path
+        """
+        self.flush()
+        return self._write_checkpoint()
+
+    def _write_checkpoint(self) -> str:
+        with self._io_lock, self._lock:
+            data = marshal.dumps(self.state.to_dict())
+            seq = self._checkpoint_seq = self.state.seq
+            self._open_segment(seq + 1)
+
+        path = os.path.join(self.directory, f"{_CHECKPOINT_PREFIX}{seq:020d}.ckpt")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(struct.pack("<I", zlib.crc32(data)))
+            f.write(data)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+        current = os.path.join(self.directory, f"{_SEGMENT_PREFIX}{seq + 1:020d}.wal")
+        for _, old in _segment_files(self.directory):
+            if old < current:
+                os.remove(old)
+        for _, old in _checkpoint_files(self.directory):
+            if old != path:
+                os.remove(old)
+        return path
+
+    def flush(self, timeout: Optional[float] = 5.0):
+        """
+        Wait until every appended record is durable.
+
+        Raises:
+            OSError: A record appended before the call could not be written
+        """
+        with self._lock:
+            target = self._seq
+            start = self._processed_seq
+            self._pending.notify()
+            self._wait_processed(target, timeout)
+            self._raise_failure(start, target)
+
+    def close(self):
+        """Flush outstanding records and close the current segment."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._pending.notify()
+        self._flusher.join(timeout=5.0)
+        self._commit()
+        with self._io_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,367 @@
+"""
+Historical K-bar Cache
+
+This module provides ``KBarService``, a historical bar service on top of a
+client's ``api``. Downloaded bars are kept per symbol and interval in a local
+columnar cache (one ``.npz`` file of NumPy arrays) together with the date
+ranges already covered. A request for a date range fetches only the missing
+segments from the broker and merges them in.
+
+Bars are returned as a dict of equal-length NumPy arrays::
+
+    {"ts": int64 epoch nanoseconds, "open": float64, "high": float64,
+     "low": float64, "close": float64, "volume": float64}
+
+Today's bars are never marked as covered, so an intraday request always
+refreshes the current session.
+"""
+
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+BAR_FIELDS = ("ts", "open", "high", "low", "close", "volume")
+NS_PER_DAY = 86_400_000_000_000
+
+logger = logging.getLogger(__name__)
+
+
+def to_day(value) -> int:
+    """
+    Convert a date-like value to a day number (days since 1970-01-01).
+
+    Args:
+        value: "YYYY-MM-DD" string, date, datetime or numpy datetime64
+
+    Returns:
+        int: Day number
+    """
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, (str, date)):
+        value = np.datetime64(value, "D")
+    return int(np.datetime64(value, "D").astype(np.int64))
+
+
+def day_to_str(day: int) -> str:
+    """Format a day number as "YYYY-MM-DD"."""
+    return str(np.datetime64(day, "D"))
+
+
+def empty_bars() -> Dict[str, np.ndarray]:
+    """Get an empty bar dict."""
+    bars = {field: np.empty(0, dtype=np.float64) for field in BAR_FIELDS}
+    bars["ts"] = np.empty(0, dtype=np.int64)
+    return bars
+
+
+def to_bar_arrays(data) -> Dict[str, np.ndarray]:
+    """
+    Normalize fetched bars to the columnar dict layout.
+
+    Accepts a dict or an SDK result object with ``ts`` plus
+    open/high/low/close/volume fields in any letter case (e.g. ``Open``).
+
+    Args:
+        data: Fetched bars
+
+    Returns:
+        Dict[str, np.ndarray]: Bars sorted by timestamp
+    """
+    if data is None:
+        return empty_bars()
+
+    def column(name):
+        for key in (name, name.capitalize(), name.upper()):
+            if isinstance(data, dict):
+                if key in data:
+                    return data[key]
+            elif hasattr(data, key):
+                return getattr(data, key)
+        raise ValueError(f"Bar data has no '{name}' column")
+
+    bars = {"ts": np.asarray(column("ts"), dtype=np.int64)}
+    for field in BAR_FIELDS[1:]:
+        bars[field] = np.asarray(column(field), dtype=np.float64)
+    if any(len(bars[field]) != len(bars["ts"]) for field in BAR_FIELDS):
+        raise ValueError("Bar columns have different lengths")
+
+    order = np.argsort(bars["ts"], kind="stable")
+    return {field: array[order] for field, array in bars.items()}
+
+
+def missing_ranges(coverage: List[Tuple[int, int]], start: int, end: int) -> List[Tuple[int, int]]:
+    """
+    Get the parts of [start, end] not covered yet.
+
+    Args:
+        coverage (List[Tuple[int, int]]): Sorted, disjoint inclusive day ranges
+        start (int): First day wanted
+        end (int): Last day wanted
+
+    Returns:
+        List[Tuple[int, int]]: Inclusive day ranges to fetch
+    """
+    gaps = []
+    cursor = start
+    for low, high in coverage:
+        if high < cursor:
+            continue
+        if low > end:
+            break
+        if low > cursor:
+            gaps.append((cursor, low - 1))
+        cursor = max(cursor, high + 1)
+        if cursor > end:
+            break
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def merge_ranges(coverage: List[Tuple[int, int]], added: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Merge day ranges, joining overlapping and adjacent ones.
+
+    Args:
+        coverage (List[Tuple[int, int]]): Existing ranges
+        added (List[Tuple[int, int]]): New ranges
+
+    Returns:
+        List[Tuple[int, int]]: Sorted, disjoint ranges
+    """
+    merged = []
+    for low, high in sorted(list(coverage) + list(added)):
+        if merged and low <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], high))
+        else:
+            merged.append((low, high))
+    return merged
+
+
+def merge_bars(old: Dict[str, np.ndarray], new: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Merge two bar dicts; bars in ``new`` replace bars with the same timestamp.
+
+    Args:
+        old (Dict[str, np.ndarray]): Cached bars
+        new (Dict[str, np.ndarray]): Fetched bars
+
+    Returns:
+        Dict[str, np.ndarray]: Merged bars sorted by timestamp
+    """
+    if not len(new["ts"]):
+        return old
+    if not len(old["ts"]):
+        return new
+    keep = ~np.isin(old["ts"], new["ts"])
+    ts = np.concatenate([old["ts"][keep], new["ts"]])
+    order = np.argsort(ts, kind="stable")
+    return {field: np.concatenate([old[field][keep], new[field]])[order] for field in BAR_FIELDS}
+
+
+class KBarCache:
+    """
+    On-disk columnar bar store, one ``.npz`` file per symbol and interval.
+
+    Writes go to a temporary file that replaces the old one, so readers in
+    other processes never see a partial file.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initialize the cache.
+
+        Args:
+            directory (str): Cache directory (created if missing)
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, symbol: str, interval: str) -> str:
+        """Get the cache file path for a symbol and interval."""
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{symbol}_{interval}")
+        return os.path.join(self.directory, f"{safe}.npz")
+
+    def load(self, symbol: str, interval: str) -> Tuple[Dict[str, np.ndarray], List[Tuple[int, int]]]:
+        """
+        Load cached bars and coverage.
+
+        Args:
+            symbol (str): Symbol code
+            interval (str): Bar interval
+
+        Returns:
+            Tuple: (bars, coverage); empty when nothing is cached
+        """
+        path = self.path_for(symbol, interval)
+        if not os.path.exists(path):
+            return empty_bars(), []
+        with np.load(path) as data:
+            bars = {field: data[field] for field in BAR_FIELDS}
+            coverage = [(int(low), int(high)) for low, high in data["coverage"]]
+        return bars, coverage
+
+    def save(self, symbol: str, interval: str, bars: Dict[str, np.ndarray],
+             coverage: List[Tuple[int, int]]):
+        """
+        Store bars and coverage atomically.
+
+        Args:
+            symbol (str): Symbol code
+            interval (str): Bar interval
+            bars (Dict[str, np.ndarray]): Bars sorted by timestamp
+            coverage (List[Tuple[int, int]]): Covered day ranges
+        """
+        path = self.path_for(symbol, interval)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, coverage=np.asarray(coverage, dtype=np.int64).reshape(-1, 2), **bars)
+        os.replace(tmp_path, path)
+
+
+def sdk_fetcher(client) -> Callable:
+    """
+    Build a fetcher backed by ``client.api.kbars``.
+
+    Args:
+        client (KGITradingClient): Logged-in client
+
+    Returns:
+        Callable: fetcher(symbol, interval, start, end) -> bar data
+    """
+    def fetch(symbol: str, interval: str, start: str, end: str):
+        if interval != "1min":
+            raise ValueError(f"SDK K-bars are 1-minute bars; cannot fetch '{interval}'")
+        api = client.api
+        contract = symbol
+        try:
+            contract = api.Contracts.Stocks[symbol]
+        except Exception:
+            pass
+        return api.kbars(contract=contract, start=start, end=end)
+    return fetch
+
+
+class KBarService:
+    """
+    Historical bar service that fetches only what the cache is missing.
+    """
+
+    def __init__(self, client=None, cache_dir: str = "kbar_cache",
+                 fetcher: Optional[Callable] = None, limiter=None):
+        """
+        Initialize the service.
+
+        Args:
+            client (KGITradingClient): Client for the default SDK fetcher (default: None)
+            cache_dir (str): Cache directory (default: "kbar_cache")
+            fetcher (Callable): fetcher(symbol, interval, start, end) returning
+                bar data for "YYYY-MM-DD" bounds (default: client.api.kbars)
+            limiter (RateLimiter): Limits broker queries, one token per fetch (default: None)
+        """
+        if fetcher is None:
+            if client is None:
+                raise ValueError("KBarService needs a client or a fetcher")
+            fetcher = sdk_fetcher(client)
+        self.fetcher = fetcher
+        self.limiter = limiter
+        self.cache = KBarCache(cache_dir)
+        self.fetch_count = 0
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def _lock_for(self, symbol: str, interval: str) -> threading.Lock:
+        key = (symbol, interval)
+        with self._locks_lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def get_bars(self, symbol: str, start, end, interval: str = "1min") -> Dict[str, np.ndarray]:
+        """
+        Get bars for a date range, fetching only uncached days.
+
+        Args:
+            symbol (str): Symbol code
+            start: First day (inclusive), "YYYY-MM-DD" or date
+            end: Last day (inclusive), "YYYY-MM-DD" or date
+            interval (str): Bar interval (default: "1min")
+
+        Returns:
+            Dict[str, np.ndarray]: Bars in the range, sorted by timestamp
+        """
+        start_day, end_day = to_day(start), to_day(end)
+        if start_day > end_day:
+            raise ValueError(f"start {start} is after end {end}")
+        today = to_day(date.today())
+
+        with self._lock_for(symbol, interval):
+            bars, coverage = self.cache.load(symbol, interval)
+            gaps = missing_ranges(coverage, start_day, end_day)
+
+            if gaps:
+                for low, high in gaps:
+                    if self.limiter is not None:
+                        self.limiter.acquire()
+                    self.logger.info(f"Fetching {symbol} {interval} {day_to_str(low)}..{day_to_str(high)}")
+                    fetched = to_bar_arrays(self.fetcher(symbol, interval, day_to_str(low), day_to_str(high)))
+                    with self._locks_lock:
+                        self.fetch_count += 1
+                    bars = merge_bars(bars, fetched)
+                # The current session is still trading; keep it uncovered.
+                done = [(low, min(high, today - 1)) for low, high in gaps if low < today]
+                coverage = merge_ranges(coverage, done)
+                self.cache.save(symbol, interval, bars, coverage)
+
+        first = np.searchsorted(bars["ts"], start_day * NS_PER_DAY, side="left")
+        last = np.searchsorted(bars["ts"], (end_day + 1) * NS_PER_DAY, side="left")
+        return {field: array[first:last] for field, array in bars.items()}
+
+    def get_many(self, symbols: List[str], start, end, interval: str = "1min",
+                 max_workers: int = 4) -> Dict[str, dict]:
+        """
+        Get bars for many symbols concurrently.
+
+        Args:
+            symbols (List[str]): Symbol codes
+            start: First day (inclusive)
+            end: Last day (inclusive)
+            interval (str): Bar interval (default: "1min")
+            max_workers (int): Concurrent fetches (default: 4)
+
+        Returns:
+            Dict[str, dict]: symbol -> bars, or {"error": str} for failed symbols
+        """
+        def fetch(symbol):
+            try:
+                return self.get_bars(symbol, start, end, interval)
+            except Exception as e:
+                self.logger.error(f"K-bar fetch error for {symbol}: {str(e)}")
+                return {"error": str(e)}
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="kbars") as pool:
+            return dict(zip(symbols, pool.map(fetch, symbols)))
+
+    def coverage(self, symbol: str, interval: str = "1min") -> List[Tuple[str, str]]:
+        """
+        Get the cached date ranges for a symbol.
+
+        Args:
+            symbol (str): Symbol code
+            interval (str): Bar interval (default: "1min")
+
+        Returns:
+            List[Tuple[str, str]]: Inclusive ("YYYY-MM-DD", "YYYY-MM-DD") ranges
+        """
+        _, coverage = self.cache.load(symbol, interval)
+        return [(day_to_str(low), day_to_str(high)) for low, high in coverage]
@@ -0,0 +1,294 @@
+"""
+Order Latency Histograms
+
+This module measures order round trips (send -> broker ack -> first fill ->
+complete fill) with monotonic nanosecond timestamps and aggregates them into
+HDR-style histograms: values are bucketed by power of two with a fixed number
+of linear sub-buckets, so recording is a few integer operations and relative
+error stays below ``1 / 2**(SIGNIFICANT_BITS - 1)`` at any scale.
+
+``OrderLatencyTracker`` keeps one histogram per interval for each
+``(account, symbol)`` pair plus an overall ``"*"`` entry. Reports may arrive
+before ``place_order`` returns the order id; stages are matched whenever
+both ends are known.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+SIGNIFICANT_BITS = 6
+MAX_VALUE_BITS = 40  # ~18 minutes in ns; larger values are clamped
+
+STAGES = ("send", "ack", "first_fill", "complete")
+INTERVALS = (
+    ("send_to_ack", "send", "ack"),
+    ("ack_to_first_fill", "ack", "first_fill"),
+    ("send_to_first_fill", "send", "first_fill"),
+    ("send_to_complete", "send", "complete")
+)
+
+_SUB_BUCKETS = 1 << SIGNIFICANT_BITS
+_HALF = _SUB_BUCKETS >> 1
+_BUCKET_COUNT = _SUB_BUCKETS + (MAX_VALUE_BITS - SIGNIFICANT_BITS) * _HALF
+_MAX_VALUE = (1 << MAX_VALUE_BITS) - 1
+
+
+def bucket_index(value: int) -> int:
+    """Get the histogram bucket for a non-negative integer value."""
+    if value < _SUB_BUCKETS:
+        return value if value > 0 else 0
+    if value > _MAX_VALUE:
+        value = _MAX_VALUE
+    shift = value.bit_length() - SIGNIFICANT_BITS
+    return _SUB_BUCKETS + (shift - 1) * _HALF + (value >> shift) - _HALF
+
+
+def bucket_bounds(index: int) -> tuple:
+    """Get the (lowest, highest) values stored in a bucket."""
+    if index < _SUB_BUCKETS:
+        return index, index
+    shift = (index - _SUB_BUCKETS) // _HALF + 1
+    top = (index - _SUB_BUCKETS) % _HALF + _HALF
+    return top << shift, ((top + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram of nanosecond values."""
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.counts = [0] * _BUCKET_COUNT
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def record(self, value_ns: int):
+        """Add one value. Callers serialize access (see OrderLatencyTracker)."""
+        if value_ns < 0:
+            value_ns = 0
+        self.counts[bucket_index(value_ns)] += 1
+        self.count += 1
+        self.total += value_ns
+        if self.min is None or value_ns < self.min:
+            self.min = value_ns
+        if self.max is None or value_ns > self.max:
+            self.max = value_ns
+
+    def percentile(self, percent: float) -> Optional[int]:
+        """
+        Get an upper bound for a percentile.
+
+        Args:
+            percent (float): Percentile in [0, 100]
+
+        Returns:
+            int: Highest value of the bucket holding the percentile, or None if empty
+        """
+        if not self.count:
+            return None
+        rank = max(1, int(round(self.count * percent / 100.0)))
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= rank:
+                return min(bucket_bounds(index)[1], self.max)
+        return self.max
+
+    def merge(self, other: "LatencyHistogram"):
+        """Add another histogram's values to this one."""
+        for index, bucket in enumerate(other.counts):
+            if bucket:
+                self.counts[index] += bucket
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                if self.min is None or value < self.min:
+                    self.min = value
+                if self.max is None or value > self.max:
+                    self.max = value
+
+    def to_dict(self) -> dict:
+        """
+        Get summary statistics in nanoseconds.
+
+        Returns:
+            dict: count, min, mean, p50, p90, p99, p999 and max
+        """
+        return {
+            "count": self.count,
+            "min": self.min,
+            "mean": self.total // self.count if self.count else None,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+            "max": self.max
+        }
+
+
+class OrderLatencyTracker:
+    """
+    Matches order stage timestamps and records the intervals between them.
+    """
+
+    def __init__(self, max_pending: int = 100_000, max_finished: int = 10_000):
+        """
+        Initialize the tracker.
+
+        Args:
+            max_pending (int): In-flight orders kept before the oldest are dropped (default: 100,000)
+            max_finished (int): Finished order ids remembered to ignore late stages (default: 10,000)
+        """
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self._pending: "OrderedDict[str, dict]" = OrderedDict()
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+        self._histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self._lock = threading.Lock()
+        self._export_thread = None
+        self._export_stop = threading.Event()
+        self.logger = logging.getLogger(__name__)
+
+    def mark(self, order_id: str, stage: str, ts_ns: Optional[int] = None,
+             account: Optional[str] = None, symbol: Optional[str] = None, done: bool = False):
+        """
+        Record the time an order reached a stage.
+
+        Only the first timestamp per stage counts. Account and symbol may be
+        given at any stage; intervals are recorded once they are known. Stages
+        arriving after an order finished (e.g. a "send" marked after a final
+        ack) are ignored rather than starting a new entry.
+
+        Args:
+            order_id (str): Broker order id
+            stage (str): One of STAGES
+            ts_ns (int): time.monotonic_ns() of the event (default: now)
+            account (str): Account id (default: None)
+            symbol (str): Symbol code (default: None)
+            done (bool): No further reports are expected for this order (default: False)
+        """
+        if ts_ns is None:
+            ts_ns = time.monotonic_ns()
+        if order_id is None:
+            return
+
+        with self._lock:
+            entry = self._pending.get(order_id)
+            if entry is None:
+                if order_id in self._finished:
+                    return
+                entry = self._pending[order_id] = {"key": None, "recorded": set()}
+                if len(self._pending) > self.max_pending:
+                    self._pending.popitem(last=False)
+            if stage not in entry:
+                entry[stage] = ts_ns
+            if entry["key"] is None and symbol is not None:
+                entry["key"] = f"{account or '-'}:{symbol}"
+
+            key = entry["key"]
+            if key is not None:
+                recorded = entry["recorded"]
+                for name, start, end in INTERVALS:
+                    if name not in recorded and start in entry and end in entry:
+                        recorded.add(name)
+                        self._record(key, name, entry[end] - entry[start])
+
+            if done or ("complete" in entry and "send" in entry):
+                self._finish(order_id)
+
+    def discard(self, order_id: str):
+        """Forget an order that ended without further stages (e.g. rejected)."""
+        with self._lock:
+            self._finish(order_id)
+
+    def _finish(self, order_id: str):
+        """Drop a pending order and remember its id. Caller holds the lock."""
+        self._pending.pop(order_id, None)
+        self._finished[order_id] = None
+        if len(self._finished) > self.max_finished:
+            self._finished.popitem(last=False)
+
+    def _record(self, key: str, interval: str, value_ns: int):
+        for bucket_key in (key, "*"):
+            histograms = self._histograms.get(bucket_key)
+            if histograms is None:
+                histograms = self._histograms[bucket_key] = {}
+            histogram = histograms.get(interval)
+            if histogram is None:
+                histogram = histograms[interval] = LatencyHistogram()
+            histogram.record(value_ns)
+
+    @property
+    def pending_count(self) -> int:
+        """Orders still waiting for later stages."""
+        return len(self._pending)
+
+    def snapshot(self, reset: bool = False) -> dict:
+        """
+        Get summary statistics for every account/symbol and interval.
+
+        Args:
+            reset (bool): Start new histograms after reading (default: False)
+
+        Returns:
+            dict: {"account:symbol" or "*": {interval: stats}}
+        """
+        with self._lock:
+            histograms = self._histograms
+            if reset:
+                self._histograms = {}
+            return {key: {name: histogram.to_dict() for name, histogram in intervals.items()}
+                    for key, intervals in histograms.items()}
+
+    def start_export(self, path: str, interval: float = 60.0, reset: bool = False):
+        """
+        Append a JSON line with the current snapshot to a file periodically.
+
+        A final snapshot is written by stop_export(); register it with the
+        shutdown manager so it runs at exit.
+
+        Args:
+            path (str): Output file
+            interval (float): Seconds between snapshots (default: 60)
+            reset (bool): Reset histograms after each export (default: False)
+        """
+        if self._export_thread is not None:
+            return
+        self._export_stop.clear()
+
+        def export_once():
+            line = json.dumps({"ts": time.time(), "latency_ns": self.snapshot(reset=reset)})
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+        def run():
+            while not self._export_stop.wait(interval):
+                try:
+                    export_once()
+                except Exception as e:
+                    self.logger.error(f"Latency export error: {str(e)}")
+            try:
+                export_once()
+            except Exception as e:
+                self.logger.error(f"Latency export error: {str(e)}")
+
+        self._export_thread = threading.Thread(target=run, name="latency-export", daemon=True)
+        self._export_thread.start()
+
+    def stop_export(self, timeout: float = 2.0):
+        """Stop periodic export after writing a final snapshot."""
+        thread = self._export_thread
+        if thread is None:
+            return
+        self._export_stop.set()
+        thread.join(timeout)
+        self._export_thread = None
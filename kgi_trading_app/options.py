@@ -0,0 +1,423 @@
+"""
+Option Chain Greeks
+
+This module prices whole option chains with NumPy: Black-76 for options on
+futures (e.g. TXO against TX) and Black-Scholes for options on spot, an
+implied volatility solver that runs Newton steps on every strike at once
+with a bisection bracket as a safeguard, and ``OptionChain``, which keeps a
+chain's quotes, IVs and greeks in arrays and recomputes only the strikes
+whose quotes changed.
+
+Chains are built from ``client.api.Contracts.Options`` (the contracts
+traded through ``futopt_account``). All pricing functions broadcast over
+their array arguments; ``is_call`` is a boolean array. Time is in years,
+rates and volatilities are annualized.
+
+Usage::
+
+    chain = OptionChain.from_contracts(client, "TXO", "2024-06-19", underlying="TXFF4")
+    chain.attach(client)             # quotes mark strikes dirty
+    chain.recompute()                # solves IV and greeks for dirty strikes only
+    chain.table()                    # code, strike, is_call, price, iv, delta, gamma, vega, theta
+"""
+
+import logging
+import threading
+from datetime import date, datetime, time as dt_time
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from .reports import get_field, status_name
+
+
+GREEKS = ("delta", "gamma", "vega", "theta")
+MIN_VOL = 1e-4
+MAX_VOL = 5.0
+SECONDS_PER_YEAR = 365.0 * 86400.0
+SETTLEMENT_TIME = dt_time(13, 30)
+
+_SQRT2 = np.sqrt(2.0)
+_INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+
+
+def _erfc(x: np.ndarray) -> np.ndarray:
+    """Complementary error function (Chebyshev fit, relative error < 1.2e-7)."""
+    z = np.abs(x)
+    t = 1.0 / (1.0 + 0.5 * z)
+    poly = (-z * z - 1.26551223 + t * (1.00002368 + t * (0.37409196 + t * (0.09678418 +
+            t * (-0.18628806 + t * (0.27886807 + t * (-1.13520398 + t * (1.48851587 +
+            t * (-0.82215223 + t * 0.17087277)))))))))
+    result = t * np.exp(poly)
+    return np.where(x >= 0, result, 2.0 - result)
+
+
+def norm_cdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal cumulative distribution."""
+    return 0.5 * _erfc(-np.asarray(x, dtype=float) / _SQRT2)
+
+
+def norm_pdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal density."""
+    x = np.asarray(x, dtype=float)
+    return _INV_SQRT_2PI * np.exp(-0.5 * x * x)
+
+
+def black_scholes(spot, strike, years, vol, is_call, rate=0.0, dividend=0.0) -> dict:
+    """
+    Price options and compute greeks with Black-Scholes (continuous dividend yield).
+
+    Args:
+        spot: Underlying price
+        strike: Strike price
+        years: Time to expiry in years
+        vol: Annualized volatility
+        is_call: True for calls, False for puts
+        rate (float): Risk-free rate (default: 0)
+        dividend (float): Dividend yield (default: 0)
+
+    Returns:
+        dict: price, delta, gamma, vega (per 1.00 vol) and theta (per year) arrays
+    """
+    spot, strike, years, vol = (np.asarray(value, dtype=float) for value in (spot, strike, years, vol))
+    is_call = np.asarray(is_call, dtype=bool)
+    sign = np.where(is_call, 1.0, -1.0)
+
+    sqrt_t = np.sqrt(np.maximum(years, 1e-12))
+    vol_t = np.maximum(vol, 1e-12) * sqrt_t
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = (np.log(spot / strike) + (rate - dividend) * years) / vol_t + 0.5 * vol_t
+    d2 = d1 - vol_t
+    spot_df = np.exp(-dividend * years)
+    strike_df = np.exp(-rate * years)
+    pdf_d1 = norm_pdf(d1)
+
+    # Price the out-of-the-money side, whose normal CDFs are small and keep
+    # full relative precision, then convert with put-call parity.
+    otm = np.where(strike * strike_df >= spot * spot_df, 1.0, -1.0)
+    cdf_d1 = norm_cdf(otm * d1)
+    cdf_d2 = norm_cdf(otm * d2)
+    flip = np.where(otm != sign, sign, 0.0)
+
+    price = (otm * (spot * spot_df * cdf_d1 - strike * strike_df * cdf_d2)
+             + flip * (spot * spot_df - strike * strike_df))
+    delta = otm * spot_df * cdf_d1 + flip * spot_df
+    gamma = spot_df * pdf_d1 / (spot * vol_t)
+    vega = spot * spot_df * pdf_d1 * sqrt_t
+    theta = (-spot * spot_df * pdf_d1 * vol / (2.0 * sqrt_t)
+             + otm * (dividend * spot * spot_df * cdf_d1 - rate * strike * strike_df * cdf_d2)
+             + flip * (dividend * spot * spot_df - rate * strike * strike_df))
+    return {"price": price, "delta": delta, "gamma": gamma, "vega": vega, "theta": theta}
+
+
+def black76(forward, strike, years, vol, is_call, rate=0.0) -> dict:
+    """
+    Price options on futures and compute greeks with Black-76.
+
+    Args:
+        forward: Futures price
+        strike: Strike price
+        years: Time to expiry in years
+        vol: Annualized volatility
+        is_call: True for calls, False for puts
+        rate (float): Discount rate (default: 0)
+
+    Returns:
+        dict: price, delta, gamma, vega (per 1.00 vol) and theta (per year) arrays
+    """
+    return black_scholes(forward, strike, years, vol, is_call, rate=rate, dividend=rate)
+
+
+MODELS = {"black76": black76, "black_scholes": black_scholes}
+
+
+def implied_vol(price, underlying, strike, years, is_call, rate=0.0, model: str = "black76",
+                initial=None, tol: float = 1e-6, max_iter: int = 50) -> np.ndarray:
+    """
+    Solve implied volatility for many options at once.
+
+    Each iteration takes a Newton step where it stays inside the current
+    bisection bracket and bisects otherwise, so every element converges.
+    Prices outside the no-arbitrage bounds give NaN.
+
+    Args:
+        price: Option prices
+        underlying: Futures (black76) or spot (black_scholes) prices
+        strike: Strike prices
+        years: Time to expiry in years
+        is_call: True for calls, False for puts
+        rate (float): Risk-free rate (default: 0)
+        model (str): "black76" or "black_scholes" (default: "black76")
+        initial: Starting volatilities, e.g. the previous solution (default: 0.2)
+        tol (float): Price tolerance (default: 1e-6)
+        max_iter (int): Maximum iterations (default: 50)
+
+    Returns:
+        np.ndarray: Implied volatilities
+    """
+    pricer = MODELS[model]
+    price, underlying, strike, years = np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in (price, underlying, strike, years)))
+    is_call = np.broadcast_to(np.asarray(is_call, dtype=bool), price.shape)
+
+    low_price = pricer(underlying, strike, years, MIN_VOL, is_call, rate=rate)["price"]
+    high_price = pricer(underlying, strike, years, MAX_VOL, is_call, rate=rate)["price"]
+    valid = np.isfinite(price) & (price >= low_price - tol) & (price <= high_price + tol) & (years > 0)
+
+    vol = np.full(price.shape, 0.2) if initial is None else \
+        np.broadcast_to(np.asarray(initial, dtype=float), price.shape).copy()
+    vol = np.where(np.isfinite(vol) & (vol > MIN_VOL) & (vol < MAX_VOL), vol, 0.2)
+    low = np.full(price.shape, MIN_VOL)
+    high = np.full(price.shape, MAX_VOL)
+    active = np.flatnonzero(valid)
+
+    for _ in range(max_iter):
+        if not active.size:
+            break
+        sub = active
+        result = pricer(underlying[sub], strike[sub], years[sub], vol[sub], is_call[sub], rate=rate)
+        diff = result["price"] - price[sub]
+        done = np.abs(diff) < tol
+        current = vol[sub]
+        high[sub] = np.where(diff > 0, current, high[sub])
+        low[sub] = np.where(diff <= 0, current, low[sub])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = current - diff / result["vega"]
+        bisect = ~np.isfinite(step) | (step <= low[sub]) | (step >= high[sub])
+        vol[sub] = np.where(done, current, np.where(bisect, 0.5 * (low[sub] + high[sub]), step))
+        active = sub[~done]
+
+    vol[~valid] = np.nan
+    return vol
+
+
+def years_to_expiry(expiry: Union[str, date, datetime], now: Optional[datetime] = None) -> float:
+    """
+    Get the time to expiry in years.
+
+    Args:
+        expiry: Expiry date ("YYYY-MM-DD", "YYYY/MM/DD", date or datetime);
+            dates settle at SETTLEMENT_TIME
+        now (datetime): Current time (default: datetime.now())
+
+    Returns:
+        float: Years to expiry, 0 once expired
+    """
+    if isinstance(expiry, str):
+        expiry = datetime.strptime(expiry.replace("/", "-")[:10], "%Y-%m-%d")
+        expiry = datetime.combine(expiry.date(), SETTLEMENT_TIME)
+    elif not isinstance(expiry, datetime):
+        expiry = datetime.combine(expiry, SETTLEMENT_TIME)
+    now = now or datetime.now()
+    return max((expiry - now).total_seconds(), 0.0) / SECONDS_PER_YEAR
+
+
+def _expiry_key(value) -> str:
+    if isinstance(value, (date, datetime)):
+        return value.strftime("%Y-%m-%d")
+    return str(value).replace("/", "-")[:10]
+
+
+def load_option_contracts(client, underlying: str, expiry: Union[str, date]) -> List[dict]:
+    """
+    Read one underlying's options for an expiry from the SDK contracts.
+
+    Args:
+        client (KGITradingClient): Logged-in client with contracts loaded
+        underlying (str): Option product, e.g. "TXO"
+        expiry: Expiry date
+
+    Returns:
+        List[dict]: code, strike and is_call per contract, sorted by strike then call first
+    """
+    wanted = _expiry_key(expiry)
+    contracts = []
+    for contract in client.api.Contracts.Options[underlying]:
+        delivery = get_field(contract, "delivery_date", "expiry", "expiration_date")
+        if delivery is None or _expiry_key(delivery) != wanted:
+            continue
+        right = status_name(get_field(contract, "option_right", "right", "call_put"))
+        contracts.append({"code": str(get_field(contract, "code", "symbol")),
+                          "strike": float(get_field(contract, "strike_price", "strike")),
+                          "is_call": right in ("call", "c", "optioncall")})
+    contracts.sort(key=lambda item: (item["strike"], not item["is_call"]))
+    return contracts
+
+
+class OptionChain:
+    """
+    One expiry's option quotes, implied volatilities and greeks in arrays.
+
+    Quote updates only mark strikes dirty; ``recompute()`` solves the dirty
+    strikes in one vectorized pass, starting Newton from their previous IV.
+    An underlying or time change marks the whole chain dirty.
+    """
+
+    def __init__(self, codes: List[str], strikes, is_call, years: float,
+                 underlying: Optional[str] = None, model: str = "black76", rate: float = 0.0):
+        """
+        Initialize the chain.
+
+        Args:
+            codes (List[str]): Option contract codes
+            strikes: Strike per contract
+            is_call: True for calls, False for puts, per contract
+            years (float): Time to expiry in years
+            underlying (str): Code of the futures/spot quote driving the chain (default: None)
+            model (str): "black76" or "black_scholes" (default: "black76")
+            rate (float): Risk-free rate (default: 0)
+        """
+        if model not in MODELS:
+            raise ValueError(f"model must be one of {tuple(MODELS)}, got {model}")
+        self.codes = list(codes)
+        self.strikes = np.asarray(strikes, dtype=float)
+        self.is_call = np.asarray(is_call, dtype=bool)
+        self.years = float(years)
+        self.underlying = underlying
+        self.underlying_price = np.nan
+        self.model = model
+        self.rate = rate
+        self._rows: Dict[str, int] = {code: row for row, code in enumerate(self.codes)}
+
+        count = len(self.codes)
+        self.price = np.full(count, np.nan)
+        self.iv = np.full(count, np.nan)
+        self.greeks = {name: np.full(count, np.nan) for name in GREEKS}
+        self._dirty = np.zeros(count, dtype=bool)
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_contracts(cls, client, product: str, expiry: Union[str, date],
+                       underlying: Optional[str] = None, **options) -> "OptionChain":
+        """
+        Build a chain from the SDK option contracts of a product and expiry.
+
+        Args:
+            client (KGITradingClient): Logged-in client with contracts loaded
+            product (str): Option product, e.g. "TXO"
+            expiry: Expiry date
+            underlying (str): Futures/spot code quoted for the underlying (default: None)
+            **options: model and rate, passed to OptionChain
+
+        Returns:
+            OptionChain: Chain with no prices yet
+        """
+        contracts = load_option_contracts(client, product, expiry)
+        return cls([c["code"] for c in contracts], [c["strike"] for c in contracts],
+                   [c["is_call"] for c in contracts], years_to_expiry(expiry),
+                   underlying=underlying, **options)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def set_underlying(self, price: float):
+        """Set the underlying price and mark every strike dirty."""
+        with self._lock:
+            self.underlying_price = float(price)
+            self._dirty[:] = True
+
+    def set_years(self, years: float):
+        """Set the time to expiry and mark every strike dirty."""
+        with self._lock:
+            self.years = float(years)
+            self._dirty[:] = True
+
+    def update_price(self, code: str, price: float) -> bool:
+        """
+        Set one option's price.
+
+        Args:
+            code (str): Option contract code
+            price (float): Option price
+
+        Returns:
+            bool: True if the code belongs to the chain
+        """
+        row = self._rows.get(code)
+        if row is None:
+            return False
+        with self._lock:
+            if self.price[row] != price:
+                self.price[row] = price
+                self._dirty[row] = True
+        return True
+
+    def on_quote(self, symbol: str, quote: dict):
+        """
+        Quote listener compatible with ``KGITradingClient.add_quote_listener``.
+
+        Options use the bid/ask midpoint when both sides are quoted and the
+        last price otherwise.
+
+        Args:
+            symbol (str): Symbol code
+            quote (dict): Quote fields (last, bid, ask)
+        """
+        bid, ask, last = quote.get("bid"), quote.get("ask"), quote.get("last")
+        if symbol == self.underlying:
+            price = last if last is not None else (
+                (bid + ask) / 2.0 if bid is not None and ask is not None else None)
+            if price is not None:
+                self.set_underlying(price)
+            return
+        if bid is not None and ask is not None and bid > 0 and ask >= bid:
+            price = (bid + ask) / 2.0
+        else:
+            price = last
+        if price is not None:
+            self.update_price(symbol, float(price))
+
+    def attach(self, client):
+        """Update the chain from every quote the client dispatches."""
+        client.add_quote_listener(self.on_quote)
+
+    def detach(self, client):
+        """Stop following a client's quotes."""
+        client.remove_quote_listener(self.on_quote)
+
+    @property
+    def dirty_count(self) -> int:
+        """Strikes waiting for recomputation."""
+        return int(self._dirty.sum())
+
+    def recompute(self) -> int:
+        """
+        Solve IV and greeks for strikes whose inputs changed.
+
+        Returns:
+            int: Number of strikes recomputed
+        """
+        with self._lock:
+            rows = np.flatnonzero(self._dirty)
+            if not rows.size or not np.isfinite(self.underlying_price):
+                return 0
+            self._dirty[rows] = False
+            price = self.price[rows]
+            initial = self.iv[rows]
+            underlying, years = self.underlying_price, self.years
+
+        strikes, is_call = self.strikes[rows], self.is_call[rows]
+        iv = implied_vol(price, underlying, strikes, years, is_call, rate=self.rate,
+                         model=self.model, initial=initial)
+        result = MODELS[self.model](underlying, strikes, years, iv, is_call, rate=self.rate)
+        with self._lock:
+            self.iv[rows] = iv
+            for name in GREEKS:
+                self.greeks[name][rows] = result[name]
+        return int(rows.size)
+
+    def table(self) -> dict:
+        """
+        Get the chain as columns.
+
+        Returns:
+            dict: code, strike, is_call, price, iv and greek arrays aligned by row
+        """
+        with self._lock:
+            table = {"code": list(self.codes), "strike": self.strikes.copy(),
+                     "is_call": self.is_call.copy(), "price": self.price.copy(),
+                     "iv": self.iv.copy()}
+            for name in GREEKS:
+                table[name] = self.greeks[name].copy()
+        return table
@@ -0,0 +1,257 @@
+"""
+Depth-of-Book
+
+This module keeps 5- or 10-level bid/ask depth per symbol in one
+preallocated NumPy array that is updated in place::
+
+    book[row] -> shape (4, levels): bid_price, bid_size, ask_price, ask_size
+
+SDK depth updates are packed with one ``struct.pack`` (which also rejects
+bad values before the row is touched) and copied over the symbol's row in
+the array's buffer; nothing is rebuilt per update. Each row carries a
+sequence number used as a seqlock (odd while the row is being written), so
+``snapshot()`` can copy a consistent book from any thread without taking the
+writer lock. Whole-universe views such as best bid/ask and imbalance are
+plain array slices.
+
+See ``benchmarks/bench_orderbook.py`` for update throughput.
+"""
+
+import logging
+import struct
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+BID_PRICE, BID_SIZE, ASK_PRICE, ASK_SIZE = range(4)
+PLANES = ("bid_price", "bid_size", "ask_price", "ask_size")
+
+
+class OrderBook:
+    """
+    Array-backed depth-of-book for many symbols.
+
+    Writes are serialized with a lock, so the book can be fed from several
+    SDK callback threads.
+    """
+
+    def __init__(self, levels: int = 5, capacity: int = 2048, max_retries: int = 1000):
+        """
+        Initialize the book.
+
+        Args:
+            levels (int): Depth levels per side, e.g. 5 or 10 (default: 5)
+            capacity (int): Maximum number of symbols (default: 2048)
+            max_retries (int): Snapshot retries while a row is being written (default: 1000)
+        """
+        if levels < 1:
+            raise ValueError(f"levels must be >= 1, got {levels}")
+        self.levels = levels
+        self.capacity = capacity
+        self.max_retries = max_retries
+        self._book = np.full((capacity, 4, levels), np.nan)
+        self._book[:, BID_SIZE, :] = 0.0
+        self._book[:, ASK_SIZE, :] = 0.0
+        self._buffer = memoryview(self._book).cast("B")
+        self._row = struct.Struct(f"={4 * levels}d")
+        # Plain lists: scalar updates are much cheaper than on NumPy arrays
+        self._seq = [0] * capacity
+        self._timestamps = [0] * capacity
+        self._rows: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._blank = [np.nan] * levels + [0.0] * levels
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def _row_for(self, symbol: str) -> int:
+        """Return the row for a symbol, assigning one if needed."""
+        row = self._rows.get(symbol)
+        if row is None:
+            row = len(self._symbols)
+            if row >= self.capacity:
+                raise ValueError(f"Order book is full ({self.capacity} symbols)")
+            self._symbols.append(symbol)
+            self._rows[symbol] = row
+        return row
+
+    def _side(self, prices: Sequence[float], sizes: Sequence[float]) -> list:
+        """Pad or trim one side to ``levels`` prices followed by ``levels`` sizes."""
+        levels = self.levels
+        prices, sizes = list(prices)[:levels], list(sizes)[:levels]
+        return (prices + self._blank[len(prices):levels] +
+                sizes + self._blank[levels + len(sizes):])
+
+    def update(self, symbol: str, bid_prices: Sequence[float], bid_sizes: Sequence[float],
+               ask_prices: Sequence[float], ask_sizes: Sequence[float],
+               timestamp_ns: Optional[int] = None):
+        """
+        Replace a symbol's depth.
+
+        Missing levels are stored as NaN prices with zero size.
+
+        Args:
+            symbol (str): Symbol code
+            bid_prices (Sequence[float]): Bid prices, best first
+            bid_sizes (Sequence[float]): Bid sizes
+            ask_prices (Sequence[float]): Ask prices, best first
+            ask_sizes (Sequence[float]): Ask sizes
+            timestamp_ns (int): Update time in ns (default: time.time_ns())
+        """
+        levels = self.levels
+        if not (len(bid_prices) == len(bid_sizes) == len(ask_prices) == len(ask_sizes) == levels):
+            bid = self._side(bid_prices, bid_sizes)
+            ask = self._side(ask_prices, ask_sizes)
+            bid_prices, bid_sizes = bid[:levels], bid[levels:]
+            ask_prices, ask_sizes = ask[:levels], ask[levels:]
+        if timestamp_ns is None:
+            timestamp_ns = time.time_ns()
+        # Pack before taking the seqlock: a bad value must not leave the row odd
+        packed = self._row.pack(*bid_prices, *bid_sizes, *ask_prices, *ask_sizes)
+        size = self._row.size
+
+        with self._lock:
+            row = self._rows.get(symbol)
+            if row is None:
+                row = self._row_for(symbol)
+            seq = self._seq
+            seq[row] += 1
+            self._buffer[row * size:(row + 1) * size] = packed
+            self._timestamps[row] = timestamp_ns
+            seq[row] += 1
+
+    def update_level(self, symbol: str, side: str, level: int, price: float, size: float,
+                     timestamp_ns: Optional[int] = None):
+        """
+        Change a single price level.
+
+        Args:
+            symbol (str): Symbol code
+            side (str): "bid" or "ask"
+            level (int): Level index, 0 = best
+            price (float): Price
+            size (float): Size (0 clears the level)
+            timestamp_ns (int): Update time in ns (default: time.time_ns())
+        """
+        if side not in ("bid", "ask"):
+            raise ValueError(f"side must be 'bid' or 'ask', got {side}")
+        if not 0 <= level < self.levels:
+            raise ValueError(f"level must be in [0, {self.levels}), got {level}")
+        plane = BID_PRICE if side == "bid" else ASK_PRICE
+        price, size = float(price), float(size)
+        if timestamp_ns is None:
+            timestamp_ns = time.time_ns()
+
+        with self._lock:
+            row = self._row_for(symbol)
+            seq = self._seq
+            seq[row] += 1
+            block = self._book[row]
+            block[plane, level] = price if size else np.nan
+            block[plane + 1, level] = size
+            self._timestamps[row] = timestamp_ns
+            seq[row] += 1
+
+    def on_depth(self, symbol: str, depth):
+        """
+        Depth callback for SDK bid/ask updates.
+
+        Args:
+            symbol (str): Symbol code
+            depth: Dict or object with bid_price, bid_volume, ask_price and
+                ask_volume sequences (and optionally timestamp_ns)
+        """
+        def field(name, default=None):
+            if isinstance(depth, dict):
+                value = depth.get(name)
+            else:
+                value = getattr(depth, name, None)
+            # Not ``or``: the truth value of a NumPy array is ambiguous
+            return default if value is None else value
+
+        try:
+            self.update(symbol, field("bid_price", ()), field("bid_volume", ()),
+                        field("ask_price", ()), field("ask_volume", ()),
+                        field("timestamp_ns"))
+        except (ValueError, TypeError, struct.error) as e:
+            self.logger.error(f"Order book update error for {symbol}: {str(e)}")
+
+    def symbols(self) -> List[str]:
+        """Get the symbols in row order."""
+        return list(self._symbols)
+
+    def view(self, symbol: str) -> Optional[np.ndarray]:
+        """
+        Get a read-only, zero-copy view of a symbol's depth.
+
+        The view reflects later updates and may be read mid-update; use
+        snapshot() when a consistent copy is needed.
+
+        Args:
+            symbol (str): Symbol code
+
+        Returns:
+            np.ndarray: Shape (4, levels) view, or None for unknown symbols
+        """
+        row = self._rows.get(symbol)
+        if row is None:
+            return None
+        view = self._book[row]
+        view.flags.writeable = False
+        return view
+
+    def snapshot(self, symbol: str) -> Optional[dict]:
+        """
+        Get a consistent copy of a symbol's depth.
+
+        Args:
+            symbol (str): Symbol code
+
+        Returns:
+            dict: bid_price/bid_size/ask_price/ask_size arrays, timestamp_ns
+                and seq, or None for unknown symbols or a row that never settled
+        """
+        row = self._rows.get(symbol)
+        if row is None:
+            return None
+
+        seq = self._seq
+        for _ in range(self.max_retries):
+            before = seq[row]
+            if before & 1:
+                continue
+            block = self._book[row].copy()
+            timestamp_ns = self._timestamps[row]
+            if seq[row] == before:
+                snapshot = dict(zip(PLANES, block))
+                snapshot["timestamp_ns"] = timestamp_ns
+                snapshot["seq"] = before // 2
+                return snapshot
+        return None
+
+    def top_of_book(self) -> dict:
+        """
+        Get best bid/ask statistics for every symbol at once.
+
+        Returns:
+            dict: symbols plus bid, ask, bid_size, ask_size, mid, spread and
+                imbalance arrays aligned with them
+        """
+        count = len(self._symbols)
+        book = self._book[:count, :, 0].copy()
+        bid, bid_size, ask, ask_size = book.T
+        depth = bid_size + ask_size
+        with np.errstate(divide="ignore", invalid="ignore"):
+            imbalance = np.where(depth > 0, (bid_size - ask_size) / depth, np.nan)
+        return {
+            "symbols": self._symbols[:count],
+            "bid": bid,
+            "ask": ask,
+            "bid_size": bid_size,
+            "ask_size": ask_size,
+            "mid": (bid + ask) / 2.0,
+            "spread": ask - bid,
+            "imbalance": imbalance
+        }
@@ -0,0 +1,173 @@
+"""
+Session Profiling
+
+This module records a whole-session profile for the CLI and GUI entry points.
+A background sampler walks the stacks of every thread (including SDK
+callback threads) and produces:
+
+    <prefix>.collapsed     flamegraph-compatible collapsed stacks
+    <prefix>.threads.json  per-thread wall time and sample counts
+    <prefix>.prof          cProfile statistics (``mode="cprofile"`` only)
+"""
+
+import cProfile
+import json
+import logging
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+
+class SessionProfiler:
+    """
+    Sampling (and optionally cProfile) profiler for a whole session.
+
+    ``stop()`` writes the output files and must be called before any hard
+    process exit; it is safe to call more than once.
+    """
+
+    def __init__(self, output_prefix: str, mode: str = "sample", interval: float = 0.005):
+        """
+        Initialize the session profiler.
+
+        Args:
+            output_prefix (str): Path prefix for the output files
+            mode (str): "sample" or "cprofile" (default: "sample")
+            interval (float): Sampling interval in seconds (default: 0.005)
+        """
+        if mode not in ("sample", "cprofile"):
+            raise ValueError(f"Unknown profile mode: {mode}")
+
+        self.output_prefix = output_prefix
+        self.mode = mode
+        self.interval = interval
+        self.logger = logging.getLogger(__name__)
+
+        self._stacks = Counter()
+        self._threads: Dict[int, dict] = {}
+        self._profiles = []
+        self._profiles_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._sampler = None
+        self._started = None
+        self._stopped = False
+
+    def start(self):
+        """Start sampling and, in cprofile mode, deterministic profiling."""
+        self._started = time.monotonic()
+
+        if self.mode == "cprofile":
+            profile = cProfile.Profile()
+            self._profiles.append(profile)
+            profile.enable()
+            if sys.version_info < (3, 12):
+                # Before 3.12 cProfile only sees the thread that enabled it,
+                # so give each new Python thread its own profile.
+                threading.setprofile(self._thread_profile_hook)
+
+        self._sampler = threading.Thread(target=self._sample_loop,
+                                         name="session-profiler", daemon=True)
+        self._sampler.start()
+        self.logger.info(f"Session profiling started ({self.mode})")
+
+    def _thread_profile_hook(self, frame, event, arg):
+        """Enable a per-thread cProfile on the first profile event of a thread."""
+        profile = cProfile.Profile()
+        with self._profiles_lock:
+            self._profiles.append(profile)
+        profile.enable()
+
+    def _sample_loop(self):
+        sampler_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            now = time.monotonic()
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == sampler_id:
+                    continue
+
+                name = names.get(thread_id, f"thread-{thread_id}")
+                info = self._threads.get(thread_id)
+                if info is None:
+                    info = self._threads[thread_id] = {"name": name, "first_seen": now,
+                                                       "last_seen": now, "samples": 0}
+                info["last_seen"] = now
+                info["samples"] += 1
+
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(name.replace(";", ":"))
+                self._stacks[";".join(reversed(stack))] += 1
+
+    def get_thread_times(self) -> Dict[str, dict]:
+        """
+        Get per-thread wall time observed by the sampler.
+
+        Returns:
+            dict: Thread label -> wall time in seconds and sample count
+        """
+        result = {}
+        for thread_id, info in list(self._threads.items()):
+            result[f"{info['name']} ({thread_id})"] = {
+                "wall_time_s": round(info["last_seen"] - info["first_seen"] + self.interval, 6),
+                "samples": info["samples"]
+            }
+        return result
+
+    def stop(self) -> Optional[str]:
+        """
+        Stop profiling and write the output files.
+
+        Returns:
+            str: Output prefix, or None if the profiler already stopped
+        """
+        if self._stopped or self._started is None:
+            return None
+        self._stopped = True
+
+        self._stop_event.set()
+        self._sampler.join(timeout=1.0)
+
+        if self.mode == "cprofile":
+            if sys.version_info < (3, 12):
+                threading.setprofile(None)
+            self._write_cprofile()
+
+        with open(f"{self.output_prefix}.collapsed", "w", encoding="utf-8") as f:
+            for stack, count in self._stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        with open(f"{self.output_prefix}.threads.json", "w", encoding="utf-8") as f:
+            json.dump({
+                "session_wall_time_s": round(time.monotonic() - self._started, 6),
+                "sample_interval_s": self.interval,
+                "threads": self.get_thread_times()
+            }, f, indent=2, ensure_ascii=False)
+
+        self.logger.info(f"Session profile written to {self.output_prefix}.*")
+        return self.output_prefix
+
+    def _write_cprofile(self):
+        with self._profiles_lock:
+            profiles = list(self._profiles)
+
+        stats = None
+        for profile in profiles:
+            try:
+                profile.disable()
+                if stats is None:
+                    stats = pstats.Stats(profile)
+                else:
+                    stats.add(profile)
+            except (TypeError, ValueError):
+                # A profile with no recorded calls cannot be loaded.
+                continue
+
+        if stats is not None:
+            stats.dump_stats(f"{self.output_prefix}.prof")
@@ -0,0 +1,293 @@
+"""
+Shared-Memory Quote Board
+
+This module publishes a fixed-layout quote board in
+``multiprocessing.shared_memory`` so that several strategy processes can read
+the quotes received by a single client session without subscribing
+separately or exchanging pickled messages.
+
+Layout (little endian)::
+
+    header   : magic(8s) version(I) slot_count(I) symbol_count(I) reserved(I)
+    symbols  : slot_count x 16 byte ASCII symbol names (NUL padded)
+    slots    : slot_count x [seq(Q) last(d) bid(d) ask(d) volume(q) timestamp_ns(q)]
+
+Each slot is protected by a seqlock: the single writer makes ``seq`` odd
+before touching the fields and even again afterwards. Readers retry until
+they observe the same even ``seq`` before and after copying the fields, so
+snapshots are consistent without any cross-process lock.
+"""
+
+import logging
+import struct
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Dict, Optional
+
+
+MAGIC = b"KGIQB\x00\x00\x01"
+VERSION = 1
+SYMBOL_SIZE = 16
+
+_HEADER = struct.Struct("<8sIIII")
+_SYMBOL = struct.Struct(f"<{SYMBOL_SIZE}s")
+_SEQ = struct.Struct("<Q")
+_FIELDS = struct.Struct("<dddqq")
+_SLOT_SIZE = _SEQ.size + _FIELDS.size
+
+_SYMBOL_COUNT_OFFSET = 16
+_SYMBOLS_OFFSET = _HEADER.size
+
+
+def _slots_offset(slot_count: int) -> int:
+    return _SYMBOLS_OFFSET + slot_count * SYMBOL_SIZE
+
+
+def board_size(slot_count: int) -> int:
+    """
+    Get the number of bytes needed for a board with ``slot_count`` slots.
+
+    Args:
+        slot_count (int): Number of symbol slots
+
+    Returns:
+        int: Size of the shared memory block in bytes
+    """
+    return _slots_offset(slot_count) + slot_count * _SLOT_SIZE
+
+
+class QuoteBoard:
+    """
+    Writer side of the shared-memory quote board.
+
+    Only one process may write to a board. Within that process updates are
+    serialized with a lock, so it is safe to feed the board from several SDK
+    callback threads.
+    """
+
+    def __init__(self, name: Optional[str] = None, slot_count: int = 2048):
+        """
+        Create a new quote board.
+
+        Args:
+            name (str): Shared memory name (default: generated by the OS)
+            slot_count (int): Maximum number of symbols (default: 2048)
+        """
+        self.slot_count = slot_count
+        self.shm = shared_memory.SharedMemory(name=name, create=True,
+                                              size=board_size(slot_count))
+        self.name = self.shm.name
+        self._buf = self.shm.buf
+        self._slots_offset = _slots_offset(slot_count)
+        self._slots: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+        _HEADER.pack_into(self._buf, 0, MAGIC, VERSION, slot_count, 0, 0)
+
+    def _slot_for(self, symbol: str) -> int:
+        """Return the slot index for a symbol, assigning one if needed."""
+        slot = self._slots.get(symbol)
+        if slot is not None:
+            return slot
+
+        slot = len(self._slots)
+        if slot >= self.slot_count:
+            raise ValueError(f"Quote board is full ({self.slot_count} slots)")
+
+        encoded = symbol.encode("ascii")
+        if len(encoded) > SYMBOL_SIZE:
+            raise ValueError(f"Symbol too long for quote board: {symbol}")
+
+        # Publish the name first, then the count, so readers never see a
+        # counted slot without its name.
+        _SYMBOL.pack_into(self._buf, _SYMBOLS_OFFSET + slot * SYMBOL_SIZE, encoded)
+        struct.pack_into("<I", self._buf, _SYMBOL_COUNT_OFFSET, slot + 1)
+        self._slots[symbol] = slot
+        return slot
+
+    def update(self, symbol: str, last: float = float("nan"),
+               bid: float = float("nan"), ask: float = float("nan"),
+               volume: int = 0, timestamp_ns: Optional[int] = None):
+        """
+        Publish a quote for a symbol.
+
+        Args:
+            symbol (str): Symbol code
+            last (float): Last traded price
+            bid (float): Best bid price
+            ask (float): Best ask price
+            volume (int): Accumulated volume
+            timestamp_ns (int): Quote time in ns (default: time.time_ns())
+        """
+        if timestamp_ns is None:
+            timestamp_ns = time.time_ns()
+        # Pack before making seq odd: a bad value must not leave the slot locked
+        fields = _FIELDS.pack(last, bid, ask, volume, timestamp_ns)
+
+        with self._lock:
+            offset = self._slots_offset + self._slot_for(symbol) * _SLOT_SIZE
+            seq = _SEQ.unpack_from(self._buf, offset)[0]
+            _SEQ.pack_into(self._buf, offset, seq + 1)
+            self._buf[offset + _SEQ.size:offset + _SLOT_SIZE] = fields
+            _SEQ.pack_into(self._buf, offset, seq + 2)
+
+    def on_quote(self, symbol: str, quote: dict):
+        """
+        Quote listener compatible with ``KGITradingClient.add_quote_listener``.
+
+        Args:
+            symbol (str): Symbol code
+            quote (dict): Normalized quote with last/bid/ask/volume keys
+        """
+        try:
+            self.update(symbol,
+                        last=quote.get("last", float("nan")),
+                        bid=quote.get("bid", float("nan")),
+                        ask=quote.get("ask", float("nan")),
+                        volume=int(quote.get("volume", 0)),
+                        timestamp_ns=quote.get("timestamp_ns"))
+        except (ValueError, TypeError, struct.error) as e:
+            self.logger.error(f"Quote board update error: {str(e)}")
+
+    def close(self, unlink: bool = True):
+        """
+        Release the shared memory block.
+
+        Args:
+            unlink (bool): Whether to destroy the block (default: True)
+        """
+        self._buf = None
+        self.shm.close()
+        if unlink:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class QuoteBoardReader:
+    """
+    Reader side of the shared-memory quote board.
+
+    Readers never take a lock; they retry a slot read while the writer is
+    in the middle of updating it.
+    """
+
+    def __init__(self, name: str, max_retries: int = 1000):
+        """
+        Attach to an existing quote board.
+
+        Args:
+            name (str): Shared memory name published by the writer
+            max_retries (int): Attempts per slot before giving up (default: 1000)
+        """
+        self.shm = shared_memory.SharedMemory(name=name)
+        if sys.version_info < (3, 13):
+            # Readers must not unlink the writer's block when they exit.
+            from multiprocessing import resource_tracker
+            try:
+                resource_tracker.unregister(self.shm._name, "shared_memory")
+            except Exception:
+                pass
+
+        self._buf = self.shm.buf
+        magic, version, slot_count, _, _ = _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC or version != VERSION:
+            self.shm.close()
+            raise ValueError(f"Shared memory block {name} is not a quote board")
+
+        self.name = name
+        self.slot_count = slot_count
+        self.max_retries = max_retries
+        self._slots_offset = _slots_offset(slot_count)
+        self._slots: Dict[str, int] = {}
+
+    def _refresh_symbols(self):
+        """Pick up symbols added by the writer since the last refresh."""
+        count = struct.unpack_from("<I", self._buf, _SYMBOL_COUNT_OFFSET)[0]
+        for slot in range(len(self._slots), count):
+            raw = _SYMBOL.unpack_from(self._buf, _SYMBOLS_OFFSET + slot * SYMBOL_SIZE)[0]
+            self._slots[raw.rstrip(b"\x00").decode("ascii")] = slot
+
+    def symbols(self) -> list:
+        """
+        Get the symbols currently published on the board.
+
+        Returns:
+            list: Symbol codes in slot order
+        """
+        self._refresh_symbols()
+        return list(self._slots)
+
+    def _read_slot(self, slot: int) -> Optional[dict]:
+        offset = self._slots_offset + slot * _SLOT_SIZE
+        for _ in range(self.max_retries):
+            before = _SEQ.unpack_from(self._buf, offset)[0]
+            if before & 1:
+                continue
+            last, bid, ask, volume, timestamp_ns = _FIELDS.unpack_from(
+                self._buf, offset + _SEQ.size)
+            if _SEQ.unpack_from(self._buf, offset)[0] == before:
+                return {
+                    "last": last,
+                    "bid": bid,
+                    "ask": ask,
+                    "volume": volume,
+                    "timestamp_ns": timestamp_ns,
+                    "seq": before >> 1
+                }
+        return None
+
+    def snapshot(self, symbol: str) -> Optional[dict]:
+        """
+        Get a consistent snapshot of one symbol.
+
+        Args:
+            symbol (str): Symbol code
+
+        Returns:
+            dict: Quote fields plus ``seq`` (update count), or None if the
+            symbol is unknown or the slot could not be read consistently
+        """
+        slot = self._slots.get(symbol)
+        if slot is None:
+            self._refresh_symbols()
+            slot = self._slots.get(symbol)
+            if slot is None:
+                return None
+        return self._read_slot(slot)
+
+    def snapshot_all(self) -> Dict[str, dict]:
+        """
+        Get consistent per-slot snapshots of every published symbol.
+
+        Returns:
+            dict: Symbol code -> quote fields
+        """
+        self._refresh_symbols()
+        result = {}
+        for symbol, slot in self._slots.items():
+            quote = self._read_slot(slot)
+            if quote is not None:
+                result[symbol] = quote
+        return result
+
+    def close(self):
+        """Detach from the shared memory block."""
+        self._buf = None
+        self.shm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
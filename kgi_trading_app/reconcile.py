@@ -0,0 +1,231 @@
+"""
+End-of-Day Reconciliation
+
+This module compares local order records (normally the journal's
+``OrderState``, see journal.py) with the broker's records for every
+account in ``client.all_accounts``.
+
+Both sides are reduced to rows keyed by a 64-bit hash of
+``(account, order_id)``, sorted once and walked with a single merge pass,
+so the diff is O(n log n) however many accounts and fills there are. Each
+row also carries a fingerprint of its compared fields; only rows whose
+fingerprints differ are compared field by field.
+
+Report layout::
+
+    {"accounts": int, "matched": int,
+     "missing": [broker records with no local record],
+     "extra": [local records the broker does not have],
+     "mismatched": [{"account", "order_id", "fields": {field: {"local", "broker"}}}],
+     "errors": {account_id: message}, "seconds": float}
+
+Accounts whose query failed are listed in ``errors`` and left out of the
+diff, so their local records are not reported as extra.
+"""
+
+import hashlib
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import Callable, Iterable, List, Optional
+
+from .reports import account_id_of, normalize_trade_report, status_name
+
+
+COMPARE_FIELDS = ("status", "quantity", "filled_quantity")
+
+# Local-only statuses and spellings that mean the same broker status
+STATUS_ALIASES = {"sent": "submitted", "canceled": "cancelled"}
+
+logger = logging.getLogger(__name__)
+
+
+def record_key(account: Optional[str], order_id: str) -> int:
+    """Get the 64-bit sort key of an (account, order id) pair."""
+    digest = hashlib.blake2b(f"{account}\x1f{order_id}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _normalize_status(value) -> str:
+    name = status_name(value)
+    return STATUS_ALIASES.get(name, name)
+
+
+def _normalize_value(value):
+    if isinstance(value, float):
+        return round(value, 6)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+def _rows(records: Iterable[dict], fields: tuple, keep_latest: bool = False) -> list:
+    """Key, fingerprint and sort records; rows without an order id are skipped."""
+    normalizers = [(field, _normalize_status if field == "status" else _normalize_value)
+                   for field in fields]
+    rows = []
+    for record in records:
+        order_id = record.get("order_id")
+        if order_id is None:
+            continue
+        account = record.get("account") or "-"
+        order_id = str(order_id)
+        values = tuple([normalize(record.get(field)) for field, normalize in normalizers])
+        rows.append((record_key(account, order_id), account, order_id, hash(values), values, record))
+    rows.sort(key=itemgetter(0, 1, 2))
+
+    if keep_latest and rows:
+        # Several reports per order: keep the one with the most filled quantity
+        unique = [rows[0]]
+        for row in rows[1:]:
+            last = unique[-1]
+            if row[:3] == last[:3]:
+                if (row[5].get("filled_quantity") or 0) >= (last[5].get("filled_quantity") or 0):
+                    unique[-1] = row
+            else:
+                unique.append(row)
+        rows = unique
+    return rows
+
+
+def reconcile(local: Iterable[dict], broker: Iterable[dict],
+              fields: tuple = COMPARE_FIELDS) -> dict:
+    """
+    Diff local records against broker records.
+
+    Args:
+        local (Iterable[dict]): Local order records with account and order_id
+        broker (Iterable[dict]): Normalized broker reports (see reports.py);
+            repeated order ids keep the most filled report
+        fields (tuple): Fields to compare (default: COMPARE_FIELDS)
+
+    Returns:
+        dict: matched, missing, extra and mismatched (see module docstring)
+    """
+    local_rows = _rows(local, fields)
+    broker_rows = _rows(broker, fields, keep_latest=True)
+    result = {"matched": 0, "missing": [], "extra": [], "mismatched": []}
+
+    i = j = 0
+    while i < len(local_rows) and j < len(broker_rows):
+        ours, theirs = local_rows[i], broker_rows[j]
+        if ours[:3] == theirs[:3]:
+            if ours[3] == theirs[3] and ours[4] == theirs[4]:
+                result["matched"] += 1
+            else:
+                differences = {field: {"local": mine, "broker": other}
+                               for field, mine, other in zip(fields, ours[4], theirs[4])
+                               if mine != other}
+                result["mismatched"].append({"account": ours[1], "order_id": ours[2],
+                                             "fields": differences})
+            i += 1
+            j += 1
+        elif ours[:3] < theirs[:3]:
+            result["extra"].append(ours[5])
+            i += 1
+        else:
+            result["missing"].append(theirs[5])
+            j += 1
+    result["extra"].extend(row[5] for row in local_rows[i:])
+    result["missing"].extend(row[5] for row in broker_rows[j:])
+    return result
+
+
+def local_records(state) -> List[dict]:
+    """
+    Get reconcilable records from a journal ``OrderState``.
+
+    Orders that never got a broker order id (failed or unsent) are skipped.
+    """
+    return [order for order in state.orders.values() if order.get("order_id") is not None]
+
+
+def sdk_fetcher(client) -> Callable:
+    """
+    Create a fetcher that lists an account's orders through the SDK.
+
+    Args:
+        client (KGITradingClient): Logged-in client
+
+    Returns:
+        Callable: fetch(account) -> iterable of SDK trade objects
+    """
+    def fetch(account):
+        return client.api.list_trades(account)
+    return fetch
+
+
+def fetch_broker_records(client, fetcher: Optional[Callable] = None, max_workers: int = 4,
+                         timeout: Optional[float] = None) -> tuple:
+    """
+    Query every account's orders concurrently under the client's query limiter.
+
+    Args:
+        client (KGITradingClient): Logged-in client
+        fetcher (Callable): fetch(account) -> iterable of reports (default: sdk_fetcher)
+        max_workers (int): Maximum concurrent account queries (default: 4)
+        timeout (float): Maximum seconds to wait for the rate limiter per query (default: wait forever)
+
+    Returns:
+        tuple: ({account_id: [normalized report]}, {account_id: error message})
+    """
+    fetcher = fetcher or sdk_fetcher(client)
+    accounts = list(client.all_accounts)
+
+    def fetch(account):
+        if not client.query_limiter.acquire(timeout=timeout):
+            raise TimeoutError("rate limit wait timed out")
+        account_id = account_id_of(account)
+        reports = []
+        for report in fetcher(account) or ():
+            normalized = normalize_trade_report(report)
+            if normalized["account"] is None:
+                normalized["account"] = account_id
+            reports.append(normalized)
+        return reports
+
+    records, errors = {}, {}
+    if not accounts:
+        return records, errors
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(accounts)),
+                            thread_name_prefix="reconcile") as pool:
+        futures = [(account_id_of(account), pool.submit(fetch, account)) for account in accounts]
+        for account_id, future in futures:
+            try:
+                records[account_id] = future.result()
+            except Exception as e:
+                logger.error(f"Reconciliation query failed for {account_id}: {str(e)}")
+                errors[account_id] = str(e)
+    return records, errors
+
+
+def reconcile_accounts(client, local: Iterable[dict], fetcher: Optional[Callable] = None,
+                       max_workers: int = 4, timeout: Optional[float] = None,
+                       fields: tuple = COMPARE_FIELDS) -> dict:
+    """
+    Reconcile local records with the broker for all of the client's accounts.
+
+    Args:
+        client (KGITradingClient): Logged-in client
+        local (Iterable[dict]): Local order records, e.g. local_records(journal.state)
+        fetcher (Callable): fetch(account) -> iterable of reports (default: sdk_fetcher)
+        max_workers (int): Maximum concurrent account queries (default: 4)
+        timeout (float): Maximum seconds to wait for the rate limiter per query (default: wait forever)
+        fields (tuple): Fields to compare (default: COMPARE_FIELDS)
+
+    Returns:
+        dict: Reconciliation report (see module docstring), or {"error": ...} when not logged in
+    """
+    if not client.is_logged_in:
+        return {"error": "Not logged in"}
+
+    start = time.perf_counter()
+    broker, errors = fetch_broker_records(client, fetcher, max_workers, timeout)
+    reconciled = set(broker)
+    result = reconcile((record for record in local if (record.get("account") or "-") in reconciled),
+                       (report for reports in broker.values() for report in reports), fields)
+    result["accounts"] = len(broker)
+    result["errors"] = errors
+    result["seconds"] = time.perf_counter() - start
+    return result
@@ -0,0 +1,242 @@
+"""
+Account Records
+
+This module provides ``AccountRecord``, an immutable snapshot of an SDK
+account built once at login. Status calls, GUI displays and exports read
+these records instead of calling ``getattr``/``hasattr`` on live SDK objects.
+"""
+
+import json
+import struct
+from typing import Iterable, List, Optional
+
+
+ACCOUNT_TYPES = ("Stock", "Future")
+
+_HEADER = struct.Struct("<HB?")
+_LENGTH = struct.Struct("<H")
+_COUNT = struct.Struct("<I")
+
+
+def account_type_of(account) -> str:
+    """
+    Get the account type name of an SDK account.
+
+    Args:
+        account: SDK account object
+
+    Returns:
+        str: "Stock" or "Future"
+    """
+    return "Stock" if "Stock" in str(type(account)) else "Future"
+
+
+def _pack_str(value: Optional[str]) -> bytes:
+    # Length 0xFFFF marks None so that "" and None round-trip distinctly.
+    if value is None:
+        return _LENGTH.pack(0xFFFF)
+    encoded = value.encode("utf-8")
+    return _LENGTH.pack(len(encoded)) + encoded
+
+
+def _unpack_str(data, offset: int):
+    length = _LENGTH.unpack_from(data, offset)[0]
+    offset += _LENGTH.size
+    if length == 0xFFFF:
+        return None, offset
+    return bytes(data[offset:offset + length]).decode("utf-8"), offset + length
+
+
+class AccountRecord:
+    """
+    Immutable snapshot of one account.
+
+    JSON and binary encodings are computed on first use and cached.
+    """
+
+    __slots__ = ("index", "type", "person_id", "broker_id", "account_id",
+                 "signed", "trader", "_dict", "_json", "_bytes")
+
+    def __init__(self, index: int, type: str, person_id: str, broker_id: str,
+                 account_id: str, signed: bool, trader: Optional[str] = None):
+        """
+        Initialize the record.
+
+        Args:
+            index (int): 1-based position in the login account list
+            type (str): "Stock" or "Future"
+            person_id (str): Person ID
+            broker_id (str): Broker ID
+            account_id (str): Account ID
+            signed (bool): Whether the account is signed
+            trader (str): Trader name (default: None)
+        """
+        setter = object.__setattr__
+        setter(self, "index", index)
+        setter(self, "type", type)
+        setter(self, "person_id", person_id)
+        setter(self, "broker_id", broker_id)
+        setter(self, "account_id", account_id)
+        setter(self, "signed", signed)
+        setter(self, "trader", trader)
+        setter(self, "_dict", None)
+        setter(self, "_json", None)
+        setter(self, "_bytes", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("AccountRecord is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("AccountRecord is immutable")
+
+    def __eq__(self, other):
+        if not isinstance(other, AccountRecord):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return f"AccountRecord({self.index}, {self.type}, {self.account_id})"
+
+    def _key(self) -> tuple:
+        return (self.index, self.type, self.person_id, self.broker_id,
+                self.account_id, self.signed, self.trader)
+
+    @classmethod
+    def from_account(cls, index: int, account) -> "AccountRecord":
+        """
+        Build a record from a live SDK account (the only SDK access).
+
+        Args:
+            index (int): 1-based position in the login account list
+            account: SDK account object
+
+        Returns:
+            AccountRecord: Snapshot of the account
+        """
+        trader = getattr(account, 'trader', None)
+        return cls(
+            index=index,
+            type=account_type_of(account),
+            person_id=str(getattr(account, 'person_id', 'N/A')),
+            broker_id=str(getattr(account, 'broker_id', 'N/A')),
+            account_id=str(getattr(account, 'account_id', 'N/A')),
+            signed=bool(getattr(account, 'signed', False)),
+            trader=str(trader) if trader else None
+        )
+
+    @property
+    def signed_status(self) -> str:
+        """Get "Signed" or "Not Signed"."""
+        return "Signed" if self.signed else "Not Signed"
+
+    def to_dict(self) -> dict:
+        """
+        Get the record as a dict (cached; treat as read-only).
+
+        Returns:
+            dict: Record fields; "trader" only when set
+        """
+        if self._dict is None:
+            data = {
+                "index": self.index,
+                "type": self.type,
+                "person_id": self.person_id,
+                "broker_id": self.broker_id,
+                "account_id": self.account_id,
+                "signed": self.signed_status
+            }
+            if self.trader:
+                data["trader"] = self.trader
+            object.__setattr__(self, "_dict", data)
+        return self._dict
+
+    def to_json(self) -> str:
+        """
+        Get the cached JSON encoding.
+
+        Returns:
+            str: JSON object
+        """
+        if self._json is None:
+            object.__setattr__(self, "_json", json.dumps(self.to_dict(), ensure_ascii=False))
+        return self._json
+
+    def to_bytes(self) -> bytes:
+        """
+        Get the cached compact binary encoding.
+
+        Returns:
+            bytes: Header followed by length-prefixed UTF-8 strings
+        """
+        if self._bytes is None:
+            data = b"".join((
+                _HEADER.pack(self.index, ACCOUNT_TYPES.index(self.type), self.signed),
+                _pack_str(self.person_id),
+                _pack_str(self.broker_id),
+                _pack_str(self.account_id),
+                _pack_str(self.trader)
+            ))
+            object.__setattr__(self, "_bytes", data)
+        return self._bytes
+
+    @classmethod
+    def from_bytes(cls, data, offset: int = 0) -> "AccountRecord":
+        """
+        Decode a record produced by to_bytes.
+
+        Args:
+            data (bytes): Encoded data
+            offset (int): Start offset (default: 0)
+
+        Returns:
+            AccountRecord: Decoded record
+        """
+        return cls._decode(data, offset)[0]
+
+    @classmethod
+    def _decode(cls, data, offset: int):
+        index, type_code, signed = _HEADER.unpack_from(data, offset)
+        offset += _HEADER.size
+        person_id, offset = _unpack_str(data, offset)
+        broker_id, offset = _unpack_str(data, offset)
+        account_id, offset = _unpack_str(data, offset)
+        trader, offset = _unpack_str(data, offset)
+        record = cls(index, ACCOUNT_TYPES[type_code], person_id, broker_id,
+                     account_id, signed, trader)
+        return record, offset
+
+
+def encode_records(records: Iterable[AccountRecord]) -> bytes:
+    """
+    Encode several records into one binary blob.
+
+    Args:
+        records (Iterable[AccountRecord]): Records to encode
+
+    Returns:
+        bytes: Count followed by each record's cached encoding
+    """
+    records = list(records)
+    return _COUNT.pack(len(records)) + b"".join(record.to_bytes() for record in records)
+
+
+def decode_records(data) -> List[AccountRecord]:
+    """
+    Decode a blob produced by encode_records.
+
+    Args:
+        data (bytes): Encoded data
+
+    Returns:
+        List[AccountRecord]: Decoded records
+    """
+    count = _COUNT.unpack_from(data, 0)[0]
+    offset = _COUNT.size
+    records = []
+    for _ in range(count):
+        record, offset = AccountRecord._decode(data, offset)
+        records.append(record)
+    return records
@@ -0,0 +1,123 @@
+"""
+Trade Report Normalization
+
+SDK order and deal callbacks deliver objects whose layout differs between
+order types and SDK versions. This module reduces them to one flat dict so
+latency tracking, journaling and other listeners can share a single shape::
+
+    {"order_id": str, "status": str, "account": str, "symbol": str,
+     "action": str, "quantity": float, "filled_quantity": float,
+     "price": float, "fill_price": float, "complete": bool, "done": bool}
+
+``complete`` means fully filled; ``done`` means no further reports are
+expected (filled, cancelled or rejected).
+
+Missing fields are None (or 0 for quantities).
+"""
+
+from typing import Optional
+
+
+ACK_STATUSES = frozenset(("submitted", "presubmitted", "ack", "accepted", "new"))
+FILL_STATUSES = frozenset(("partfilled", "partiallyfilled", "filled", "deal", "fill"))
+DONE_STATUSES = frozenset(("filled", "cancelled", "canceled", "failed", "rejected"))
+
+
+def get_field(obj, *names):
+    """Get the first present field from a dict or object."""
+    if obj is None:
+        return None
+    for name in names:
+        if isinstance(obj, dict):
+            if name in obj and obj[name] is not None:
+                return obj[name]
+        else:
+            value = getattr(obj, name, None)
+            if value is not None:
+                return value
+    return None
+
+
+def _number(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def status_name(status) -> str:
+    """Normalize an SDK status (string or enum) to a lowercase name."""
+    if status is None:
+        return ""
+    return str(getattr(status, "name", status)).rsplit(".", 1)[-1].lower()
+
+
+def order_id_of(obj) -> Optional[str]:
+    """
+    Get the broker order id from a trade, order or report.
+
+    Args:
+        obj: SDK trade/order/report object or dict
+
+    Returns:
+        str: Order id, or None if none is present
+    """
+    order_id = get_field(obj, "order_id", "ordno")
+    if order_id is None:
+        order_id = get_field(get_field(obj, "order"), "id", "ordno", "seqno")
+    if order_id is None:
+        order_id = get_field(obj, "id", "seqno")
+    return str(order_id) if order_id is not None else None
+
+
+def symbol_of(contract) -> Optional[str]:
+    """Get the symbol code of a contract object, dict or string."""
+    if contract is None or isinstance(contract, str):
+        return contract
+    code = get_field(contract, "code", "symbol")
+    return str(code) if code is not None else None
+
+
+def account_id_of(account) -> Optional[str]:
+    """Get the account id of an account object, dict or string."""
+    if account is None or isinstance(account, str):
+        return account
+    account_id = get_field(account, "account_id")
+    return str(account_id) if account_id is not None else None
+
+
+def normalize_trade_report(report) -> dict:
+    """
+    Flatten an SDK order/deal report.
+
+    Args:
+        report: SDK trade report object or dict
+
+    Returns:
+        dict: Normalized report (see module docstring)
+    """
+    order = get_field(report, "order")
+    status = get_field(report, "status")
+    detail = status
+    if status is not None and not isinstance(status, str) and get_field(status, "status") is not None:
+        status = get_field(status, "status")
+
+    quantity = _number(get_field(report, "quantity") or get_field(order, "quantity"))
+    filled = _number(get_field(report, "filled_quantity", "deal_quantity") or
+                     get_field(detail, "deal_quantity", "filled_quantity"))
+    name = status_name(status)
+    complete = name == "filled" or (quantity > 0 and filled >= quantity)
+
+    return {
+        "order_id": order_id_of(report),
+        "status": name,
+        "account": account_id_of(get_field(report, "account") or get_field(order, "account")),
+        "symbol": symbol_of(get_field(report, "contract") or get_field(report, "symbol", "code")),
+        "action": status_name(get_field(report, "action") or get_field(order, "action")),
+        "quantity": quantity,
+        "filled_quantity": filled,
+        "price": get_field(report, "price") or get_field(order, "price"),
+        "fill_price": get_field(report, "fill_price", "deal_price") or get_field(detail, "deal_price"),
+        "complete": complete,
+        "done": complete or name in DONE_STATUSES
+    }
@@ -0,0 +1,330 @@
+"""
+Portfolio Margin and Stress
+
+This module estimates margin and scenario PnL for futures and options
+positions held in ``futopt_account`` accounts, fast enough to re-run on
+every fill instead of waiting for the broker's margin query.
+
+Positions are revalued under a grid of underlying moves x volatility
+shifts in one broadcast: an (instruments, scenarios) price matrix from
+Black-76 (options) or the shifted underlying (futures), minus current
+values, expanded to (positions, scenarios) and scaled by signed quantity
+and multiplier. The portfolio PnL per
+scenario is a column sum; the worst loss is the scan risk.
+
+Rule-based margins follow the TAIFEX style: futures pay a fixed amount
+per contract; short options pay premium + max(A - out-of-the-money
+amount, B); long options pay nothing beyond their premium. ``MARGIN_TABLE``
+holds defaults only; pass current exchange figures as ``margin_table``.
+
+Result layout::
+
+    {"initial_margin", "maintenance_margin", "scan_risk": float,
+     "moves", "vol_shifts": arrays, "pnl": (moves, vol_shifts) array,
+     "worst": {"move", "vol_shift", "pnl"},
+     "by_account": {account: {"initial_margin", "maintenance_margin", "scan_risk"}},
+     "positions": [(account, symbol, quantity)], "position_pnl": (positions, scenarios) array}
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from .options import black76
+
+
+# product -> margin parameters per contract (NTD); override with exchange figures
+MARGIN_TABLE = {
+    "TX": {"multiplier": 200, "initial": 184_000, "maintenance": 141_000},
+    "MTX": {"multiplier": 50, "initial": 46_000, "maintenance": 35_250},
+    "TXO": {"multiplier": 50, "a": 44_000, "b": 22_000, "a_maintenance": 34_000,
+            "b_maintenance": 17_000}
+}
+
+DEFAULT_MOVES = np.linspace(-0.10, 0.10, 11)
+DEFAULT_VOL_SHIFTS = np.array([-0.05, 0.0, 0.05])
+MIN_VOL = 0.01
+
+logger = logging.getLogger(__name__)
+
+
+class RiskEngine:
+    """
+    Positions, prices and vols for a futures/options book, with vectorized
+    margin and stress evaluation.
+    """
+
+    def __init__(self, margin_table: Optional[Dict[str, dict]] = None, moves=DEFAULT_MOVES,
+                 vol_shifts=DEFAULT_VOL_SHIFTS, rate: float = 0.0, default_vol: float = 0.2):
+        """
+        Initialize the engine.
+
+        Args:
+            margin_table (Dict[str, dict]): product -> margin parameters (default: MARGIN_TABLE)
+            moves: Relative underlying moves to test (default: -10% .. +10%)
+            vol_shifts: Absolute volatility shifts to test (default: -5, 0, +5 points)
+            rate (float): Discount rate for options (default: 0)
+            default_vol (float): Volatility for options without a set vol (default: 0.2)
+        """
+        self.margin_table = margin_table or MARGIN_TABLE
+        self.moves = np.asarray(moves, dtype=float)
+        self.vol_shifts = np.asarray(vol_shifts, dtype=float)
+        self.rate = rate
+        self.default_vol = default_vol
+        self._instruments: Dict[str, dict] = {}
+        self._positions: Dict[Tuple[str, str], float] = {}
+        self._prices: Dict[str, float] = {}
+        self._vols: Dict[str, float] = {}
+        self._filled: Dict[str, float] = {}
+        self._callbacks: Tuple[Callable, ...] = ()
+        self._lock = threading.Lock()
+        self.last_result: Optional[dict] = None
+        self.logger = logging.getLogger(__name__)
+
+    def add_instrument(self, symbol: str, product: str, underlying: str, kind: str = "future",
+                       strike: Optional[float] = None, years: Optional[float] = None,
+                       multiplier: Optional[float] = None):
+        """
+        Describe a tradable contract.
+
+        Args:
+            symbol (str): Contract code
+            product (str): Margin table product, e.g. "TX" or "TXO"
+            underlying (str): Code whose price drives the contract (futures use their own code)
+            kind (str): "future", "call" or "put" (default: "future")
+            strike (float): Option strike (default: None)
+            years (float): Option time to expiry in years (default: None)
+            multiplier (float): Contract multiplier (default: from the margin table)
+        """
+        if kind not in ("future", "call", "put"):
+            raise ValueError(f"kind must be 'future', 'call' or 'put', got {kind}")
+        if kind != "future" and (strike is None or years is None):
+            raise ValueError("options need a strike and years to expiry")
+        if multiplier is None:
+            multiplier = self.margin_table.get(product, {}).get("multiplier", 1)
+        with self._lock:
+            self._instruments[symbol] = {"product": product, "underlying": underlying, "kind": kind,
+                                         "strike": strike, "years": years,
+                                         "multiplier": float(multiplier)}
+
+    def set_position(self, account: str, symbol: str, quantity: float):
+        """Set a signed position (long > 0, short < 0)."""
+        with self._lock:
+            if quantity:
+                self._positions[(account, symbol)] = float(quantity)
+            else:
+                self._positions.pop((account, symbol), None)
+
+    def positions(self) -> Dict[Tuple[str, str], float]:
+        """Get {(account, symbol): signed quantity}."""
+        with self._lock:
+            return dict(self._positions)
+
+    def set_price(self, symbol: str, price: float):
+        """Set the latest price of a contract or underlying."""
+        self._prices[symbol] = float(price)
+
+    def set_vol(self, symbol: str, vol: float):
+        """Set an option's volatility (e.g. from OptionChain implied vols)."""
+        self._vols[symbol] = float(vol)
+
+    def subscribe(self, callback: Callable[[dict], None]) -> Callable[[], None]:
+        """
+        Register a callback for results evaluated after fills.
+
+        Args:
+            callback (Callable): Called with each result dict
+
+        Returns:
+            Callable: Call it to unsubscribe
+        """
+        with self._lock:
+            self._callbacks = self._callbacks + (callback,)
+
+        def unsubscribe():
+            with self._lock:
+                self._callbacks = tuple(c for c in self._callbacks if c is not callback)
+        return unsubscribe
+
+    def on_quote(self, symbol: str, quote: dict):
+        """Quote listener compatible with ``KGITradingClient.add_quote_listener``."""
+        price = quote.get("last")
+        if price is not None:
+            self._prices[symbol] = float(price)
+
+    def on_report(self, report: dict):
+        """
+        Trade listener compatible with ``KGITradingClient.add_trade_listener``.
+
+        Fills of registered instruments update positions and trigger a new
+        evaluation, delivered to subscribers.
+
+        Args:
+            report (dict): Normalized trade report
+        """
+        symbol, order_id = report.get("symbol"), report.get("order_id")
+        if symbol not in self._instruments or order_id is None:
+            return
+        with self._lock:
+            filled = report.get("filled_quantity") or 0.0
+            delta = filled - self._filled.get(order_id, 0.0)
+            if delta <= 0:
+                return
+            self._filled[order_id] = filled
+            side = -1.0 if report.get("action") == "sell" else 1.0
+            key = (report.get("account") or "-", symbol)
+            quantity = self._positions.get(key, 0.0) + side * delta
+            if quantity:
+                self._positions[key] = quantity
+            else:
+                self._positions.pop(key, None)
+            price = report.get("fill_price")
+            if isinstance(price, (int, float)):
+                self._prices.setdefault(symbol, float(price))
+            callbacks = self._callbacks
+
+        result = self.evaluate()
+        for callback in callbacks:
+            try:
+                callback(result)
+            except Exception as e:
+                self.logger.error(f"Risk callback error: {str(e)}")
+
+    def attach(self, client):
+        """Follow a client's quotes and fills."""
+        client.add_quote_listener(self.on_quote)
+        client.add_trade_listener(self.on_report)
+
+    def detach(self, client):
+        """Stop following a client."""
+        client.remove_quote_listener(self.on_quote)
+        client.remove_trade_listener(self.on_report)
+
+    def _arrays(self):
+        """Gather positions and market data into aligned arrays."""
+        with self._lock:
+            items = [(key, quantity, self._instruments.get(key[1]))
+                     for key, quantity in self._positions.items()]
+        missing = sorted({key[1] for key, _, instrument in items if instrument is None})
+        if missing:
+            raise ValueError(f"No instrument for {', '.join(missing)}")
+
+        count = len(items)
+        arrays = {
+            "quantity": np.array([quantity for _, quantity, _ in items], dtype=float),
+            "multiplier": np.array([inst["multiplier"] for _, _, inst in items]),
+            "is_future": np.array([inst["kind"] == "future" for _, _, inst in items], dtype=bool),
+            "is_call": np.array([inst["kind"] == "call" for _, _, inst in items], dtype=bool),
+            "strike": np.array([inst["strike"] or 0.0 for _, _, inst in items], dtype=float),
+            "years": np.array([inst["years"] or 0.0 for _, _, inst in items], dtype=float),
+            "vol": np.array([self._vols.get(key[1], self.default_vol) for key, _, _ in items]),
+            "underlying": np.array([self._prices.get(inst["underlying"], np.nan)
+                                    for _, _, inst in items]),
+            "price": np.array([self._prices.get(key[1], np.nan) for key, _, _ in items])
+        }
+        if count and np.isnan(arrays["underlying"]).any():
+            unpriced = sorted({items[i][2]["underlying"] for i in np.flatnonzero(np.isnan(arrays["underlying"]))})
+            raise ValueError(f"No price for {', '.join(unpriced)}")
+        return items, arrays
+
+    def _rule_margin(self, items, arrays, short_premium: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-position initial and maintenance margin."""
+        params = [self.margin_table.get(inst["product"], {}) for _, _, inst in items]
+
+        def column(name, fallback=None):
+            return np.array([p.get(name, p.get(fallback, 0.0) if fallback else 0.0) for p in params],
+                            dtype=float)
+
+        underlying, strike = arrays["underlying"], arrays["strike"]
+        otm = np.where(arrays["is_call"], np.maximum(strike - underlying, 0.0),
+                       np.maximum(underlying - strike, 0.0)) * arrays["multiplier"]
+        short_option = ~arrays["is_future"] & (arrays["quantity"] < 0)
+        option_initial = short_premium + np.maximum(column("a") - otm, column("b"))
+        option_maintenance = short_premium + np.maximum(column("a_maintenance", "a") - otm,
+                                                        column("b_maintenance", "b"))
+        size = np.abs(arrays["quantity"])
+        initial = np.where(arrays["is_future"], column("initial"),
+                           np.where(short_option, option_initial, 0.0))
+        maintenance = np.where(arrays["is_future"], column("maintenance", "initial"),
+                               np.where(short_option, option_maintenance, 0.0))
+        return initial * size, maintenance * size
+
+    def evaluate(self) -> dict:
+        """
+        Compute margins and scenario PnL for the current positions.
+
+        Returns:
+            dict: Result (see module docstring), or {"error": ...} when
+                instruments or prices are missing
+        """
+        try:
+            items, arrays = self._arrays()
+        except ValueError as e:
+            return {"error": str(e)}
+
+        moves, shifts = self.moves, self.vol_shifts
+        scenario_move = np.repeat(moves, shifts.size)          # (scenarios,)
+        scenario_shift = np.tile(shifts, moves.size)
+        # Revalue each instrument once; positions in several accounts share it
+        symbols = np.array([key[1] for key, _, _ in items], dtype=object)
+        if items:
+            _, first, instrument_of = np.unique(symbols, return_index=True, return_inverse=True)
+        else:
+            first = instrument_of = np.zeros(0, dtype=int)
+        is_future = arrays["is_future"][first, None]
+        underlying = arrays["underlying"][first, None]
+        shocked = underlying * (1.0 + scenario_move[None, :])  # (instruments, scenarios)
+        vol = np.maximum(arrays["vol"][first, None] + scenario_shift[None, :], MIN_VOL)
+        strike, years = arrays["strike"][first, None], arrays["years"][first, None]
+        is_call = arrays["is_call"][first, None]
+
+        # Futures rows go through the option model too and are discarded
+        with np.errstate(all="ignore"):
+            model_now = black76(underlying, strike, years, arrays["vol"][first, None], is_call,
+                                rate=self.rate)["price"]
+            shocked_options = black76(shocked, strike, years, vol, is_call, rate=self.rate)["price"]
+        instrument_now = np.where(is_future, underlying, model_now)
+        instrument_change = np.where(is_future, shocked, shocked_options) - instrument_now
+
+        exposure = arrays["quantity"] * arrays["multiplier"]
+        position_pnl = instrument_change[instrument_of] * exposure[:, None]
+        pnl = position_pnl.sum(axis=0)
+        value_now = instrument_now[instrument_of, 0]
+
+        # Short option premium at the market price when quoted, else the model price
+        premium = np.where(np.isnan(arrays["price"]), value_now, arrays["price"])
+        short_premium = np.where(~arrays["is_future"], premium * arrays["multiplier"], 0.0)
+        initial, maintenance = self._rule_margin(items, arrays, short_premium)
+
+        accounts = sorted({key[0] for key, _, _ in items})
+        index = {account: n for n, account in enumerate(accounts)}
+        account_of = np.array([index[key[0]] for key, _, _ in items], dtype=int)
+        membership = np.zeros((len(accounts), len(items)))
+        membership[account_of, np.arange(len(items))] = 1.0
+        account_pnl = membership @ position_pnl
+        account_initial = np.bincount(account_of, initial, minlength=len(accounts))
+        account_maintenance = np.bincount(account_of, maintenance, minlength=len(accounts))
+
+        worst = int(np.argmin(pnl)) if pnl.size else 0
+        result = {
+            "initial_margin": float(initial.sum()),
+            "maintenance_margin": float(maintenance.sum()),
+            "scan_risk": float(max(0.0, -pnl.min())) if items else 0.0,
+            "moves": moves,
+            "vol_shifts": shifts,
+            "pnl": pnl.reshape(moves.size, shifts.size),
+            "worst": {"move": float(scenario_move[worst]), "vol_shift": float(scenario_shift[worst]),
+                      "pnl": float(pnl[worst]) if items else 0.0},
+            "by_account": {
+                account: {"initial_margin": float(account_initial[n]),
+                          "maintenance_margin": float(account_maintenance[n]),
+                          "scan_risk": float(max(0.0, -account_pnl[n].min()))}
+                for account, n in index.items()
+            },
+            "positions": [(key[0], key[1], quantity) for key, quantity, _ in items],
+            "position_pnl": position_pnl
+        }
+        self.last_result = result
+        return result
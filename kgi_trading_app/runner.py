@@ -0,0 +1,314 @@
+"""
+Process-Pool Strategy Runner
+
+This module fans quote events from one ``KGITradingClient`` session out to
+several strategy worker processes. Each worker owns a subset of symbols and
+can be pinned to a CPU core, so strategy code does not compete for the GIL
+with the SDK callback threads. Order intents produced by the workers are sent
+back to the parent and placed through the client's rate-limited order path.
+"""
+
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import zlib
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+# Workers report stats every N events, and at least this often while behind
+_STATS_EVERY = 256
+_STATS_INTERVAL = 0.1
+
+
+def _pin_to_core(core: Optional[int]) -> Optional[int]:
+    """Pin the current process to a core where the platform supports it."""
+    if core is None or not hasattr(os, "sched_setaffinity"):
+        return None
+    try:
+        os.sched_setaffinity(0, {core})
+        return core
+    except OSError:
+        return None
+
+
+def _worker_main(worker_id: int, core: Optional[int], strategy_factory: Callable,
+                 symbols: List[str], events, results):
+    """
+    Worker process loop.
+
+    Events are ``(symbol, quote, sent_ns)`` tuples; ``None`` stops the worker.
+    The strategy's ``on_quote`` may return an iterable of order intents.
+    """
+    pinned = _pin_to_core(core)
+    strategy = strategy_factory(worker_id, symbols)
+
+    processed = 0
+    reported = 0
+    reported_at = time.monotonic()
+    latency_total_ns = 0
+    latency_max_ns = 0
+
+    def report():
+        nonlocal reported, reported_at
+        reported, reported_at = processed, time.monotonic()
+        results.put(("stats", worker_id, {
+            "core": pinned,
+            "processed": processed,
+            "latency_total_ns": latency_total_ns,
+            "latency_max_ns": latency_max_ns
+        }))
+
+    while True:
+        try:
+            event = events.get(timeout=_STATS_INTERVAL)
+        except queue.Empty:
+            # Idle: publish progress the last periodic report missed
+            if processed != reported:
+                report()
+            continue
+        if event is None:
+            break
+
+        symbol, quote, sent_ns = event
+        try:
+            intents = strategy.on_quote(symbol, quote)
+        except Exception as e:
+            results.put(("error", worker_id, f"{symbol}: {str(e)}"))
+            intents = None
+
+        if intents:
+            for intent in intents:
+                results.put(("order", worker_id, intent))
+
+        latency = time.monotonic_ns() - sent_ns
+        processed += 1
+        latency_total_ns += latency
+        if latency > latency_max_ns:
+            latency_max_ns = latency
+        if (processed % _STATS_EVERY == 0 or
+                time.monotonic() - reported_at >= _STATS_INTERVAL):
+            report()
+
+    if hasattr(strategy, "close"):
+        strategy.close()
+    report()
+
+
+class StrategyRunner:
+    """
+    Fan quote events from one client session out to strategy processes.
+
+    ``strategy_factory(worker_id, symbols)`` runs inside each worker and must
+    be picklable (a module-level function or class). The object it returns
+    needs an ``on_quote(symbol, quote)`` method that returns order intents
+    (or None). The parent turns each intent into ``(contract, order)`` with
+    ``order_factory`` and places it through ``client.place_order``.
+    """
+
+    def __init__(self, client, strategy_factory: Callable,
+                 order_factory: Optional[Callable[[dict], tuple]] = None,
+                 num_workers: Optional[int] = None,
+                 assignments: Optional[Dict[str, int]] = None,
+                 pin_cores: bool = True):
+        """
+        Initialize the strategy runner.
+
+        Args:
+            client (KGITradingClient): Session providing quotes and the order path
+            strategy_factory (Callable): Builds the strategy inside each worker
+            order_factory (Callable): Maps an intent to (contract, order) (default: orders are logged only)
+            num_workers (int): Number of worker processes (default: CPU count - 1)
+            assignments (dict): Explicit symbol -> worker index map (default: hash by symbol)
+            pin_cores (bool): Pin each worker to its own core where supported (default: True)
+        """
+        cpu_count = os.cpu_count() or 1
+        self.client = client
+        self.strategy_factory = strategy_factory
+        self.order_factory = order_factory
+        self.num_workers = num_workers or max(1, cpu_count - 1)
+        self.assignments = dict(assignments or {})
+        self.pin_cores = pin_cores
+        self.logger = logging.getLogger(__name__)
+
+        self._ctx = multiprocessing.get_context("spawn")
+        self._processes = []
+        self._event_queues = []
+        self._results = None
+        self._collector = None
+        self._running = False
+        self._sent = [0] * self.num_workers
+        self._orders = [0] * self.num_workers
+        self._worker_stats = [{} for _ in range(self.num_workers)]
+        self._stats_lock = threading.Lock()
+
+    def worker_for(self, symbol: str) -> int:
+        """
+        Get the worker index that owns a symbol.
+
+        Args:
+            symbol (str): Symbol code
+
+        Returns:
+            int: Worker index
+        """
+        worker = self.assignments.get(symbol)
+        if worker is None:
+            worker = zlib.crc32(symbol.encode("utf-8")) % self.num_workers
+        return worker
+
+    def start(self, symbols: Iterable[str] = ()):
+        """
+        Start the worker processes and subscribe to the client's quotes.
+
+        Args:
+            symbols (Iterable[str]): Known symbols, passed to each owning worker's factory
+        """
+        if self._running:
+            return
+
+        with self._stats_lock:
+            self._sent = [0] * self.num_workers
+            self._orders = [0] * self.num_workers
+            self._worker_stats = [{} for _ in range(self.num_workers)]
+
+        owned = [[] for _ in range(self.num_workers)]
+        for symbol in symbols:
+            owned[self.worker_for(symbol)].append(symbol)
+
+        cpu_count = os.cpu_count() or 1
+        self._results = self._ctx.Queue()
+        for worker_id in range(self.num_workers):
+            events = self._ctx.Queue()
+            core = (worker_id + 1) % cpu_count if self.pin_cores else None
+            process = self._ctx.Process(
+                target=_worker_main,
+                args=(worker_id, core, self.strategy_factory, owned[worker_id],
+                      events, self._results),
+                name=f"strategy-worker-{worker_id}",
+                daemon=True
+            )
+            process.start()
+            self._event_queues.append(events)
+            self._processes.append(process)
+
+        with self._stats_lock:
+            self._running = True
+        self._collector = threading.Thread(target=self._collect, name="strategy-collector",
+                                           daemon=True)
+        self._collector.start()
+        self.client.add_quote_listener(self.on_quote)
+        self.logger.info(f"Strategy runner started with {self.num_workers} workers")
+
+    def on_quote(self, symbol: str, quote: dict):
+        """
+        Route a quote to the worker that owns the symbol.
+
+        Args:
+            symbol (str): Symbol code
+            quote (dict): Normalized quote fields
+        """
+        worker = self.worker_for(symbol)
+        # Quotes arrive on several SDK threads; stop() clears the queues under the same lock
+        with self._stats_lock:
+            if not self._running:
+                return
+            self._event_queues[worker].put((symbol, quote, time.monotonic_ns()))
+            self._sent[worker] += 1
+
+    def _collect(self):
+        """Handle order intents, errors and stats coming back from the workers."""
+        while True:
+            try:
+                item = self._results.get(timeout=0.5)
+            except queue.Empty:
+                # stop() ends the loop with None once the workers' final stats are in
+                continue
+            except (EOFError, OSError):
+                break
+
+            if item is None:
+                break
+
+            kind, worker_id, payload = item
+            if kind == "order":
+                self._orders[worker_id] += 1
+                self._submit(worker_id, payload)
+            elif kind == "stats":
+                with self._stats_lock:
+                    self._worker_stats[worker_id] = payload
+            elif kind == "error":
+                self.logger.error(f"Strategy worker {worker_id} error: {payload}")
+
+    def _submit(self, worker_id: int, intent: dict):
+        if self.order_factory is None:
+            self.logger.info(f"Worker {worker_id} order intent (no order factory): {intent}")
+            return
+        try:
+            contract, order = self.order_factory(intent)
+        except Exception as e:
+            self.logger.error(f"Worker {worker_id} invalid order intent {intent}: {str(e)}")
+            return
+        self.client.place_order(contract, order)
+
+    def get_stats(self) -> List[dict]:
+        """
+        Get per-worker latency and backlog statistics.
+
+        Returns:
+            List[dict]: One entry per worker with sent, processed, backlog,
+            average and maximum quote-to-strategy latency in microseconds
+        """
+        stats = []
+        with self._stats_lock:
+            for worker_id in range(self.num_workers):
+                worker = self._worker_stats[worker_id]
+                processed = worker.get("processed", 0)
+                total_ns = worker.get("latency_total_ns", 0)
+                stats.append({
+                    "worker_id": worker_id,
+                    "core": worker.get("core"),
+                    "alive": (worker_id < len(self._processes)
+                              and self._processes[worker_id].is_alive()),
+                    "sent": self._sent[worker_id],
+                    "processed": processed,
+                    "backlog": self._sent[worker_id] - processed,
+                    "orders": self._orders[worker_id],
+                    "latency_avg_us": total_ns / processed / 1000 if processed else 0.0,
+                    "latency_max_us": worker.get("latency_max_ns", 0) / 1000
+                })
+        return stats
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Stop the workers and unsubscribe from the client's quotes.
+
+        Args:
+            timeout (float): Seconds to wait for each worker to drain (default: 5)
+        """
+        if not self._running:
+            return
+
+        self.client.remove_quote_listener(self.on_quote)
+        with self._stats_lock:
+            self._running = False
+        for events in self._event_queues:
+            events.put(None)
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                self.logger.warning(f"Terminating unresponsive worker {process.name}")
+                process.terminate()
+
+        self._results.put(None)
+        self._collector.join(timeout)
+
+        # Counters stay readable until the next start() resets them
+        with self._stats_lock:
+            self._processes = []
+            self._event_queues = []
+        self._results = None
+        self._collector = None
+        self.logger.info("Strategy runner stopped")
@@ -0,0 +1,373 @@
+"""
+Market Scanner
+
+This module evaluates screening expressions as NumPy operations over a
+columnar table of symbols fed by ``KGITradingClient.get_snapshots()``, the
+client's quote stream or a ``QuoteBoardReader``. Only rows that changed since
+the previous pass are re-evaluated.
+
+Screens are either callables taking a column dict or expression strings::
+
+    scanner = Scanner()
+    scanner.load_snapshots(client.get_snapshots(universe))
+    scanner.add_screen("gappers", "gap_pct > 3 and volume_ratio > 2")
+    scanner.add_screen("tight", "spread_pct < 0.2 and 50 <= close <= 500")
+    client.add_quote_listener(scanner.on_quote)
+    result = scanner.scan()   # {"gappers": {"matches", "entered", "exited"}, ...}
+
+Expression strings may use column names, numbers, arithmetic, comparisons
+(including chains), ``and``/``or``/``not`` (applied element-wise) and the
+functions in ``FUNCTIONS``. Anything else is rejected when the screen is added.
+
+Base columns: open, high, low, close, volume, bid, ask, prev_close,
+avg_volume. Derived columns: mid, spread, spread_pct, change_pct, gap_pct,
+range_pct, volume_ratio. Fill prev_close and avg_volume (e.g. from the K-bar
+cache) with ``update_columns()``.
+"""
+
+import ast
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+
+BASE_COLUMNS = ("open", "high", "low", "close", "volume", "bid", "ask",
+                "prev_close", "avg_volume")
+DERIVED_COLUMNS = ("mid", "spread", "spread_pct", "change_pct", "gap_pct",
+                   "range_pct", "volume_ratio")
+FUNCTIONS = {"abs": np.abs, "minimum": np.minimum, "maximum": np.maximum,
+             "log": np.log, "sqrt": np.sqrt, "isnan": np.isnan}
+
+# Quote listener keys -> scanner columns
+_QUOTE_COLUMNS = {"last": "close", "bid": "bid", "ask": "ask", "volume": "volume"}
+
+
+def _percent(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, numerator / denominator * 100.0, np.nan)
+
+
+def derive_columns(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Add derived columns to a column dict (in place).
+
+    Args:
+        columns (Dict[str, np.ndarray]): Base columns
+
+    Returns:
+        Dict[str, np.ndarray]: The same dict with derived columns added
+    """
+    bid, ask, close = columns["bid"], columns["ask"], columns["close"]
+    prev_close = columns["prev_close"]
+    mid = (bid + ask) / 2.0
+    columns["mid"] = mid
+    columns["spread"] = ask - bid
+    columns["spread_pct"] = _percent(ask - bid, mid)
+    columns["change_pct"] = _percent(close - prev_close, prev_close)
+    columns["gap_pct"] = _percent(columns["open"] - prev_close, prev_close)
+    columns["range_pct"] = _percent(columns["high"] - columns["low"], columns["low"])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_volume = columns["avg_volume"]
+        columns["volume_ratio"] = np.where(avg_volume > 0, columns["volume"] / avg_volume, np.nan)
+    return columns
+
+
+class _ElementWise(ast.NodeTransformer):
+    """Rewrite boolean operators and comparison chains as element-wise ops."""
+
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        op = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+        result = node.values[0]
+        for value in node.values[1:]:
+            result = ast.BinOp(left=result, op=op, right=value)
+        return result
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            return ast.UnaryOp(op=ast.Invert(), operand=node.operand)
+        return node
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        if len(node.ops) == 1:
+            return node
+        parts = []
+        left = node.left
+        for op, right in zip(node.ops, node.comparators):
+            parts.append(ast.Compare(left=left, ops=[op], comparators=[right]))
+            left = right
+        result = parts[0]
+        for part in parts[1:]:
+            result = ast.BinOp(left=result, op=ast.BitAnd(), right=part)
+        return result
+
+
+_ALLOWED_NODES = (ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not,
+                  ast.USub, ast.UAdd, ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div,
+                  ast.Pow, ast.Mod, ast.Compare, ast.Gt, ast.GtE, ast.Lt, ast.LtE,
+                  ast.Eq, ast.NotEq, ast.Name, ast.Load, ast.Constant, ast.Call)
+
+
+def compile_expression(expression: str) -> Callable[[Dict[str, np.ndarray]], np.ndarray]:
+    """
+    Compile a screening expression into a function of a column dict.
+
+    Args:
+        expression (str): Expression such as "gap_pct > 3 and volume > 1e6"
+
+    Returns:
+        Callable: screen(columns) -> bool array
+
+    Raises:
+        ValueError: If the expression uses unsupported syntax or names
+    """
+    try:
+        tree = ast.parse(expression, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid screen expression: {e.msg}")
+
+    known = set(BASE_COLUMNS) | set(DERIVED_COLUMNS)
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"Unsupported syntax in screen expression: {type(node).__name__}")
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS or node.keywords:
+                raise ValueError(f"Unsupported function call in screen expression: {ast.dump(node.func)}")
+        elif isinstance(node, ast.Name) and node.id not in known and node.id not in FUNCTIONS:
+            raise ValueError(f"Unknown column in screen expression: {node.id}")
+        elif isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            raise ValueError(f"Unsupported constant in screen expression: {node.value!r}")
+
+    tree = ast.fix_missing_locations(_ElementWise().visit(tree))
+    code = compile(tree, "<screen>", "eval")
+
+    def screen(columns):
+        namespace = dict(FUNCTIONS)
+        namespace.update(columns)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return eval(code, {"__builtins__": {}}, namespace)
+    return screen
+
+
+class Scanner:
+    """
+    Incremental, vectorized screen evaluator.
+
+    Updates and scans are serialized with a lock, so quotes may arrive on SDK
+    callback threads while another thread scans.
+    """
+
+    def __init__(self, symbols: Optional[List[str]] = None, capacity: int = 1024):
+        """
+        Initialize the scanner.
+
+        Args:
+            symbols (List[str]): Initial symbols (more are added as they appear)
+            capacity (int): Initial row capacity (default: 1024)
+        """
+        self._capacity = max(capacity, len(symbols or ()), 1)
+        self._columns = {name: np.full(self._capacity, np.nan) for name in BASE_COLUMNS}
+        self._dirty = np.zeros(self._capacity, dtype=bool)
+        self._rows: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._screens: Dict[str, Callable] = {}
+        self._results: Dict[str, np.ndarray] = {}
+        self._stale_screens = set()
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+        for symbol in symbols or ():
+            self._row_for(symbol)
+
+    def _grow(self, needed: int):
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+        extra = capacity - self._capacity
+        for name, column in self._columns.items():
+            self._columns[name] = np.concatenate([column, np.full(extra, np.nan)])
+        self._dirty = np.concatenate([self._dirty, np.zeros(extra, dtype=bool)])
+        for name, result in self._results.items():
+            self._results[name] = np.concatenate([result, np.zeros(extra, dtype=bool)])
+        self._capacity = capacity
+
+    def _row_for(self, symbol: str) -> int:
+        row = self._rows.get(symbol)
+        if row is None:
+            row = len(self._symbols)
+            if row >= self._capacity:
+                self._grow(row + 1)
+            self._symbols.append(symbol)
+            self._rows[symbol] = row
+            self._dirty[row] = True
+        return row
+
+    @property
+    def symbols(self) -> List[str]:
+        """Symbols in row order."""
+        return list(self._symbols)
+
+    def add_screen(self, name: str, screen: Union[str, Callable]):
+        """
+        Add or replace a screen.
+
+        Args:
+            name (str): Screen name
+            screen (str or Callable): Expression string or callable(columns) -> bool array
+
+        Raises:
+            ValueError: If an expression string is invalid
+        """
+        if isinstance(screen, str):
+            screen = compile_expression(screen)
+        with self._lock:
+            self._screens[name] = screen
+            self._results[name] = np.zeros(self._capacity, dtype=bool)
+            self._stale_screens.add(name)
+
+    def remove_screen(self, name: str):
+        """Remove a screen."""
+        with self._lock:
+            self._screens.pop(name, None)
+            self._results.pop(name, None)
+            self._stale_screens.discard(name)
+
+    def update(self, symbol: str, **values):
+        """
+        Update base columns for one symbol.
+
+        Args:
+            symbol (str): Symbol code
+            **values: Column values (e.g. close=601.0, volume=12000)
+        """
+        with self._lock:
+            row = self._row_for(symbol)
+            columns = self._columns
+            for name, value in values.items():
+                column = columns.get(name)
+                if column is None:
+                    raise ValueError(f"Unknown scanner column: {name}")
+                if value is not None and column[row] != value:
+                    column[row] = value
+                    self._dirty[row] = True
+
+    def update_columns(self, symbols, **columns):
+        """
+        Update many symbols at once from aligned arrays.
+
+        Only rows whose values actually changed are marked for re-evaluation.
+
+        Args:
+            symbols: Symbol codes aligned with the arrays
+            **columns: Column name -> array of values
+        """
+        unknown = set(columns) - set(BASE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown scanner column: {sorted(unknown)[0]}")
+        with self._lock:
+            rows = np.fromiter((self._row_for(symbol) for symbol in symbols), dtype=np.intp)
+            for name, values in columns.items():
+                column = self._columns[name]
+                values = np.asarray(values, dtype=np.float64)
+                current = column[rows]
+                changed = ~((current == values) | (np.isnan(current) & np.isnan(values)))
+                if changed.any():
+                    column[rows[changed]] = values[changed]
+                    self._dirty[rows[changed]] = True
+
+    def load_snapshots(self, snapshots: dict):
+        """
+        Update from a KGITradingClient.get_snapshots() result.
+
+        Rows that failed to fetch are skipped. The snapshot's close and
+        change_price also fill prev_close.
+
+        Args:
+            snapshots (dict): Columnar snapshot result
+        """
+        ok = np.asarray(snapshots["ok"], dtype=bool)
+        symbols = np.asarray(snapshots["symbol"], dtype=object)[ok]
+        columns = {name: np.asarray(snapshots[name])[ok]
+                   for name in ("open", "high", "low", "close", "volume", "bid", "ask")}
+        if "change_price" in snapshots:
+            change = np.asarray(snapshots["change_price"])[ok]
+            columns["prev_close"] = np.where(np.isnan(change), np.nan, columns["close"] - change)
+        self.update_columns(symbols, **columns)
+
+    def on_quote(self, symbol: str, quote: dict):
+        """
+        Quote listener compatible with ``KGITradingClient.add_quote_listener``.
+
+        Args:
+            symbol (str): Symbol code
+            quote (dict): Normalized quote with last/bid/ask/volume keys
+        """
+        self.update(symbol, **{column: quote[key] for key, column in _QUOTE_COLUMNS.items()
+                               if key in quote})
+
+    def load_quote_board(self, reader):
+        """
+        Update from every symbol on a shared-memory quote board.
+
+        Args:
+            reader (QuoteBoardReader): Board reader
+        """
+        for symbol, quote in reader.snapshot_all().items():
+            self.on_quote(symbol, quote)
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Get a copy of all base and derived columns for the current symbols."""
+        with self._lock:
+            count = len(self._symbols)
+            base = {name: column[:count].copy() for name, column in self._columns.items()}
+        return derive_columns(base)
+
+    def scan(self) -> Dict[str, dict]:
+        """
+        Re-evaluate screens for changed rows (and new screens for all rows).
+
+        Returns:
+            Dict[str, dict]: screen -> {"matches", "entered", "exited"} symbol lists
+        """
+        with self._lock:
+            return self._scan()
+
+    def _scan(self) -> Dict[str, dict]:
+        count = len(self._symbols)
+        all_rows = np.arange(count)
+        dirty_rows = np.flatnonzero(self._dirty[:count])
+        subsets = {}
+        results = {}
+
+        for name, screen in self._screens.items():
+            stale = name in self._stale_screens
+            rows = all_rows if stale else dirty_rows
+            result = self._results[name]
+            before = result[rows].copy()
+            after = before
+
+            if len(rows):
+                columns = subsets.get(stale)
+                if columns is None:
+                    columns = subsets[stale] = derive_columns(
+                        {column: values[rows] for column, values in self._columns.items()})
+                try:
+                    after = np.broadcast_to(np.asarray(screen(columns), dtype=bool), rows.shape)
+                except Exception as e:
+                    self.logger.error(f"Screen '{name}' failed: {str(e)}")
+                    after = np.zeros(len(rows), dtype=bool)
+                result[rows] = after
+
+            symbols = self._symbols
+            results[name] = {
+                "matches": [symbols[i] for i in np.flatnonzero(result[:count])],
+                "entered": [symbols[i] for i in rows[after & ~before]],
+                "exited": [symbols[i] for i in rows[before & ~after]]
+            }
+
+        self._dirty[:count] = False
+        self._stale_screens.clear()
+        return results
@@ -0,0 +1,343 @@
+"""
+Prioritized Request Scheduler
+
+All SDK calls in a process share one ``api`` session. ``RequestScheduler``
+arbitrates between them: requests are queued per priority class (cancel,
+order, interactive query, background) and a fixed pool of workers always
+starts the highest-priority request whose class is below its concurrency
+limit. Cancels also have workers of their own, so a cancel starts at once
+even when orders and queries occupy every shared worker.
+
+Requests may carry a deadline; one that has not started by then is
+dropped with ``DeadlineExceeded`` instead of running late. Queue and run
+times are recorded per class in the same log-bucketed histograms as order
+latency (see latency.py).
+
+``ScheduledClient`` puts the scheduler in front of ``KGITradingClient``::
+
+    scheduler = RequestScheduler()
+    client = ScheduledClient(KGITradingClient(), scheduler)
+    client.cancel_order(trade)                           # cancel class
+    client.get_snapshots(symbols, priority=Priority.BACKGROUND)
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from enum import IntEnum
+from typing import Callable, Dict, Optional
+
+from .latency import LatencyHistogram
+
+
+class Priority(IntEnum):
+    """Request classes, most urgent first."""
+
+    CANCEL = 0
+    ORDER = 1
+    INTERACTIVE = 2
+    BACKGROUND = 3
+
+
+DEFAULT_LIMITS = {Priority.CANCEL: 2, Priority.ORDER: 4, Priority.INTERACTIVE: 2,
+                  Priority.BACKGROUND: 1}
+
+
+class DeadlineExceeded(TimeoutError):
+    """A request's deadline passed before it started."""
+
+
+class _Request:
+    __slots__ = ("priority", "fn", "args", "kwargs", "future", "deadline", "queued_ns")
+
+    def __init__(self, priority, fn, args, kwargs, deadline):
+        self.priority = priority
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+        self.deadline = deadline
+        self.queued_ns = time.monotonic_ns()
+
+
+class RequestScheduler:
+    """
+    Priority queues with per-class concurrency limits in front of one SDK session.
+    """
+
+    def __init__(self, max_workers: int = 6, limits: Optional[Dict[Priority, int]] = None):
+        """
+        Initialize the scheduler and start its workers.
+
+        Args:
+            max_workers (int): Workers shared by all classes (default: 6); another
+                limits[Priority.CANCEL] workers serve only cancels
+            limits (Dict[Priority, int]): Per-class concurrency limits (default: DEFAULT_LIMITS)
+        """
+        self.max_workers = max_workers
+        self.limits = dict(DEFAULT_LIMITS)
+        if limits:
+            self.limits.update(limits)
+        self._queues = {priority: deque() for priority in Priority}
+        self._running = {priority: 0 for priority in Priority}
+        self._counts = {priority: {"submitted": 0, "completed": 0, "failed": 0, "expired": 0,
+                                    "cancelled": 0}
+                        for priority in Priority}
+        self._queue_ns = {priority: LatencyHistogram() for priority in Priority}
+        self._run_ns = {priority: LatencyHistogram() for priority in Priority}
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._closed = False
+        self.logger = logging.getLogger(__name__)
+
+        self._workers = [threading.Thread(target=self._work, args=(tuple(Priority),),
+                                          name=f"scheduler-{n}", daemon=True)
+                         for n in range(max_workers)]
+        self._workers += [threading.Thread(target=self._work, args=((Priority.CANCEL,),),
+                                           name=f"scheduler-cancel-{n}", daemon=True)
+                          for n in range(self.limits[Priority.CANCEL])]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, priority: Priority, fn: Callable, *args, deadline: Optional[float] = None,
+               **kwargs) -> Future:
+        """
+        Queue a call.
+
+        Args:
+            priority (Priority): Request class
+            fn (Callable): Function to call
+            *args: Positional arguments for fn
+            deadline (float): Seconds from now by which the call must start (default: none)
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Future: Result of fn; fails with DeadlineExceeded if it never started
+        """
+        priority = Priority(priority)
+        expires = None if deadline is None else time.monotonic_ns() + int(deadline * 1e9)
+        request = _Request(priority, fn, args, kwargs, expires)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Scheduler is shut down")
+            self._queues[priority].append(request)
+            self._counts[priority]["submitted"] += 1
+            # Wake everyone: a cancel-only worker cannot take other classes
+            self._ready.notify_all()
+        return request.future
+
+    def call(self, priority: Priority, fn: Callable, *args, deadline: Optional[float] = None,
+             **kwargs):
+        """
+        Queue a call and wait for its result.
+
+        Args:
+            priority (Priority): Request class
+            fn (Callable): Function to call
+            *args: Positional arguments for fn
+            deadline (float): Seconds from now by which the call must start (default: none)
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            The result of fn (exceptions, including DeadlineExceeded, propagate)
+        """
+        future = self.submit(priority, fn, *args, deadline=deadline, **kwargs)
+        if deadline is not None:
+            # Give up at the deadline even while every worker is busy
+            try:
+                return future.result(timeout=deadline)
+            except TimeoutError:
+                if future.cancel():
+                    raise DeadlineExceeded(
+                        f"{Priority(priority).name.lower()} request waited past its deadline")
+        return future.result()
+
+    def _next_request(self, classes) -> Optional[_Request]:
+        """Pop the most urgent startable request, expiring stale ones. Caller holds the lock."""
+        # Every worker expires every class, so a deadline is honoured even
+        # while all workers that could run the request are busy.
+        now = time.monotonic_ns()
+        for priority, queue in self._queues.items():
+            while queue and queue[0].deadline is not None and queue[0].deadline < now:
+                expired = queue.popleft()
+                self._counts[priority]["expired"] += 1
+                # call() may already have given up on it
+                if expired.future.set_running_or_notify_cancel():
+                    expired.future.set_exception(DeadlineExceeded(
+                        f"{priority.name.lower()} request waited past its deadline"))
+        for priority in classes:
+            queue = self._queues[priority]
+            if queue and self._running[priority] < self.limits[priority]:
+                return queue.popleft()
+        return None
+
+    def _work(self, classes):
+        while True:
+            with self._lock:
+                request = self._next_request(classes)
+                while request is None:
+                    if self._closed and not any(self._queues[priority] for priority in classes):
+                        return
+                    self._ready.wait(self._next_expiry())
+                    request = self._next_request(classes)
+                priority = request.priority
+                self._running[priority] += 1
+
+            started_ns = time.monotonic_ns()
+            if request.future.set_running_or_notify_cancel():
+                try:
+                    result = request.fn(*request.args, **request.kwargs)
+                except BaseException as e:
+                    request.future.set_exception(e)
+                    outcome = "failed"
+                else:
+                    request.future.set_result(result)
+                    outcome = "completed"
+            elif request.deadline is not None and request.deadline < started_ns:
+                outcome = "expired"
+            else:
+                outcome = "cancelled"
+            finished_ns = time.monotonic_ns()
+
+            with self._lock:
+                self._running[priority] -= 1
+                self._counts[priority][outcome] += 1
+                self._queue_ns[priority].record(started_ns - request.queued_ns)
+                self._run_ns[priority].record(finished_ns - started_ns)
+                # A finished request may unblock its class for another worker
+                self._ready.notify_all()
+
+    def _next_expiry(self) -> Optional[float]:
+        """Seconds until the earliest queued deadline. Caller holds the lock."""
+        deadlines = [queue[0].deadline for queue in self._queues.values()
+                     if queue and queue[0].deadline is not None]
+        if not deadlines:
+            return None
+        return max(0.0, (min(deadlines) - time.monotonic_ns()) / 1e9)
+
+    def metrics(self, reset: bool = False) -> dict:
+        """
+        Get per-class queue state, counts and timing.
+
+        Args:
+            reset (bool): Start new histograms and counts after reading (default: False)
+
+        Returns:
+            dict: {class name: {"queued", "running", "limit", "submitted",
+                "completed", "failed", "expired", "cancelled", "queue_ns", "run_ns"}}
+        """
+        with self._lock:
+            result = {}
+            for priority in Priority:
+                stats = {"queued": len(self._queues[priority]),
+                         "running": self._running[priority],
+                         "limit": self.limits[priority]}
+                stats.update(self._counts[priority])
+                stats["queue_ns"] = self._queue_ns[priority].to_dict()
+                stats["run_ns"] = self._run_ns[priority].to_dict()
+                result[priority.name.lower()] = stats
+                if reset:
+                    self._counts[priority] = {key: 0 for key in self._counts[priority]}
+                    self._queue_ns[priority] = LatencyHistogram()
+                    self._run_ns[priority] = LatencyHistogram()
+            return result
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = True, timeout: float = 5.0):
+        """
+        Stop accepting requests and stop the workers.
+
+        Args:
+            wait (bool): Join the workers (default: True)
+            cancel_pending (bool): Cancel queued requests instead of running them (default: True)
+            timeout (float): Seconds to wait for all workers together (default: 5)
+        """
+        with self._lock:
+            self._closed = True
+            if cancel_pending:
+                for priority, queue in self._queues.items():
+                    self._counts[priority]["cancelled"] += len(queue)
+                    while queue:
+                        queue.popleft().future.cancel()
+            self._ready.notify_all()
+        if wait:
+            end = time.monotonic() + timeout
+            for worker in self._workers:
+                worker.join(max(0.0, end - time.monotonic()))
+
+    def register_shutdown(self, manager=None, name: str = "request-scheduler",
+                          timeout: float = 1.0):
+        """
+        Stop the scheduler before the client session is torn down.
+
+        Args:
+            manager (ShutdownManager): Manager to use (default: the process-wide manager)
+            name (str): Hook name (default: "request-scheduler")
+            timeout (float): Seconds to wait for running calls (default: 1); a
+                stuck SDK call is left behind on its daemon worker
+        """
+        from .shutdown import get_shutdown_manager, PRIORITY_SESSION
+
+        # Runs just before logout so no queued call races the teardown; the
+        # joins stop short of the hook timeout so the hook itself reports ok
+        join_timeout = timeout * 0.75
+        (manager or get_shutdown_manager()).register(
+            name, lambda: self.shutdown(timeout=join_timeout), priority=PRIORITY_SESSION - 1,
+            timeout=timeout)
+
+
+class ScheduledClient:
+    """
+    ``KGITradingClient`` wrapper that routes SDK calls through a scheduler.
+
+    Failures keep the client's conventions: a dropped order returns None, a
+    dropped cancel False and a dropped query {"error": ...}. Attributes not
+    wrapped here pass through to the client unscheduled.
+    """
+
+    def __init__(self, client, scheduler: RequestScheduler):
+        """
+        Initialize the wrapper.
+
+        Args:
+            client (KGITradingClient): Client to wrap
+            scheduler (RequestScheduler): Scheduler shared by every caller of the session
+        """
+        self.client = client
+        self.scheduler = scheduler
+        self.logger = logging.getLogger(__name__)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    def _call(self, priority: Priority, deadline: Optional[float], failure, fn, *args, **kwargs):
+        try:
+            return self.scheduler.call(priority, fn, *args, deadline=deadline, **kwargs)
+        except DeadlineExceeded as e:
+            self.logger.error(f"{fn.__name__} dropped: {str(e)}")
+            return failure(str(e))
+
+    def place_order(self, contract, order, timeout: Optional[float] = None,
+                    deadline: Optional[float] = None):
+        """Place an order in the order class (see KGITradingClient.place_order)."""
+        return self._call(Priority.ORDER, deadline, lambda error: None,
+                          self.client.place_order, contract, order, timeout=timeout)
+
+    def cancel_order(self, trade, timeout: Optional[float] = None,
+                     deadline: Optional[float] = None) -> bool:
+        """Cancel an order in the cancel class (see KGITradingClient.cancel_order)."""
+        return self._call(Priority.CANCEL, deadline, lambda error: False,
+                          self.client.cancel_order, trade, timeout=timeout)
+
+    def get_account_balance(self, account=None, priority: Priority = Priority.INTERACTIVE,
+                            deadline: Optional[float] = None) -> dict:
+        """Query a balance (see KGITradingClient.get_account_balance)."""
+        return self._call(priority, deadline, lambda error: {"error": error},
+                          self.client.get_account_balance, account)
+
+    def get_snapshots(self, symbols, priority: Priority = Priority.INTERACTIVE,
+                      deadline: Optional[float] = None, **options) -> dict:
+        """Query bulk snapshots (see KGITradingClient.get_snapshots)."""
+        return self._call(priority, deadline, lambda error: {"error": error},
+                          self.client.get_snapshots, symbols, **options)
@@ -0,0 +1,183 @@
+"""
+Graceful Shutdown
+
+This module coordinates a bounded-time application shutdown. Components
+register hooks with a priority; hooks run in ascending priority order, each
+on a helper thread so one hanging SDK call cannot block the rest. Remaining
+non-daemon threads are then joined with a timeout. The process only falls
+back to a hard ``os._exit`` when something is still stuck.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+# Hooks run in ascending priority order.
+PRIORITY_SESSION = 10   # logout and SDK teardown
+PRIORITY_FLUSH = 50     # journals, metrics, traces, profiles
+PRIORITY_CLOSE = 90     # files, shared memory
+
+
+class ShutdownManager:
+    """Runs registered shutdown hooks under a global deadline."""
+
+    def __init__(self, deadline: float = 10.0, thread_join_timeout: float = 2.0):
+        """
+        Initialize the shutdown manager.
+
+        Args:
+            deadline (float): Total seconds allowed for all hooks (default: 10)
+            thread_join_timeout (float): Seconds allowed for joining threads (default: 2)
+        """
+        self.deadline = deadline
+        self.thread_join_timeout = thread_join_timeout
+        self.last_report: Optional[dict] = None
+        self.logger = logging.getLogger(__name__)
+
+        self._hooks: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._order = 0
+
+    def register(self, name: str, callback: Callable[[], None],
+                 priority: int = PRIORITY_FLUSH, timeout: Optional[float] = None):
+        """
+        Register (or replace) a shutdown hook.
+
+        Args:
+            name (str): Unique hook name
+            callback (Callable): Function to run at shutdown
+            priority (int): Lower runs first (default: PRIORITY_FLUSH)
+            timeout (float): Maximum seconds for this hook (default: remaining deadline)
+        """
+        with self._lock:
+            self._order += 1
+            self._hooks[name] = (priority, self._order, callback, timeout)
+
+    def unregister(self, name: str):
+        """
+        Remove a shutdown hook.
+
+        Args:
+            name (str): Hook name passed to register
+        """
+        with self._lock:
+            self._hooks.pop(name, None)
+
+    def _run_hook(self, name: str, callback: Callable, timeout: float) -> dict:
+        result = {"name": name, "status": "ok", "elapsed_s": 0.0}
+        errors: List[str] = []
+
+        def target():
+            try:
+                callback()
+            except Exception as e:
+                errors.append(str(e))
+
+        started = time.monotonic()
+        worker = threading.Thread(target=target, name=f"shutdown-{name}", daemon=True)
+        worker.start()
+        worker.join(max(0.0, timeout))
+        result["elapsed_s"] = round(time.monotonic() - started, 4)
+
+        if worker.is_alive():
+            result["status"] = "timeout"
+        elif errors:
+            result["status"] = "error"
+            result["error"] = errors[0]
+        return result
+
+    def shutdown(self, deadline: Optional[float] = None) -> dict:
+        """
+        Run all hooks, then join remaining non-daemon threads.
+
+        Args:
+            deadline (float): Total seconds for hooks (default: the manager's deadline)
+
+        Returns:
+            dict: Per-hook results, per-phase timings, stuck threads and a
+            ``clean`` flag that is False if anything timed out
+        """
+        deadline = self.deadline if deadline is None else deadline
+        started = time.monotonic()
+        end = started + deadline
+
+        with self._lock:
+            hooks = sorted(self._hooks.items(), key=lambda item: item[1][:2])
+            self._hooks.clear()
+
+        hook_results = []
+        for name, (priority, _, callback, timeout) in hooks:
+            remaining = end - time.monotonic()
+            budget = remaining if timeout is None else min(timeout, remaining)
+            if budget <= 0:
+                hook_results.append({"name": name, "status": "skipped", "elapsed_s": 0.0})
+                continue
+            result = self._run_hook(name, callback, budget)
+            result["priority"] = priority
+            hook_results.append(result)
+            self.logger.info(f"Shutdown hook {name}: {result['status']} ({result['elapsed_s']}s)")
+
+        hooks_done = time.monotonic()
+
+        join_end = hooks_done + self.thread_join_timeout
+        current = threading.current_thread()
+        for thread in threading.enumerate():
+            if thread is current or thread.daemon or thread is threading.main_thread():
+                continue
+            thread.join(max(0.0, join_end - time.monotonic()))
+        stuck = [thread.name for thread in threading.enumerate()
+                 if thread is not current and not thread.daemon
+                 and thread is not threading.main_thread() and thread.is_alive()]
+
+        finished = time.monotonic()
+        report = {
+            "hooks": hook_results,
+            "phases": {
+                "hooks_s": round(hooks_done - started, 4),
+                "thread_join_s": round(finished - hooks_done, 4),
+                "total_s": round(finished - started, 4)
+            },
+            "stuck_threads": stuck,
+            "clean": not stuck and all(result["status"] in ("ok", "error")
+                                       for result in hook_results)
+        }
+        self.last_report = report
+        self.logger.info(f"Shutdown phases: {report['phases']}")
+        return report
+
+    def exit(self, code: int = 0, deadline: Optional[float] = None):
+        """
+        Shut down and exit the process.
+
+        Exits normally when everything finished in time; otherwise falls
+        back to ``os._exit`` so hanging SDK threads cannot keep the process
+        alive.
+
+        Args:
+            code (int): Exit status (default: 0)
+            deadline (float): Total seconds for hooks (default: the manager's deadline)
+        """
+        report = self.shutdown(deadline)
+        if report["clean"]:
+            sys.exit(code)
+
+        self.logger.warning(f"Shutdown incomplete, forcing exit (stuck threads: {report['stuck_threads']})")
+        logging.shutdown()
+        os._exit(code)
+
+
+_manager = ShutdownManager()
+
+
+def get_shutdown_manager() -> ShutdownManager:
+    """
+    Get the process-wide shutdown manager.
+
+    Returns:
+        ShutdownManager: Shared manager used by the entry points
+    """
+    return _manager
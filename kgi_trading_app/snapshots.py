@@ -0,0 +1,124 @@
+"""
+Bulk Snapshot Columns
+
+Helpers for ``KGITradingClient.get_snapshots``: splitting symbol lists into
+broker-sized chunks and turning SDK snapshot objects into one columnar result
+(a NumPy array per field) that scanners can consume directly.
+
+Result layout::
+
+    {"symbol": object array, "ok": bool array,
+     "ts": int64, "open", "high", "low", "close", "volume", "total_volume",
+     "bid", "ask", "change_price": float64,
+     "errors": {symbol: message}}
+
+Rows follow the order of the requested symbols; fields of symbols that could
+not be fetched are NaN (``ts`` is 0) with ``ok`` False and the reason in
+``errors``.
+"""
+
+import re
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from .reports import get_field
+
+
+# Result field -> SDK snapshot attribute names to try
+SNAPSHOT_FIELDS = {
+    "open": ("open",),
+    "high": ("high",),
+    "low": ("low",),
+    "close": ("close", "last", "price"),
+    "volume": ("volume",),
+    "total_volume": ("total_volume",),
+    "bid": ("buy_price", "bid", "bid_price"),
+    "ask": ("sell_price", "ask", "ask_price"),
+    "change_price": ("change_price",)
+}
+
+# Error text that points at a symbol rather than at the session. Bare "code"
+# is left out: it also appears in "error code 503", "status code" and the like.
+SYMBOL_ERROR_HINTS = ("unknown", "invalid", "not found", "no such", "symbol", "contract")
+
+
+def chunked(symbols: List[str], size: int) -> List[List[str]]:
+    """
+    Split symbols into chunks.
+
+    Args:
+        symbols (List[str]): Symbol codes
+        size (int): Maximum symbols per chunk
+
+    Returns:
+        List[List[str]]: Chunks in order
+    """
+    if size < 1:
+        raise ValueError(f"chunk size must be >= 1, got {size}")
+    return [symbols[i:i + size] for i in range(0, len(symbols), size)]
+
+
+def is_symbol_error(error: str, chunk: List[str]) -> bool:
+    """
+    Guess whether a failed chunk query was caused by one of its symbols.
+
+    Args:
+        error (str): Error message
+        chunk (List[str]): Symbols requested
+
+    Returns:
+        bool: True if the message names a chunk symbol or looks symbol-specific
+    """
+    text = str(error).lower()
+    if any(hint in text for hint in SYMBOL_ERROR_HINTS):
+        return True
+    # Whole words only, so symbol "50" does not match "error code 503"
+    words = set(re.findall(r"[a-z0-9.]+", text))
+    return any(symbol.lower() in words for symbol in chunk)
+
+
+def empty_columns(symbols: List[str]) -> Dict[str, np.ndarray]:
+    """Allocate a result for ``symbols`` with every row marked missing."""
+    count = len(symbols)
+    columns = {"symbol": np.array(symbols, dtype=object),
+               "ok": np.zeros(count, dtype=bool),
+               "ts": np.zeros(count, dtype=np.int64)}
+    for field in SNAPSHOT_FIELDS:
+        columns[field] = np.full(count, np.nan)
+    columns["errors"] = {}
+    return columns
+
+
+def fill_rows(columns: Dict[str, np.ndarray], rows: Dict[str, int], chunk: List[str],
+              snapshots: Iterable):
+    """
+    Write one chunk's SDK snapshots into the result.
+
+    Snapshots are matched to rows by their ``code``; snapshots without a
+    code are matched by position within the chunk.
+
+    Args:
+        columns (Dict[str, np.ndarray]): Result from empty_columns
+        rows (Dict[str, int]): symbol -> row index
+        chunk (List[str]): Symbols requested in this chunk
+        snapshots (Iterable): SDK snapshot objects or dicts
+    """
+    for position, snapshot in enumerate(snapshots or ()):
+        code = get_field(snapshot, "code", "symbol")
+        if code is None and position < len(chunk):
+            code = chunk[position]
+        row = rows.get(str(code))
+        if row is None:
+            continue
+        for field, names in SNAPSHOT_FIELDS.items():
+            value = get_field(snapshot, *names)
+            if value is not None:
+                try:
+                    columns[field][row] = float(value)
+                except (TypeError, ValueError):
+                    pass
+        ts = get_field(snapshot, "ts", "timestamp_ns")
+        if ts is not None:
+            columns["ts"][row] = int(ts)
+        columns["ok"][row] = True
@@ -0,0 +1,118 @@
+"""
+Client State Snapshots
+
+This module provides ``ClientState``, the immutable session state published
+by ``KGITradingClient``. Writers build a new snapshot and swap it in under a
+lock; readers take the current snapshot with a single attribute read and
+never block or observe a half-updated state.
+"""
+
+from typing import Optional, Tuple
+
+from .records import AccountRecord
+
+
+class ClientState:
+    """Immutable snapshot of a client session."""
+
+    __slots__ = ("logged_in", "accounts", "all_accounts", "stock_account",
+                 "futopt_account", "account_records", "records_by_id",
+                 "contracts_ready", "version", "_details")
+
+    def __init__(self, logged_in: bool = False, accounts: Tuple = (),
+                 all_accounts: Tuple = (), stock_account=None, futopt_account=None,
+                 account_records: Tuple[AccountRecord, ...] = (),
+                 records_by_id: Optional[dict] = None, contracts_ready: bool = False,
+                 version: int = 0):
+        """
+        Initialize the snapshot.
+
+        Args:
+            logged_in (bool): Whether the session is logged in
+            accounts (Tuple): Accounts visible in the current type filter
+            all_accounts (Tuple): All accounts returned at login
+            stock_account: Default stock account (default: None)
+            futopt_account: Default futures/options account (default: None)
+            account_records (Tuple[AccountRecord, ...]): Records for all_accounts
+            records_by_id (dict): id(account) -> AccountRecord (treated as read-only)
+            contracts_ready (bool): Whether contract data has finished loading
+            version (int): Increases with every published change
+        """
+        setter = object.__setattr__
+        setter(self, "logged_in", logged_in)
+        setter(self, "accounts", tuple(accounts))
+        setter(self, "all_accounts", tuple(all_accounts))
+        setter(self, "stock_account", stock_account)
+        setter(self, "futopt_account", futopt_account)
+        setter(self, "account_records", tuple(account_records))
+        setter(self, "records_by_id", records_by_id if records_by_id is not None else {})
+        setter(self, "contracts_ready", contracts_ready)
+        setter(self, "version", version)
+        setter(self, "_details", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ClientState is immutable")
+
+    def __repr__(self):
+        return (f"ClientState(v{self.version}, logged_in={self.logged_in}, "
+                f"accounts={len(self.accounts)}/{len(self.all_accounts)})")
+
+    def replace(self, **changes) -> "ClientState":
+        """
+        Get a copy with some fields changed and the version bumped.
+
+        Args:
+            **changes: Field values to replace
+
+        Returns:
+            ClientState: New snapshot
+        """
+        fields = {
+            "logged_in": self.logged_in,
+            "accounts": self.accounts,
+            "all_accounts": self.all_accounts,
+            "stock_account": self.stock_account,
+            "futopt_account": self.futopt_account,
+            "account_records": self.account_records,
+            "records_by_id": self.records_by_id,
+            "contracts_ready": self.contracts_ready
+        }
+        fields.update(changes)
+        fields["version"] = self.version + 1
+        return ClientState(**fields)
+
+    def record_for(self, account) -> AccountRecord:
+        """
+        Get the login record for an SDK account.
+
+        Args:
+            account: SDK account object
+
+        Returns:
+            AccountRecord: Login snapshot, or a fresh record for unknown accounts
+        """
+        record = self.records_by_id.get(id(account))
+        if record is None:
+            record = AccountRecord.from_account(0, account)
+        return record
+
+    def cached_details(self) -> Optional[dict]:
+        """Get the account details computed for this snapshot, if any."""
+        return self._details
+
+    def cache_details(self, details: dict) -> dict:
+        """
+        Remember the account details for this snapshot.
+
+        Concurrent readers may both compute the same details; the first
+        stored value wins, which is harmless because snapshots never change.
+
+        Args:
+            details (dict): Details computed from this snapshot
+
+        Returns:
+            dict: The cached details
+        """
+        if self._details is None:
+            object.__setattr__(self, "_details", details)
+        return self._details
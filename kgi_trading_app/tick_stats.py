@@ -0,0 +1,358 @@
+"""
+Rolling Tick Statistics
+
+This module provides ``TickStats``, which keeps per-symbol statistics over
+trailing time windows (e.g. the last 60 s and 5 min of trades) and updates
+them in amortized O(1) per tick instead of rescanning the raw ticks on
+every query:
+
+- count, volume, mean, population variance/std and VWAP from running sums
+  that add each tick as it arrives and subtract it as it leaves the window
+- min and max from monotonic deques of tick indices
+
+Aggregates live in ``array.array`` columns indexed by symbol id, one set
+per window, so ``snapshot()`` turns a whole window into NumPy columns in
+one copy. Ticks are kept once per symbol until every window has expired
+them; each window only tracks where it starts.
+
+Fed from the client's quote stream, a quote counts as a trade when its
+accumulated volume increases::
+
+    stats = TickStats(windows=(60.0, 300.0))
+    stats.attach(client)
+    stats.stats("2330", window=60.0)   # count, volume, mean, std, min, max, vwap, ...
+    stats.snapshot(300.0)              # {"symbol": [...], "vwap": array, ...}
+
+Windows are measured on the feed's clock: a query without ``now_ns``
+expires ticks relative to the newest timestamp seen on any symbol.
+"""
+
+import math
+import threading
+import time
+from array import array
+from collections import deque
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+STAT_FIELDS = ("count", "volume", "mean", "variance", "std", "min", "max", "vwap")
+
+# Drop expired ticks from a symbol's buffer once this many have piled up
+_COMPACT_THRESHOLD = 1024
+
+
+class TickStats:
+    """
+    Rolling per-symbol statistics over one or more time windows.
+    """
+
+    def __init__(self, windows: Sequence[float] = (60.0, 300.0)):
+        """
+        Initialize the statistics.
+
+        Args:
+            windows (Sequence[float]): Window lengths in seconds (default: 60 s and 5 min)
+        """
+        if not windows or any(window <= 0 for window in windows):
+            raise ValueError(f"windows must be positive, got {windows}")
+        self.windows = tuple(float(window) for window in windows)
+        self._window_ns = [int(window * 1e9) for window in self.windows]
+
+        self._ids: Dict[str, int] = {}
+        self.symbols: List[str] = []
+        # Per symbol: retained ticks, index of the first retained tick,
+        # price shift for the sums and last accumulated volume
+        self._ts: List[List[int]] = []
+        self._px: List[List[float]] = []
+        self._size: List[List[float]] = []
+        self._base = array("q")
+        self._shift = array("d")
+        self._last_volume = array("d")
+        # Per window, per symbol
+        self._start = [array("q") for _ in self.windows]
+        self._count = [array("q") for _ in self.windows]
+        self._sum = [array("d") for _ in self.windows]
+        self._sum_sq = [array("d") for _ in self.windows]
+        self._volume = [array("d") for _ in self.windows]
+        self._notional = [array("d") for _ in self.windows]
+        self._min: List[List[deque]] = [[] for _ in self.windows]
+        self._max: List[List[deque]] = [[] for _ in self.windows]
+
+        self.now_ns = 0
+        self._lock = threading.Lock()
+
+    def symbol_id(self, symbol: str) -> int:
+        """
+        Get a symbol's slot index, assigning one if needed.
+
+        Args:
+            symbol (str): Symbol code
+
+        Returns:
+            int: Slot index
+        """
+        sid = self._ids.get(symbol)
+        if sid is not None:
+            return sid
+        with self._lock:
+            return self._slot_for(symbol)
+
+    def _slot_for(self, symbol: str) -> int:
+        """Return the slot index for a symbol, assigning one if needed. Caller holds the lock."""
+        sid = self._ids.get(symbol)
+        if sid is not None:
+            return sid
+        sid = len(self.symbols)
+        self._ts.append([])
+        self._px.append([])
+        self._size.append([])
+        self._base.append(0)
+        self._shift.append(math.nan)
+        self._last_volume.append(math.nan)
+        for w in range(len(self.windows)):
+            for column in (self._start[w], self._count[w]):
+                column.append(0)
+            for column in (self._sum[w], self._sum_sq[w], self._volume[w], self._notional[w]):
+                column.append(0.0)
+            self._min[w].append(deque())
+            self._max[w].append(deque())
+        self.symbols.append(symbol)
+        self._ids[symbol] = sid
+        return sid
+
+    def update(self, symbol: str, price: float, size: float = 0.0,
+               timestamp_ns: Optional[int] = None):
+        """
+        Add a trade.
+
+        Args:
+            symbol (str): Symbol code
+            price (float): Trade price
+            size (float): Trade quantity (default: 0)
+            timestamp_ns (int): Trade time in ns (default: time.time_ns())
+        """
+        price = float(price)
+        size = float(size)
+        if timestamp_ns is None:
+            timestamp_ns = time.time_ns()
+        with self._lock:
+            self._add(self._slot_for(symbol), price, size, timestamp_ns)
+
+    def _add(self, sid: int, price: float, size: float, timestamp_ns: int):
+        """Add a trade to every window. Caller holds the lock."""
+        ts, px, sizes = self._ts[sid], self._px[sid], self._size[sid]
+        index = self._base[sid] + len(ts)
+        ts.append(timestamp_ns)
+        px.append(price)
+        sizes.append(size)
+        if timestamp_ns > self.now_ns:
+            self.now_ns = timestamp_ns
+
+        shift = self._shift[sid]
+        if shift != shift:
+            shift = self._shift[sid] = price
+        shifted = price - shift
+        for w in range(len(self.windows)):
+            self._count[w][sid] += 1
+            self._sum[w][sid] += shifted
+            self._sum_sq[w][sid] += shifted * shifted
+            self._volume[w][sid] += size
+            self._notional[w][sid] += size * price
+            lows = self._min[w][sid]
+            while lows and px[lows[-1] - self._base[sid]] >= price:
+                lows.pop()
+            lows.append(index)
+            highs = self._max[w][sid]
+            while highs and px[highs[-1] - self._base[sid]] <= price:
+                highs.pop()
+            highs.append(index)
+            self._expire(w, sid, timestamp_ns - self._window_ns[w])
+        self._compact(sid)
+
+    def _expire(self, w: int, sid: int, cutoff_ns: int):
+        """Remove ticks at or before cutoff_ns from window w. Caller holds the lock."""
+        ts, px, sizes = self._ts[sid], self._px[sid], self._size[sid]
+        base = self._base[sid]
+        start = self._start[w][sid]
+        i = start - base
+        if i >= len(ts) or ts[i] > cutoff_ns:
+            return
+
+        shift = self._shift[sid]
+        total, total_sq, volume, notional = 0.0, 0.0, 0.0, 0.0
+        end = len(ts)
+        while i < end and ts[i] <= cutoff_ns:
+            price = px[i]
+            shifted = price - shift
+            total += shifted
+            total_sq += shifted * shifted
+            volume += sizes[i]
+            notional += sizes[i] * price
+            i += 1
+        removed = i + base - start
+        start += removed
+        self._start[w][sid] = start
+        count = self._count[w][sid] - removed
+        self._count[w][sid] = count
+        if count:
+            self._sum[w][sid] -= total
+            self._sum_sq[w][sid] -= total_sq
+            self._volume[w][sid] -= volume
+            self._notional[w][sid] -= notional
+        else:
+            # Restart from exact zeros so rounding error cannot accumulate
+            self._sum[w][sid] = self._sum_sq[w][sid] = 0.0
+            self._volume[w][sid] = self._notional[w][sid] = 0.0
+
+        for extremes in (self._min[w][sid], self._max[w][sid]):
+            while extremes and extremes[0] < start:
+                extremes.popleft()
+
+    def _compact(self, sid: int):
+        """Drop ticks every window has expired. Caller holds the lock."""
+        # Queries can move a long window past a shorter one, so take the earliest start
+        dropped = min(start[sid] for start in self._start) - self._base[sid]
+        if dropped < _COMPACT_THRESHOLD or dropped * 2 < len(self._ts[sid]):
+            return
+        del self._ts[sid][:dropped]
+        del self._px[sid][:dropped]
+        del self._size[sid][:dropped]
+        self._base[sid] += dropped
+
+    def on_quote(self, symbol: str, quote: dict):
+        """
+        Quote listener compatible with ``KGITradingClient.add_quote_listener``.
+
+        The trade size is the increase in accumulated volume; quotes that
+        do not add volume (bid/ask updates) and the first quote of a
+        symbol, which only sets the baseline, are not counted.
+
+        Args:
+            symbol (str): Symbol code
+            quote (dict): Normalized quote with last/volume/timestamp_ns keys
+        """
+        price = quote.get("last")
+        volume = quote.get("volume")
+        if volume is None:
+            return
+        volume = float(volume)
+        timestamp_ns = quote.get("timestamp_ns") or time.time_ns()
+        with self._lock:
+            sid = self._slot_for(symbol)
+            previous = self._last_volume[sid]
+            self._last_volume[sid] = volume
+            if previous != previous:
+                return
+            # Accumulated volume restarts with each session
+            size = volume - previous if volume >= previous else volume
+            if size > 0 and price is not None and price == price:
+                self._add(sid, float(price), size, timestamp_ns)
+
+    def attach(self, client):
+        """Follow every quote the client dispatches."""
+        client.add_quote_listener(self.on_quote)
+
+    def detach(self, client):
+        """Stop following a client's quotes."""
+        client.remove_quote_listener(self.on_quote)
+
+    def _window_index(self, window: Optional[float]) -> int:
+        if window is None:
+            return 0
+        try:
+            return self.windows.index(float(window))
+        except ValueError:
+            raise ValueError(f"Unknown window {window}; configured: {self.windows}") from None
+
+    def _row(self, w: int, sid: int) -> dict:
+        """Statistics of one slot. Caller holds the lock."""
+        count = self._count[w][sid]
+        if not count:
+            return {"count": 0, "volume": 0.0, "mean": math.nan, "variance": math.nan,
+                    "std": math.nan, "min": math.nan, "max": math.nan, "vwap": math.nan}
+        px = self._px[sid]
+        base = self._base[sid]
+        mean = self._sum[w][sid] / count
+        variance = max(self._sum_sq[w][sid] / count - mean * mean, 0.0)
+        volume = self._volume[w][sid]
+        return {
+            "count": count,
+            "volume": volume,
+            "mean": mean + self._shift[sid],
+            "variance": variance,
+            "std": math.sqrt(variance),
+            "min": px[self._min[w][sid][0] - base],
+            "max": px[self._max[w][sid][0] - base],
+            "vwap": self._notional[w][sid] / volume if volume > 0 else math.nan
+        }
+
+    def stats(self, symbol: str, window: Optional[float] = None,
+              now_ns: Optional[int] = None) -> Optional[dict]:
+        """
+        Get one symbol's statistics.
+
+        Args:
+            symbol (str): Symbol code
+            window (float): Window length in seconds (default: the first window)
+            now_ns (int): End of the window in ns (default: newest tick time seen)
+
+        Returns:
+            dict: count, volume, mean, variance, std, min, max and vwap
+                (NaN for an empty window), or None for an unknown symbol
+        """
+        w = self._window_index(window)
+        with self._lock:
+            sid = self._ids.get(symbol)
+            if sid is None:
+                return None
+            now = self.now_ns if now_ns is None else now_ns
+            self._expire(w, sid, now - self._window_ns[w])
+            return self._row(w, sid)
+
+    def snapshot(self, window: Optional[float] = None, now_ns: Optional[int] = None) -> dict:
+        """
+        Get every symbol's statistics as columns.
+
+        Args:
+            window (float): Window length in seconds (default: the first window)
+            now_ns (int): End of the window in ns (default: newest tick time seen)
+
+        Returns:
+            dict: "symbol" list plus one NumPy array per STAT_FIELDS entry,
+                row i describing symbol i
+        """
+        w = self._window_index(window)
+        with self._lock:
+            now = self.now_ns if now_ns is None else now_ns
+            cutoff = now - self._window_ns[w]
+            for sid in range(len(self.symbols)):
+                self._expire(w, sid, cutoff)
+
+            count = np.array(self._count[w], dtype=np.int64)
+            volume = np.array(self._volume[w], dtype=np.float64)
+            shift = np.array(self._shift, dtype=np.float64)
+            notional = np.array(self._notional[w], dtype=np.float64)
+            lows = np.full(len(self.symbols), np.nan)
+            highs = np.full(len(self.symbols), np.nan)
+            for sid in np.flatnonzero(count):
+                base = self._base[sid]
+                lows[sid] = self._px[sid][self._min[w][sid][0] - base]
+                highs[sid] = self._px[sid][self._max[w][sid][0] - base]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean = np.array(self._sum[w], dtype=np.float64) / count
+                variance = np.maximum(np.array(self._sum_sq[w], dtype=np.float64) / count
+                                      - mean * mean, 0.0)
+                vwap = np.where(volume > 0, notional / volume, np.nan)
+            return {
+                "symbol": list(self.symbols),
+                "count": count,
+                "volume": volume,
+                "mean": mean + shift,
+                "variance": variance,
+                "std": np.sqrt(variance),
+                "min": lows,
+                "max": highs,
+                "vwap": vwap
+            }
@@ -0,0 +1,293 @@
+"""
+Lightweight Tracing
+
+This module provides a minimal in-process tracer. Spans carry monotonic-ns
+timestamps and parent/child links, are propagated through ``contextvars``
+(and across threads with ``Tracer.wrap``), and are exported in batches to a
+rotating JSON lines file by a background thread.
+
+Tracing is disabled until ``configure_tracing`` is called; disabled spans
+cost one attribute check.
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+
+_current_span = contextvars.ContextVar("kgi_current_span", default=None)
+
+
+class Span:
+    """A single timed operation."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns",
+                 "thread", "attributes", "error")
+
+    def __init__(self, name: str, trace_id: str, span_id: str,
+                 parent_id: Optional[str], attributes: dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start_ns = time.monotonic_ns()
+        self.end_ns = None
+        self.thread = threading.current_thread().name
+        self.attributes = attributes
+        self.error = None
+
+    def set_attribute(self, key: str, value):
+        """Attach a key/value pair to the span."""
+        self.attributes[key] = value
+
+    def to_dict(self) -> dict:
+        """
+        Get the span as an exportable dict.
+
+        Returns:
+            dict: Span fields with duration in ns
+        """
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ns": (self.end_ns - self.start_ns) if self.end_ns else None,
+            "thread": self.thread,
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+
+class JsonlSpanExporter:
+    """
+    Batching exporter that writes spans to a rotating JSON lines file.
+
+    Rotation follows ``logging.handlers.RotatingFileHandler``: when the file
+    exceeds ``max_bytes`` it is renamed to ``path.1`` (older files shift up)
+    and at most ``backup_count`` old files are kept.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 10 * 1024 * 1024,
+                 backup_count: int = 5, batch_size: int = 256,
+                 flush_interval: float = 1.0):
+        """
+        Initialize the exporter and start its writer thread.
+
+        Args:
+            path (str): Output file path
+            max_bytes (int): Rotate when the file exceeds this size (default: 10 MB)
+            backup_count (int): Rotated files to keep (default: 5)
+            batch_size (int): Spans written per batch (default: 256)
+            flush_interval (float): Maximum seconds a span waits in memory (default: 1)
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.logger = logging.getLogger(__name__)
+
+        self._queue = queue.Queue()
+        self._file = open(path, "a", encoding="utf-8")
+        self._writer = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._writer.start()
+
+    def export(self, span: Span):
+        """Queue a finished span for writing."""
+        self._queue.put(span)
+
+    def _run(self):
+        while True:
+            batch = []
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+                batch.append(item)
+                while len(batch) < self.batch_size:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            stop = None in batch
+            self._write([span for span in batch if span is not None])
+            if stop:
+                break
+
+    def _write(self, spans):
+        if not spans:
+            return
+        try:
+            self._file.write("".join(json.dumps(span.to_dict(), ensure_ascii=False,
+                                                default=str) + "\n" for span in spans))
+            self._file.flush()
+            if self._file.tell() >= self.max_bytes:
+                self._rotate()
+        except Exception as e:
+            self.logger.error(f"Span export error: {str(e)}")
+
+    def _rotate(self):
+        self._file.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def shutdown(self, timeout: float = 2.0):
+        """
+        Write all queued spans and close the file.
+
+        Args:
+            timeout (float): Seconds to wait for the writer thread (default: 2)
+        """
+        self._queue.put(None)
+        self._writer.join(timeout)
+        self._file.close()
+
+
+class Tracer:
+    """Creates spans and hands finished spans to an exporter."""
+
+    def __init__(self, exporter: Optional[JsonlSpanExporter] = None):
+        """
+        Initialize the tracer.
+
+        Args:
+            exporter (JsonlSpanExporter): Destination for spans (default: None, tracing disabled)
+        """
+        self.exporter = exporter
+        self.enabled = exporter is not None
+
+    @contextmanager
+    def span(self, name: str, parent: Optional[Span] = None, **attributes):
+        """
+        Time a block of code as a span.
+
+        Args:
+            name (str): Span name, e.g. "client.login"
+            parent (Span): Explicit parent (default: the current span in this context)
+            **attributes: Extra key/value pairs recorded on the span
+
+        Yields:
+            Span: The active span, or None when tracing is disabled
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        parent = parent or _current_span.get()
+        span_id = os.urandom(8).hex()
+        trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        span = Span(name, trace_id, span_id, parent.span_id if parent else None, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {str(e)}"
+            raise
+        finally:
+            span.end_ns = time.monotonic_ns()
+            _current_span.reset(token)
+            self.exporter.export(span)
+
+    def wrap(self, func: Callable) -> Callable:
+        """
+        Bind a callable to the current trace context.
+
+        Use this for thread targets and SDK callbacks so spans they create
+        become children of the span active when ``wrap`` was called.
+
+        Args:
+            func (Callable): Function to run later, possibly on another thread
+
+        Returns:
+            Callable: Wrapped function
+        """
+        if not self.enabled:
+            return func
+        context = contextvars.copy_context()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return context.copy().run(func, *args, **kwargs)
+        return wrapper
+
+    def shutdown(self):
+        """Flush and close the exporter."""
+        if self.exporter is not None:
+            self.enabled = False
+            self.exporter.shutdown()
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """
+    Get the process-wide tracer.
+
+    Returns:
+        Tracer: Current tracer (disabled unless configure_tracing was called)
+    """
+    return _tracer
+
+
+def configure_tracing(path: str, **exporter_options) -> Tracer:
+    """
+    Enable tracing to a rotating JSON lines file.
+
+    Args:
+        path (str): Output file path
+        **exporter_options: Passed to JsonlSpanExporter
+
+    Returns:
+        Tracer: The new process-wide tracer
+    """
+    global _tracer
+    _tracer.shutdown()
+    _tracer = Tracer(JsonlSpanExporter(path, **exporter_options))
+    return _tracer
+
+
+def current_span() -> Optional[Span]:
+    """
+    Get the span active in the current context.
+
+    Returns:
+        Span: Current span, or None
+    """
+    return _current_span.get()
+
+
+def traced(name: Optional[str] = None):
+    """
+    Decorator that records each call as a span.
+
+    Args:
+        name (str): Span name (default: the function's qualified name)
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
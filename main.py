@@ -10,6 +10,8 @@ from kgi_trading_app.client import KGITradingClient
 import argparse
 import getpass
 
+from kgi_trading_app.shutdown import get_shutdown_manager, PRIORITY_FLUSH
+
 
 def main():
     """Main entry point for the KGI trading application."""
@@ -25,9 +27,41 @@ def main():
                        help='Interactive mode (default: True)')
     parser.add_argument('--gui', action='store_true',
                        help='Launch GUI version instead of command line')
+    parser.add_argument('--batch', type=str, metavar='JOB_FILE',
+                       help='Run jobs from a JSON lines job file concurrently (non-interactive)')
+    parser.add_argument('--batch-workers', type=int, default=4,
+                       help='Maximum concurrent batch jobs (default: 4)')
+    parser.add_argument('--batch-timeout', type=float, default=60.0,
+                       help='Default per-job timeout in seconds (default: 60)')
+    parser.add_argument('--batch-output', type=str,
+                       help='JSON lines result file (default: stdout)')
+    parser.add_argument('--export-dir', type=str, default='exports',
+                       help='Directory for batch "export" files (default: exports)')
+    parser.add_argument('--profile', type=str, metavar='PREFIX',
+                       help='Profile the whole session and write PREFIX.collapsed / .threads.json on exit')
+    parser.add_argument('--profile-mode', choices=['sample', 'cprofile'], default='sample',
+                       help='Profiler type (default: sample); cprofile also writes PREFIX.prof')
+    parser.add_argument('--trace', type=str, metavar='FILE',
+                       help='Write tracing spans to a rotating JSON lines file')
+    parser.add_argument('--shutdown-timeout', type=float, default=10.0,
+                       help='Seconds allowed for logout and flushing on exit (default: 10)')
     
     args = parser.parse_args()
     
+    shutdown = get_shutdown_manager()
+    shutdown.deadline = args.shutdown_timeout
+    
+    if args.trace:
+        from kgi_trading_app.tracing import configure_tracing
+        tracer = configure_tracing(args.trace)
+        shutdown.register("tracing", tracer.shutdown, priority=PRIORITY_FLUSH)
+    
+    if args.profile:
+        from kgi_trading_app.profiling import SessionProfiler
+        profiler = SessionProfiler(args.profile, mode=args.profile_mode)
+        profiler.start()
+        shutdown.register("profiler", profiler.stop, priority=PRIORITY_FLUSH)
+    
     # Check if GUI mode is requested
     if args.gui:
         try:
@@ -37,7 +71,7 @@ def main():
             root = tk.Tk()
             app = KGITradingGUI(root)
             root.mainloop()
-            return
+            shutdown.exit(0)
         except ImportError:
             print("錯誤: tkinter 未安裝，無法啟動 GUI 版本")
             print("正在啟動命令行版本...")
@@ -48,6 +82,9 @@ def main():
     # Determine mode
     simulation_mode = args.simulation and not args.production
     
+    if args.batch:
+        shutdown.exit(run_batch_mode(args, simulation_mode))
+    
     print("=" * 60)
     print("    KGI Securities Trading Application")
     print("    Basic Login/Logout Functionality Demo")
@@ -55,8 +92,9 @@ def main():
     print(f"Mode: {'SIMULATION' if simulation_mode else 'PRODUCTION'}")
     print()
     
-    # Create client
+    # Create client; logout and SDK teardown run under the shutdown deadline
     client = KGITradingClient(simulation=simulation_mode)
+    client.register_shutdown(shutdown)
     
     try:
         if args.interactive:
@@ -77,18 +115,50 @@ def main():
     except Exception as e:
         print(f"Application error: {str(e)}")
     finally:
-        # Ensure logout
+        # Logout, cleanup and flushing run as shutdown hooks
         if client.is_connected():
             print("\nLogging out...")
-            client.logout()
-        
-        # Force cleanup
-        client.cleanup()
         
         print("Application terminated.")
-        # Force exit to handle hanging SuperPy threads
-        import os
-        os._exit(0)
+        shutdown.exit(0)
+
+
+def run_batch_mode(args, simulation_mode):
+    """
+    Run jobs from a job file concurrently and stream results as JSON lines.
+    
+    Returns:
+        int: Exit status - 0 if every job succeeded, 1 if any job failed or
+        timed out, 2 if the job file could not be loaded
+    """
+    from kgi_trading_app.batch import load_jobs, run_batch
+    
+    try:
+        jobs = load_jobs(args.batch)
+    except (OSError, ValueError) as e:
+        print(f"Error: Cannot load job file: {str(e)}", file=sys.stderr)
+        return 2
+    
+    # Progress goes to stderr so stdout stays valid JSON lines
+    print(f"Running {len(jobs)} jobs with {args.batch_workers} workers...", file=sys.stderr)
+    output = open(args.batch_output, 'w', encoding='utf-8') if args.batch_output else sys.stdout
+    
+    try:
+        summary = run_batch(
+            jobs,
+            client_factory=lambda: KGITradingClient(simulation=simulation_mode),
+            output=output,
+            max_workers=args.batch_workers,
+            timeout=args.batch_timeout,
+            export_dir=args.export_dir
+        )
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    
+    print(f"Batch completed - OK: {summary['ok']}, Error: {summary['error']}, Timeout: {summary['timeout']}",
+          file=sys.stderr)
+    return 1 if summary['error'] or summary['timeout'] else 0
 
 
 def interactive_mode(client, user_id=None):
@@ -123,10 +193,6 @@ def interactive_mode(client, user_id=None):
             break
         else:
             print("Invalid option. Please select 1-6.")
-    
-    # Force clean exit
-    import os
-    os._exit(0)
 
 
 def handle_login(client, user_id=None):
@@ -192,22 +258,21 @@ def handle_account_info(client):
         print("Not logged in. Please login first.")
         return
     
-    accounts = client.get_account_list()
+    records = client.get_account_records()
     
-    if accounts:
-        print(f"\nFound {len(accounts)} accounts:")
-        for i, account in enumerate(accounts):
-            account_type = "Stock" if "Stock" in str(type(account)) else "Future"
-            signed_status = "✓ Signed" if hasattr(account, 'signed') and account.signed else "✗ Not Signed"
+    if records:
+        print(f"\nFound {len(records)} accounts:")
+        for i, record in enumerate(records):
+            signed_status = "✓ Signed" if record.signed else "✗ Not Signed"
             
-            print(f"\nAccount {i+1}: {account_type}")
-            print(f"  Person ID: {account.person_id}")
-            print(f"  Broker ID: {account.broker_id}")
-            print(f"  Account ID: {account.account_id}")
+            print(f"\nAccount {i+1}: {record.type}")
+            print(f"  Person ID: {record.person_id}")
+            print(f"  Broker ID: {record.broker_id}")
+            print(f"  Account ID: {record.account_id}")
             print(f"  Status: {signed_status}")
             
-            if hasattr(account, 'trader') and account.trader:
-                print(f"  Trader: {account.trader}")
+            if record.trader:
+                print(f"  Trader: {record.trader}")
     else:
         print("No accounts found.")
 
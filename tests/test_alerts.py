@@ -0,0 +1,187 @@
+"""
+Test script for the price alert engine
+
+This script checks the sorted threshold index against a brute-force scan
+over random ticks, plus removal, repeating cross alerts and delivery.
+"""
+
+import sys
+import os
+import logging
+import random
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kgi_trading_app.alerts import AlertEngine, log_consumer
+
+
+def _brute_force(alerts, last, symbol, price):
+    """Reference implementation: scan every alert."""
+    fired = []
+    for alert_id, (alert_symbol, kind, threshold) in list(alerts.items()):
+        if alert_symbol != symbol:
+            continue
+        previous = last.get(symbol)
+        if kind == "above":
+            hit = price >= threshold
+        elif kind == "below":
+            hit = price <= threshold
+        else:
+            hit = previous is not None and (previous < threshold <= price or price <= threshold < previous)
+        if hit:
+            fired.append(alert_id)
+            del alerts[alert_id]
+    last[symbol] = price
+    return sorted(fired)
+
+
+def test_matches_brute_force():
+    """Test that bisect-triggered alerts equal a full scan on random ticks."""
+    print("Testing alert index against brute force...")
+
+    rng = random.Random(7)
+    engine = AlertEngine()
+    reference, last = {}, {}
+    symbols = ["2330", "2317", "2454"]
+    for _ in range(3000):
+        symbol = rng.choice(symbols)
+        kind = rng.choice(["above", "below", "cross"])
+        threshold = round(rng.uniform(90, 110), 1)
+        alert_id = engine.add_alert(symbol, kind, threshold)
+        reference[alert_id] = (symbol, kind, threshold)
+
+    for _ in range(2000):
+        symbol = rng.choice(symbols)
+        price = round(rng.uniform(85, 115), 1)
+        hits = engine.check(symbol, price)
+        assert sorted(hit["alert_id"] for hit in hits) == _brute_force(reference, last, symbol, price)
+        if rng.random() < 0.1:
+            alert_id = engine.add_alert(symbol, "cross", price)
+            reference[alert_id] = (symbol, "cross", price)
+
+    assert len(engine) == len(reference)
+    print("✓ Alert index matches brute force")
+
+
+def test_remove_and_repeat():
+    """Test removal and repeating cross alerts."""
+    print("\nTesting alert removal and repeat...")
+
+    engine = AlertEngine()
+    keep = engine.add_alert("2330", "cross", 600, repeat=True)
+    gone = engine.add_alert("2330", "above", 610)
+    same = engine.add_alert("2330", "above", 610)
+    assert engine.remove_alert(gone) and not engine.remove_alert(gone)
+
+    assert engine.check("2330", 590) == []
+    assert [hit["alert_id"] for hit in engine.check("2330", 605)] == [keep]
+    assert [hit["alert_id"] for hit in engine.check("2330", 595)] == [keep]
+    hits = engine.check("2330", 612)
+    assert sorted(hit["alert_id"] for hit in hits) == [keep, same]
+    assert [alert.alert_id for alert in engine.alerts("2330")] == [keep]
+
+    try:
+        engine.add_alert("2330", "above", 1, repeat=True)
+        assert False, "repeat above alert accepted"
+    except ValueError:
+        pass
+    print("✓ Alert removal and repeat working")
+
+
+def test_delivery():
+    """Test quote listener hookup, consumers and logging."""
+    print("\nTesting alert delivery...")
+
+    class FakeClient:
+        def __init__(self):
+            self.listeners = []
+
+        def add_quote_listener(self, listener):
+            self.listeners.append(listener)
+
+        def remove_quote_listener(self, listener):
+            self.listeners.remove(listener)
+
+        def handle_quote(self, symbol, quote):
+            for listener in self.listeners:
+                listener(symbol, quote)
+
+    class ListHandler(logging.Handler):
+        def __init__(self):
+            super().__init__()
+            self.messages = []
+
+        def emit(self, record):
+            self.messages.append(record.getMessage())
+
+    client = FakeClient()
+    engine = AlertEngine()
+    engine.attach(client)
+    received = []
+    unsubscribe = engine.subscribe(received.append)
+    handler = ListHandler()
+    log = logging.getLogger("test_alerts")
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+    engine.subscribe(log_consumer(log))
+    engine.subscribe(lambda hit: 1 / 0)  # failing consumers do not block others
+
+    engine.add_alert("2330", "below", 580, message="stop level")
+    client.handle_quote("2330", {"last": 600.0, "timestamp_ns": 1})
+    client.handle_quote("2330", {"bid": 579.0})
+    client.handle_quote("2330", {"last": 579.0, "timestamp_ns": 2})
+
+    assert len(received) == 1 and received[0]["price"] == 579.0 and received[0]["previous"] == 600.0
+    assert received[0]["timestamp_ns"] == 2
+    assert handler.messages == ["Alert 1: 2330 below 580.0 at 579.0 - stop level"]
+
+    unsubscribe()
+    engine.add_alert("2330", "above", 590)
+    client.handle_quote("2330", {"last": 595.0})
+    assert len(received) == 1 and len(handler.messages) == 2
+    engine.detach(client)
+    assert client.listeners == []
+    print("✓ Alert delivery working")
+
+
+def test_tick_cost():
+    """Test that ticks stay cheap with many alerts that do not fire."""
+    print("\nTesting tick cost...")
+
+    engine = AlertEngine()
+    for n in range(20000):
+        engine.add_alert("2330", ("above", "below", "cross")[n % 3], 1000 + (n % 500))
+    start = time.perf_counter()
+    for tick in range(20000):
+        engine.check("2330", 1499.5 + (tick % 2) * 0.25 + 100)
+    elapsed = time.perf_counter() - start
+    # Only the first tick fires; the rest are O(log n) lookups
+    assert len(engine) < 20000
+    print(f"✓ {20000 / elapsed:,.0f} ticks/s with {len(engine)} armed alerts")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("KGI Trading Application - Alert Tests")
+    print("=" * 50)
+
+    try:
+        test_matches_brute_force()
+        test_remove_and_repeat()
+        test_delivery()
+        test_tick_cost()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,194 @@
+"""
+Test script for multi-account parent-order allocation
+
+This script tests ratio and fixed allocation, concurrent child submission
+under a rate limiter, and aggregate fill tracking, including reports that
+arrive before a child's order id is known.
+"""
+
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kgi_trading_app.allocation import (allocate_quantities, fixed_quantities,
+                                        submit_parent_order)
+from kgi_trading_app.rate_limit import RateLimiter
+
+
+class FakeAccount:
+    def __init__(self, account_id):
+        self.account_id = account_id
+
+
+class FakeClient:
+    """Duck-typed client: slow place_order, rate limiter and trade listeners."""
+
+    def __init__(self, count, latency=0.05, fail=()):
+        self.all_accounts = [FakeAccount(f"S{n}") for n in range(count)]
+        self.order_limiter = RateLimiter(rate=1000.0, burst=1000)
+        self.latency = latency
+        self.fail = set(fail)
+        self.listeners = []
+        self.sent = []
+        self.lock = threading.Lock()
+
+    def add_trade_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_trade_listener(self, listener):
+        self.listeners.remove(listener)
+
+    def report(self, report):
+        for listener in tuple(self.listeners):
+            listener(report)
+
+    def place_order(self, contract, order, timeout=None):
+        if not self.order_limiter.acquire(timeout=timeout):
+            return None
+        account = order["account"].account_id
+        if account in self.fail:
+            raise RuntimeError("rejected")
+        order_id = f"O-{account}"
+        # The broker acknowledges before place_order returns
+        self.report({"order_id": order_id, "status": "submitted", "symbol": contract["code"],
+                     "filled_quantity": 0.0, "done": False})
+        time.sleep(self.latency)
+        with self.lock:
+            self.sent.append(account)
+        return {"order_id": order_id}
+
+
+def _make_order(account, quantity):
+    return {"account": account, "quantity": quantity, "action": "Buy"}
+
+
+def test_allocation():
+    """Test ratio rounding and fixed sizes."""
+    print("Testing quantity allocation...")
+
+    accounts = ["S1", "S2", "S3"]
+    assert allocate_quantities(10, accounts) == {"S1": 4, "S2": 3, "S3": 3}
+    split = allocate_quantities(10_000, accounts, {"S1": 1, "S2": 1, "S3": 1}, lot_size=1000)
+    assert sum(split.values()) == 10_000 and all(q % 1000 == 0 for q in split.values())
+    assert allocate_quantities(5, accounts, {"S1": 0.9, "S2": 0.1}) == {"S1": 5}
+    assert fixed_quantities(accounts, 2) == {"S1": 2, "S2": 2, "S3": 2}
+    assert fixed_quantities(accounts, {"S1": 1, "S3": 0}) == {"S1": 1}
+
+    for bad in (lambda: allocate_quantities(1500, accounts, lot_size=1000),
+                lambda: allocate_quantities(10, accounts, {"S1": -1, "S2": 2})):
+        try:
+            bad()
+            assert False, "invalid allocation accepted"
+        except ValueError:
+            pass
+    print("✓ Quantity allocation working")
+
+
+def test_concurrent_submission():
+    """Test that children are sent concurrently and fills aggregate."""
+    print("\nTesting concurrent child submission...")
+
+    client = FakeClient(24, latency=0.05, fail={"S7"})
+    accounts = [account.account_id for account in client.all_accounts]
+    allocations = allocate_quantities(48, accounts)
+    contract = {"code": "2330"}
+
+    start = time.perf_counter()
+    parent = submit_parent_order(client, contract, _make_order, allocations, max_workers=12)
+    elapsed = time.perf_counter() - start
+    # Sequential submission would take 24 * 50 ms
+    assert elapsed < 0.6, elapsed
+    assert len(client.sent) == 23
+
+    progress = parent.progress()
+    assert progress["sent"] == 23 and progress["failed"] == 1
+    assert progress["children"]["S7"]["error"] == "rejected"
+    assert progress["children"]["S0"]["status"] == "submitted"
+    assert not parent.done
+
+    for account in accounts:
+        if account == "S7":
+            continue
+        client.report({"order_id": f"O-{account}", "status": "partfilled", "filled_quantity": 1.0,
+                       "fill_price": 600.0, "done": False})
+        client.report({"order_id": f"O-{account}", "status": "filled", "filled_quantity": 2.0,
+                       "fill_price": 602.0, "done": True})
+
+    assert parent.wait(timeout=1)
+    progress = parent.progress()
+    assert progress["filled_quantity"] == 46 and progress["quantity"] == 48
+    assert abs(progress["avg_fill_price"] - 601.0) < 1e-9
+    assert client.listeners == []
+    print(f"✓ 24 children sent in {elapsed:.2f}s")
+
+
+def test_unrelated_reports_and_close():
+    """Test that unrelated reports are not held and close() removes the listener."""
+    print("\nTesting unrelated reports and close...")
+
+    client = FakeClient(3, latency=0.0)
+    allocations = {"S0": 1, "S1": 1, "S2": 1}
+    parent = submit_parent_order(client, {"code": "2330"}, _make_order, allocations,
+                                 track_timeout=0.2)
+    # Another strategy's orders in the same symbol, after every child was sent
+    for n in range(100):
+        client.report({"order_id": f"X{n}", "status": "submitted", "symbol": "2330"})
+    assert parent._early_reports == {}
+    assert client.listeners == [parent.on_report]
+
+    # Children still working: the tracking timeout closes the parent
+    deadline = time.monotonic() + 5
+    while client.listeners and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert client.listeners == [] and not parent.done
+    client.report({"order_id": "O-S0", "status": "filled", "filled_quantity": 1.0, "done": True})
+    parent.on_report({"order_id": "O-S0", "status": "filled", "filled_quantity": 1.0, "done": True})
+    assert parent.progress()["filled_quantity"] == 0
+    parent.close()
+
+    empty = submit_parent_order(client, {"code": "2330"}, _make_order, {})
+    assert empty.done and client.listeners == []
+    print("✓ Unrelated reports dropped and listener removed on close")
+
+
+def test_unknown_account():
+    """Test that allocations to unknown accounts are refused."""
+    print("\nTesting unknown account handling...")
+
+    client = FakeClient(2)
+    try:
+        submit_parent_order(client, {"code": "2330"}, _make_order, {"S9": 1})
+        assert False, "unknown account accepted"
+    except ValueError:
+        pass
+    assert client.listeners == []
+    print("✓ Unknown accounts refused")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("KGI Trading Application - Allocation Tests")
+    print("=" * 50)
+
+    try:
+        test_allocation()
+        test_concurrent_submission()
+        test_unrelated_reports_and_close()
+        test_unknown_account()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
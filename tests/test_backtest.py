@@ -0,0 +1,154 @@
+"""
+Test script for the backtesting engine
+
+This script checks that the vectorized and event-driven paths agree, tests
+limit orders and cancellation, and runs symbols in a process pool.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from kgi_trading_app.backtest import (SimulatedBroker, CachedBarLoader, run_backtest,
+                                      run_backtests, run_event_driven)
+from kgi_trading_app.indicators import sma, SMA
+from kgi_trading_app.kbars import KBarCache, NS_PER_DAY, to_day
+
+
+def make_bars(count=300, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, count))
+    open_ = close + rng.normal(0, 0.3, count)
+    ts = to_day("2024-01-02") * NS_PER_DAY + np.arange(count, dtype=np.int64) * 60 * 10**9
+    return {"ts": ts, "open": open_, "high": np.maximum(open_, close) + 0.5,
+            "low": np.minimum(open_, close) - 0.5, "close": close, "volume": np.ones(count)}
+
+
+class VectorCrossover:
+    """Hold 10 shares while the close is above its 20-bar average."""
+
+    def target_positions(self, bars):
+        average = sma(bars["close"], 20)
+        return np.where(bars["close"] > average, 10.0, 0.0)
+
+
+class EventCrossover:
+    """Same rule as VectorCrossover, written against the order interface."""
+
+    def __init__(self):
+        self.average = SMA(20)
+
+    def on_bar(self, symbol, bar, client):
+        average = self.average.update(bar["close"])
+        target = 10.0 if bar["close"] > average else 0.0
+        held = client.get_positions().get(symbol, 0.0)
+        pending = sum((t["quantity"] if t["action"] == "Buy" else -t["quantity"])
+                      for t in client.trades if t["status"] == "Submitted")
+        change = target - held - pending
+        if change:
+            client.place_order(symbol, {"action": "Buy" if change > 0 else "Sell",
+                                        "quantity": abs(change)})
+
+
+def crossover_factory(symbol):
+    return VectorCrossover()
+
+
+def test_paths_agree():
+    """Test that vectorized and event-driven runs produce the same equity."""
+    print("Testing vectorized and event-driven paths...")
+
+    bars = make_bars()
+    vectorized = run_backtest(VectorCrossover(), "2330", bars, fee_rate=0.001, slippage=0.05)
+    event = run_backtest(EventCrossover(), "2330", bars, fee_rate=0.001, slippage=0.05)
+
+    assert vectorized["mode"] == "vectorized" and event["mode"] == "event"
+    assert vectorized["trades"] == event["trades"] > 0
+    assert np.allclose(vectorized["equity"], event["equity"])
+    print("✓ Vectorized and event-driven paths agree")
+
+
+def test_limit_orders_and_cancel():
+    """Test limit fills and cancellation in the simulated broker."""
+    print("\nTesting limit orders and cancellation...")
+
+    broker = SimulatedBroker(initial_cash=1000.0)
+    buy = broker.place_order("2330", {"action": "Buy", "quantity": 2, "price": 9.5})
+    stale = broker.place_order("2330", {"action": "Buy", "quantity": 1, "price": 1.0})
+    assert broker.place_order("2330", {"action": "Hold", "quantity": 1}) is None
+
+    broker.process_bar("2330", 1, 10.0, 10.5, 9.8, 10.2)
+    assert buy["status"] == "Submitted"
+    broker.process_bar("2330", 2, 10.0, 10.1, 9.0, 9.6)
+    assert buy["status"] == "Filled" and buy["fill_price"] == 9.5
+    assert broker.cancel_order(stale)
+    assert not broker.cancel_order(buy)
+    assert broker.get_positions() == {"2330": 2.0}
+    assert broker.get_account_balance()["balance"]["equity"] == 1000.0 - 19.0 + 2 * 9.6
+    print("✓ Limit orders and cancellation working")
+
+
+def test_process_pool():
+    """Test parallel backtests reading bars from the K-bar cache."""
+    print("\nTesting parallel backtests...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = KBarCache(directory)
+        for seed, symbol in enumerate(("2330", "2317", "2454")):
+            cache.save(symbol, "1min", make_bars(seed=seed), [(to_day("2024-01-02"), to_day("2024-01-02"))])
+        loader = CachedBarLoader(directory, "2024-01-02", "2024-01-02")
+
+        results = run_backtests(crossover_factory, ["2330", "2317", "2454", "MISSING"],
+                                loader, max_workers=2)
+        assert [r["symbol"] for r in results] == ["2330", "2317", "2454", "MISSING"]
+        assert all(r["bars"] == 300 and "equity" not in r for r in results[:3])
+        expected = run_backtest(VectorCrossover(), "2330", loader("2330"))
+        assert np.isclose(results[0]["final_equity"], expected["final_equity"])
+        assert results[3]["bars"] == 0
+    print("✓ Parallel backtests working")
+
+
+def test_multi_symbol_event_run():
+    """Test that an event-driven run interleaves several symbols."""
+    print("\nTesting multi-symbol event run...")
+
+    seen = []
+
+    class Recorder:
+        def on_bar(self, symbol, bar, client):
+            seen.append((bar["ts"], symbol))
+
+    run_event_driven(Recorder(), {"A": make_bars(5), "B": make_bars(5)})
+    assert seen == sorted(seen, key=lambda item: item[0])
+    assert len(seen) == 10
+    print("✓ Multi-symbol event run working")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("KGI Trading Application - Backtest Tests")
+    print("=" * 50)
+
+    try:
+        test_paths_agree()
+        test_limit_orders_and_cancel()
+        test_process_pool()
+        test_multi_symbol_event_run()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
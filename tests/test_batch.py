@@ -0,0 +1,167 @@
+"""
+Test script for the batch job runner
+
+This script tests job file parsing, concurrent execution, timeouts, stuck
+jobs and export file names.
+"""
+
+import sys
+import os
+import io
+import json
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kgi_trading_app.batch import export_filename, load_jobs, run_batch
+
+
+class FakeClient:
+    """Minimal stand-in for KGITradingClient used by batch jobs."""
+
+    def __init__(self):
+        self.logged_in = False
+
+    def login(self, user_id, password, fetch_contract=True, account_type="all"):
+        if user_id == "slow":
+            time.sleep(2)
+        self.logged_in = user_id != "bad"
+        return self.logged_in
+
+    def is_connected(self):
+        return self.logged_in
+
+    def logout(self):
+        self.logged_in = False
+        return True
+
+    def cleanup(self):
+        pass
+
+    def get_all_account_details(self):
+        return {"total_accounts": 1, "accounts": []}
+
+    def get_account_balance(self):
+        return {"acc_balance": 1000}
+
+    def get_client_info(self):
+        return {"logged_in": self.logged_in}
+
+
+def test_load_jobs():
+    """Test parsing of the job file."""
+    print("Testing job file parsing...")
+
+    with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as f:
+        f.write('# morning check\n')
+        f.write('{"user_id": "A1", "operations": ["login_check", "balance"]}\n')
+        f.write('\n{"user_id": "B2"}\n')
+        path = f.name
+    try:
+        jobs = load_jobs(path)
+        assert [job["user_id"] for job in jobs] == ["A1", "B2"]
+    finally:
+        os.unlink(path)
+
+    for timeout in ('"5"', '0', 'true'):
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as f:
+            f.write(f'{{"user_id": "A1", "timeout": {timeout}}}\n')
+            path = f.name
+        try:
+            load_jobs(path)
+            assert False, f"timeout {timeout} accepted"
+        except ValueError:
+            pass
+        finally:
+            os.unlink(path)
+    print("✓ Job file parsing working")
+
+
+def test_run_batch():
+    """Test concurrent execution with streamed results and timeouts."""
+    print("\nTesting batch execution...")
+
+    os.environ["KGI_PASSWORD"] = "secret"
+    jobs = [
+        {"user_id": "A1", "operations": ["login_check", "account_dump", "balance"]},
+        {"user_id": "bad"},
+        {"user_id": "slow", "timeout": 0.2},
+        {"user_id": "C3", "password_env": "KGI_PASSWORD_MISSING"}
+    ]
+    output = io.StringIO()
+    summary = run_batch(jobs, FakeClient, output, max_workers=2, timeout=5)
+
+    assert summary == {"ok": 1, "error": 2, "timeout": 1}
+    records = {record["user_id"]: record
+               for record in map(json.loads, output.getvalue().splitlines())}
+    assert records["A1"]["results"]["balance"] == {"acc_balance": 1000}
+    assert records["slow"]["status"] == "timeout"
+    assert "KGI_PASSWORD_MISSING" in records["C3"]["error"]
+
+    # Jobs built in code skip load_jobs; a bad timeout must still be reported
+    output = io.StringIO()
+    summary = run_batch([{"user_id": "slow", "timeout": "5"}, {"user_id": "B2"}], FakeClient,
+                        output, max_workers=1, timeout=5)
+    assert summary == {"ok": 1, "error": 1, "timeout": 0}
+    print("✓ Batch execution working")
+
+
+def test_stuck_jobs():
+    """Test that timed-out jobs keep their slot and abandoned threads are capped."""
+    print("\nTesting stuck job handling...")
+
+    os.environ["KGI_PASSWORD"] = "secret"
+    jobs = [{"user_id": "slow", "timeout": 0.1}, {"user_id": "A1"}]
+    output = io.StringIO()
+    start = time.monotonic()
+    summary = run_batch(jobs, FakeClient, output, max_workers=1, timeout=5)
+    assert summary == {"ok": 1, "error": 0, "timeout": 1}
+    # A1 waited for the stuck login to return before taking the only slot
+    assert time.monotonic() - start >= 1.8
+
+    jobs = [{"user_id": "slow", "timeout": 0.1}, {"user_id": "A1"}, {"user_id": "B2"}]
+    output = io.StringIO()
+    summary = run_batch(jobs, FakeClient, output, max_workers=1, timeout=5,
+                        abandon_after=0.1, max_abandoned=1)
+    assert summary == {"ok": 0, "error": 2, "timeout": 1}
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert all("abandoned" in record["error"] for record in records if record["status"] == "error")
+    print("✓ Stuck jobs hold their slot and abandonment is capped")
+
+
+def test_export_filename():
+    """Test that user ids cannot escape the export directory."""
+    print("\nTesting export file names...")
+
+    assert export_filename("A123456789") == "A123456789.json"
+    assert export_filename("../../etc/passwd") == "_.._etc_passwd.json"
+    assert export_filename("..") == "user.json"
+    assert os.sep not in export_filename(f"a{os.sep}b")
+    print("✓ Export file names sanitized")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("KGI Trading Application - Batch Mode Tests")
+    print("=" * 50)
+
+    try:
+        test_load_jobs()
+        test_run_batch()
+        test_stuck_jobs()
+        test_export_filename()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
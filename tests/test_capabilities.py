@@ -0,0 +1,84 @@
+"""
+Test script for cached capability introspection
+
+This script tests discovery, caching and that properties are never evaluated.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kgi_trading_app.capabilities import get_capabilities, clear_capability_cache
+
+
+class FakeStockAccount:
+    """Stand-in for an SDK account with a side-effecting property."""
+
+    property_reads = 0
+
+    def place_order(self):
+        pass
+
+    @staticmethod
+    def helper():
+        pass
+
+    @property
+    def balance(self):
+        FakeStockAccount.property_reads += 1
+        return 0
+
+    def _private(self):
+        pass
+
+
+def test_discovery():
+    """Test that methods and attributes are classified without side effects."""
+    print("Testing capability discovery...")
+
+    clear_capability_cache()
+    capabilities = get_capabilities(FakeStockAccount())
+
+    assert capabilities.supports("place_order")
+    assert capabilities.supports("helper")
+    assert not capabilities.supports("balance")
+    assert capabilities.has_attribute("balance")
+    assert not capabilities.supports("_private")
+    assert FakeStockAccount.property_reads == 0
+    print("✓ Capability discovery working")
+
+
+def test_cached_per_class():
+    """Test that instances of the same class share one cached map."""
+    print("\nTesting capability cache...")
+
+    first = get_capabilities(FakeStockAccount())
+    assert get_capabilities(FakeStockAccount()) is first
+    assert get_capabilities(FakeStockAccount) is first
+    assert first.method_names == ("helper", "place_order")
+    print("✓ Capability cache working")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("KGI Trading Application - Capability Tests")
+    print("=" * 50)
+
+    try:
+        test_discovery()
+        test_cached_per_class()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
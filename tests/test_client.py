@@ -6,9 +6,11 @@ This script tests the basic functionality of the trading client.
 
 import sys
 import os
+import threading
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from kgi_trading_app.client import KGITradingClient
+from kgi_trading_app.shutdown import ShutdownManager, PRIORITY_FLUSH
 
 
 def test_client_initialization():
@@ -83,6 +85,39 @@ def test_account_list():
     del client
 
 
+class HangingLogoutApi:
+    """Stand-in for an SDK session whose logout never returns."""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def logout(self):
+        self.release.wait()
+
+
+def test_shutdown_with_hanging_logout():
+    """Test that a hanging SDK logout leaves time for the flush hooks."""
+    print("\nTesting shutdown with a hanging logout...")
+    
+    client = KGITradingClient(simulation=True)
+    api = client.api = HangingLogoutApi()
+    with client._state_lock:
+        client._publish(logged_in=True)
+    manager = ShutdownManager(deadline=2.0)
+    client.register_shutdown(manager, timeout=0.4)
+    manager.register("journal", lambda: None, priority=PRIORITY_FLUSH)
+    
+    try:
+        report = manager.shutdown()
+    finally:
+        api.release.set()
+    statuses = {hook["name"]: hook["status"] for hook in report["hooks"]}
+    assert statuses == {"kgi-client": "ok", "kgi-client-latency": "ok", "journal": "ok"}, statuses
+    assert report["phases"]["hooks_s"] < 1.0
+    assert not client.is_logged_in
+    print("✓ Flush hooks run after a hanging logout")
+
+
 def main():
     """Run all tests."""
     print("=" * 50)
@@ -94,6 +129,7 @@ def main():
         test_client_info()
         test_contract_status()
         test_account_list()
+        test_shutdown_with_hanging_logout()
         
         print("\n" + "=" * 50)
         print("✓ All tests passed!")
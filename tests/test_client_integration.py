@@ -0,0 +1,210 @@
+"""
+Integration tests for KGITradingClient order, report and query paths
+
+This script drives a logged-in client against fake SDK objects to test
+order latency tracking, the order journal and bulk snapshot queries.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kgi_trading_app.client import KGITradingClient
+from kgi_trading_app.records import AccountRecord
+from kgi_trading_app.journal import Journal
+from kgi_trading_app.shutdown import ShutdownManager
+
+
+class FakeStockAccount:
+    """Stand-in for an SDK stock account."""
+
+    def __init__(self, account_id):
+        self.person_id = "A123456789"
+        self.broker_id = "9A00"
+        self.account_id = account_id
+        self.signed = True
+
+
+class FakeFutureAccount(FakeStockAccount):
+    """Stand-in for an SDK futures account."""
+
+
+def _logged_in_client():
+    client = KGITradingClient(simulation=True)
+    accounts = tuple([FakeStockAccount(f"S{i}") for i in range(3)] +
+                     [FakeFutureAccount(f"F{i}") for i in range(2)])
+    records = tuple(AccountRecord.from_account(i + 1, account) for i, account in enumerate(accounts))
+    with client._state_lock:
+        client._publish(logged_in=True, accounts=accounts, all_accounts=accounts,
+                        stock_account=accounts[0], futopt_account=accounts[3],
+                        account_records=records,
+                        records_by_id={id(a): r for a, r in zip(accounts, records)})
+    return client
+
+
+
+
+class FakeOrderApi:
+    """Stand-in for the SDK order path."""
+
+    def place_order(self, contract, order):
+        return {"order": {"id": "A1"}, "contract": contract}
+
+
+def test_order_latency_tracking():
+    """Test that place_order and trade reports feed the latency histograms."""
+    print("Testing order latency tracking, the order journal and bulk snapshot queries...")
+
+    client = _logged_in_client()
+    client.api = FakeOrderApi()
+    reports = []
+    client.add_trade_listener(reports.append)
+
+    assert client.place_order({"code": "2330"}, {"action": "Buy", "quantity": 1})
+    client.handle_trade_report({"order_id": "A1", "status": "Submitted", "quantity": 1})
+    client.handle_trade_report({"order_id": "A1", "status": "Filled", "quantity": 1,
+                                "deal_quantity": 1, "deal_price": 600})
+
+    assert [r["status"] for r in reports] == ["submitted", "filled"]
+    assert reports[1]["complete"] and reports[1]["fill_price"] == 600
+    latency = client.get_client_info()["order_latency_ns"]
+    stats = latency["S0:2330"]
+    for interval in ("send_to_ack", "ack_to_first_fill", "send_to_complete"):
+        assert stats[interval]["count"] == 1, interval
+    assert client.latency.pending_count == 0
+    print("✓ Order latency tracking working")
+
+
+def test_order_journal():
+    """Test that orders are journaled before sending and recovered with their fills."""
+    print("\nTesting order journal...")
+
+    class RecordingOrderApi(FakeOrderApi):
+        def place_order(self, contract, order):
+            self.journaled = [o["status"] for o in journal.state.orders.values()]
+            return super().place_order(contract, order)
+
+    with tempfile.TemporaryDirectory() as directory:
+        client = _logged_in_client()
+        client.api = RecordingOrderApi()
+        journal = Journal(directory, fsync=False)
+        manager = ShutdownManager()
+        journal.attach(client, manager)
+
+        assert client.place_order({"code": "2330"}, {"action": "Buy", "quantity": 3, "price": 600})
+        assert client.api.journaled == ["submitted"]
+        client.handle_trade_report({"order_id": "A1", "status": "Filled", "quantity": 3,
+                                    "deal_quantity": 3, "deal_price": 601})
+        manager.shutdown()
+
+        recovered = Journal(directory, fsync=False)
+        try:
+            (order,) = recovered.state.orders.values()
+            assert order["order_id"] == "A1" and order["status"] == "filled"
+            assert order["account"] == "S0" and order["fill_price"] == 601
+            assert recovered.state.positions == {"S0:2330": 3.0}
+        finally:
+            recovered.close()
+    print("✓ Order journal working")
+
+
+class FakeSnapshotApi:
+    """Stand-in for the SDK snapshot call; the first call for '2317' fails."""
+
+    def __init__(self):
+        self.calls = []
+        self.failed = False
+
+    def snapshots(self, contracts):
+        self.calls.append(list(contracts))
+        if "2317" in contracts and not self.failed:
+            self.failed = True
+            raise RuntimeError("temporary failure")
+        if "BAD" in contracts:
+            raise RuntimeError("unknown symbol")
+        return [{"code": code, "close": float(len(code))} for code in contracts]
+
+
+def test_bulk_snapshots():
+    """Test chunked snapshot queries with retries and columnar output."""
+    print("\nTesting bulk snapshots...")
+
+    client = _logged_in_client()
+    client.api = FakeSnapshotApi()
+    symbols = ["2330", "2317", "2454", "2330", "BAD"]
+    result = client.get_snapshots(symbols, chunk_size=2, max_workers=2, retries=1)
+
+    assert list(result["symbol"]) == ["2330", "2317", "2454", "BAD"]
+    assert list(result["ok"]) == [True, True, True, False]
+    assert list(result["close"][:3]) == [4.0, 4.0, 4.0]
+    assert list(result["errors"]) == ["BAD"]
+    assert len(client.api.calls) == 6
+    print("✓ Bulk snapshots working")
+
+
+class OutageSnapshotApi:
+    """Stand-in for a failing session; optionally omits a symbol when it works."""
+
+    def __init__(self, down=True, omit=None, error="connection reset"):
+        self.calls = []
+        self.down = down
+        self.omit = omit
+        self.error = error
+
+    def snapshots(self, contracts):
+        self.calls.append(list(contracts))
+        if self.down:
+            raise RuntimeError(self.error)
+        return [{"code": code, "close": 1.0} for code in contracts if code != self.omit]
+
+
+def test_snapshot_outage():
+    """Test that a session-wide failure is not bisected into a request storm."""
+    print("\nTesting bulk snapshots during an outage...")
+
+    client = _logged_in_client()
+    symbols = [f"{1000 + n}" for n in range(40)]
+    client.api = OutageSnapshotApi()
+    result = client.get_snapshots(symbols, chunk_size=10, max_workers=2, retries=0)
+    assert len(client.api.calls) == 4
+    assert not result["ok"].any() and sorted(result["errors"]) == symbols
+
+    # A symbol-specific error is bisected, within the call cap
+    client.api = OutageSnapshotApi(error="unknown contract")
+    result = client.get_snapshots(symbols, chunk_size=10, max_workers=2, retries=0,
+                                  max_split_calls=8)
+    assert len(client.api.calls) == 4 + 8
+    assert len(result["errors"]) == 40
+
+    client.api = OutageSnapshotApi(down=False, omit="1003")
+    result = client.get_snapshots(symbols, chunk_size=10)
+    assert list(result["errors"]) == ["1003"] and result["ok"].sum() == 39
+    print("✓ Outages fail fast and omitted symbols are reported")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("KGI Trading Application - Client Integration Tests")
+    print("=" * 50)
+
+    try:
+        test_order_latency_tracking()
+        test_order_journal()
+        test_bulk_snapshots()
+        test_snapshot_outage()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
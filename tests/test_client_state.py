@@ -0,0 +1,156 @@
+"""
+Stress test for KGITradingClient state snapshots
+
+This script switches account types from several writer threads while many
+reader threads check that every snapshot they see is internally consistent.
+"""
+
+import sys
+import os
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kgi_trading_app.client import KGITradingClient
+from kgi_trading_app.records import AccountRecord
+from kgi_trading_app.events import ClientEvent
+
+
+class FakeStockAccount:
+    """Stand-in for an SDK stock account."""
+
+    def __init__(self, account_id):
+        self.person_id = "A123456789"
+        self.broker_id = "9A00"
+        self.account_id = account_id
+        self.signed = True
+
+
+class FakeFutureAccount(FakeStockAccount):
+    """Stand-in for an SDK futures account."""
+
+
+def _logged_in_client():
+    client = KGITradingClient(simulation=True)
+    accounts = tuple([FakeStockAccount(f"S{i}") for i in range(3)] +
+                     [FakeFutureAccount(f"F{i}") for i in range(2)])
+    records = tuple(AccountRecord.from_account(i + 1, account) for i, account in enumerate(accounts))
+    with client._state_lock:
+        client._publish(logged_in=True, accounts=accounts, all_accounts=accounts,
+                        stock_account=accounts[0], futopt_account=accounts[3],
+                        account_records=records,
+                        records_by_id={id(a): r for a, r in zip(accounts, records)})
+    return client
+
+
+def test_concurrent_readers_and_writers():
+    """Test that readers never observe a torn state while writers switch types."""
+    print("Testing concurrent state access...")
+
+    client = _logged_in_client()
+    stop = threading.Event()
+    errors = []
+
+    def writer(types):
+        while not stop.is_set():
+            for account_type in types:
+                client.switch_account_type(account_type)
+
+    def reader():
+        for _ in range(3000):
+            state = client.state
+            stock = sum(1 for a in state.accounts if state.record_for(a).type == "Stock")
+            futures = len(state.accounts) - stock
+            if (state.stock_account is not None) != (stock > 0):
+                errors.append(f"stock default mismatch in {state}")
+            if (state.futopt_account is not None) != (futures > 0):
+                errors.append(f"futures default mismatch in {state}")
+
+            info = client.get_client_info()
+            if info["account_count"] != info["stock_accounts"] + info["futures_accounts"]:
+                errors.append(f"inconsistent client info {info}")
+
+            details = client.get_all_account_details()
+            visible = sum(1 for a in details["accounts"] if a["is_visible_in_current_filter"])
+            if visible != details["current_visible_accounts"]:
+                errors.append(f"inconsistent details {details}")
+
+    writers = [threading.Thread(target=writer, args=(types,))
+               for types in (("stock", "all"), ("futures", "stock"), ("all", "futures"))]
+    readers = [threading.Thread(target=reader) for _ in range(8)]
+    for thread in writers + readers:
+        thread.start()
+    for thread in readers:
+        thread.join()
+    stop.set()
+    for thread in writers:
+        thread.join()
+
+    assert not errors, errors[:3]
+    assert client.state.version > 1
+    print("✓ Concurrent state access working")
+
+
+def test_snapshot_is_immutable():
+    """Test that published snapshots cannot be modified."""
+    print("\nTesting snapshot immutability...")
+
+    client = _logged_in_client()
+    state = client.state
+    try:
+        state.logged_in = False
+        assert False, "Expected AttributeError"
+    except AttributeError:
+        pass
+    client.switch_account_type("stock")
+    assert len(state.accounts) == 5
+    assert len(client.state.accounts) == 3
+    print("✓ Snapshot immutability working")
+
+
+def test_state_change_events():
+    """Test that state changes emit typed events."""
+    print("\nTesting state change events...")
+
+    client = _logged_in_client()
+    received = []
+    client.subscribe(lambda event: received.append(event.type))
+
+    client.switch_account_type("stock")
+    assert received == [ClientEvent.ACCOUNTS_CHANGED, ClientEvent.DEFAULTS_CHANGED]
+
+    del received[:]
+    client.switch_account_type("stock")
+    assert received == []
+
+    client.handle_contracts_ready()
+    client.handle_contracts_ready()
+    client.handle_connection_lost("socket closed")
+    assert received == [ClientEvent.CONTRACTS_READY, ClientEvent.CONNECTION_LOST]
+    assert client.get_client_info()["contracts_ready"]
+    print("✓ State change events working")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("KGI Trading Application - Client State Tests")
+    print("=" * 50)
+
+    try:
+        test_concurrent_readers_and_writers()
+        test_snapshot_is_immutable()
+        test_state_change_events()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
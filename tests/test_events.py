@@ -0,0 +1,146 @@
+"""
+Test script for the client event dispatcher
+
+This script tests subscription filtering, unsubscribing, error isolation and
+the asyncio and Tk bridges.
+"""
+
+import sys
+import os
+import asyncio
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kgi_trading_app.events import ClientEvent, EventDispatcher, asyncio_bridge, tk_bridge
+
+
+def test_subscribe_and_filter():
+    """Test that typed and catch-all subscribers receive the right events."""
+    print("Testing event subscription...")
+
+    dispatcher = EventDispatcher()
+    everything = []
+    logins = []
+    dispatcher.subscribe(everything.append)
+    unsubscribe = dispatcher.subscribe(logins.append, ClientEvent.LOGGED_IN)
+
+    dispatcher.emit(ClientEvent.LOGGED_IN)
+    dispatcher.emit(ClientEvent.ACCOUNTS_CHANGED, count=3)
+    assert [e.type for e in everything] == [ClientEvent.LOGGED_IN, ClientEvent.ACCOUNTS_CHANGED]
+    assert everything[1].data == {"count": 3}
+    assert len(logins) == 1
+
+    unsubscribe()
+    dispatcher.emit(ClientEvent.LOGGED_IN)
+    assert len(logins) == 1
+    assert len(everything) == 3
+    assert dispatcher.has_subscribers(ClientEvent.LOGGED_OUT)
+    print("✓ Event subscription working")
+
+
+def test_callback_errors_are_isolated():
+    """Test that a failing subscriber does not stop the others."""
+    print("\nTesting callback error isolation...")
+
+    dispatcher = EventDispatcher()
+    received = []
+
+    def broken(event):
+        raise RuntimeError("boom")
+
+    dispatcher.subscribe(broken)
+    dispatcher.subscribe(received.append)
+    dispatcher.emit(ClientEvent.CONNECTION_LOST, reason="test")
+    assert received and received[0].data["reason"] == "test"
+    print("✓ Callback error isolation working")
+
+
+def test_asyncio_bridge():
+    """Test that events emitted on another thread run on the event loop."""
+    print("\nTesting asyncio bridge...")
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        done = asyncio.Event()
+        seen = []
+
+        def on_event(event):
+            seen.append(threading.get_ident())
+            done.set()
+
+        dispatcher = EventDispatcher()
+        dispatcher.subscribe(asyncio_bridge(loop, on_event), ClientEvent.CONTRACTS_READY)
+        threading.Thread(target=dispatcher.emit, args=(ClientEvent.CONTRACTS_READY,)).start()
+        await asyncio.wait_for(done.wait(), 5)
+        return seen
+
+    seen = asyncio.run(run())
+    assert seen == [threading.get_ident()]
+    print("✓ Asyncio bridge working")
+
+
+class FakeRoot:
+    """Stand-in for a Tk root: after() callbacks run when the test pumps them."""
+
+    def __init__(self):
+        self.scheduled = []
+        self.destroyed = False
+
+    def after(self, delay, callback, *args):
+        if self.destroyed:
+            raise RuntimeError("application has been destroyed")
+        self.scheduled.append((callback, args))
+
+    def run_pending(self):
+        scheduled, self.scheduled = self.scheduled, []
+        for callback, args in scheduled:
+            callback(*args)
+
+
+def test_tk_bridge():
+    """Test that events from other threads are queued until the Tk thread polls."""
+    print("\nTesting Tk bridge...")
+
+    root = FakeRoot()
+    seen = []
+    dispatcher = EventDispatcher()
+    dispatcher.subscribe(tk_bridge(root, lambda event: seen.append(threading.get_ident())))
+    thread = threading.Thread(target=dispatcher.emit, args=(ClientEvent.LOGGED_OUT,))
+    thread.start()
+    thread.join()
+    assert seen == [] and len(root.scheduled) == 1
+
+    root.run_pending()
+    assert seen == [threading.get_ident()]
+    root.destroyed = True
+    dispatcher.emit(ClientEvent.LOGGED_OUT)
+    root.run_pending()
+    assert root.scheduled == [] and len(seen) == 2
+    print("✓ Tk bridge working")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("KGI Trading Application - Event Tests")
+    print("=" * 50)
+
+    try:
+        test_subscribe_and_filter()
+        test_callback_errors_are_isolated()
+        test_asyncio_bridge()
+        test_tk_bridge()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
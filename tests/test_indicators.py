@@ -0,0 +1,103 @@
+"""
+Test script for vectorized and streaming indicators
+
+This script checks the batch indicators against straightforward loops and
+checks that the streaming classes reproduce the batch values bar by bar.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from kgi_trading_app import indicators as ind
+
+
+def _bars(count=500, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 600 + np.cumsum(rng.normal(0, 1, count))
+    high = close + rng.uniform(0, 2, count)
+    low = close - rng.uniform(0, 2, count)
+    volume = rng.integers(1, 1000, count).astype(float)
+    return high, low, close, volume
+
+
+def test_batch_against_loops():
+    """Test batch indicators against reference loops."""
+    print("Testing batch indicators...")
+
+    high, low, close, volume = _bars()
+
+    expected_sma = np.array([close[i - 19:i + 1].mean() if i >= 19 else np.nan
+                             for i in range(len(close))])
+    assert np.allclose(ind.sma(close, 20), expected_sma, equal_nan=True)
+
+    expected_ema = [close[0]]
+    for value in close[1:]:
+        expected_ema.append(expected_ema[-1] + 2 / 11 * (value - expected_ema[-1]))
+    assert np.allclose(ind.ema(close, 10), expected_ema)
+    assert np.allclose(ind.ema(close, 1), close)
+
+    expected_std = np.array([close[i - 19:i + 1].std() if i >= 19 else np.nan
+                             for i in range(len(close))])
+    assert np.allclose(ind.rolling_std(close, 20), expected_std, equal_nan=True)
+
+    typical = (high + low + close) / 3
+    assert np.allclose(ind.vwap(high, low, close, volume),
+                       np.cumsum(typical * volume) / np.cumsum(volume))
+
+    universe = np.vstack([close, close * 2])
+    assert np.allclose(ind.ema(universe, 10)[1], 2 * np.asarray(expected_ema))
+    print("✓ Batch indicators working")
+
+
+def test_streaming_matches_batch():
+    """Test that streaming updates reproduce the batch series."""
+    print("\nTesting streaming indicators...")
+
+    high, low, close, volume = _bars()
+    sma, ema, rsi, zscore = ind.SMA(20), ind.EMA(20), ind.RSI(14), ind.ZScore(20)
+    atr, vwap, bands = ind.ATR(14), ind.VWAP(), ind.Bollinger(20)
+
+    streamed = {name: [] for name in ("sma", "ema", "rsi", "zscore", "atr", "vwap", "upper")}
+    for h, l, c, v in zip(high, low, close, volume):
+        streamed["sma"].append(sma.update(c))
+        streamed["ema"].append(ema.update(c))
+        streamed["rsi"].append(rsi.update(c))
+        streamed["zscore"].append(zscore.update(c))
+        streamed["atr"].append(atr.update(h, l, c))
+        streamed["vwap"].append(vwap.update(h, l, c, v))
+        streamed["upper"].append(bands.update(c)[0])
+
+    batch = ind.bar_indicators({"high": high, "low": low, "close": close, "volume": volume})
+    for name, key in (("sma", "sma"), ("ema", "ema"), ("rsi", "rsi"), ("zscore", "zscore"),
+                      ("atr", "atr"), ("vwap", "vwap"), ("upper", "bollinger_upper")):
+        assert np.allclose(streamed[name], batch[key], equal_nan=True), name
+    assert 0 <= np.nanmin(batch["rsi"]) and np.nanmax(batch["rsi"]) <= 100
+    print("✓ Streaming indicators working")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("KGI Trading Application - Indicator Tests")
+    print("=" * 50)
+
+    try:
+        test_batch_against_loops()
+        test_streaming_matches_batch()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
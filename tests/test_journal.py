@@ -0,0 +1,253 @@
+"""
+Test script for the order and fill journal
+
+This script tests record round trips, crash recovery with a torn tail,
+checkpoints, segment rotation, group commit under concurrent writers,
+write failures and reports that arrive before an order is marked sent.
+"""
+
+import sys
+import os
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kgi_trading_app.journal import Journal, SUBMIT, REPORT, read_segment
+
+
+def _journal(directory, **options):
+    options.setdefault("fsync", False)
+    options.setdefault("commit_interval", 0.0005)
+    return Journal(directory, **options)
+
+
+def _trade_day(journal, orders=3):
+    """Submit, send and fill a few orders (buy 2330, sell 2317)."""
+    for n in range(orders):
+        local_id = f"L{n}"
+        symbol, action = ("2330", "buy") if n % 2 == 0 else ("2317", "sell")
+        journal.record_order("submit", {"local_id": local_id, "account": "S1", "symbol": symbol,
+                                        "action": action, "quantity": 2.0, "price": 100.0})
+        journal.record_order("sent", {"local_id": local_id, "order_id": f"A{n}"})
+        journal.record_report({"order_id": f"A{n}", "status": "partfilled", "filled_quantity": 1.0})
+        journal.record_report({"order_id": f"A{n}", "status": "filled", "filled_quantity": 2.0,
+                               "fill_price": 101.0, "received_ns": 1})
+
+
+def test_recovery():
+    """Test that reopening a journal rebuilds orders and positions."""
+    print("Testing journal recovery...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        with _journal(directory) as journal:
+            _trade_day(journal)
+            journal.record_order("submit", {"local_id": "L9", "account": "S1", "symbol": "2603",
+                                            "action": "buy", "quantity": 1.0, "price": None})
+            live = journal.state.to_dict()
+
+        recovered = _journal(directory)
+        try:
+            assert recovered.state.to_dict() == live
+            assert recovered.state.positions == {"S1:2330": 4.0, "S1:2317": -2.0}
+            assert [o["local_id"] for o in recovered.state.open_orders()] == ["L9"]
+            assert recovered.recovery_stats["records"] == 13
+            seq = recovered.append(REPORT, {"order_id": "X1", "status": "submitted"})
+            assert seq == 14
+        finally:
+            recovered.close()
+    print("✓ Journal recovery working")
+
+
+def test_torn_tail():
+    """Test that a partially written last record is dropped and truncated."""
+    print("\nTesting torn journal tail...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        with _journal(directory) as journal:
+            _trade_day(journal, orders=1)
+        segment = os.path.join(directory, sorted(os.listdir(directory))[0])
+        size = os.path.getsize(segment)
+        with open(segment, "ab") as f:
+            f.write(b"\x40\x00\x00\x00garbage")
+
+        recovered = _journal(directory)
+        try:
+            assert recovered.state.seq == 4
+            assert recovered.state.positions == {"S1:2330": 2.0}
+            assert os.path.getsize(segment) == size
+        finally:
+            recovered.close()
+
+        # Flip a payload byte: the record fails its checksum
+        with open(segment, "r+b") as f:
+            f.seek(size - 2)
+            f.write(b"\xff")
+        records, valid = read_segment(segment)
+        assert len(records) == 3 and valid < size
+    print("✓ Torn journal tail handled")
+
+
+def test_checkpoint_and_rotation():
+    """Test that checkpoints drop covered segments and replay only the tail."""
+    print("\nTesting checkpoints and segment rotation...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        journal = _journal(directory, segment_bytes=256)
+        _trade_day(journal, orders=6)
+        journal.flush()
+        segments = [name for name in os.listdir(directory) if name.endswith(".wal")]
+        assert len(segments) > 1, segments
+
+        journal.checkpoint()
+        journal.record_order("submit", {"local_id": "L9", "account": "S1", "symbol": "2330",
+                                        "action": "sell", "quantity": 4.0, "price": 99.0})
+        journal.record_order("sent", {"local_id": "L9", "order_id": "A9"})
+        journal.record_report({"order_id": "A9", "status": "filled", "filled_quantity": 4.0})
+        live = journal.state.to_dict()
+        journal.close()
+        names = os.listdir(directory)
+        assert len([name for name in names if name.startswith("checkpoint-")]) == 1
+
+        recovered = _journal(directory)
+        try:
+            assert recovered.recovery_stats["records"] == 3
+            assert recovered.state.to_dict() == live
+            assert recovered.state.positions["S1:2330"] == 2.0
+        finally:
+            recovered.close()
+    print("✓ Checkpoints and segment rotation working")
+
+
+def test_group_commit():
+    """Test that concurrent durable appends share fsyncs and all survive."""
+    print("\nTesting group commit...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        journal = Journal(directory, commit_interval=0.002)
+        commits = []
+        original = journal._commit
+
+        def counting_commit():
+            commits.append(len(journal._batch))
+            original()
+        journal._commit = counting_commit
+
+        def writer(n):
+            for i in range(25):
+                journal.append(SUBMIT, {"local_id": f"T{n}-{i}", "symbol": "2330", "action": "buy",
+                                        "quantity": 1.0}, durable=True)
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        journal.close()
+
+        assert sum(commits) == 200
+        assert len([c for c in commits if c]) < 200
+        recovered = _journal(directory)
+        try:
+            assert len(recovered.state.orders) == 200
+        finally:
+            recovered.close()
+    print("✓ Group commit working")
+
+
+class _FailingFile:
+    """Segment file whose next write stores half the bytes, then fails."""
+
+    def __init__(self, file):
+        self.file = file
+        self.fail = True
+
+    def write(self, data):
+        if self.fail:
+            self.fail = False
+            self.file.write(data[:len(data) // 2])
+            raise OSError(28, "No space left on device")
+        return self.file.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+
+def test_write_failure():
+    """Test that a failed write refuses durable records and keeps later ones readable."""
+    print("\nTesting journal write failure...")
+
+    submit = {"account": "S1", "symbol": "2330", "action": "buy", "quantity": 1.0, "price": 100.0}
+    with tempfile.TemporaryDirectory() as directory:
+        journal = _journal(directory)
+        journal.record_order("submit", dict(submit, local_id="L0"))
+        journal._file = _FailingFile(journal._file)
+        try:
+            journal.record_order("submit", dict(submit, local_id="L1"))
+            assert False, "failed submit reported durable"
+        except OSError:
+            pass
+        journal.record_order("submit", dict(submit, local_id="L2"))
+        journal.flush()
+        journal.close()
+
+        recovered = _journal(directory)
+        try:
+            assert sorted(recovered.state.orders) == ["L0", "L2"]
+            assert recovered.recovery_stats["records"] == 2
+        finally:
+            recovered.close()
+    print("✓ Failed writes refused and cut from the segment")
+
+
+def test_report_before_sent():
+    """Test that fills reported before SENT merge into the local order."""
+    print("\nTesting reports that arrive before SENT...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        with _journal(directory) as journal:
+            journal.record_order("submit", {"local_id": "L1", "account": "S0", "symbol": "2330",
+                                            "action": "sell", "quantity": 3.0, "price": 100.0})
+            journal.record_report({"order_id": "A1", "status": "partfilled", "filled_quantity": 1.0})
+            journal.record_order("sent", {"local_id": "L1", "order_id": "A1"})
+            journal.record_report({"order_id": "A1", "status": "filled", "filled_quantity": 3.0})
+            live = journal.state.to_dict()
+
+        recovered = _journal(directory)
+        try:
+            assert recovered.state.to_dict() == live
+            assert recovered.state.positions == {"S0:2330": -3.0}, recovered.state.positions
+            assert list(recovered.state.orders) == ["L1"]
+            assert recovered.state.orders["L1"]["status"] == "filled"
+            assert recovered.state.open_orders() == []
+        finally:
+            recovered.close()
+    print("✓ Early reports merged without double counting")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("KGI Trading Application - Journal Tests")
+    print("=" * 50)
+
+    try:
+        test_recovery()
+        test_torn_tail()
+        test_checkpoint_and_rotation()
+        test_group_commit()
+        test_write_failure()
+        test_report_before_sent()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
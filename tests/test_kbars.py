@@ -0,0 +1,114 @@
+"""
+Test script for the incremental K-bar cache
+
+This script tests gap detection, gap-only fetching, merging and persistence
+with an in-memory fetcher.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from kgi_trading_app.kbars import (KBarService, missing_ranges, merge_ranges,
+                                   to_day, NS_PER_DAY)
+
+
+class FakeFetcher:
+    """Returns two bars per day and records each requested range."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, symbol, interval, start, end):
+        self.calls.append((start, end))
+        days = np.arange(to_day(start), to_day(end) + 1, dtype=np.int64)
+        ts = np.sort(np.concatenate([days * NS_PER_DAY + 3600 * 10**9,
+                                     days * NS_PER_DAY + 7200 * 10**9]))
+        price = ts / 1e18
+        return {"ts": ts, "Open": price, "High": price + 1, "Low": price - 1,
+                "Close": price, "Volume": np.ones(len(ts))}
+
+
+def test_range_helpers():
+    """Test missing and merged day ranges."""
+    print("Testing range helpers...")
+
+    assert missing_ranges([], 1, 10) == [(1, 10)]
+    assert missing_ranges([(3, 4), (7, 8)], 1, 10) == [(1, 2), (5, 6), (9, 10)]
+    assert missing_ranges([(0, 20)], 1, 10) == []
+    assert merge_ranges([(1, 2)], [(3, 5), (8, 9)]) == [(1, 5), (8, 9)]
+    print("✓ Range helpers working")
+
+
+def test_gap_only_fetching():
+    """Test that only uncached days are fetched and results persist."""
+    print("\nTesting gap-only fetching...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        fetcher = FakeFetcher()
+        service = KBarService(cache_dir=directory, fetcher=fetcher)
+
+        bars = service.get_bars("2330", "2024-01-10", "2024-01-12")
+        assert len(bars["ts"]) == 6
+        assert fetcher.calls == [("2024-01-10", "2024-01-12")]
+
+        bars = service.get_bars("2330", "2024-01-08", "2024-01-15")
+        assert len(bars["ts"]) == 16
+        assert np.all(np.diff(bars["ts"]) > 0)
+        assert fetcher.calls[1:] == [("2024-01-08", "2024-01-09"), ("2024-01-13", "2024-01-15")]
+
+        reopened = KBarService(cache_dir=directory, fetcher=fetcher)
+        bars = reopened.get_bars("2330", "2024-01-11", "2024-01-11")
+        assert len(bars["ts"]) == 2
+        assert len(fetcher.calls) == 3
+        assert reopened.coverage("2330") == [("2024-01-08", "2024-01-15")]
+    print("✓ Gap-only fetching working")
+
+
+def test_get_many_reports_errors():
+    """Test that one failing symbol does not fail the batch."""
+    print("\nTesting multi-symbol fetch...")
+
+    fetcher = FakeFetcher()
+
+    def fetch(symbol, interval, start, end):
+        if symbol == "BAD":
+            raise RuntimeError("no such symbol")
+        return fetcher(symbol, interval, start, end)
+
+    with tempfile.TemporaryDirectory() as directory:
+        service = KBarService(cache_dir=directory, fetcher=fetch)
+        results = service.get_many(["2330", "BAD", "2317"], "2024-01-10", "2024-01-10")
+        assert len(results["2330"]["ts"]) == 2
+        assert "error" in results["BAD"]
+        assert service.fetch_count == 2
+    print("✓ Multi-symbol fetch working")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("KGI Trading Application - K-bar Cache Tests")
+    print("=" * 50)
+
+    try:
+        test_range_helpers()
+        test_gap_only_fetching()
+        test_get_many_reports_errors()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
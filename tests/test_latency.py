@@ -0,0 +1,122 @@
+"""
+Test script for order latency histograms
+
+This script tests bucket precision, percentiles and stage matching,
+including reports that arrive before the order id is known.
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kgi_trading_app.latency import (LatencyHistogram, OrderLatencyTracker,
+                                     bucket_index, bucket_bounds, SIGNIFICANT_BITS)
+
+
+def test_bucket_precision():
+    """Test that every value lands in a bucket within the relative error bound."""
+    print("Testing bucket precision...")
+
+    bound = 1.0 / 2 ** (SIGNIFICANT_BITS - 1)
+    for value in list(range(0, 5000)) + [10**k + 7 for k in range(4, 12)]:
+        low, high = bucket_bounds(bucket_index(value))
+        assert low <= value <= high, value
+        assert (high - low) <= max(1, value * bound), value
+    print("✓ Bucket precision working")
+
+
+def test_percentiles():
+    """Test percentile estimates on a known distribution."""
+    print("\nTesting percentiles...")
+
+    histogram = LatencyHistogram()
+    for value in range(1, 100001):
+        histogram.record(value * 1000)
+    stats = histogram.to_dict()
+    assert stats["count"] == 100000
+    assert stats["min"] == 1000 and stats["max"] == 100000000
+    for key, expected in (("p50", 50e6), ("p90", 90e6), ("p99", 99e6)):
+        assert abs(stats[key] - expected) / expected < 0.04, (key, stats[key])
+    print("✓ Percentiles working")
+
+
+def test_stage_matching():
+    """Test interval recording per account/symbol, in and out of order."""
+    print("\nTesting stage matching...")
+
+    tracker = OrderLatencyTracker()
+    tracker.mark("A1", "send", 1000, account="9A00-1", symbol="2330")
+    tracker.mark("A1", "ack", 3000)
+    tracker.mark("A1", "first_fill", 7000)
+    tracker.mark("A1", "first_fill", 9000)
+    tracker.mark("A1", "complete", 11000)
+
+    # Ack arrives before place_order returned the order id
+    tracker.mark("B2", "ack", 5000)
+    tracker.mark("B2", "send", 2000, account="9A00-1", symbol="2330")
+    tracker.mark("C3", "send", 0, symbol="2317")
+    tracker.discard("C3")
+
+    # A final report overtakes the send mark; the late send must not linger
+    tracker.mark("D4", "ack", 4000, account="9A00-1", symbol="2330", done=True)
+    tracker.mark("D4", "send", 1000, account="9A00-1", symbol="2330")
+
+    snapshot = tracker.snapshot()
+    stats = snapshot["9A00-1:2330"]
+    assert stats["send_to_ack"]["count"] == 2
+    assert stats["send_to_ack"]["max"] == 3000
+    assert stats["ack_to_first_fill"]["min"] == 4000
+    assert stats["send_to_complete"]["min"] == 10000
+    assert snapshot["*"]["send_to_ack"]["count"] == 2
+    assert tracker.pending_count == 1
+
+    assert tracker.snapshot(reset=True)
+    assert tracker.snapshot() == {}
+    print("✓ Stage matching working")
+
+
+def test_export():
+    """Test that stopping the exporter writes a final snapshot."""
+    print("\nTesting latency export...")
+
+    tracker = OrderLatencyTracker()
+    tracker.mark("A1", "send", 0, symbol="2330")
+    tracker.mark("A1", "ack", 500)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "latency.jsonl")
+        tracker.start_export(path, interval=60)
+        tracker.stop_export()
+        with open(path, "r", encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+    assert len(lines) == 1
+    assert lines[0]["latency_ns"]["-:2330"]["send_to_ack"]["count"] == 1
+    print("✓ Latency export working")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("KGI Trading Application - Latency Tests")
+    print("=" * 50)
+
+    try:
+        test_bucket_precision()
+        test_percentiles()
+        test_stage_matching()
+        test_export()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,180 @@
+"""
+Test script for option chain greeks
+
+This script checks Black-Scholes/Black-76 prices and greeks against a
+scalar reference, the vectorized IV solver and incremental chain
+recomputation.
+"""
+
+import sys
+import os
+import math
+import time
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from kgi_trading_app.options import (OptionChain, black76, black_scholes, implied_vol,
+                                     norm_cdf, years_to_expiry)
+
+
+def _reference_call(spot, strike, years, vol, rate, dividend):
+    """Scalar Black-Scholes call using math.erf."""
+    cdf = lambda x: 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
+    d1 = (math.log(spot / strike) + (rate - dividend + 0.5 * vol * vol) * years) / (vol * math.sqrt(years))
+    d2 = d1 - vol * math.sqrt(years)
+    return spot * math.exp(-dividend * years) * cdf(d1) - strike * math.exp(-rate * years) * cdf(d2)
+
+
+def test_pricing():
+    """Test prices against a scalar reference, parity and finite-difference greeks."""
+    print("Testing option pricing...")
+
+    x = np.linspace(-6, 6, 121)
+    reference = np.array([0.5 * (1.0 + math.erf(v / math.sqrt(2.0))) for v in x])
+    assert np.max(np.abs(norm_cdf(x) - reference)) < 1e-7
+
+    strikes = np.arange(15000, 19001, 100.0)
+    calls = black_scholes(17000, strikes, 0.1, 0.22, True, rate=0.015, dividend=0.03)
+    puts = black_scholes(17000, strikes, 0.1, 0.22, False, rate=0.015, dividend=0.03)
+    expected = [_reference_call(17000, k, 0.1, 0.22, 0.015, 0.03) for k in strikes]
+    assert np.allclose(calls["price"], expected, atol=1e-3)
+    parity = 17000 * math.exp(-0.03 * 0.1) - strikes * math.exp(-0.015 * 0.1)
+    assert np.allclose(calls["price"] - puts["price"], parity, atol=1e-3)
+
+    bump = 0.01
+    for is_call in (True, False):
+        base = black76(17000, strikes, 0.1, 0.22, is_call, rate=0.015)
+        up = black76(17000 + bump, strikes, 0.1, 0.22, is_call, rate=0.015)["price"]
+        down = black76(17000 - bump, strikes, 0.1, 0.22, is_call, rate=0.015)["price"]
+        assert np.allclose(base["delta"], (up - down) / (2 * bump), atol=1e-4)
+        vol_up = black76(17000, strikes, 0.1, 0.22 + 1e-4, is_call, rate=0.015)["price"]
+        assert np.allclose(base["vega"], (vol_up - base["price"]) / 1e-4, rtol=1e-2, atol=1e-2)
+        later = black76(17000, strikes, 0.1 - 1e-5, 0.22, is_call, rate=0.015)["price"]
+        assert np.allclose(base["theta"], (later - base["price"]) / 1e-5, rtol=1e-2, atol=1e-1)
+    print("✓ Option pricing working")
+
+
+def test_implied_vol():
+    """Test that the solver recovers volatilities and rejects impossible prices."""
+    print("\nTesting implied volatility solver...")
+
+    rng = np.random.default_rng(3)
+    strikes = rng.uniform(14000, 20000, 2000)
+    is_call = rng.random(2000) < 0.5
+    vols = rng.uniform(0.08, 1.2, 2000)
+    years = rng.uniform(0.01, 0.5, 2000)
+    prices = black76(17000, strikes, years, vols, is_call)["price"]
+    # Options worth only intrinsic value have no recoverable volatility
+    intrinsic = np.maximum(np.where(is_call, 17000 - strikes, strikes - 17000), 0)
+    priced = prices - intrinsic > 0.01
+
+    solved = implied_vol(prices, 17000, strikes, years, is_call)
+    assert np.allclose(solved[priced], vols[priced], atol=1e-3)
+
+    bad = implied_vol([-1.0, 20000.0, np.nan], 17000, 17000, 0.1, True)
+    assert np.isnan(bad).all()
+    print("✓ Implied volatility solver working")
+
+
+def test_chain_incremental():
+    """Test chain loading, dirty tracking and incremental recomputation."""
+    print("\nTesting incremental chain recomputation...")
+
+    class Contract:
+        def __init__(self, code, strike, right, delivery):
+            self.code, self.strike_price = code, strike
+            self.option_right, self.delivery_date = right, delivery
+
+    class FakeApi:
+        class Contracts:
+            Options = {"TXO": [Contract(f"TXO{k}{r[0]}", k, r, d)
+                               for k in range(16000, 18001, 50)
+                               for r in ("Call", "Put")
+                               for d in ("2099/06/19", "2099/07/17")]}
+
+    class FakeClient:
+        api = FakeApi()
+
+        def add_quote_listener(self, listener):
+            self.listener = listener
+
+    client = FakeClient()
+    chain = OptionChain.from_contracts(client, "TXO", "2099-06-19", underlying="TXF")
+    assert len(chain) == 82 and chain.codes[:2] == ["TXO16000C", "TXO16000P"]
+    chain.attach(client)
+
+    years = 0.08
+    chain.set_years(years)
+    vols = 0.18 + 0.1 * np.abs(chain.strikes - 17000) / 1000
+    theoretical = black76(17000, chain.strikes, years, vols, chain.is_call)["price"]
+    client.listener("TXF", {"last": 17000.0})
+    for code, price in zip(chain.codes, theoretical):
+        client.listener(code, {"bid": price - 0.5, "ask": price + 0.5})
+    assert chain.recompute() == 82
+    table = chain.table()
+    liquid = table["price"] > 1
+    assert np.allclose(table["iv"][liquid], vols[liquid], atol=2e-3)
+    assert np.all(table["delta"][table["is_call"]] > 0)
+    assert np.all(table["delta"][~table["is_call"]] < 0)
+
+    client.listener("TXO17000C", {"bid": theoretical[40] + 4, "ask": theoretical[40] + 6})
+    client.listener("OTHER", {"last": 1.0})
+    assert chain.dirty_count == 1 and chain.recompute() == 1
+    assert chain.table()["iv"][40] > vols[40]
+    assert chain.recompute() == 0
+
+    client.listener("TXF", {"last": 17100.0})
+    assert chain.dirty_count == 82
+    assert years_to_expiry("2099/06/19", datetime(2099, 6, 19, 13, 30)) == 0.0
+    print("✓ Incremental chain recomputation working")
+
+
+def test_chain_speed():
+    """Test a full-chain recompute stays in the millisecond range."""
+    print("\nTesting chain recompute speed...")
+
+    strikes = np.repeat(np.arange(12000, 22000, 25.0), 2)
+    is_call = np.tile([True, False], strikes.size // 2)
+    chain = OptionChain([f"O{n}" for n in range(strikes.size)], strikes, is_call, 0.05)
+    chain.set_underlying(17000)
+    prices = black76(17000, strikes, 0.05, 0.2, is_call)["price"]
+    for code, price in zip(chain.codes, prices):
+        chain.update_price(code, price)
+
+    start = time.perf_counter()
+    chain.recompute()
+    full = time.perf_counter() - start
+    chain.update_price("O400", prices[400] + 1)
+    start = time.perf_counter()
+    chain.recompute()
+    single = time.perf_counter() - start
+    print(f"✓ {strikes.size} strikes: full {full * 1000:.1f} ms, one strike {single * 1000:.2f} ms")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("KGI Trading Application - Option Chain Tests")
+    print("=" * 50)
+
+    try:
+        test_pricing()
+        test_implied_vol()
+        test_chain_incremental()
+        test_chain_speed()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,138 @@
+"""
+Test script for the array-backed order book
+
+This script tests full and single-level updates, padding, snapshots,
+top-of-book views and snapshot consistency under a concurrent writer.
+"""
+
+import sys
+import os
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from kgi_trading_app.orderbook import OrderBook
+
+
+def test_updates_and_snapshots():
+    """Test depth updates, padding and snapshot copies."""
+    print("Testing order book updates...")
+
+    book = OrderBook(levels=5, capacity=4)
+    book.update("2330", [600, 599.5, 599, 598.5, 598], [10, 20, 30, 40, 50],
+                [600.5, 601, 601.5, 602, 602.5], [5, 6, 7, 8, 9], timestamp_ns=123)
+    book.on_depth("2317", {"bid_price": [100.0], "bid_volume": [3],
+                           "ask_price": [100.5, 101.0], "ask_volume": [4, 5]})
+
+    snapshot = book.snapshot("2330")
+    assert list(snapshot["bid_price"]) == [600, 599.5, 599, 598.5, 598]
+    assert list(snapshot["ask_size"]) == [5, 6, 7, 8, 9]
+    assert snapshot["timestamp_ns"] == 123 and snapshot["seq"] == 1
+
+    padded = book.snapshot("2317")
+    assert padded["bid_price"][0] == 100.0 and np.isnan(padded["bid_price"][1])
+    assert list(padded["bid_size"]) == [3, 0, 0, 0, 0]
+
+    class ArrayDepth:
+        bid_price = np.array([50.0, 49.5])
+        bid_volume = np.array([1, 2])
+        ask_price = np.array([50.5])
+        ask_volume = np.array([3])
+
+    book.on_depth("2454", ArrayDepth())
+    assert list(book.snapshot("2454")["bid_size"]) == [1, 2, 0, 0, 0]
+
+    # A bad level is rejected without leaving the row mid-write
+    book.on_depth("2330", {"bid_price": [None], "bid_volume": [1],
+                           "ask_price": [600.5], "ask_volume": [1]})
+    try:
+        book.update_level("2330", "ask", 0, None, 1)
+        assert False, "Expected TypeError"
+    except TypeError:
+        pass
+    kept = book.snapshot("2330")
+    assert kept is not None and kept["seq"] == 1 and kept["bid_price"][0] == 600
+
+    book.update_level("2317", "bid", 0, 100.0, 0)
+    assert np.isnan(book.snapshot("2317")["bid_price"][0])
+
+    view = book.view("2330")
+    snapshot["bid_price"][0] = -1
+    assert view[0, 0] == 600
+    try:
+        view[0, 0] = 1
+        assert False, "Expected read-only view"
+    except ValueError:
+        pass
+    assert book.snapshot("UNKNOWN") is None
+    print("✓ Order book updates working")
+
+
+def test_top_of_book():
+    """Test vectorized best bid/ask statistics."""
+    print("\nTesting top of book...")
+
+    book = OrderBook(levels=5, capacity=8)
+    book.update("A", [10.0], [30], [10.5], [10])
+    book.update("B", [20.0], [0], [20.2], [0])
+    top = book.top_of_book()
+    assert top["symbols"] == ["A", "B"]
+    assert np.allclose(top["mid"], [10.25, 20.1])
+    assert np.isclose(top["imbalance"][0], 0.5) and np.isnan(top["imbalance"][1])
+    print("✓ Top of book working")
+
+
+def test_consistent_snapshots():
+    """Test that readers never see a half-written row."""
+    print("\nTesting snapshot consistency...")
+
+    book = OrderBook(levels=10, capacity=2)
+    stop = threading.Event()
+
+    def writer():
+        value = 0.0
+        while not stop.is_set():
+            value += 1
+            book.update("X", [value] * 10, [value] * 10, [value] * 10, [value] * 10)
+
+    book.update("X", [0.0] * 10, [0.0] * 10, [0.0] * 10, [0.0] * 10)
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(20000):
+            snapshot = book.snapshot("X")
+            if snapshot is None:
+                continue
+            values = np.concatenate([snapshot[p] for p in ("bid_price", "bid_size", "ask_price", "ask_size")])
+            assert np.all(values == values[0]), values
+    finally:
+        stop.set()
+        thread.join()
+    print("✓ Snapshot consistency working")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("KGI Trading Application - Order Book Tests")
+    print("=" * 50)
+
+    try:
+        test_updates_and_snapshots()
+        test_top_of_book()
+        test_consistent_snapshots()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
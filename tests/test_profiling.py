@@ -0,0 +1,88 @@
+"""
+Test script for session profiling
+
+This script tests that the profiler captures worker threads and writes its files.
+"""
+
+import sys
+import os
+import json
+import tempfile
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kgi_trading_app.profiling import SessionProfiler
+
+
+def _busy_worker(seconds):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        sum(range(1000))
+
+
+def _run_profiled(mode):
+    prefix = os.path.join(tempfile.mkdtemp(), "session")
+    profiler = SessionProfiler(prefix, mode=mode, interval=0.001)
+    profiler.start()
+
+    worker = threading.Thread(target=_busy_worker, args=(0.2,), name="sdk-callback")
+    worker.start()
+    worker.join()
+
+    assert profiler.stop() == prefix
+    assert profiler.stop() is None
+    return prefix
+
+
+def test_sample_mode():
+    """Test that sampling records other threads and writes collapsed stacks."""
+    print("Testing sampling profiler...")
+
+    prefix = _run_profiled("sample")
+
+    with open(f"{prefix}.collapsed", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert any(line.startswith("sdk-callback;") and "_busy_worker" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+    with open(f"{prefix}.threads.json", encoding="utf-8") as f:
+        threads = json.load(f)["threads"]
+    assert any(name.startswith("sdk-callback") and info["wall_time_s"] > 0
+               for name, info in threads.items())
+    print("✓ Sampling profiler working")
+
+
+def test_cprofile_mode():
+    """Test that cprofile mode also writes pstats output."""
+    print("\nTesting cProfile mode...")
+
+    prefix = _run_profiled("cprofile")
+    assert os.path.exists(f"{prefix}.prof")
+    assert os.path.exists(f"{prefix}.collapsed")
+    print("✓ cProfile mode working")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("KGI Trading Application - Profiling Tests")
+    print("=" * 50)
+
+    try:
+        test_sample_mode()
+        test_cprofile_mode()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,98 @@
+"""
+Test script for the shared-memory quote board
+
+This script tests publishing quotes and reading them from another process.
+"""
+
+import sys
+import os
+import multiprocessing
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kgi_trading_app.quote_board import QuoteBoard, QuoteBoardReader
+
+
+def _read_in_child(name, symbol, result_queue):
+    with QuoteBoardReader(name) as reader:
+        result_queue.put(reader.snapshot(symbol))
+
+
+def test_publish_and_read():
+    """Test that a reader sees the latest published quote."""
+    print("Testing quote board publish/read...")
+
+    with QuoteBoard(slot_count=4) as board:
+        board.update("2330", last=600.0, bid=599.0, ask=601.0, volume=100)
+        board.on_quote("2330", {"last": 602.0, "bid": 601.0, "ask": 603.0, "volume": 150})
+
+        with QuoteBoardReader(board.name) as reader:
+            quote = reader.snapshot("2330")
+            assert quote["last"] == 602.0
+            assert quote["volume"] == 150
+            assert quote["seq"] == 2
+
+            # A quote with a missing price is dropped without locking the slot
+            board.on_quote("2330", {"last": None, "volume": 151})
+            assert reader.snapshot("2330")["last"] == 602.0
+            assert reader.snapshot("0050") is None
+            assert reader.symbols() == ["2330"]
+    print("✓ Quote board publish/read working")
+
+
+def test_board_full():
+    """Test that a full board rejects new symbols."""
+    print("\nTesting quote board capacity...")
+
+    with QuoteBoard(slot_count=1) as board:
+        board.update("2330", last=600.0)
+        try:
+            board.update("2317", last=100.0)
+            assert False, "Expected ValueError"
+        except ValueError:
+            pass
+    print("✓ Quote board capacity check working")
+
+
+def test_cross_process_read():
+    """Test that another process can read the board."""
+    print("\nTesting cross-process read...")
+
+    ctx = multiprocessing.get_context("spawn")
+    with QuoteBoard(slot_count=8) as board:
+        board.update("0050", last=150.5, bid=150.0, ask=151.0, volume=42)
+
+        result_queue = ctx.Queue()
+        process = ctx.Process(target=_read_in_child, args=(board.name, "0050", result_queue))
+        process.start()
+        quote = result_queue.get(timeout=30)
+        process.join(timeout=30)
+
+        assert quote["last"] == 150.5
+        assert quote["volume"] == 42
+    print("✓ Cross-process read working")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("KGI Trading Application - Quote Board Tests")
+    print("=" * 50)
+
+    try:
+        test_publish_and_read()
+        test_board_full()
+        test_cross_process_read()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,137 @@
+"""
+Test script for end-of-day reconciliation
+
+This script tests the sorted-merge diff, journal-state input and
+concurrent per-account broker queries with failures.
+"""
+
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kgi_trading_app.journal import OrderState, SUBMIT, SENT, REPORT
+from kgi_trading_app.rate_limit import RateLimiter
+from kgi_trading_app.reconcile import reconcile, reconcile_accounts, local_records
+
+
+class FakeAccount:
+    def __init__(self, account_id):
+        self.account_id = account_id
+
+
+class FakeClient:
+    """Duck-typed client with accounts and a query limiter."""
+
+    def __init__(self, accounts):
+        self.all_accounts = accounts
+        self.is_logged_in = True
+        self.query_limiter = RateLimiter(rate=1000.0, burst=100)
+
+
+def _order(account, order_id, status="filled", quantity=2.0, filled=2.0):
+    return {"account": account, "order_id": order_id, "status": status,
+            "quantity": quantity, "filled_quantity": filled}
+
+
+def test_diff():
+    """Test missing, extra and mismatched detection."""
+    print("Testing reconciliation diff...")
+
+    local = [_order("S1", "A1"), _order("S1", "A2", "sent", filled=0.0),
+             _order("S1", "A3"), _order("S2", "A1", "partfilled", filled=1.0)]
+    broker = [_order("S2", "A1", "partfilled", filled=1.0),
+              _order("S2", "A1", "filled", filled=2.0),      # later report wins
+              _order("S1", "A2", "Submitted", filled=0.0),   # "sent" matches submitted
+              _order("S1", "A1"), _order("S1", "A9")]
+
+    result = reconcile(local, broker)
+    assert result["matched"] == 2
+    assert [r["order_id"] for r in result["extra"]] == ["A3"]
+    assert [r["order_id"] for r in result["missing"]] == ["A9"]
+    (mismatch,) = result["mismatched"]
+    assert (mismatch["account"], mismatch["order_id"]) == ("S2", "A1")
+    assert mismatch["fields"] == {"status": {"local": "partfilled", "broker": "filled"},
+                                  "filled_quantity": {"local": 1.0, "broker": 2.0}}
+    print("✓ Reconciliation diff working")
+
+
+def test_journal_state():
+    """Test that journal state rows reconcile and unsent orders are skipped."""
+    print("\nTesting reconciliation from journal state...")
+
+    state = OrderState()
+    state.apply(1, SUBMIT, {"local_id": "L1", "account": "S1", "symbol": "2330",
+                            "action": "buy", "quantity": 2.0, "price": 600.0})
+    state.apply(2, SENT, {"local_id": "L1", "order_id": "A1"})
+    state.apply(3, REPORT, {"order_id": "A1", "status": "filled", "filled_quantity": 2.0})
+    state.apply(4, SUBMIT, {"local_id": "L2", "account": "S1", "symbol": "2330",
+                            "action": "buy", "quantity": 1.0, "price": 600.0})
+
+    records = local_records(state)
+    assert [r["order_id"] for r in records] == ["A1"]
+    assert reconcile(records, [_order("S1", "A1")])["matched"] == 1
+    print("✓ Journal state reconciliation working")
+
+
+def test_concurrent_accounts():
+    """Test bounded concurrent queries, failed accounts and scale."""
+    print("\nTesting concurrent account reconciliation...")
+
+    accounts = [FakeAccount(f"S{n}") for n in range(12)]
+    per_account = 2000
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def fetcher(account):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        if account.account_id == "S5":
+            raise RuntimeError("query failed")
+        # Broker reports carry no account; it is filled in from the query
+        return [{"order_id": f"A{n}", "status": "Filled", "quantity": 2, "deal_quantity": 2}
+                for n in range(per_account)]
+
+    local = [_order(account.account_id, f"A{n}") for account in accounts for n in range(per_account)]
+    local[0]["filled_quantity"] = 1.0
+    local.pop()
+
+    result = reconcile_accounts(FakeClient(accounts), local, fetcher=fetcher, max_workers=3)
+    assert peak[0] <= 3
+    assert result["accounts"] == 11 and list(result["errors"]) == ["S5"]
+    assert len(result["mismatched"]) == 1 and result["mismatched"][0]["order_id"] == "A0"
+    assert [(r["account"], r["order_id"]) for r in result["missing"]] == [("S11", f"A{per_account - 1}")]
+    assert result["extra"] == []
+    assert result["matched"] == 11 * per_account - 2
+    print(f"✓ Reconciled {len(local)} records in {result['seconds']:.2f}s")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("KGI Trading Application - Reconciliation Tests")
+    print("=" * 50)
+
+    try:
+        test_diff()
+        test_journal_state()
+        test_concurrent_accounts()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,91 @@
+"""
+Test script for account record snapshots
+
+This script tests immutability and the cached JSON/binary encodings.
+"""
+
+import sys
+import os
+import json
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kgi_trading_app.records import AccountRecord, encode_records, decode_records
+
+
+class StockAccount:
+    """Stand-in for an SDK stock account."""
+
+    def __init__(self):
+        self.person_id = "A123456789"
+        self.broker_id = "9A00"
+        self.account_id = "1234567"
+        self.signed = True
+        self.trader = "王小明"
+
+
+class FutureAccount:
+    """Stand-in for an SDK futures account without a trader."""
+
+    def __init__(self):
+        self.person_id = "A123456789"
+        self.broker_id = "F002"
+        self.account_id = "7654321"
+        self.signed = False
+
+
+def test_from_account():
+    """Test building records from SDK accounts."""
+    print("Testing record snapshots...")
+
+    stock = AccountRecord.from_account(1, StockAccount())
+    futures = AccountRecord.from_account(2, FutureAccount())
+
+    assert stock.type == "Stock" and stock.signed_status == "Signed"
+    assert futures.type == "Future" and futures.trader is None
+    assert "trader" not in futures.to_dict()
+    try:
+        stock.account_id = "other"
+        assert False, "Expected AttributeError"
+    except AttributeError:
+        pass
+    print("✓ Record snapshots working")
+
+
+def test_encodings():
+    """Test cached JSON and binary round trips."""
+    print("\nTesting record encodings...")
+
+    stock = AccountRecord.from_account(1, StockAccount())
+    futures = AccountRecord.from_account(2, FutureAccount())
+
+    assert stock.to_json() is stock.to_json()
+    assert json.loads(stock.to_json())["trader"] == "王小明"
+    assert stock.to_bytes() is stock.to_bytes()
+    assert AccountRecord.from_bytes(stock.to_bytes()) == stock
+    assert decode_records(encode_records([stock, futures])) == [stock, futures]
+    print("✓ Record encodings working")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("KGI Trading Application - Account Record Tests")
+    print("=" * 50)
+
+    try:
+        test_from_account()
+        test_encodings()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
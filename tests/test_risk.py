@@ -0,0 +1,150 @@
+"""
+Test script for portfolio margin and stress
+
+This script checks scenario PnL against per-position revaluation, rule
+margins for futures and short options, per-account totals and
+fill-driven re-evaluation.
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from kgi_trading_app.options import black76
+from kgi_trading_app.risk import RiskEngine
+
+
+def _engine():
+    engine = RiskEngine(moves=[-0.1, 0.0, 0.1], vol_shifts=[0.0, 0.05])
+    engine.add_instrument("TXF", "TX", "TXF")
+    engine.add_instrument("TXO17000C", "TXO", "TXF", "call", strike=17000, years=0.05)
+    engine.add_instrument("TXO16500P", "TXO", "TXF", "put", strike=16500, years=0.05)
+    engine.set_price("TXF", 17000)
+    engine.set_vol("TXO17000C", 0.2)
+    engine.set_vol("TXO16500P", 0.25)
+    return engine
+
+
+def test_scenarios():
+    """Test scenario PnL against a scalar revaluation."""
+    print("Testing stress scenarios...")
+
+    engine = _engine()
+    engine.set_position("F1", "TXF", 1)
+    engine.set_position("F1", "TXO17000C", -2)
+    engine.set_position("F2", "TXO16500P", 3)
+    result = engine.evaluate()
+    assert result["pnl"].shape == (3, 2)
+
+    for m, move in enumerate([-0.1, 0.0, 0.1]):
+        for v, shift in enumerate([0.0, 0.05]):
+            underlying = 17000 * (1 + move)
+            expected = 200 * (underlying - 17000)
+            for symbol, strike, vol, is_call, quantity in (("C", 17000, 0.2, True, -2),
+                                                           ("P", 16500, 0.25, False, 3)):
+                now = black76(17000, strike, 0.05, vol, is_call)["price"]
+                shocked = black76(underlying, strike, 0.05, vol + shift, is_call)["price"]
+                expected += 50 * quantity * (shocked - now)
+            assert abs(result["pnl"][m, v] - expected) < 1e-6, (move, shift)
+
+    assert result["pnl"][1, 0] == 0.0
+    assert result["scan_risk"] == -result["pnl"].min() == -result["worst"]["pnl"]
+    assert result["worst"]["move"] == -0.1
+    assert set(result["by_account"]) == {"F1", "F2"}
+    print("✓ Stress scenarios working")
+
+
+def test_rule_margin():
+    """Test futures and short option margins."""
+    print("\nTesting rule-based margin...")
+
+    engine = _engine()
+    engine.set_position("F1", "TXF", -2)
+    engine.set_position("F1", "TXO17000C", 1)          # long option: no margin
+    engine.set_position("F2", "TXO16500P", -1)
+    engine.set_price("TXO16500P", 40)
+
+    result = engine.evaluate()
+    put_otm = (17000 - 16500) * 50
+    put_initial = 40 * 50 + max(44_000 - put_otm, 22_000)
+    put_maintenance = 40 * 50 + max(34_000 - put_otm, 17_000)
+    assert result["by_account"]["F1"]["initial_margin"] == 2 * 184_000
+    assert result["by_account"]["F1"]["maintenance_margin"] == 2 * 141_000
+    assert result["by_account"]["F2"]["initial_margin"] == put_initial
+    assert result["by_account"]["F2"]["maintenance_margin"] == put_maintenance
+    assert result["initial_margin"] == 2 * 184_000 + put_initial
+
+    engine.set_position("F3", "UNKNOWN", 1)
+    assert "error" in engine.evaluate()
+    print("✓ Rule-based margin working")
+
+
+def test_fills():
+    """Test that fills update positions and push new results."""
+    print("\nTesting fill-driven evaluation...")
+
+    engine = _engine()
+    results = []
+    engine.subscribe(results.append)
+    engine.on_report({"order_id": "A1", "symbol": "TXF", "account": "F1", "action": "sell",
+                      "filled_quantity": 1.0, "fill_price": 17010.0})
+    engine.on_report({"order_id": "A1", "symbol": "TXF", "account": "F1", "action": "sell",
+                      "filled_quantity": 3.0, "done": True})
+    engine.on_report({"order_id": "A1", "symbol": "TXF", "account": "F1", "action": "sell",
+                      "filled_quantity": 3.0, "done": True})
+    engine.on_report({"order_id": "B1", "symbol": "2330", "filled_quantity": 1.0})
+
+    assert engine.positions() == {("F1", "TXF"): -3.0}
+    assert len(results) == 2
+    assert results[-1]["initial_margin"] == 3 * 184_000
+    assert results[-1]["worst"]["move"] == 0.1
+    print("✓ Fill-driven evaluation working")
+
+
+def test_speed():
+    """Test evaluation time for a large book."""
+    print("\nTesting evaluation speed...")
+
+    engine = RiskEngine(moves=np.linspace(-0.15, 0.15, 31), vol_shifts=[-0.1, -0.05, 0, 0.05, 0.1])
+    engine.set_price("TXF", 17000)
+    for n, strike in enumerate(range(15000, 19000, 50)):
+        for kind in ("call", "put"):
+            symbol = f"TXO{strike}{kind[0]}"
+            engine.add_instrument(symbol, "TXO", "TXF", kind, strike=strike, years=0.05)
+            for account in range(10):
+                engine.set_position(f"F{account}", symbol, (n % 5) - 2 or 1)
+    start = time.perf_counter()
+    result = engine.evaluate()
+    elapsed = time.perf_counter() - start
+    positions = len(result["positions"])
+    print(f"✓ {positions} positions x 155 scenarios in {elapsed * 1000:.1f} ms")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("KGI Trading Application - Risk Tests")
+    print("=" * 50)
+
+    try:
+        test_scenarios()
+        test_rule_margin()
+        test_fills()
+        test_speed()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
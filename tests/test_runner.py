@@ -0,0 +1,141 @@
+"""
+Test script for the process-pool strategy runner
+
+This script tests routing quotes to worker processes and collecting orders.
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kgi_trading_app.rate_limit import RateLimiter
+from kgi_trading_app.runner import StrategyRunner
+
+
+class FakeClient:
+    """Minimal stand-in for KGITradingClient's quote and order interface."""
+
+    def __init__(self):
+        self.listeners = []
+        self.orders = []
+
+    def add_quote_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_quote_listener(self, listener):
+        self.listeners.remove(listener)
+
+    def handle_quote(self, symbol, quote):
+        for listener in list(self.listeners):
+            listener(symbol, quote)
+
+    def place_order(self, contract, order):
+        self.orders.append((contract, order))
+        return order
+
+
+class BuyAboveStrategy:
+    """Emit a buy intent whenever the last price is above 100."""
+
+    def __init__(self, worker_id, symbols):
+        self.worker_id = worker_id
+
+    def on_quote(self, symbol, quote):
+        if quote["last"] > 100:
+            return [{"symbol": symbol, "action": "Buy", "quantity": 1}]
+        return None
+
+
+def build_strategy(worker_id, symbols):
+    return BuyAboveStrategy(worker_id, symbols)
+
+
+def test_rate_limiter():
+    """Test token bucket limits."""
+    print("Testing rate limiter...")
+
+    limiter = RateLimiter(rate=1000, burst=2)
+    assert limiter.try_acquire()
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+    assert limiter.acquire(timeout=1.0)
+    print("✓ Rate limiter working")
+
+
+def test_runner_routes_quotes_and_orders():
+    """Test that quotes reach workers and intents come back as orders."""
+    print("\nTesting strategy runner...")
+
+    client = FakeClient()
+    runner = StrategyRunner(client, build_strategy,
+                            order_factory=lambda intent: (intent["symbol"], intent),
+                            num_workers=2, pin_cores=False)
+    assert runner.worker_for("2330") == runner.worker_for("2330")
+
+    runner.start(["2330", "2317"])
+    try:
+        client.handle_quote("2330", {"last": 101.0})
+        client.handle_quote("2317", {"last": 99.0})
+        client.handle_quote("2317", {"last": 102.0})
+
+        deadline = time.monotonic() + 30
+        while len(client.orders) < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        runner.stop()
+
+    assert sorted(contract for contract, _ in client.orders) == ["2317", "2330"]
+    stats = runner.get_stats()
+    assert sum(worker["processed"] for worker in stats) == 3
+    assert all(worker["backlog"] == 0 for worker in stats)
+    print("✓ Strategy runner working")
+
+
+def test_runner_restart_and_live_stats():
+    """Test that stats arrive between batches and the runner can start again after stop."""
+    print("\nTesting strategy runner restart...")
+
+    client = FakeClient()
+    runner = StrategyRunner(client, build_strategy, num_workers=1, pin_cores=False)
+    for _ in range(2):
+        runner.start(["2330"])
+        try:
+            for _ in range(3):
+                client.handle_quote("2330", {"last": 99.0})
+            # Far fewer than a full stats batch: the interval report must catch up
+            deadline = time.monotonic() + 30
+            while runner.get_stats()[0]["processed"] < 3 and time.monotonic() < deadline:
+                time.sleep(0.05)
+            (stats,) = runner.get_stats()
+            assert stats["alive"] and stats["processed"] == 3 and stats["backlog"] == 0
+        finally:
+            runner.stop()
+        assert client.listeners == []
+    print("✓ Strategy runner restart working")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("KGI Trading Application - Strategy Runner Tests")
+    print("=" * 50)
+
+    try:
+        test_rate_limiter()
+        test_runner_routes_quotes_and_orders()
+        test_runner_restart_and_live_stats()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,119 @@
+"""
+Test script for the vectorized market scanner
+
+This script tests expression compilation, rejection of unsafe expressions,
+incremental re-evaluation and loading from snapshot columns.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from kgi_trading_app.scanner import Scanner, compile_expression
+from kgi_trading_app.snapshots import empty_columns
+
+
+def test_expressions():
+    """Test element-wise boolean logic, chains and validation."""
+    print("Testing screen expressions...")
+
+    columns = {"close": np.array([10.0, 60.0, 600.0]), "volume": np.array([5.0, 50.0, 500.0])}
+    screen = compile_expression("50 <= close <= 500 or not volume < 100")
+    assert list(screen(columns)) == [False, True, True]
+    assert list(compile_expression("abs(close - 60) < 1 and volume > 1e1")(columns)) == [False, True, False]
+
+    for bad in ("__import__('os')", "close.real > 1", "price > 1", "close > 'x'",
+                "[c for c in close]", "close >"):
+        try:
+            compile_expression(bad)
+            assert False, f"Expected ValueError for {bad}"
+        except ValueError:
+            pass
+    print("✓ Screen expressions working")
+
+
+def test_incremental_scan():
+    """Test that only changed rows are re-evaluated."""
+    print("\nTesting incremental scan...")
+
+    evaluated = []
+
+    def counting(columns):
+        evaluated.append(len(columns["close"]))
+        return columns["change_pct"] > 2
+
+    scanner = Scanner(capacity=2)
+    scanner.update_columns(["A", "B", "C"], close=[102.0, 100.0, 99.0], prev_close=[100.0, 100.0, 100.0])
+    scanner.add_screen("movers", counting)
+    scanner.add_screen("gappers", "gap_pct > 1 and volume_ratio > 2")
+
+    result = scanner.scan()
+    assert result["movers"]["matches"] == [] and evaluated == [3]
+
+    scanner.update("B", close=103.0)
+    scanner.update("C", close=99.0)
+    result = scanner.scan()
+    assert evaluated == [3, 1]
+    assert result["movers"]["matches"] == ["B"] and result["movers"]["entered"] == ["B"]
+
+    scanner.update_columns(["A", "B", "C"], close=[102.0, 101.0, 99.0])
+    result = scanner.scan()
+    assert evaluated == [3, 1, 1]
+    assert result["movers"]["exited"] == ["B"]
+
+    assert scanner.scan()["movers"]["matches"] == []
+    assert evaluated == [3, 1, 1]
+    print("✓ Incremental scan working")
+
+
+def test_snapshot_and_quote_feeds():
+    """Test loading snapshot columns and quote listener updates."""
+    print("\nTesting snapshot and quote feeds...")
+
+    snapshots = empty_columns(["2330", "2317", "BAD"])
+    snapshots["ok"][:2] = True
+    snapshots["open"][:2] = [610.0, 100.0]
+    snapshots["close"][:2] = [615.0, 101.0]
+    snapshots["change_price"][:2] = [15.0, 1.0]
+    snapshots["volume"][:2] = [30000.0, 1000.0]
+
+    scanner = Scanner()
+    scanner.load_snapshots(snapshots)
+    scanner.update_columns(["2330", "2317"], avg_volume=[10000.0, 1000.0])
+    scanner.add_screen("gappers", "gap_pct > 1 and volume_ratio > 2")
+    assert scanner.scan()["gappers"]["matches"] == ["2330"]
+    assert scanner.symbols == ["2330", "2317"]
+
+    scanner.on_quote("2317", {"last": 101.0, "bid": 100.5, "ask": 101.0, "volume": 5000})
+    scanner.update("2317", open=102.0)
+    assert scanner.scan()["gappers"]["entered"] == ["2317"]
+    assert np.isclose(scanner.columns()["spread"][1], 0.5)
+    print("✓ Snapshot and quote feeds working")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("KGI Trading Application - Scanner Tests")
+    print("=" * 50)
+
+    try:
+        test_expressions()
+        test_incremental_scan()
+        test_snapshot_and_quote_feeds()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
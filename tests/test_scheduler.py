@@ -0,0 +1,264 @@
+"""
+Test script for the prioritized request scheduler
+
+This script tests priority ordering, per-class concurrency limits,
+deadlines, metrics and the ScheduledClient wrapper, including cancels
+submitted behind background backlogs and saturated order and query classes.
+"""
+
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kgi_trading_app.scheduler import (DeadlineExceeded, Priority, RequestScheduler,
+                                       ScheduledClient)
+from kgi_trading_app.shutdown import ShutdownManager, PRIORITY_FLUSH
+
+
+class SlowClient:
+    """Duck-typed client whose queries take a while."""
+
+    def __init__(self, latency=0.05):
+        self.latency = latency
+        self.cancelled = []
+        self.name = "slow"
+
+    def get_snapshots(self, symbols, **options):
+        time.sleep(self.latency)
+        return {"symbols": list(symbols)}
+
+    def get_account_balance(self, account=None):
+        time.sleep(self.latency)
+        return {"account": account, "balance": 100.0}
+
+    def cancel_order(self, trade, timeout=None):
+        self.cancelled.append(trade)
+        return True
+
+    def place_order(self, contract, order, timeout=None):
+        return {"order_id": f"O-{order}"}
+
+
+def test_priority_order():
+    """Test that queued requests start most urgent class first."""
+    print("Testing priority ordering...")
+
+    scheduler = RequestScheduler(max_workers=1, limits={Priority.BACKGROUND: 1})
+    gate = threading.Event()
+    started = []
+    blocker = scheduler.submit(Priority.BACKGROUND, gate.wait)
+    time.sleep(0.05)
+
+    futures = [scheduler.submit(priority, started.append, priority.name)
+               for priority in (Priority.BACKGROUND, Priority.INTERACTIVE,
+                                Priority.ORDER, Priority.CANCEL, Priority.ORDER)]
+    gate.set()
+    for future in futures + [blocker]:
+        future.result(timeout=1)
+    assert started == ["CANCEL", "ORDER", "ORDER", "INTERACTIVE", "BACKGROUND"], started
+    scheduler.shutdown()
+    print("✓ Cancels and orders start before queries")
+
+
+def test_class_limits():
+    """Test that a class never exceeds its concurrency limit."""
+    print("\nTesting per-class limits...")
+
+    scheduler = RequestScheduler(max_workers=6, limits={Priority.BACKGROUND: 2})
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def task():
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+
+    futures = [scheduler.submit(Priority.BACKGROUND, task) for _ in range(10)]
+    for future in futures:
+        future.result(timeout=2)
+    assert running[1] == 2, running
+    scheduler.shutdown()
+    print("✓ Background concurrency capped at its limit")
+
+
+def test_cancel_not_stuck():
+    """Test that a cancel overtakes a background backlog."""
+    print("\nTesting cancel latency behind bulk work...")
+
+    scheduler = RequestScheduler(max_workers=3)
+    client = ScheduledClient(SlowClient(latency=0.05), scheduler)
+    backlog = [scheduler.submit(Priority.BACKGROUND, client.client.get_snapshots, [str(n)])
+               for n in range(40)]
+    time.sleep(0.01)
+
+    start = time.perf_counter()
+    assert client.cancel_order("T1") is True
+    elapsed = time.perf_counter() - start
+    # The backlog takes 40 * 50 ms with one background slot
+    assert elapsed < 0.1, elapsed
+    assert client.client.cancelled == ["T1"]
+    assert client.name == "slow"
+
+    metrics = scheduler.metrics()
+    assert metrics["cancel"]["completed"] == 1
+    assert metrics["background"]["running"] <= 1
+    scheduler.shutdown(wait=True)
+    assert all(future.done() for future in backlog)
+    assert scheduler.metrics()["background"]["cancelled"] > 0
+    print(f"✓ Cancel finished in {elapsed * 1000:.1f}ms behind 40 queries")
+
+
+def test_cancel_with_shared_workers_busy():
+    """Test that a cancel starts while orders and queries fill every shared worker."""
+    print("\nTesting cancel with orders and queries saturated...")
+
+    scheduler = RequestScheduler()
+    gate = threading.Event()
+    blockers = [scheduler.submit(Priority.ORDER, gate.wait) for _ in range(4)]
+    blockers += [scheduler.submit(Priority.INTERACTIVE, gate.wait) for _ in range(2)]
+    time.sleep(0.05)
+    metrics = scheduler.metrics()
+    assert metrics["order"]["running"] == 4 and metrics["interactive"]["running"] == 2
+
+    start = time.perf_counter()
+    assert scheduler.call(Priority.CANCEL, lambda: True, deadline=1.0) is True
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.1, elapsed
+    gate.set()
+    for future in blockers:
+        future.result(timeout=1)
+    scheduler.shutdown()
+    print(f"✓ Cancel finished in {elapsed * 1000:.1f}ms with every shared worker busy")
+
+
+def test_expiry_while_workers_busy():
+    """Test that a deadline fires on time, without spinning, while every shared worker is busy."""
+    print("\nTesting expiry with the shared worker busy...")
+
+    scheduler = RequestScheduler(max_workers=1)
+    busy = scheduler.submit(Priority.BACKGROUND, time.sleep, 0.6)
+    time.sleep(0.02)
+    late = scheduler.submit(Priority.ORDER, time.sleep, 0, deadline=0.1)
+
+    start, cpu = time.perf_counter(), time.process_time()
+    try:
+        late.result(timeout=1)
+        assert False, "late request ran"
+    except DeadlineExceeded:
+        pass
+    expired_after = time.perf_counter() - start
+    assert expired_after < 0.3, expired_after
+    busy.result(timeout=1)
+    spent = time.process_time() - cpu
+    # Cancel-only workers wait instead of polling the foreign deadline
+    assert spent < 0.3, spent
+    scheduler.shutdown()
+    print(f"✓ Request expired after {expired_after * 1000:.0f}ms using {spent:.2f} CPU-seconds")
+
+
+def test_deadlines_and_metrics():
+    """Test deadline expiry, error mapping and histograms."""
+    print("\nTesting deadlines and metrics...")
+
+    scheduler = RequestScheduler(max_workers=1)
+    client = ScheduledClient(SlowClient(latency=0.1), scheduler)
+    busy = scheduler.submit(Priority.INTERACTIVE, time.sleep, 0.1)
+    time.sleep(0.01)
+
+    late = scheduler.submit(Priority.BACKGROUND, time.sleep, 0, deadline=0.02)
+    start = time.perf_counter()
+    result = client.get_account_balance("S1", deadline=0.01)
+    assert "error" in result, result
+    # The caller is released at its deadline, not when the worker frees up
+    assert time.perf_counter() - start < 0.08
+    try:
+        late.result(timeout=1)
+        assert False, "late request ran"
+    except DeadlineExceeded:
+        pass
+    busy.result(timeout=1)
+
+    assert client.get_account_balance("S1") == {"account": "S1", "balance": 100.0}
+    assert client.place_order("contract", "1") == {"order_id": "O-1"}
+    failing = scheduler.submit(Priority.ORDER, lambda: 1 / 0)
+    try:
+        failing.result(timeout=1)
+        assert False, "error swallowed"
+    except ZeroDivisionError:
+        pass
+
+    metrics = scheduler.metrics(reset=True)
+    interactive = metrics["interactive"]
+    assert interactive["completed"] == 2 and interactive["expired"] == 1
+    assert interactive["run_ns"]["count"] == 2
+    assert metrics["background"]["expired"] == 1
+    assert metrics["order"]["completed"] == 1 and metrics["order"]["failed"] == 1
+    assert scheduler.metrics()["interactive"]["completed"] == 0
+
+    manager = ShutdownManager()
+    scheduler.register_shutdown(manager)
+    manager.shutdown()
+    try:
+        scheduler.submit(Priority.CANCEL, print)
+        assert False, "closed scheduler accepted a request"
+    except RuntimeError:
+        pass
+    print("✓ Deadlines, error mapping and metrics working")
+
+
+def test_shutdown_with_stuck_calls():
+    """Test that stuck calls cost one bounded wait, not a wait per worker."""
+    print("\nTesting shutdown with stuck calls...")
+
+    scheduler = RequestScheduler(max_workers=4)
+    gate = threading.Event()
+    for _ in range(4):
+        scheduler.submit(Priority.ORDER, gate.wait)
+    time.sleep(0.05)
+
+    manager = ShutdownManager(deadline=5.0)
+    scheduler.register_shutdown(manager, timeout=0.4)
+    manager.register("journal", lambda: None, priority=PRIORITY_FLUSH)
+    try:
+        report = manager.shutdown()
+    finally:
+        gate.set()
+    statuses = {hook["name"]: hook["status"] for hook in report["hooks"]}
+    assert statuses == {"request-scheduler": "ok", "journal": "ok"}, statuses
+    assert report["phases"]["hooks_s"] < 0.6, report["phases"]
+    print(f"✓ Scheduler shutdown took {report['phases']['hooks_s']:.2f}s with 4 stuck calls")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("KGI Trading Application - Scheduler Tests")
+    print("=" * 50)
+
+    try:
+        test_priority_order()
+        test_class_limits()
+        test_cancel_not_stuck()
+        test_cancel_with_shared_workers_busy()
+        test_expiry_while_workers_busy()
+        test_deadlines_and_metrics()
+        test_shutdown_with_stuck_calls()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
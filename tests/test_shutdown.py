@@ -0,0 +1,97 @@
+"""
+Test script for the graceful shutdown manager
+
+This script tests hook ordering, deadlines and thread joining.
+"""
+
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kgi_trading_app.shutdown import ShutdownManager, PRIORITY_SESSION, PRIORITY_FLUSH, PRIORITY_CLOSE
+
+
+def test_hook_order_and_errors():
+    """Test that hooks run by priority and errors do not stop later hooks."""
+    print("Testing shutdown hook order...")
+
+    calls = []
+    manager = ShutdownManager(deadline=5)
+    manager.register("close", lambda: calls.append("close"), priority=PRIORITY_CLOSE)
+    manager.register("flush", lambda: calls.append("flush"), priority=PRIORITY_FLUSH)
+    manager.register("logout", lambda: calls.append("logout"), priority=PRIORITY_SESSION)
+    manager.register("broken", lambda: 1 / 0, priority=PRIORITY_FLUSH)
+
+    report = manager.shutdown()
+    assert calls == ["logout", "flush", "close"]
+    statuses = {hook["name"]: hook["status"] for hook in report["hooks"]}
+    assert statuses["broken"] == "error"
+    assert report["clean"]
+    assert set(report["phases"]) == {"hooks_s", "thread_join_s", "total_s"}
+    print("✓ Shutdown hook order working")
+
+
+def test_deadline():
+    """Test that a hanging hook is abandoned and later hooks are skipped."""
+    print("\nTesting shutdown deadline...")
+
+    release = threading.Event()
+    manager = ShutdownManager(deadline=0.2)
+    manager.register("hanging-logout", release.wait, priority=PRIORITY_SESSION)
+    manager.register("flush", lambda: None, priority=PRIORITY_FLUSH)
+
+    started = time.monotonic()
+    report = manager.shutdown()
+    release.set()
+
+    assert time.monotonic() - started < 1.0
+    statuses = {hook["name"]: hook["status"] for hook in report["hooks"]}
+    assert statuses == {"hanging-logout": "timeout", "flush": "skipped"}
+    assert not report["clean"]
+    print("✓ Shutdown deadline working")
+
+
+def test_thread_join():
+    """Test that non-daemon threads are joined with a timeout."""
+    print("\nTesting thread joining...")
+
+    stop = threading.Event()
+    worker = threading.Thread(target=stop.wait, name="stuck-worker")
+    worker.start()
+    try:
+        manager = ShutdownManager(thread_join_timeout=0.1)
+        report = manager.shutdown()
+        assert "stuck-worker" in report["stuck_threads"]
+        assert not report["clean"]
+    finally:
+        stop.set()
+        worker.join()
+    print("✓ Thread joining working")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("KGI Trading Application - Shutdown Tests")
+    print("=" * 50)
+
+    try:
+        test_hook_order_and_errors()
+        test_deadline()
+        test_thread_join()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,186 @@
+"""
+Test script for rolling tick statistics
+
+This script checks the incremental window statistics against a brute-force
+recomputation over the raw ticks, the quote listener's volume handling,
+expiry of quiet symbols and the column snapshot.
+"""
+
+import sys
+import os
+import math
+import random
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from kgi_trading_app.tick_stats import STAT_FIELDS, TickStats
+
+
+class FakeClient:
+    def __init__(self):
+        self.listeners = []
+
+    def add_quote_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_quote_listener(self, listener):
+        self.listeners.remove(listener)
+
+
+def _brute_force(ticks, now_ns, window_ns):
+    inside = [(price, size) for ts, price, size in ticks if now_ns - window_ns < ts <= now_ns]
+    if not inside:
+        return None
+    prices = [price for price, _ in inside]
+    volume = sum(size for _, size in inside)
+    mean = sum(prices) / len(prices)
+    return {"count": len(prices), "volume": volume, "mean": mean,
+            "variance": sum((p - mean) ** 2 for p in prices) / len(prices),
+            "min": min(prices), "max": max(prices),
+            "vwap": sum(p * s for p, s in inside) / volume if volume else math.nan}
+
+
+def test_against_brute_force():
+    """Test every window against recomputation from the raw ticks."""
+    print("Testing rolling statistics against brute force...")
+
+    rng = random.Random(7)
+    stats = TickStats(windows=(1.0, 5.0))
+    ticks = {"2330": [], "2317": []}
+    now = 1_000_000_000_000
+    for n in range(6000):
+        now += rng.randint(0, 20_000_000)
+        symbol = rng.choice(("2330", "2317"))
+        price = round(600 + rng.gauss(0, 3), 1)
+        size = float(rng.randint(0, 5))
+        stats.update(symbol, price, size, now)
+        ticks[symbol].append((now, price, size))
+
+        if n % 97 == 0:
+            for symbol, history in ticks.items():
+                for window in stats.windows:
+                    expected = _brute_force(history, now, int(window * 1e9))
+                    actual = stats.stats(symbol, window)
+                    if expected is None:
+                        assert actual is None or actual["count"] == 0
+                        continue
+                    for field, value in expected.items():
+                        assert math.isclose(actual[field], value, rel_tol=1e-9, abs_tol=1e-7) or \
+                            (math.isnan(value) and math.isnan(actual[field])), (field, actual, expected)
+    # Expired ticks are dropped from the buffers
+    assert all(len(buffer) < 3000 for buffer in stats._ts)
+    print("✓ Mean, variance, min/max, VWAP and counts match over 6000 ticks")
+
+
+def test_quotes_and_expiry():
+    """Test volume deltas from quotes and expiry of a quiet symbol."""
+    print("\nTesting quote listener and expiry...")
+
+    client = FakeClient()
+    stats = TickStats(windows=(60.0,))
+    stats.attach(client)
+    listener = client.listeners[0]
+    second = 1_000_000_000
+    start = 1_700_000_000 * second
+
+    listener("2330", {"last": 600.0, "volume": 1000, "timestamp_ns": start})
+    assert stats.stats("2330")["count"] == 0                # baseline only
+    listener("2330", {"last": 601.0, "volume": 1003, "timestamp_ns": start + second})
+    listener("2330", {"last": 601.0, "bid": 600.0, "volume": 1003, "timestamp_ns": start + 2 * second})
+    listener("2330", {"last": 603.0, "volume": 1004, "timestamp_ns": start + 3 * second})
+    listener("2317", {"last": 100.0, "volume": 10, "timestamp_ns": start + 50 * second})
+    listener("2317", {"last": 101.0, "volume": 12, "timestamp_ns": start + 62 * second})
+
+    result = stats.stats("2330", now_ns=start + 3 * second)
+    assert result["count"] == 2 and result["volume"] == 4.0
+    assert result["vwap"] == (601.0 * 3 + 603.0) / 4
+    assert result["min"] == 601.0 and result["max"] == 603.0
+
+    # The feed clock has moved past the 2330 ticks
+    assert stats.stats("2330")["count"] == 1
+    assert math.isnan(stats.stats("2330", now_ns=start + 70 * second)["mean"])
+    assert stats.stats("9999") is None
+    try:
+        stats.stats("2330", window=30.0)
+        assert False, "unknown window accepted"
+    except ValueError:
+        pass
+
+    stats.detach(client)
+    assert client.listeners == []
+    print("✓ Quotes counted by volume increase and quiet windows expire")
+
+
+def test_compaction_after_query():
+    """Test that a query moving the long window ahead does not break shorter ones."""
+    print("\nTesting compaction after a far-ahead query...")
+
+    stats = TickStats(windows=(60.0, 300.0))
+    second = 1_000_000_000
+    for n in range(3000):
+        stats.update("A", 100.0 + n % 7, 1.0, n * second // 100)
+    last = 2999 * second // 100
+    assert stats.stats("A", 300.0, now_ns=last + 1000 * second)["count"] == 0
+    stats.update("A", 105.0, 2.0, last + second)
+    result = stats.stats("A", 60.0)
+    expected = _brute_force([(n * second // 100, 100.0 + n % 7, 1.0) for n in range(3000)]
+                            + [(last + second, 105.0, 2.0)], last + second, 60 * second)
+    assert result["count"] == expected["count"] and result["min"] == expected["min"]
+    assert math.isclose(result["vwap"], expected["vwap"])
+    print("✓ Shorter windows survive compaction")
+
+
+def test_snapshot_and_speed():
+    """Test column snapshots and per-tick cost."""
+    print("\nTesting snapshot and update cost...")
+
+    stats = TickStats(windows=(10.0, 60.0))
+    symbols = [f"S{n:04d}" for n in range(500)]
+    for symbol in symbols:
+        stats.symbol_id(symbol)
+    rng = random.Random(3)
+    now = 0
+    count = 50_000
+    start = time.perf_counter()
+    for n in range(count):
+        now += 1_000_000
+        stats.update(symbols[n % 500], 100.0 + rng.random(), 1.0, now)
+    per_tick = (time.perf_counter() - start) / count
+
+    snapshot = stats.snapshot(10.0)
+    assert set(STAT_FIELDS) <= set(snapshot)
+    assert snapshot["symbol"] == symbols
+    assert int(snapshot["count"].sum()) == 10_000
+    assert np.all(snapshot["min"] <= snapshot["vwap"]) and np.all(snapshot["vwap"] <= snapshot["max"])
+    row = stats.stats("S0007", 10.0)
+    assert math.isclose(snapshot["mean"][7], row["mean"]) and math.isclose(snapshot["std"][7], row["std"])
+    print(f"✓ {per_tick * 1e6:.1f}µs per tick, snapshot of {len(symbols)} symbols")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("KGI Trading Application - Tick Statistics Tests")
+    print("=" * 50)
+
+    try:
+        test_against_brute_force()
+        test_quotes_and_expiry()
+        test_compaction_after_query()
+        test_snapshot_and_speed()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
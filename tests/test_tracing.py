@@ -0,0 +1,116 @@
+"""
+Test script for lightweight tracing
+
+This script tests span nesting, cross-thread propagation and file export.
+"""
+
+import sys
+import os
+import json
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kgi_trading_app import tracing
+
+
+def _read_spans(path):
+    with open(path, encoding="utf-8") as f:
+        return {span["name"]: span for span in map(json.loads, f)}
+
+
+def test_disabled_tracer():
+    """Test that the default tracer is a no-op."""
+    print("Testing disabled tracer...")
+
+    tracer = tracing.Tracer()
+    with tracer.span("noop") as span:
+        assert span is None
+
+    def func():
+        return 1
+    assert tracer.wrap(func) is func
+    print("✓ Disabled tracer working")
+
+
+def test_spans_and_propagation():
+    """Test parent/child links across threads and the decorator."""
+    print("\nTesting span propagation...")
+
+    path = os.path.join(tempfile.mkdtemp(), "spans.jsonl")
+    tracer = tracing.configure_tracing(path, flush_interval=0.05)
+
+    @tracing.traced("client.query")
+    def query():
+        return "ok"
+
+    def worker():
+        with tracer.span("worker.task"):
+            query()
+
+    try:
+        with tracer.span("gui.click", button="login") as root:
+            thread = threading.Thread(target=tracer.wrap(worker))
+            thread.start()
+            thread.join()
+        try:
+            with tracer.span("failing"):
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+    finally:
+        tracer.shutdown()
+
+    spans = _read_spans(path)
+    assert spans["worker.task"]["parent_id"] == root.span_id
+    assert spans["client.query"]["parent_id"] == spans["worker.task"]["span_id"]
+    assert spans["client.query"]["trace_id"] == root.trace_id
+    assert spans["gui.click"]["attributes"] == {"button": "login"}
+    assert spans["gui.click"]["duration_ns"] >= spans["worker.task"]["duration_ns"]
+    assert spans["failing"]["error"] == "RuntimeError: boom"
+    assert spans["failing"]["trace_id"] != root.trace_id
+    print("✓ Span propagation working")
+
+
+def test_rotation():
+    """Test that the exporter rotates files."""
+    print("\nTesting exporter rotation...")
+
+    path = os.path.join(tempfile.mkdtemp(), "spans.jsonl")
+    tracer = tracing.Tracer(tracing.JsonlSpanExporter(path, max_bytes=200, backup_count=2,
+                                                      batch_size=1, flush_interval=0.01))
+    for i in range(20):
+        with tracer.span(f"span-{i}"):
+            pass
+    tracer.shutdown()
+
+    assert os.path.exists(f"{path}.1")
+    assert os.path.exists(f"{path}.2")
+    assert not os.path.exists(f"{path}.3")
+    print("✓ Exporter rotation working")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("KGI Trading Application - Tracing Tests")
+    print("=" * 50)
+
+    try:
+        test_disabled_tracer()
+        test_spans_and_propagation()
+        test_rotation()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)